@@ -0,0 +1,199 @@
+"""Synthetic CHAT corpus generator for the benchmarks."""
+
+from __future__ import annotations
+
+import os
+import random
+import zipfile
+
+# (word, part-of-speech tag, morphology) by grammatical role.
+_SUBJECTS = [
+    ("I", "pro:sub", "I"),
+    ("you", "pro:per", "you"),
+    ("he", "pro:sub", "he"),
+    ("she", "pro:sub", "she"),
+    ("we", "pro:sub", "we"),
+    ("they", "pro:sub", "they"),
+]
+_VERBS = [
+    ("want", "v", "want"),
+    ("see", "v", "see"),
+    ("like", "v", "like"),
+    ("have", "v", "have"),
+    ("eat", "v", "eat"),
+    ("take", "v", "take"),
+    ("wants", "v", "want-3S"),
+    ("wanted", "v", "want-PAST"),
+    ("is", "aux", "be&3S"),
+]
+_DETERMINERS = [
+    ("the", "det:art", "the"),
+    ("a", "det:art", "a"),
+    ("more", "qn", "more"),
+    ("my", "det:poss", "my"),
+]
+_NOUNS = [
+    ("cookie", "n", "cookie"),
+    ("cookies", "n", "cookie-PL"),
+    ("dog", "n", "dog"),
+    ("dogs", "n", "dog-PL"),
+    ("ball", "n", "ball"),
+    ("juice", "n", "juice"),
+    ("book", "n", "book"),
+    ("car", "n", "car"),
+    ("mommy", "n:prop", "Mommy"),
+    ("teddy", "n", "teddy"),
+]
+_ADVERBS = [
+    ("here", "adv", "here"),
+    ("now", "adv", "now"),
+    ("again", "adv", "again"),
+    ("too", "adv", "too"),
+]
+_TERMINATORS = [".", ".", ".", "?", "!"]
+
+_PARTICIPANTS = [
+    ("CHI", "Target_Child"),
+    ("MOT", "Mother"),
+    ("FAT", "Father"),
+    ("INV", "Investigator"),
+]
+
+
+def _utterance(rng: random.Random) -> tuple[list[tuple[str, str, str]], list[str]]:
+    """Return the (word, pos, mor) items and %gra relations of an utterance.
+
+    Utterances are of the form "[subject] verb [[determiner] noun] [adverb]",
+    with the verb as the root of the dependency tree.
+    """
+    items: list[tuple[str, str, str]] = []
+    relations: list[tuple[str, int]] = []  # (relation, head index) per item
+    if rng.random() < 0.7:
+        items.append(rng.choice(_SUBJECTS))
+        relations.append(("SUBJ", -1))
+    i_verb = len(items)
+    items.append(rng.choice(_VERBS))
+    relations.append(("ROOT", -1))
+    if rng.random() < 0.8:
+        if rng.random() < 0.6:
+            items.append(rng.choice(_DETERMINERS))
+            relations.append(("DET", len(items)))
+        items.append(rng.choice(_NOUNS))
+        relations.append(("OBJ", i_verb))
+    if rng.random() < 0.3:
+        items.append(rng.choice(_ADVERBS))
+        relations.append(("JCT", i_verb))
+    terminator = rng.choice(_TERMINATORS)
+    items.append((terminator, "", terminator))
+    relations.append(("PUNCT", i_verb))
+    gra = []
+    for i, (relation, head) in enumerate(relations):
+        if relation == "ROOT":
+            head_number = 0
+        else:
+            head_number = (i_verb if head == -1 else head) + 1
+        gra.append(f"{i + 1}|{head_number}|{relation}")
+    return items, gra
+
+
+def generate_file(
+    rng: random.Random,
+    *,
+    n_utterances: int,
+    n_participants: int = 2,
+    mor_density: float = 1.0,
+    gra_density: float = 1.0,
+    age_in_months: int = 24,
+) -> str:
+    """Generate the text of one synthetic CHAT file.
+
+    Args:
+        rng: Random number generator.
+        n_utterances: Number of utterances.
+        n_participants: Number of participants, from 1 to 4.
+            The first one is always the target child, "CHI".
+        mor_density: Proportion of utterances with a %mor tier.
+        gra_density: Proportion of the utterances with a %mor tier
+            that also have a %gra tier.
+        age_in_months: Age of the target child.
+
+    Returns:
+        The CHAT file as a string.
+    """
+    participants = _PARTICIPANTS[: max(1, min(n_participants, len(_PARTICIPANTS)))]
+    years, months = divmod(age_in_months, 12)
+    lines = [
+        "@UTF8",
+        "@Begin",
+        "@Languages:\teng",
+        "@Participants:\t" + ", ".join(f"{code} {role}" for code, role in participants),
+    ]
+    for code, role in participants:
+        age = f"{years};{months:02d}.00" if code == "CHI" else ""
+        lines.append(f"@ID:\teng|synthetic|{code}|{age}||||{role}|||")
+    time = 0
+    for _ in range(n_utterances):
+        code = rng.choice(participants)[0]
+        items, gra = _utterance(rng)
+        duration = rng.randint(500, 3000)
+        words = " ".join(item[0] for item in items)
+        lines.append(f"*{code}:\t{words} \x15{time}_{time + duration}\x15")
+        time += duration + rng.randint(0, 1000)
+        if rng.random() < mor_density:
+            lines.append(
+                "%mor:\t"
+                + " ".join(f"{pos}|{mor}" if pos else mor for _, pos, mor in items)
+            )
+            if rng.random() < gra_density:
+                lines.append("%gra:\t" + " ".join(gra))
+    lines.append("@End")
+    return "\n".join(lines) + "\n"
+
+
+def generate_corpus(
+    out_dir: str | os.PathLike[str],
+    *,
+    n_files: int = 20,
+    n_utterances: int = 500,
+    n_participants: int = 2,
+    mor_density: float = 1.0,
+    gra_density: float = 1.0,
+    seed: int = 0,
+) -> tuple[str, str]:
+    """Write a synthetic corpus as both a directory and a zip file.
+
+    The same arguments always produce the same corpus.
+
+    Args:
+        out_dir: Directory to write to.
+        n_files: Number of CHAT files.
+        n_utterances: Number of utterances per file.
+        n_participants: Number of participants per file, from 1 to 4.
+        mor_density: Proportion of utterances with a %mor tier.
+        gra_density: Proportion of the utterances with a %mor tier
+            that also have a %gra tier.
+        seed: Seed of the random number generator.
+
+    Returns:
+        The paths of the corpus directory and the zip file.
+    """
+    rng = random.Random(seed)
+    corpus_dir = os.path.join(out_dir, "corpus")
+    zip_path = os.path.join(out_dir, "corpus.zip")
+    os.makedirs(corpus_dir, exist_ok=True)
+    with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as f:
+        for i in range(n_files):
+            name = f"Child/{i:04d}.cha"
+            data = generate_file(
+                rng,
+                n_utterances=n_utterances,
+                n_participants=n_participants,
+                mor_density=mor_density,
+                gra_density=gra_density,
+                age_in_months=12 + i % 48,
+            )
+            os.makedirs(os.path.join(corpus_dir, "Child"), exist_ok=True)
+            with open(os.path.join(corpus_dir, name), "w", encoding="utf-8") as g:
+                g.write(data)
+            f.writestr(name, data)
+    return corpus_dir, zip_path
@@ -0,0 +1,354 @@
+"""Benchmarks for pylangacq.
+
+Each benchmark runs in a fresh Python process on a synthetic corpus
+(see ``corpus.py``), so that its import time and peak memory
+are not affected by the other benchmarks.
+Results are written to a JSON file, by default named after
+the pylangacq and rustling versions under ``benchmarks/results/``,
+so that runs can be compared across versions:
+
+.. code-block:: bash
+
+    python benchmarks/run.py
+    python benchmarks/run.py --compare results/old.json results/new.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Any, Callable
+
+from corpus import generate_corpus
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+try:
+    import resource
+except ImportError:  # pragma: no cover (Windows)
+    resource = None  # type: ignore[assignment]
+
+
+def _peak_rss() -> int | None:
+    """Return the peak resident set size of this process in bytes."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on macOS.
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+# Setup functions return the state that the benchmark takes.
+# Each benchmark is (setup, run, whether it takes `parallel`).
+
+
+def _load(paths: dict[str, str], parallel: bool) -> Any:
+    import pylangacq
+
+    return pylangacq.CHAT.from_dir(paths["dir"], parallel=parallel)
+
+
+def _none(paths: dict[str, str], parallel: bool) -> Any:
+    return None
+
+
+def _read_chat(paths: dict[str, str], parallel: bool, state: Any) -> Any:
+    import pylangacq
+
+    return pylangacq.read_chat(paths["zip"])
+
+
+def _read_chat_chi(paths: dict[str, str], parallel: bool, state: Any) -> Any:
+    import pylangacq
+
+    return pylangacq.read_chat(paths["zip"], filter_participants="CHI")
+
+
+def _read_chat_lazy_tiers(paths: dict[str, str], parallel: bool, state: Any) -> Any:
+    import pylangacq
+
+    return pylangacq.read_chat(paths["zip"], lazy_tiers=True).words()
+
+
+def _from_dir(paths: dict[str, str], parallel: bool, state: Any) -> Any:
+    import pylangacq
+
+    return pylangacq.CHAT.from_dir(paths["dir"], parallel=parallel)
+
+
+def _from_zip(paths: dict[str, str], parallel: bool, state: Any) -> Any:
+    import pylangacq
+
+    return pylangacq.CHAT.from_zip(paths["zip"], parallel=parallel)
+
+
+def _iter_chat(paths: dict[str, str], parallel: bool, state: Any) -> Any:
+    import pylangacq
+
+    for chat in pylangacq.iter_chat(paths["zip"], chunk_files=4, parallel=parallel):
+        chat.words()
+
+
+def _collection(paths: dict[str, str], parallel: bool, state: Any) -> Any:
+    import pylangacq
+
+    # Two corpora under a budget for one, accessed in turn,
+    # with the evicted corpus spilled to a snapshot.
+    with tempfile.TemporaryDirectory() as spill_dir:
+        collection = pylangacq.CorpusCollection(
+            {"zip": paths["zip"], "dir": paths["dir"]},
+            max_memory=0,
+            spill_dir=spill_dir,
+        )
+        for name in ["zip", "dir"] * 3:
+            collection[name].words()
+
+
+def _run_parallel(paths: dict[str, str], parallel: bool, state: Any) -> Any:
+    # Queries on a thread each, or one after another without `parallel`.
+    queries = [
+        "words",
+        "tokens",
+        lambda chat: chat.utterances(by_file=True),
+        "mlum",
+        lambda chat: chat.word_ngrams(2),
+        lambda chat: chat.search(word="cookie"),
+    ]
+    return state.run_parallel(queries, workers=None if parallel else 1)
+
+
+BENCHMARKS: dict[str, tuple[Callable, Callable, bool]] = {
+    "read_chat": (_none, _read_chat, False),
+    "read_chat[CHI]": (_none, _read_chat_chi, False),
+    "read_chat[lazy_tiers]+words": (_none, _read_chat_lazy_tiers, False),
+    "CHAT.from_dir": (_none, _from_dir, True),
+    "CHAT.from_zip": (_none, _from_zip, True),
+    "iter_chat": (_none, _iter_chat, True),
+    "CorpusCollection": (_none, _collection, False),
+    "CHAT.words": (_load, lambda p, par, chat: chat.words(), False),
+    "CHAT.tokens": (_load, lambda p, par, chat: chat.tokens(), False),
+    "CHAT.word_ids": (_load, lambda p, par, chat: chat.word_ids(), False),
+    "CHAT.utterances": (_load, lambda p, par, chat: chat.utterances(), False),
+    "CHAT.word_ngrams": (_load, lambda p, par, chat: chat.word_ngrams(2), False),
+    "CHAT.word_ngrams[top_k]": (
+        _load,
+        lambda p, par, chat: chat.word_ngrams(2, top_k=100, approximate=True),
+        False,
+    ),
+    "CHAT.collocations": (
+        _load,
+        lambda p, par, chat: chat.collocations("log_likelihood", top_k=100),
+        False,
+    ),
+    "CHAT.mlum": (_load, lambda p, par, chat: chat.mlum(), False),
+    "CHAT.ipsyn": (_load, lambda p, par, chat: chat.ipsyn(), False),
+    "CHAT.measures_table": (_load, lambda p, par, chat: chat.measures_table(), False),
+    "CHAT.measures_by_age": (
+        _load,
+        lambda p, par, chat: chat.measures_by_age(["mlum", "ttr"]),
+        False,
+    ),
+    "CHAT.bootstrap": (
+        _load,
+        lambda p, par, chat: chat.bootstrap("mlum", seed=0),
+        False,
+    ),
+    "CHAT.to_columns": (_load, lambda p, par, chat: chat.to_columns(), False),
+    "CHAT.search": (_load, lambda p, par, chat: chat.search(word="cookie"), False),
+    "CHAT.find_dependencies": (
+        _load,
+        lambda p, par, chat: chat.find_dependencies("[pos=v] -OBJ-> [pos=n]"),
+        False,
+    ),
+    "CHAT.run_parallel": (_load, _run_parallel, True),
+    "CHAT.to_strs": (_load, lambda p, par, chat: chat.to_strs(), False),
+    "CHAT.to_conllu_strs": (_load, lambda p, par, chat: chat.to_conllu_strs(), False),
+}
+
+
+def _worker(name: str, paths: dict[str, str], parallel: bool, repeat: int) -> None:
+    """Run one benchmark in this process and print its results as JSON."""
+    start = time.perf_counter()
+    import pylangacq  # noqa: F401
+
+    import_time = time.perf_counter() - start
+    setup, run, _ = BENCHMARKS[name]
+    times = []
+    for _ in range(repeat):
+        # A fresh reader for each repeat, or else methods with memoized results
+        # would be timed on a cache hit after the first repeat.
+        state = setup(paths, parallel)
+        start = time.perf_counter()
+        run(paths, parallel, state)
+        times.append(time.perf_counter() - start)
+    result = {
+        "import_time": import_time,
+        "times": times,
+        "peak_rss": _peak_rss(),
+    }
+    print(json.dumps(result))
+
+
+def _run_one(
+    name: str, paths: dict[str, str], parallel: bool, repeat: int
+) -> dict[str, Any]:
+    command = [
+        sys.executable,
+        os.path.abspath(__file__),
+        "--worker",
+        name,
+        "--worker-paths",
+        json.dumps(paths),
+        "--repeat",
+        str(repeat),
+    ]
+    if parallel:
+        command.append("--worker-parallel")
+    output = subprocess.run(command, check=True, capture_output=True, text=True).stdout
+    result = json.loads(output.splitlines()[-1])
+    times = result.pop("times")
+    result["min"] = min(times)
+    result["median"] = statistics.median(times)
+    return result
+
+
+def _versions() -> dict[str, str]:
+    from importlib.metadata import version
+
+    return {package: version(package) for package in ("pylangacq", "rustling")}
+
+
+def run_benchmarks(
+    *,
+    names: list[str] | None = None,
+    n_files: int,
+    n_utterances: int,
+    n_participants: int,
+    mor_density: float,
+    gra_density: float,
+    repeat: int,
+) -> dict[str, Any]:
+    """Run the benchmarks and return the results."""
+    corpus = {
+        "n_files": n_files,
+        "n_utterances": n_utterances,
+        "n_participants": n_participants,
+        "mor_density": mor_density,
+        "gra_density": gra_density,
+    }
+    results: dict[str, Any] = {}
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        corpus_dir, zip_path = generate_corpus(tmp_dir, **corpus)
+        paths = {"dir": corpus_dir, "zip": zip_path}
+        for name in names or BENCHMARKS:
+            takes_parallel = BENCHMARKS[name][2]
+            for parallel in (True, False) if takes_parallel else (True,):
+                key = f"{name}[parallel={parallel}]" if takes_parallel else name
+                results[key] = _run_one(name, paths, parallel, repeat)
+                print(
+                    f"{key:<40} {results[key]['median']:>10.4f} s",
+                    file=sys.stderr,
+                )
+    return {
+        "versions": _versions(),
+        "python": platform.python_version(),
+        # Whether threads run Python code in parallel, on a free-threaded build.
+        "free_threaded": not getattr(sys, "_is_gil_enabled", lambda: True)(),
+        "platform": platform.platform(),
+        "corpus": corpus,
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def compare(old: dict[str, Any], new: dict[str, Any]) -> str:
+    """Return a table of median times of two runs, and their ratios."""
+    old_label = "{pylangacq}/{rustling}".format(**old["versions"])
+    new_label = "{pylangacq}/{rustling}".format(**new["versions"])
+    lines = [f"{'benchmark':<40} {old_label:>14} {new_label:>14} {'ratio':>7}"]
+    for key, result in new["results"].items():
+        if key not in old["results"]:
+            continue
+        before, after = old["results"][key]["median"], result["median"]
+        lines.append(f"{key:<40} {before:>14.4f} {after:>14.4f} {after / before:>7.2f}")
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=50)
+    parser.add_argument("--utterances", type=int, default=500)
+    parser.add_argument("--participants", type=int, default=2)
+    parser.add_argument("--mor-density", type=float, default=1.0)
+    parser.add_argument("--gra-density", type=float, default=1.0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--benchmark",
+        action="append",
+        choices=list(BENCHMARKS),
+        help="Benchmark to run (repeatable). All by default.",
+    )
+    parser.add_argument("--output", help="Path of the JSON results.")
+    parser.add_argument(
+        "--compare",
+        nargs=2,
+        metavar=("OLD", "NEW"),
+        help="Compare two JSON results instead of running benchmarks.",
+    )
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    parser.add_argument("--worker-paths", help=argparse.SUPPRESS)
+    parser.add_argument(
+        "--worker-parallel", action="store_true", help=argparse.SUPPRESS
+    )
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        _worker(
+            args.worker,
+            json.loads(args.worker_paths),
+            args.worker_parallel,
+            args.repeat,
+        )
+        return
+
+    if args.compare:
+        with open(args.compare[0]) as f:
+            old = json.load(f)
+        with open(args.compare[1]) as f:
+            new = json.load(f)
+        print(compare(old, new))
+        return
+
+    results = run_benchmarks(
+        names=args.benchmark,
+        n_files=args.files,
+        n_utterances=args.utterances,
+        n_participants=args.participants,
+        mor_density=args.mor_density,
+        gra_density=args.gra_density,
+        repeat=args.repeat,
+    )
+    output = args.output
+    if output is None:
+        output = os.path.join(
+            HERE,
+            "results",
+            "pylangacq-{pylangacq}-rustling-{rustling}.json".format(
+                **results["versions"]
+            ),
+        )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"Results written to {output}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -2,7 +2,6 @@ from importlib.metadata import version
 
 from rustling.chat import (
     Age,
-    CHAT,
     ChangeableHeader,
     Gra,
     Headers,
@@ -10,23 +9,64 @@ from rustling.chat import (
     Token,
     Utterance,
     Utterances,
-    read_chat,
 )
 from rustling.ngram import Ngrams
 
+from pylangacq._ages import AgeBin
+from pylangacq._cache import CacheStats, ParseCache
+from pylangacq._chat import CHAT, read_chat
+from pylangacq._collection import CollectionStats, CorpusCollection
+from pylangacq._collocations import Collocations
+from pylangacq._columns import Columns
+from pylangacq._convert import Conversion
+from pylangacq._dependency import DependencyMatch
+from pylangacq._index import ConcordanceLine, SearchHit
+from pylangacq._mapreduce import Reducer
+from pylangacq._measures import MeasureCacheInfo, MeasuresTable
+from pylangacq._profile import FileProfile, LoadProfile
+from pylangacq._refresh import DirChanges
+from pylangacq._resampling import ConfidenceInterval, PermutationTest
+from pylangacq._sketch import TopNgrams
+from pylangacq._sources import SourceCache
+from pylangacq._stream import iter_chat
+from pylangacq._vocab import Vocabulary
+
 __version__ = version("pylangacq")
 
 __all__ = [
     "__version__",
     "read_chat",
+    "iter_chat",
     "Age",
+    "AgeBin",
     "CHAT",
+    "CacheStats",
     "ChangeableHeader",
+    "CollectionStats",
+    "Collocations",
+    "Columns",
+    "ConcordanceLine",
+    "ConfidenceInterval",
+    "Conversion",
+    "CorpusCollection",
+    "DependencyMatch",
+    "DirChanges",
+    "FileProfile",
     "Gra",
     "Headers",
+    "LoadProfile",
+    "MeasureCacheInfo",
+    "MeasuresTable",
     "Ngrams",
+    "ParseCache",
     "Participant",
+    "PermutationTest",
+    "Reducer",
+    "SearchHit",
+    "SourceCache",
     "Token",
+    "TopNgrams",
     "Utterance",
     "Utterances",
+    "Vocabulary",
 ]
@@ -0,0 +1,5 @@
+import sys
+
+from pylangacq._cli import main
+
+sys.exit(main())
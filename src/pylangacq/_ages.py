@@ -0,0 +1,161 @@
+"""Age index of CHAT files, for longitudinal queries."""
+
+from __future__ import annotations
+
+import bisect
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Sequence
+
+from rustling.chat import Age, Headers
+
+from pylangacq._prefilter import age_in_months
+from pylangacq._table import FileTable
+
+
+@dataclass(frozen=True)
+class AgeBin:
+    """Files and developmental measures of one age bin,
+    from :meth:`CHAT.measures_by_age`."""
+
+    start: float
+    """Start of the bin in months, inclusive."""
+    end: float
+    """End of the bin in months, exclusive."""
+    files: tuple[int, ...]
+    """Indices in :attr:`CHAT.file_paths` of the files in the bin."""
+    n_utterances: int
+    """Number of utterances of the participant in the files."""
+    n_words: int
+    """Number of words (punctuation included) of the participant in the files."""
+    measures: dict[str, float | None]
+    """Mean of each measure over the files where the participant has
+    any utterances, or None if there are no such files."""
+
+
+@dataclass
+class FileSummary:
+    """Ages and utterance counts of the participants of one file."""
+
+    ages: dict[str, float | None] = field(default_factory=dict)
+    n_utterances: Counter[str] = field(default_factory=Counter)
+    n_words: Counter[str] = field(default_factory=Counter)
+
+    @classmethod
+    def from_table(cls, ages: dict[str, float | None], table: FileTable) -> FileSummary:
+        summary = cls(ages)
+        offsets = table.offsets
+        for i, participant in enumerate(table.participants):
+            summary.n_utterances[participant] += 1
+            summary.n_words[participant] += offsets[i + 1] - offsets[i]
+        return summary
+
+    @classmethod
+    def from_words(
+        cls,
+        ages: dict[str, float | None],
+        participants: Sequence[str | None],
+        words: Sequence[Sequence[str]],
+    ) -> FileSummary:
+        """Summarize a file from the participant and words of each utterance."""
+        summary = cls(ages)
+        n_utterances, n_words = summary.n_utterances, summary.n_words
+        for participant, utterance_words in zip(participants, words):
+            if participant is None:
+                continue
+            n_utterances[participant] += 1
+            n_words[participant] += len(utterance_words)
+        return summary
+
+    def with_participants(self, patterns: Sequence[str]) -> FileSummary:
+        """Return the summary of the matching participants only.
+
+        As with :meth:`CHAT.ages`, the participants filtered out
+        have no ages either.
+        """
+        regex = re.compile("|".join(f"(?:{p})" for p in patterns))
+        return FileSummary(
+            {k: v for k, v in self.ages.items() if regex.fullmatch(k)},
+            Counter({k: v for k, v in self.n_utterances.items() if regex.fullmatch(k)}),
+            Counter({k: v for k, v in self.n_words.items() if regex.fullmatch(k)}),
+        )
+
+
+def header_ages(headers: Headers) -> dict[str, float | None]:
+    """Return the age in months of each participant in the headers of a file."""
+    return {
+        p.code: None if p.age is None else p.age.in_months()
+        for p in headers.participants
+    }
+
+
+def as_months(age: float | str | Age | None, name: str) -> float | None:
+    """Return an age in months, from months, a CHAT age string, or an Age.
+
+    Raises:
+        ValueError: If the age is a string not in the CHAT format.
+    """
+    if age is None or isinstance(age, (int, float)):
+        return age
+    if isinstance(age, Age):
+        return age.in_months()
+    months = age_in_months(age)
+    if months is None:
+        raise ValueError(f"{name} must be in months or as, e.g., '2;06': {age!r}")
+    return months
+
+
+class AgeIndex:
+    """Files sorted by the age of one participant.
+
+    Files where the participant has no age are left out.
+    """
+
+    def __init__(self, summaries: Sequence[FileSummary], participant: str) -> None:
+        pairs = sorted(
+            (age, i)
+            for i, summary in enumerate(summaries)
+            if (age := summary.ages.get(participant)) is not None
+        )
+        self.months = [age for age, _ in pairs]
+        self.files = [i for _, i in pairs]
+
+    def select(self, start: float | None, end: float | None) -> list[int]:
+        """Return the files with ages from *start* up to *end* (exclusive),
+        in file order."""
+        lo = 0 if start is None else bisect.bisect_left(self.months, start)
+        hi = len(self.months) if end is None else bisect.bisect_left(self.months, end)
+        return sorted(self.files[lo:hi])
+
+    def bins(
+        self, width: float, start: float | None, end: float | None
+    ) -> list[tuple[float, float, list[int]]]:
+        """Return the (start, end, files) of each non-empty bin of ages.
+
+        Bins are *width* months wide from *start*, or else from the multiple of
+        *width* at or below the youngest age.
+        """
+        lo = 0 if start is None else bisect.bisect_left(self.months, start)
+        hi = len(self.months) if end is None else bisect.bisect_left(self.months, end)
+        if lo >= hi:
+            return []
+        origin = math.floor(self.months[lo] / width) * width if start is None else start
+        bins: list[tuple[float, float, list[int]]] = []
+        i = lo
+        while i < hi:
+            k = math.floor((self.months[i] - origin) / width)
+            # Guard against rounding errors at the edge of a bin.
+            while origin + (k + 1) * width <= self.months[i]:
+                k += 1
+            while origin + k * width > self.months[i]:
+                k -= 1
+            bin_start = origin + k * width
+            bin_end = origin + (k + 1) * width
+            if end is not None:
+                bin_end = min(bin_end, end)
+            j = bisect.bisect_left(self.months, bin_end, i, hi)
+            bins.append((float(bin_start), float(bin_end), sorted(self.files[i:j])))
+            i = j
+        return bins
@@ -0,0 +1,225 @@
+"""On-disk cache of parsed CHAT data."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+from dataclasses import dataclass
+from importlib.metadata import version
+from typing import Any, Iterable
+
+from pylangacq._table import FileTable
+
+_DEFAULT_CACHE_DIR = os.path.join("~", ".pylangacq", "cache", "parsed")
+_ENTRY_SUFFIX = ".pkl"
+_HASH_BLOCK_SIZE = 1 << 20
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """Usage statistics of a :class:`ParseCache`."""
+
+    hits: int
+    """Number of lookups answered from the cache."""
+    misses: int
+    """Number of lookups that had to parse the source data."""
+    evictions: int
+    """Number of entries removed to stay under the size cap."""
+    n_entries: int
+    """Number of entries currently on disk."""
+    size: int
+    """Total size of the entries currently on disk, in bytes."""
+
+
+@dataclass
+class CacheEntry:
+    """Parsed data of one source, as stored in a :class:`ParseCache`."""
+
+    file_paths: list[str]
+    strs: list[str]
+    tables: list[FileTable]
+
+
+class ParseCache:
+    """On-disk cache of parsed CHAT data.
+
+    Entries are keyed by the content of the data source, the parsing
+    options (``strict``, ``mor_tier``, ``gra_tier``, etc.),
+    and the versions of ``pylangacq`` and ``rustling``,
+    so that a changed file, option, or library version never serves stale data.
+    A warm read loads the pre-parsed tokens without re-running the CHAT parser;
+    the parser only runs if and when data beyond words and tokens is requested.
+
+    Entries are evicted in least-recently-used order
+    whenever the total size of the cache exceeds ``max_size``.
+
+    Cache entries are pickle files. Only point a ``ParseCache``
+    to a directory that you trust.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str | os.PathLike[str] | None = None,
+        *,
+        max_size: int | None = 2**30,
+    ) -> None:
+        """Initialize a cache.
+
+        Args:
+            cache_dir: Directory for the cache entries.
+                Defaults to ``~/.pylangacq/cache/parsed/``.
+            max_size: Maximum total size of the cache in bytes.
+                If None, the cache grows without bound.
+
+        Raises:
+            ValueError: If max_size is negative.
+        """
+        if max_size is not None and max_size < 0:
+            raise ValueError(f"max_size must not be negative: {max_size}")
+        self.cache_dir = os.path.expanduser(
+            os.fspath(cache_dir) if cache_dir is not None else _DEFAULT_CACHE_DIR
+        )
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def __repr__(self) -> str:
+        return f"ParseCache({self.cache_dir!r}, max_size={self.max_size!r})"
+
+    def key(self, data: bytes | Iterable[bytes], /, **options: Any) -> str:
+        """Return the cache key for source data and parsing options.
+
+        Args:
+            data: The raw bytes of the source, or an iterable of byte chunks.
+            **options: Parsing options that affect the parsed output.
+
+        Returns:
+            A hex digest.
+        """
+        digest = hashlib.sha256()
+        chunks = [data] if isinstance(data, bytes) else data
+        for chunk in chunks:
+            digest.update(chunk)
+        options["pylangacq"] = version("pylangacq")
+        options["rustling"] = version("rustling")
+        digest.update(repr(sorted(options.items())).encode("utf-8"))
+        return digest.hexdigest()
+
+    def get(self, key: str) -> CacheEntry | None:
+        """Return the entry for a key, or None on a miss."""
+        path = self._entry_path(key)
+        try:
+            with open(path, "rb") as f:
+                entry = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            with self._lock:
+                self._misses += 1
+            return None
+        try:
+            # Refresh the mtime for least-recently-used eviction.
+            os.utime(path)
+        except OSError:
+            pass
+        with self._lock:
+            self._hits += 1
+        return entry
+
+    def put(self, key: str, entry: CacheEntry) -> None:
+        """Store an entry, then evict old entries if the cache is too large."""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # Write to a temporary file first, so that concurrent readers
+        # never see a partially written entry.
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(entry, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self._entry_path(key))
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        self._evict()
+
+    def stats(self) -> CacheStats:
+        """Return the usage statistics of this cache."""
+        entries = self._entries()
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                n_entries=len(entries),
+                size=sum(size for _, size, _ in entries),
+            )
+
+    def clear(self) -> None:
+        """Remove all entries and reset the statistics."""
+        for path, _, _ in self._entries():
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+        with self._lock:
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key + _ENTRY_SUFFIX)
+
+    def _entries(self) -> list[tuple[str, int, float]]:
+        """Return (path, size, mtime) of all entries, least recently used first."""
+        try:
+            names = os.listdir(self.cache_dir)
+        except FileNotFoundError:
+            return []
+        entries = []
+        for name in names:
+            if not name.endswith(_ENTRY_SUFFIX):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            entries.append((path, stat.st_size, stat.st_mtime))
+        entries.sort(key=lambda entry: entry[2])
+        return entries
+
+    def _evict(self) -> None:
+        if self.max_size is None:
+            return
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        for path, size, _ in entries:
+            if total <= self.max_size:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+            total -= size
+            with self._lock:
+                self._evictions += 1
+
+
+def hash_file(path: str | os.PathLike[str]) -> Iterable[bytes]:
+    """Yield the content of a file in blocks."""
+    with open(path, "rb") as f:
+        while block := f.read(_HASH_BLOCK_SIZE):
+            yield block
+
+
+def hash_dir(path: str, file_paths: list[str]) -> Iterable[bytes]:
+    """Yield the relative paths and contents of files under a directory."""
+    for file_path in file_paths:
+        yield os.path.relpath(file_path, path).encode("utf-8") + b"\0"
+        yield from hash_file(file_path)
+        yield b"\0"
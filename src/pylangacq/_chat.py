@@ -0,0 +1,3487 @@
+"""The CHAT data reader."""
+
+from __future__ import annotations
+
+import array
+import contextlib
+import functools
+import os
+import re
+import threading
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field, replace
+from typing import TYPE_CHECKING, Any, Callable, Iterator, Mapping, Sequence
+
+from rustling.chat import CHAT as _CHAT
+
+from pylangacq._ages import AgeBin, AgeIndex, FileSummary, as_months, header_ages
+from pylangacq._cache import CacheEntry, ParseCache, hash_dir, hash_file
+from pylangacq._collocations import (
+    Collocations,
+    check_arguments,
+    count_bigrams,
+    score,
+)
+from pylangacq._columns import Columns, build_columns, to_arrow
+from pylangacq._convert import (
+    Conversion,
+    check_formats,
+    convert_chat,
+    convert_shard,
+    output_names,
+    with_progress,
+)
+from pylangacq._dependency import DependencyMatch, parse_pattern
+from pylangacq._files import list_dir, list_zip
+from pylangacq._index import ConcordanceLine, FileIndex, IndexView, SearchHit
+from pylangacq._mapreduce import (
+    Reducer,
+    get_reducer,
+    imap_ordered,
+    process_pool,
+    run_shard,
+)
+from pylangacq._measures import (
+    DEFAULT_N,
+    MEASURE_NAMES,
+    MISSING,
+    FileMeasures,
+    MeasureCacheInfo,
+    MeasuresTable,
+)
+from pylangacq._prefilter import (
+    Prefilter,
+    declared_participants,
+    parse_files,
+    participant_ages,
+)
+from pylangacq._profile import FileProfile, LoadProfile, load_profiled
+from pylangacq._refresh import DirChanges, DirSource
+from pylangacq._resampling import (
+    UTTERANCE_MEASURES,
+    ConfidenceInterval,
+    PermutationTest,
+    bootstrap_interval,
+    check_resampling,
+    permute,
+    random_generator,
+    utterance_measures,
+    utterance_units,
+)
+from pylangacq._sketch import TopNgrams
+from pylangacq._snapshot import LazySequence, Snapshot, save
+from pylangacq._sources import SourceCache, is_remote
+from pylangacq._table import FileTable, build_tables, group
+from pylangacq._vocab import Vocabulary
+
+if TYPE_CHECKING:
+    import pyarrow
+    from rustling.chat import Age, Headers, Participant, Token, Utterance, Utterances
+    from rustling.conllu import CoNLLU
+    from rustling.elan import ELAN
+    from rustling.ngram import Ngrams
+    from rustling.srt import SRT
+    from rustling.textgrid import TextGrid
+
+
+def _as_list(patterns: str | Sequence[str]) -> list[str]:
+    return [patterns] if isinstance(patterns, str) else list(patterns)
+
+
+# Parsing options that the results of a reader depend on,
+# with the defaults of rustling.
+_PARSE_OPTIONS = {"strict": True, "mor_tier": "%mor", "gra_tier": "%gra"}
+
+
+def _parse_options(options: Mapping[str, Any] | None) -> dict[str, Any]:
+    """Return the parsing options in *options*, with the defaults for the rest."""
+    options = options or {}
+    return {name: options.get(name, value) for name, value in _PARSE_OPTIONS.items()}
+
+
+@dataclass
+class _Pending:
+    """Pre-parsed data of a CHAT reader whose parsing has been deferred."""
+
+    file_paths: list[str]
+    strs: Sequence[str]
+    tables: Sequence[FileTable]
+    options: dict[str, Any]
+    participants: list[list[str]] = field(default_factory=list)
+    # The participants kept in each file, if the text has the headers of others
+    # (e.g., in the snapshot of a reader filtered by participants).
+    codes: list[list[str]] | None = None
+
+    def parse(self) -> _CHAT:
+        chat = _CHAT.from_strs(list(self.strs), ids=self.file_paths, **self.options)
+        if self.codes is not None:
+            chat = _refilter(chat, self.codes)
+        for patterns in self.participants:
+            chat = chat.filter(participants=patterns)
+        return chat
+
+    def select(self, indices: Sequence[int]) -> _Pending:
+        return replace(
+            self,
+            file_paths=[self.file_paths[i] for i in indices],
+            strs=[self.strs[i] for i in indices],
+            tables=[self.tables[i] for i in indices],
+            participants=list(self.participants),
+            codes=None if self.codes is None else [self.codes[i] for i in indices],
+        )
+
+    def filter(
+        self,
+        files: str | Sequence[str] | None,
+        participants: str | Sequence[str] | None,
+    ) -> _Pending:
+        indices: Sequence[int] = range(len(self.file_paths))
+        if files is not None:
+            regex = re.compile("|".join(f"(?:{p})" for p in _as_list(files)))
+            indices = [i for i in indices if regex.search(self.file_paths[i])]
+        pending = self.select(indices)
+        if participants is not None:
+            patterns = _as_list(participants)
+            pending.tables = [t.filter_participants(patterns) for t in pending.tables]
+            pending.participants.append(patterns)
+        return pending
+
+
+@dataclass
+class _LazyTiers:
+    """State of a CHAT reader whose %mor and %gra tiers are parsed on demand."""
+
+    options: dict[str, Any]
+    # Whether each file still has its %mor and %gra tiers unparsed.
+    unparsed: list[bool] = field(default_factory=list)
+    participants: list[list[str]] = field(default_factory=list)
+
+    @classmethod
+    def create(cls, lazy_tiers: bool, **options: Any) -> _LazyTiers | None:
+        """Return the lazy state, or None if the tiers are to be parsed now."""
+        if not lazy_tiers or (
+            options["mor_tier"] is None and options["gra_tier"] is None
+        ):
+            return None
+        return cls(options)
+
+    def select(
+        self, indices: Sequence[int], participants: str | Sequence[str] | None = None
+    ) -> _LazyTiers | None:
+        unparsed = [self.unparsed[i] for i in indices]
+        if not any(unparsed):
+            return None
+        new = replace(self, unparsed=unparsed, participants=list(self.participants))
+        if participants is not None:
+            new.participants.append(_as_list(participants))
+        return new
+
+
+def _assemble(sources: list[tuple[_CHAT, int]]) -> _CHAT:
+    """Put files together from (reader, file index) pairs, in order.
+
+    Runs of consecutive files of the same reader are taken as one slice.
+    """
+    pieces = []
+    start = 0
+    for end in range(1, len(sources) + 1):
+        if (
+            end == len(sources)
+            or sources[end][0] is not sources[start][0]
+            or sources[end][1] != sources[end - 1][1] + 1
+        ):
+            chat, first = sources[start]
+            pieces.append(chat[first : first + end - start])
+            start = end
+    new = _CHAT()
+    new.extend(pieces)
+    return new
+
+
+def _unwrap(chat: CHAT | _CHAT) -> _CHAT:
+    return chat._chat if isinstance(chat, CHAT) else chat
+
+
+def _filter_parsed(chat: _CHAT, prefilter: Prefilter) -> _CHAT:
+    """Apply a prefilter to CHAT data that has already been parsed."""
+    by_file: list[list[Any]] = chat.participants(by_file=True)  # type: ignore
+    files = []
+    for i, age in enumerate(chat.ages()):
+        if not prefilter.keeps_age(age.in_months() if age else None):
+            continue
+        file = chat[i]
+        if prefilter.participants or prefilter.exclude_participants:
+            codes = [p.code for p in by_file[i] if prefilter.keeps_participant(p.code)]
+            # "(?!)" never matches, for a file without any participants left.
+            file = file.filter(participants=[re.escape(c) for c in codes] or "(?!)")
+        files.append(file)
+    new = _CHAT()
+    new.extend(files)
+    return new
+
+
+def _refilter(chat: _CHAT, codes: Sequence[Sequence[str]]) -> _CHAT:
+    """Filter CHAT data parsed again to the participants kept in each file.
+
+    The text of a reader filtered by participants still has the headers
+    of the others, e.g., in a snapshot or in a worker process.
+
+    Args:
+        codes: The participants kept in each file,
+            from ``CHAT._participant_codes()`` of the reader.
+    """
+    by_file: list[list[Any]] = chat.participants(by_file=True)  # type: ignore
+    sources: list[tuple[_CHAT, int]] = []
+    changed = False
+    for i, (participants, kept) in enumerate(zip(by_file, codes)):
+        if {p.code for p in participants} <= set(kept):
+            sources.append((chat, i))
+            continue
+        # "(?!)" never matches, for a file without any participants left.
+        patterns = [re.escape(code) for code in kept] or ["(?!)"]
+        sources.append((chat[i].filter(participants=patterns), 0))
+        changed = True
+    return _assemble(sources) if changed else chat
+
+
+def _filter_headers(chat: CHAT, prefilter: Prefilter | None) -> CHAT:
+    """Filter prefiltered data by participant, as :meth:`CHAT.filter` does.
+
+    A prefilter only removes the utterances of the participants filtered out,
+    whereas :meth:`CHAT.filter` also removes them from the headers,
+    e.g., for the ages and the participants of each file.
+    """
+    if prefilter is None or (
+        prefilter.participants is None and prefilter.exclude_participants is None
+    ):
+        return chat
+    patterns: Sequence[str] | None = prefilter.participants
+    if prefilter.exclude_participants is not None:
+        codes = {code for codes in chat._header_codes() for code in codes}
+        kept = sorted(code for code in codes if prefilter.keeps_participant(code))
+        # "(?!)" never matches, for no participants left at all.
+        patterns = [re.escape(code) for code in kept] or ["(?!)"]
+    return chat.filter(participants=patterns)
+
+
+def _kept_indices(old_paths: list[str], new_paths: list[str]) -> list[int]:
+    """Return the positions in old_paths of the files kept in new_paths."""
+    indices = []
+    i = 0
+    for path in new_paths:
+        while old_paths[i] != path:
+            i += 1
+        indices.append(i)
+        i += 1
+    return indices
+
+
+class CHAT:
+    """CHAT data reader for CHILDES/TalkBank transcripts.
+
+    This class parses CHAT transcription files and provides access
+    to utterances, tokens, words, and annotations.
+    The parsing itself is done by :class:`rustling.chat.CHAT`,
+    which this class wraps.
+    """
+
+    def __init__(self) -> None:
+        self._parsed: _CHAT | None = _CHAT()
+        self._pending: _Pending | None = None
+        self._lazy: _LazyTiers | None = None
+        # Derived data, one item per file (None if not computed yet).
+        self._index: list[IndexView | None] | None = None
+        self._measures: list[FileMeasures] | None = None
+        self._summaries: list[FileSummary | None] | None = None
+        # Age indices by participant, built from the file summaries.
+        self._age_indices: dict[str, AgeIndex] = {}
+        self._measure_hits = 0
+        self._measure_misses = 0
+        self._profile: LoadProfile | None = None
+        self._source: DirSource | None = None
+        self._vocab = Vocabulary()
+        # The options the data was parsed with, for parsing its text again
+        # (e.g., in worker processes or from a snapshot) with the same results.
+        self._options: dict[str, Any] = dict(_PARSE_OPTIONS)
+        # Guards the data parsed and derived on demand,
+        # so that queries can run on multiple threads.
+        self._lock = threading.RLock()
+        self._frozen = False
+        self._n_running = 0
+
+    @classmethod
+    def _wrap(
+        cls,
+        chat: _CHAT,
+        lazy: _LazyTiers | None = None,
+        options: Mapping[str, Any] | None = None,
+    ) -> CHAT:
+        """Wrap a rustling reader.
+
+        Args:
+            lazy: The state of the unparsed %mor and %gra tiers, if any.
+            options: The options *chat* was parsed with, if not the defaults.
+                With *lazy*, the options of the tiers to parse are used instead.
+        """
+        new = cls()
+        new._parsed = chat
+        if lazy is not None and not lazy.unparsed:
+            lazy.unparsed = [True] * chat.n_files
+        new._lazy = lazy
+        new._options = _parse_options(lazy.options if lazy is not None else options)
+        return new
+
+    @classmethod
+    def _from_pending(cls, pending: _Pending) -> CHAT:
+        new = cls()
+        new._parsed = None
+        new._pending = pending
+        new._options = _parse_options(pending.options)
+        return new
+
+    def _derive(self, chat: _CHAT) -> CHAT:
+        """Wrap a rustling reader of data taken from this reader."""
+        new = self._wrap(chat, options=self._options)
+        new._vocab = self._vocab
+        return new
+
+    @property
+    def _base(self) -> _CHAT:
+        """The underlying rustling CHAT reader, parsed on first access.
+
+        With lazy tiers, the %mor and %gra tiers may not be parsed yet.
+        """
+        parsed = self._parsed
+        if parsed is not None:
+            return parsed
+        with self._lock:
+            # Check again, in case another thread has just parsed the data.
+            if self._parsed is None:
+                assert self._pending is not None
+                self._parsed = self._pending.parse()
+                self._pending = None
+            return self._parsed
+
+    @property
+    def _chat(self) -> _CHAT:
+        """The underlying rustling CHAT reader, fully parsed on first access."""
+        if self._lazy is not None:
+            self._parse_tiers()
+        return self._base
+
+    def _parse_tiers(self, indices: Sequence[int] | None = None) -> None:
+        """Parse the %mor and %gra tiers of files, or of all files if None."""
+        if self._lazy is None:
+            return
+        with self._lock:
+            self._parse_tiers_locked(indices)
+
+    def _parse_tiers_locked(self, indices: Sequence[int] | None) -> None:
+        lazy = self._lazy
+        if lazy is None:
+            return
+        base = self._base
+        if indices is None:
+            indices = range(len(lazy.unparsed))
+        todo = [i for i in indices if lazy.unparsed[i]]
+        if todo:
+            # A file's CHAT data still has its %mor and %gra tiers as text,
+            # and all its utterances even in a reader filtered by participants.
+            if len(todo) == len(lazy.unparsed):
+                strs = base.to_strs()
+            else:
+                strs = [base[i].to_strs()[0] for i in todo]
+            file_paths = base.file_paths
+            parsed = _CHAT.from_strs(
+                strs, ids=[file_paths[i] for i in todo], **lazy.options
+            )
+            for patterns in lazy.participants:
+                parsed = parsed.filter(participants=patterns)
+            positions = {i: k for k, i in enumerate(todo)}
+            self._parsed = _assemble(
+                [
+                    (parsed, positions[i]) if i in positions else (base, i)
+                    for i in range(len(lazy.unparsed))
+                ]
+            )
+            for i in todo:
+                lazy.unparsed[i] = False
+        if not any(lazy.unparsed):
+            self._lazy = None
+
+    def _tables(self) -> Sequence[FileTable]:
+        """Return the token table of each file."""
+        pending = self._pending
+        if pending is not None:
+            return pending.tables
+        return build_tables(self._chat)
+
+    def _participant_codes(self) -> list[list[str]]:
+        """Return the codes of the participants kept in each file.
+
+        These are the participants in the headers of the file
+        and those with utterances in it, to filter its text parsed again
+        (see ``_refilter``) into the same data as in this reader.
+        """
+        pending = self._pending
+        if pending is None:
+            lazy = self._lazy is not None
+            tables = build_tables(self._base) if lazy else self._tables()
+        else:
+            tables = pending.tables
+        return [
+            list(dict.fromkeys([*codes, *table.participants]))
+            for codes, table in zip(self._header_codes(), tables)
+        ]
+
+    def _header_codes(self) -> list[list[str]]:
+        """Return the codes of the participants in the headers of each file.
+
+        Pending data is not parsed for them.
+        """
+        pending = self._pending
+        if pending is None:
+            by_file: list[list[Any]] = self._base.participants(  # type: ignore
+                by_file=True
+            )
+            return [[p.code for p in participants] for participants in by_file]
+        if pending.codes is not None:
+            headers = pending.codes
+        else:
+            headers = [declared_participants(text) for text in pending.strs]
+        for patterns in pending.participants:
+            regex = re.compile("|".join(f"(?:{p})" for p in patterns))
+            headers = [[c for c in codes if regex.fullmatch(c)] for codes in headers]
+        return headers
+
+    def _splice(self, index: slice, n_new: int) -> tuple[list, list]:
+        """Keep derived data in line with files removed or added at index.
+
+        Returns:
+            The removed index views and memoized measures.
+        """
+        removed_index: list = []
+        removed_measures: list = []
+        if self._index is not None:
+            removed_index = self._index[index]
+            self._index[index] = [None] * n_new
+        if self._measures is not None:
+            removed_measures = self._measures[index]
+            self._measures[index] = [FileMeasures() for _ in range(n_new)]
+        if self._summaries is not None:
+            self._summaries[index] = [None] * n_new
+        self._age_indices = {}
+        return removed_index, removed_measures
+
+    def _adopt_options(self, others: Sequence[CHAT | _CHAT]) -> None:
+        """Take the parsing options of the data added to this reader, if empty."""
+        self._options = self._merged_options(others)
+
+    def _merged_options(self, others: Sequence[CHAT | _CHAT]) -> dict[str, Any]:
+        """Return the parsing options of this reader with data added to it.
+
+        Raises:
+            ValueError: If the data was parsed with other %mor or %gra tiers,
+                as its text would then be parsed again with the wrong ones
+                (e.g., in worker processes or from a snapshot).
+        """
+        options = self._options if self.n_files else None
+        for other in others:
+            if not isinstance(other, CHAT) or not other.n_files:
+                continue
+            if options is None:
+                options = other._options
+                continue
+            for name in ("mor_tier", "gra_tier"):
+                if other._options[name] != options[name]:
+                    raise ValueError(
+                        f"Cannot combine CHAT data parsed with different {name}: "
+                        f"{options[name]!r} and {other._options[name]!r}"
+                    )
+        return dict(self._options if options is None else options)
+
+    @contextlib.contextmanager
+    def _mutating(self) -> Iterator[None]:
+        """Hold the lock while this reader is modified, if it can be.
+
+        The lock is held from the check to the end of the modification,
+        so that the reader can't be frozen or queried by :meth:`run_parallel`
+        in the meantime.
+        """
+        with self._lock:
+            if self._frozen:
+                raise ValueError("Cannot modify a frozen CHAT reader")
+            if self._n_running:
+                raise ValueError(
+                    "Cannot modify a CHAT reader while run_parallel() is running on it"
+                )
+            yield
+
+    def _compute_measure(self, name: str, participant: str, n: int | None) -> list[Any]:
+        """Compute a measure per file, reusing the memoized results."""
+        name = MEASURE_NAMES[name]
+        key = (name, participant, n)
+        with self._lock:
+            if self._measures is None:
+                self._measures = [FileMeasures() for _ in range(self.n_files)]
+            file_measures = self._measures
+            results = [measures.get(key) for measures in file_measures]
+            missing = [i for i, result in enumerate(results) if result is MISSING]
+            self._measure_hits += len(results) - len(missing)
+            self._measure_misses += len(missing)
+        # Computed without holding the lock, so that other queries can run
+        # meanwhile. Threads computing the same results store the same values.
+        if len(missing) == len(results):
+            values = getattr(self._chat, name)(participant=participant, n=n)
+        else:
+            self._parse_tiers(missing)
+            values = [
+                getattr(self._base[i], name)(participant=participant, n=n)[0]
+                for i in missing
+            ]
+        for i, value in zip(missing, values):
+            results[i] = value
+            file_measures[i].set(key, value)
+        return results
+
+    def _compute_utterance_measures(
+        self,
+        names: Sequence[str],
+        participants: Sequence[str],
+        tables: Sequence[FileTable] | None = None,
+    ) -> dict[tuple[str, str], list[float]]:
+        """Compute measures with per-utterance units, with their default n,
+        reusing the memoized results.
+
+        Unlike :meth:`_compute_measure`, all the measures and participants
+        of a file are computed in one pass over its token table.
+
+        Args:
+            names: Measures from ``"mlum"``, ``"mluw"``, and ``"ttr"``.
+            participants: Participant codes.
+            tables: The token tables of the files, if already built.
+
+        Returns:
+            The measure per file by measure name and participant.
+        """
+        keys = {
+            (name, code): (name, code, DEFAULT_N[name])
+            for name in names
+            for code in participants
+        }
+        with self._lock:
+            if self._measures is None:
+                self._measures = [FileMeasures() for _ in range(self.n_files)]
+            file_measures = self._measures
+            results = {
+                pair: [measures.get(key) for measures in file_measures]
+                for pair, key in keys.items()
+            }
+            n_missing = sum(
+                result is MISSING for values in results.values() for result in values
+            )
+            self._measure_hits += len(keys) * len(file_measures) - n_missing
+            self._measure_misses += n_missing
+        if not n_missing:
+            return results  # type: ignore[return-value]
+        if tables is None:
+            tables = self._tables()
+        defaults = {name: DEFAULT_N[name] for name in names}
+        for i, table in enumerate(tables):
+            if all(values[i] is not MISSING for values in results.values()):
+                continue
+            by_participant = utterance_measures(table, defaults)
+            for (name, code), values in results.items():
+                if values[i] is MISSING:
+                    value = by_participant.get(code, {}).get(name, 0.0)
+                    values[i] = value
+                    file_measures[i].set(keys[name, code], value)
+        return results  # type: ignore[return-value]
+
+    def _select(self, kept: Sequence[int], parsed: _CHAT | None = None) -> CHAT:
+        """Return a new reader of some files in order, with their derived data.
+
+        Args:
+            kept: Indices of the files to keep.
+            parsed: The files already taken from the underlying reader, if any.
+        """
+        pending, lazy = self._pending, self._lazy
+        if pending is not None:
+            new = self._from_pending(pending.select(kept))
+            new._vocab = self._vocab
+        else:
+            if parsed is None:
+                parsed = _assemble([(self._base, i) for i in kept])
+            new = self._derive(parsed)
+        if lazy is not None:
+            new._lazy = lazy.select(kept)
+        if self._index is not None:
+            new._index = [self._index[i] for i in kept]
+        file_measures = self._measures
+        if file_measures is not None:
+            new._measures = [file_measures[i] for i in kept]
+        if self._summaries is not None:
+            new._summaries = [self._summaries[i] for i in kept]
+        return new
+
+    def _file_summaries(self) -> list[FileSummary]:
+        """Return the participant ages and utterance counts of each file."""
+        with self._lock:
+            return self._file_summaries_locked()
+
+    def _file_summaries_locked(self) -> list[FileSummary]:
+        if self._summaries is None:
+            self._summaries = [None] * self.n_files
+        summaries = self._summaries
+        missing = [i for i, summary in enumerate(summaries) if summary is None]
+        if not missing:
+            return summaries  # type: ignore[return-value]
+        pending = self._pending
+        if pending is not None:
+            for i in missing:
+                summary = FileSummary.from_table(
+                    participant_ages(pending.strs[i]), pending.tables[i]
+                )
+                for patterns in pending.participants:
+                    summary = summary.with_participants(patterns)
+                summaries[i] = summary
+        else:
+            chat = self._base
+            if len(missing) < len(summaries):
+                chat = _assemble([(chat, i) for i in missing])
+            # Words are much faster to get than tokens, and need no %mor or %gra.
+            for i, headers, utterances, words in zip(
+                missing,
+                chat.headers(),
+                chat.utterances(by_file=True),
+                chat.words(by_utterance=True, by_file=True),
+            ):
+                summaries[i] = FileSummary.from_words(
+                    header_ages(headers), [u.participant for u in utterances], words
+                )
+        return summaries  # type: ignore[return-value]
+
+    def _age_index(self, participant: str) -> AgeIndex:
+        with self._lock:
+            if participant not in self._age_indices:
+                self._age_indices[participant] = AgeIndex(
+                    self._file_summaries(), participant
+                )
+            return self._age_indices[participant]
+
+    @classmethod
+    def from_strs(
+        cls,
+        strs: Sequence[str],
+        ids: Sequence[str] | None = None,
+        parallel: bool = True,
+        strict: bool = True,
+        mor_tier: str | None = "%mor",
+        gra_tier: str | None = "%gra",
+        *,
+        participants: str | Sequence[str] | None = None,
+        exclude_participants: str | Sequence[str] | None = None,
+        age_range: tuple[float | None, float | None] | None = None,
+        lazy_tiers: bool = False,
+    ) -> CHAT:
+        """Parse CHAT data from in-memory strings.
+
+        Args:
+            strs: CHAT-formatted strings to parse.
+            ids: Optional identifiers for each string. If None, UUIDs
+                are generated.
+            parallel: If True, use parallel processing. Set to False
+                to disable multithreading.
+            strict: If True (default), raise ValueError on mor/word
+                misalignment. If False, emit a warning and set tokens
+                to an empty list for affected utterances.
+            mor_tier: Name of the dependent tier to treat as the
+                morphology tier, e.g. ``"%mor"`` or ``"%xmor"``.
+                Set to None to disable mor+gra handling.
+            gra_tier: Name of the dependent tier to treat as the
+                grammatical relation tier, e.g. ``"%gra"`` or ``"%xgra"``.
+                Set to None to disable mor+gra handling.
+            participants: Regex pattern(s) of the participant codes to keep,
+                auto-anchored as in :meth:`filter`. Unlike :meth:`filter`,
+                the utterances of the other participants are removed before
+                parsing, which saves the time and memory to parse them.
+            exclude_participants: Regex pattern(s) of the participant codes
+                whose utterances are removed before parsing.
+            age_range: ``(start, end)`` in months, to keep only the files
+                where the target child (CHI) is at least *start* and
+                younger than *end* months old. Either can be None for
+                an open end. The other files are not parsed at all.
+            lazy_tiers: If True, parse the %mor and %gra tiers of a file
+                only when they are first needed (e.g., by :meth:`tokens`,
+                :meth:`mlum`, or :meth:`to_conllu`),
+                so that methods such as :meth:`words` don't pay for them.
+
+        Returns:
+            A new CHAT reader with the parsed data.
+
+        Raises:
+            ValueError: If strs and ids have different lengths, or if
+                strict is True and mor/word misalignment is found.
+        """
+        prefilter = Prefilter.create(participants, exclude_participants, age_range)
+        if prefilter is not None:
+            strs, ids = prefilter.apply(strs, ids)
+        lazy = _LazyTiers.create(
+            lazy_tiers,
+            parallel=parallel,
+            strict=strict,
+            mor_tier=mor_tier,
+            gra_tier=gra_tier,
+        )
+        if lazy is not None:
+            mor_tier = gra_tier = None
+        new = cls._wrap(
+            _CHAT.from_strs(
+                strs,
+                ids=ids,
+                parallel=parallel,
+                strict=strict,
+                mor_tier=mor_tier,
+                gra_tier=gra_tier,
+            ),
+            lazy,
+            {"strict": strict, "mor_tier": mor_tier, "gra_tier": gra_tier},
+        )
+        return _filter_headers(new, prefilter)
+
+    @classmethod
+    def from_files(
+        cls,
+        paths: Sequence[str | os.PathLike[str]],
+        *,
+        parallel: bool = True,
+        strict: bool = True,
+        mor_tier: str | None = "%mor",
+        gra_tier: str | None = "%gra",
+        participants: str | Sequence[str] | None = None,
+        exclude_participants: str | Sequence[str] | None = None,
+        age_range: tuple[float | None, float | None] | None = None,
+        lazy_tiers: bool = False,
+    ) -> CHAT:
+        """Load CHAT data from file paths.
+
+        Args:
+            paths: Paths to CHAT files.
+            parallel: If True, use parallel processing. Set to False
+                to disable multithreading.
+            strict: If True (default), raise ValueError on mor/word
+                misalignment. If False, emit a warning and set tokens
+                to an empty list for affected utterances.
+            mor_tier: Name of the dependent tier to treat as the
+                morphology tier. Set to None to disable mor+gra handling.
+            gra_tier: Name of the dependent tier to treat as the
+                grammatical relation tier. Set to None to disable
+                mor+gra handling.
+            participants: Regex pattern(s) of the participant codes to keep,
+                auto-anchored as in :meth:`filter`. Unlike :meth:`filter`,
+                the utterances of the other participants are removed before
+                parsing, which saves the time and memory to parse them.
+            exclude_participants: Regex pattern(s) of the participant codes
+                whose utterances are removed before parsing.
+            age_range: ``(start, end)`` in months, to keep only the files
+                where the target child (CHI) is at least *start* and
+                younger than *end* months old. Either can be None for
+                an open end. The other files are not parsed at all.
+            lazy_tiers: If True, parse the %mor and %gra tiers of a file
+                only when they are first needed (e.g., by :meth:`tokens`,
+                :meth:`mlum`, or :meth:`to_conllu`),
+                so that methods such as :meth:`words` don't pay for them.
+
+        Returns:
+            A new CHAT reader with the parsed data.
+
+        Raises:
+            ValueError: If strict is True and mor/word misalignment
+                is found.
+        """
+        lazy = _LazyTiers.create(
+            lazy_tiers,
+            parallel=parallel,
+            strict=strict,
+            mor_tier=mor_tier,
+            gra_tier=gra_tier,
+        )
+        if lazy is not None:
+            mor_tier = gra_tier = None
+        options: dict[str, Any] = {
+            "strict": strict,
+            "mor_tier": mor_tier,
+            "gra_tier": gra_tier,
+        }
+        prefilter = Prefilter.create(participants, exclude_participants, age_range)
+        new = cls._wrap(
+            parse_files(
+                [os.fspath(path) for path in paths],
+                prefilter,
+                dict(options, parallel=parallel),
+            ),
+            lazy,
+            options,
+        )
+        return _filter_headers(new, prefilter)
+
+    @classmethod
+    def from_dir(
+        cls,
+        path: str | os.PathLike[str],
+        *,
+        match: str | None = None,
+        extension: str = ".cha",
+        parallel: bool = True,
+        strict: bool = True,
+        mor_tier: str | None = "%mor",
+        gra_tier: str | None = "%gra",
+        cache: ParseCache | None = None,
+        incremental: bool = False,
+        participants: str | Sequence[str] | None = None,
+        exclude_participants: str | Sequence[str] | None = None,
+        age_range: tuple[float | None, float | None] | None = None,
+        lazy_tiers: bool = False,
+    ) -> CHAT:
+        """Recursively load CHAT data from a directory.
+
+        Args:
+            path: Directory path to search.
+            match: Regex pattern to include only matching file paths.
+            extension: File extension to filter by (default: ".cha").
+            parallel: If True, use parallel processing. Set to False
+                to disable multithreading.
+            strict: If True (default), raise ValueError on mor/word
+                misalignment. If False, emit a warning and set tokens
+                to an empty list for affected utterances.
+            mor_tier: Name of the dependent tier to treat as the
+                morphology tier. Set to None to disable mor+gra handling.
+            gra_tier: Name of the dependent tier to treat as the
+                grammatical relation tier. Set to None to disable
+                mor+gra handling.
+            cache: If provided, look up the parsed data in this
+                :class:`~pylangacq.ParseCache` first,
+                and store the parsed data there on a miss.
+                Not used if *incremental* or *lazy_tiers* is True.
+            incremental: If True, keep track of the modification time,
+                size, and hash of each file, so that :meth:`refresh`
+                and :meth:`watch` can reparse only the files changed since.
+            participants: Regex pattern(s) of the participant codes to keep,
+                auto-anchored as in :meth:`filter`. Unlike :meth:`filter`,
+                the utterances of the other participants are removed before
+                parsing, which saves the time and memory to parse them.
+            exclude_participants: Regex pattern(s) of the participant codes
+                whose utterances are removed before parsing.
+            age_range: ``(start, end)`` in months, to keep only the files
+                where the target child (CHI) is at least *start* and
+                younger than *end* months old. Either can be None for
+                an open end. The other files are not parsed at all.
+            lazy_tiers: If True, parse the %mor and %gra tiers of a file
+                only when they are first needed (e.g., by :meth:`tokens`,
+                :meth:`mlum`, or :meth:`to_conllu`),
+                so that methods such as :meth:`words` don't pay for them.
+
+        Returns:
+            A new CHAT reader with the parsed data.
+
+        Raises:
+            ValueError: If strict is True and mor/word misalignment
+                is found, or if both *incremental* and *lazy_tiers* are True.
+        """
+        if incremental and lazy_tiers:
+            raise ValueError("incremental and lazy_tiers can't be both True")
+        lazy = _LazyTiers.create(
+            lazy_tiers,
+            parallel=parallel,
+            strict=strict,
+            mor_tier=mor_tier,
+            gra_tier=gra_tier,
+        )
+        if lazy is not None:
+            mor_tier = gra_tier = None
+        options: dict[str, Any] = {
+            "strict": strict,
+            "mor_tier": mor_tier,
+            "gra_tier": gra_tier,
+        }
+        prefilter = Prefilter.create(participants, exclude_participants, age_range)
+        dir_path = os.fspath(path)
+
+        def parse() -> _CHAT:
+            if prefilter is not None:
+                return parse_files(
+                    list_dir(dir_path, extension, match),
+                    prefilter,
+                    dict(options, parallel=parallel),
+                )
+            return _CHAT.from_dir(
+                path, match=match, extension=extension, parallel=parallel, **options
+            )
+
+        if incremental:
+            source = DirSource(
+                dir_path,
+                match,
+                extension,
+                dict(options, parallel=parallel),
+                prefilter=prefilter,
+            )
+            file_paths, _, source.states = source.scan()
+            new = cls._wrap(source.parse(file_paths), options=options)
+            new = _filter_headers(new, prefilter)
+            new._source = source
+            return new
+        if cache is None or lazy is not None:
+            return _filter_headers(cls._wrap(parse(), lazy, options), prefilter)
+        file_paths = list_dir(dir_path, extension)
+        key = cache.key(
+            hash_dir(dir_path, file_paths),
+            source="dir",
+            path=dir_path,
+            match=match,
+            extension=extension,
+            **options,
+            **(prefilter.key() if prefilter is not None else {}),
+        )
+        new = cls._from_cache(cache, key, parse, dict(options, parallel=parallel))
+        return _filter_headers(new, prefilter)
+
+    @classmethod
+    def from_zip(
+        cls,
+        path: str | os.PathLike[str],
+        *,
+        match: str | None = None,
+        extension: str = ".cha",
+        parallel: bool = True,
+        strict: bool = True,
+        mor_tier: str | None = "%mor",
+        gra_tier: str | None = "%gra",
+        cache: ParseCache | None = None,
+        participants: str | Sequence[str] | None = None,
+        exclude_participants: str | Sequence[str] | None = None,
+        age_range: tuple[float | None, float | None] | None = None,
+        lazy_tiers: bool = False,
+    ) -> CHAT:
+        """Load CHAT data from a ZIP archive.
+
+        Args:
+            path: Path to the ZIP file.
+            match: Regex pattern to include only matching file paths.
+            extension: File extension to filter by (default: ".cha").
+            parallel: If True, use parallel processing. Set to False
+                to disable multithreading.
+            strict: If True (default), raise ValueError on mor/word
+                misalignment. If False, emit a warning and set tokens
+                to an empty list for affected utterances.
+            mor_tier: Name of the dependent tier to treat as the
+                morphology tier. Set to None to disable mor+gra handling.
+            gra_tier: Name of the dependent tier to treat as the
+                grammatical relation tier. Set to None to disable
+                mor+gra handling.
+            cache: If provided, look up the parsed data in this
+                :class:`~pylangacq.ParseCache` first,
+                and store the parsed data there on a miss.
+                Not used if *lazy_tiers* is True.
+            participants: Regex pattern(s) of the participant codes to keep,
+                auto-anchored as in :meth:`filter`. Unlike :meth:`filter`,
+                the utterances of the other participants are removed before
+                parsing, which saves the time and memory to parse them.
+            exclude_participants: Regex pattern(s) of the participant codes
+                whose utterances are removed before parsing.
+            age_range: ``(start, end)`` in months, to keep only the files
+                where the target child (CHI) is at least *start* and
+                younger than *end* months old. Either can be None for
+                an open end. The other files are not parsed at all.
+            lazy_tiers: If True, parse the %mor and %gra tiers of a file
+                only when they are first needed (e.g., by :meth:`tokens`,
+                :meth:`mlum`, or :meth:`to_conllu`),
+                so that methods such as :meth:`words` don't pay for them.
+
+        Returns:
+            A new CHAT reader with the parsed data.
+
+        Raises:
+            ValueError: If strict is True and mor/word misalignment
+                is found.
+        """
+        lazy = _LazyTiers.create(
+            lazy_tiers,
+            parallel=parallel,
+            strict=strict,
+            mor_tier=mor_tier,
+            gra_tier=gra_tier,
+        )
+        if lazy is not None:
+            mor_tier = gra_tier = None
+        options: dict[str, Any] = {
+            "strict": strict,
+            "mor_tier": mor_tier,
+            "gra_tier": gra_tier,
+        }
+        prefilter = Prefilter.create(participants, exclude_participants, age_range)
+
+        def parse() -> _CHAT:
+            if prefilter is not None:
+                names = list_zip(path, extension, match)
+                with zipfile.ZipFile(path) as f:
+                    strs = [f.read(name).decode("utf-8") for name in names]
+                strs, ids = prefilter.apply(strs, names)
+                return _CHAT.from_strs(strs, ids=ids, parallel=parallel, **options)
+            return _CHAT.from_zip(
+                path, match=match, extension=extension, parallel=parallel, **options
+            )
+
+        if cache is None or lazy is not None:
+            return _filter_headers(cls._wrap(parse(), lazy, options), prefilter)
+        key = cache.key(
+            hash_file(path),
+            source="zip",
+            match=match,
+            extension=extension,
+            **options,
+            **(prefilter.key() if prefilter is not None else {}),
+        )
+        new = cls._from_cache(cache, key, parse, dict(options, parallel=parallel))
+        return _filter_headers(new, prefilter)
+
+    @classmethod
+    def _from_cache(
+        cls,
+        cache: ParseCache,
+        key: str,
+        parse: Any,
+        options: dict[str, Any],
+    ) -> CHAT:
+        entry = cache.get(key)
+        if entry is not None:
+            return cls._from_pending(
+                _Pending(entry.file_paths, entry.strs, entry.tables, options)
+            )
+        chat = parse()
+        cache.put(key, CacheEntry(chat.file_paths, chat.to_strs(), build_tables(chat)))
+        return cls._wrap(chat, options=options)
+
+    @classmethod
+    def from_git(
+        cls,
+        url: str,
+        *,
+        rev: str | None = None,
+        depth: int | None = None,
+        match: str | None = None,
+        extension: str = ".cha",
+        cache_dir: str | os.PathLike[str] | None = None,
+        force_download: bool = False,
+        parallel: bool = True,
+        strict: bool = True,
+        mor_tier: str | None = "%mor",
+        gra_tier: str | None = "%gra",
+    ) -> CHAT:
+        """Load CHAT data from a git repository.
+
+        Clones the repository (or uses a cached clone) and parses all
+        matching files from the resulting directory.
+
+        Args:
+            url: Git repository URL.
+            rev: Branch, tag, or commit hash. If None, uses the
+                repository's default branch.
+            depth: Clone depth. Defaults to 1 (shallow clone).
+                Ignored when rev is a commit hash.
+            match: Regex pattern to include only matching file paths.
+            extension: File extension to filter by (default: ".cha").
+            cache_dir: Directory for caching cloned repositories.
+                Defaults to ``~/.rustling/cache/``.
+            force_download: If True, re-clone even if a cached copy exists.
+            parallel: If True, use parallel processing.
+            strict: If True (default), raise ValueError on mor/word
+                misalignment. If False, emit a warning and set tokens
+                to an empty list for affected utterances.
+            mor_tier: Name of the dependent tier to treat as the
+                morphology tier. Set to None to disable.
+            gra_tier: Name of the dependent tier to treat as the
+                grammatical relation tier. Set to None to disable.
+
+        Returns:
+            A new CHAT reader with the parsed data.
+        """
+        return cls._wrap(
+            _CHAT.from_git(
+                url,
+                rev=rev,
+                depth=depth,
+                match=match,
+                extension=extension,
+                cache_dir=cache_dir,
+                force_download=force_download,
+                parallel=parallel,
+                strict=strict,
+                mor_tier=mor_tier,
+                gra_tier=gra_tier,
+            ),
+            options={"strict": strict, "mor_tier": mor_tier, "gra_tier": gra_tier},
+        )
+
+    @classmethod
+    def from_url(
+        cls,
+        url: str,
+        *,
+        match: str | None = None,
+        extension: str = ".cha",
+        cache_dir: str | os.PathLike[str] | None = None,
+        force_download: bool = False,
+        parallel: bool = True,
+        strict: bool = True,
+        mor_tier: str | None = "%mor",
+        gra_tier: str | None = "%gra",
+    ) -> CHAT:
+        """Load CHAT data from a URL.
+
+        Downloads the file (or uses a cached copy) and parses it.
+        ZIP files are automatically detected and extracted.
+
+        Args:
+            url: URL to download from.
+            match: Regex pattern to include only matching file paths
+                (applicable for ZIP files).
+            extension: File extension to filter by (default: ".cha",
+                applicable for ZIP files).
+            cache_dir: Directory for caching downloads.
+                Defaults to ``~/.rustling/cache/``.
+            force_download: If True, re-download even if a cached
+                copy exists.
+            parallel: If True, use parallel processing.
+            strict: If True (default), raise ValueError on mor/word
+                misalignment. If False, emit a warning and set tokens
+                to an empty list for affected utterances.
+            mor_tier: Name of the dependent tier to treat as the
+                morphology tier. Set to None to disable.
+            gra_tier: Name of the dependent tier to treat as the
+                grammatical relation tier. Set to None to disable.
+
+        Returns:
+            A new CHAT reader with the parsed data.
+        """
+        return cls._wrap(
+            _CHAT.from_url(
+                url,
+                match=match,
+                extension=extension,
+                cache_dir=cache_dir,
+                force_download=force_download,
+                parallel=parallel,
+                strict=strict,
+                mor_tier=mor_tier,
+                gra_tier=gra_tier,
+            ),
+            options={"strict": strict, "mor_tier": mor_tier, "gra_tier": gra_tier},
+        )
+
+    @classmethod
+    def from_urls(
+        cls,
+        urls: Sequence[str],
+        *,
+        max_concurrency: int = 4,
+        cache: SourceCache | None = None,
+        checksums: Mapping[str, str] | None = None,
+        revalidate: bool = True,
+        match: str | None = None,
+        extension: str = ".cha",
+        parallel: bool = True,
+        strict: bool = True,
+        mor_tier: str | None = "%mor",
+        gra_tier: str | None = "%gra",
+        participants: str | Sequence[str] | None = None,
+        exclude_participants: str | Sequence[str] | None = None,
+        age_range: tuple[float | None, float | None] | None = None,
+        lazy_tiers: bool = False,
+    ) -> CHAT:
+        """Load CHAT data from multiple URLs and git repositories concurrently.
+
+        The sources are downloaded or cloned on a thread pool,
+        and each one is parsed as soon as it's fetched,
+        while the others are still being fetched.
+        Fetched sources are kept in a :class:`~pylangacq.SourceCache`,
+        which resumes interrupted downloads and only fetches a source again
+        if it has changed.
+
+        Args:
+            urls: URLs of files (e.g., ZIP archives) over HTTP or HTTPS,
+                or of git repositories (ending in ``.git``).
+                Local paths of ``.zip`` files, directories,
+                and ``.cha`` files are read as well.
+            max_concurrency: Maximum number of sources fetched at the same time.
+            cache: The :class:`~pylangacq.SourceCache` for the fetched sources.
+                Defaults to one at ``~/.pylangacq/cache/sources/``.
+            checksums: Expected checksums of downloaded files, by URL,
+                as ``"<algorithm>:<hex digest>"`` or SHA-256 hex digests.
+            revalidate: If False, use cached copies without checking
+                with the servers whether they have changed.
+            match: Regex pattern to include only matching file paths.
+            extension: File extension to filter by (default: ".cha").
+            parallel: If True, use parallel processing for parsing.
+            strict: If True (default), raise ValueError on mor/word
+                misalignment. If False, emit a warning and set tokens
+                to an empty list for affected utterances.
+            mor_tier: Name of the dependent tier to treat as the
+                morphology tier. Set to None to disable.
+            gra_tier: Name of the dependent tier to treat as the
+                grammatical relation tier. Set to None to disable.
+            participants: Regex pattern(s) of the participant codes to keep,
+                as in :meth:`from_zip`.
+            exclude_participants: Regex pattern(s) of the participant codes
+                whose utterances are removed before parsing.
+            age_range: ``(start, end)`` in months of the target child's age,
+                as in :meth:`from_zip`.
+            lazy_tiers: If True, parse the %mor and %gra tiers of a file
+                only when they are first needed, as in :meth:`from_zip`.
+
+        Returns:
+            A new CHAT reader with the files of all the sources,
+            in the order of *urls*.
+
+        Raises:
+            ValueError: If *max_concurrency* is less than 1,
+                or if a downloaded file doesn't match its checksum.
+        """
+        if max_concurrency < 1:
+            raise ValueError(f"max_concurrency must be at least 1: {max_concurrency}")
+        if cache is None:
+            cache = SourceCache()
+        checksums = checksums or {}
+        options: dict[str, Any] = {
+            "match": match,
+            "extension": extension,
+            "parallel": parallel,
+            "strict": strict,
+            "mor_tier": mor_tier,
+            "gra_tier": gra_tier,
+            "participants": participants,
+            "exclude_participants": exclude_participants,
+            "age_range": age_range,
+            "lazy_tiers": lazy_tiers,
+        }
+        unique = list(dict.fromkeys(urls))
+        remote = [url for url in unique if is_remote(url)]
+
+        def fetch_and_parse(url: str) -> CHAT:
+            # Keep the source pinned in the cache until it's parsed,
+            # for the other fetches not to evict it in the meantime.
+            with cache.pinned(
+                url, checksum=checksums.get(url), revalidate=revalidate
+            ) as path:
+                return cls._from_local(path, options)
+
+        parsed: dict[str, CHAT] = {}
+        with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+            futures = {executor.submit(fetch_and_parse, url): url for url in remote}
+            try:
+                for url in unique:
+                    if url not in remote:
+                        parsed[url] = cls._from_local(url, options)
+                for future in as_completed(futures):
+                    parsed[futures[future]] = future.result()
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+        readers = [parsed[url] for url in urls]
+        if any(reader._lazy is not None for reader in readers):
+            return cls._concat_lazy(readers)
+        new = cls()
+        new._options = _parse_options(options)
+        new.extend(readers)
+        return new
+
+    @classmethod
+    def _concat_lazy(cls, readers: Sequence[CHAT]) -> CHAT:
+        """Put together readers loaded with the same options, with lazy tiers.
+
+        Unlike :meth:`extend`, the %mor and %gra tiers are left unparsed.
+        """
+        lazy = next(reader._lazy for reader in readers if reader._lazy is not None)
+        unparsed: list[bool] = []
+        for reader in readers:
+            if reader._lazy is None:
+                unparsed.extend([False] * reader.n_files)
+            else:
+                unparsed.extend(reader._lazy.unparsed)
+        base = _CHAT()
+        base.extend([reader._base for reader in readers])
+        return cls._wrap(base, replace(lazy, unparsed=unparsed))
+
+    @classmethod
+    def _from_local(cls, path: str, options: dict[str, Any]) -> CHAT:
+        """Parse a local ZIP file, directory, or CHAT file."""
+        if os.path.isdir(path):
+            return cls.from_dir(path, **options)
+        if zipfile.is_zipfile(path):
+            return cls.from_zip(path, **options)
+        options = dict(options)
+        options.pop("match")
+        options.pop("extension")
+        return cls.from_files([path], **options)
+
+    @classmethod
+    def from_utterances(cls, utterances: Sequence[Utterance]) -> CHAT:
+        """Construct a CHAT reader from a list of utterances.
+
+        Creates a new reader containing a single virtual file with the given
+        utterances. Useful for splitting a reader into sub-readers based on
+        utterance boundaries.
+
+        Args:
+            utterances: Utterance objects to include.
+
+        Returns:
+            A new CHAT reader containing the given utterances.
+        """
+        return cls._wrap(_CHAT.from_utterances(utterances))
+
+    @property
+    def file_paths(self) -> list[str]:
+        """Return the list of file paths.
+
+        Returns:
+            File paths or identifiers.
+        """
+        pending = self._pending
+        if pending is not None:
+            return list(pending.file_paths)
+        return self._base.file_paths
+
+    @property
+    def profile(self) -> LoadProfile | None:
+        """Profile of loading the data, from ``read_chat(..., profile=True)``.
+
+        None if the data was not loaded with profiling.
+        """
+        return self._profile
+
+    @property
+    def vocab(self) -> Vocabulary:
+        """The interned vocabulary for :meth:`word_ids`, ``tokens(compact=True)``,
+        and :meth:`collocations`.
+
+        The readers derived from this reader (e.g., with :meth:`filter`
+        or indexing) share its vocabulary, so that their IDs can be compared.
+        For the same IDs across separately read readers,
+        give them the same vocabulary, e.g., ``cds.vocab = chi.vocab``.
+        The vocabulary only grows with the strings encoded,
+        and its memory is released along with the readers that use it.
+        """
+        return self._vocab
+
+    @vocab.setter
+    def vocab(self, vocab: Vocabulary) -> None:
+        self._vocab = vocab
+
+    @property
+    def n_files(self) -> int:
+        """Return the number of files.
+
+        Returns:
+            Number of loaded files.
+        """
+        pending = self._pending
+        if pending is not None:
+            return len(pending.file_paths)
+        return self._base.n_files
+
+    @property
+    def frozen(self) -> bool:
+        """Whether this reader is read-only, after :meth:`freeze`."""
+        return self._frozen
+
+    def filter(
+        self,
+        *,
+        files: str | Sequence[str] | None = None,
+        participants: str | Sequence[str] | None = None,
+    ) -> CHAT:
+        """Return a new CHAT filtered by file path and/or participant regex.
+
+        Args:
+            files: Regex pattern(s) to include only matching file paths.
+                Accepts a single string or a sequence of strings.
+                Multiple patterns are OR'd.
+            participants: Regex pattern(s) to include only matching
+                participant codes. Accepts a single string or a sequence
+                of strings. Patterns are auto-anchored (full match).
+                Multiple patterns are OR'd.
+
+        Returns:
+            A new filtered CHAT reader.
+        """
+        pending, lazy = self._pending, self._lazy
+        if pending is not None:
+            new = self._from_pending(pending.filter(files, participants))
+            new._vocab = self._vocab
+        else:
+            new = self._derive(
+                self._base.filter(files=files, participants=participants)
+            )
+        if lazy is not None:
+            kept = _kept_indices(self.file_paths, new.file_paths)
+            new._lazy = lazy.select(kept, participants)
+        if self._index is not None:
+            kept = _kept_indices(self.file_paths, new.file_paths)
+            views = [self._index[i] for i in kept]
+            if participants is not None:
+                patterns = _as_list(participants)
+                views = [
+                    view.with_participants(patterns) if view is not None else None
+                    for view in views
+                ]
+            new._index = views
+        file_measures = self._measures
+        if file_measures is not None:
+            kept = _kept_indices(self.file_paths, new.file_paths)
+            measures = [file_measures[i] for i in kept]
+            if participants is not None:
+                patterns = _as_list(participants)
+                measures = [m.with_participants(patterns) for m in measures]
+            new._measures = measures
+        if self._summaries is not None:
+            kept = _kept_indices(self.file_paths, new.file_paths)
+            summaries = [self._summaries[i] for i in kept]
+            if participants is not None:
+                patterns = _as_list(participants)
+                summaries = [
+                    s.with_participants(patterns) if s is not None else None
+                    for s in summaries
+                ]
+            new._summaries = summaries
+        return new
+
+    def headers(self) -> list[Headers]:
+        """Return file-level headers.
+
+        Returns:
+            A list of Headers, one per file.
+        """
+        return self._base.headers()
+
+    def participants(
+        self, *, by_file: bool = False
+    ) -> list[Participant] | list[list[Participant]]:
+        """Return participants.
+
+        Args:
+            by_file: If True, group participants by file.
+
+        Returns:
+            Participants, optionally grouped by file.
+        """
+        return self._base.participants(by_file=by_file)
+
+    def languages(self, *, by_file: bool = False) -> list[str] | list[list[str]]:
+        """Return languages.
+
+        Args:
+            by_file: If True, group languages by file.
+
+        Returns:
+            Language codes, optionally grouped by file.
+        """
+        return self._base.languages(by_file=by_file)
+
+    def utterances(
+        self, *, by_file: bool = False
+    ) -> list[Utterance] | list[list[Utterance]]:
+        """Return utterances.
+
+        Args:
+            by_file: If True, group utterances by file.
+
+        Returns:
+            Utterances, optionally grouped by file.
+        """
+        return self._chat.utterances(by_file=by_file)
+
+    def head(self, n: int = 5) -> Utterances:
+        """Return the first n utterances with a formatted display.
+
+        Args:
+            n: Number of utterances to include.
+
+        Returns:
+            An Utterances object that displays as formatted text.
+        """
+        return self._chat.head(n)
+
+    def tail(self, n: int = 5) -> Utterances:
+        """Return the last n utterances with a formatted display.
+
+        Args:
+            n: Number of utterances to include.
+
+        Returns:
+            An Utterances object that displays as formatted text.
+        """
+        return self._chat.tail(n)
+
+    def words(
+        self, *, by_utterance: bool = False, by_file: bool = False
+    ) -> list[str] | list[list[str]] | list[list[list[str]]]:
+        """Return words.
+
+        Args:
+            by_utterance: If True, group words by utterance.
+            by_file: If True, group words by file.
+
+        Returns:
+            Words with optional grouping.
+        """
+        pending = self._pending
+        if pending is not None:
+            per_file = [t.utterance_words() for t in pending.tables]
+            return group(per_file, by_utterance=by_utterance, by_file=by_file)
+        return self._base.words(by_utterance=by_utterance, by_file=by_file)
+
+    def word_ids(
+        self, *, by_utterance: bool = False, by_file: bool = False
+    ) -> array.array | list[array.array] | list[list[array.array]]:
+        """Return words as integer IDs in :attr:`vocab`.
+
+        Each group of IDs is an :class:`array.array` of 32-bit integers,
+        which takes up 4 bytes per word instead of a Python string object,
+        and can be passed to NumPy (``numpy.asarray(ids)``) without copying.
+        Use ``chat.vocab.decode(ids)`` for the words.
+
+        Args:
+            by_utterance: If True, group word IDs by utterance.
+            by_file: If True, group word IDs by file.
+
+        Returns:
+            Word IDs with optional grouping, in the same shape as :meth:`words`.
+        """
+        encode = self._vocab.encode
+        if by_utterance:
+            per_file = []
+            for words, offsets in self._word_columns():
+                ids = encode(words)
+                per_file.append(
+                    [ids[offsets[i] : offsets[i + 1]] for i in range(len(offsets) - 1)]
+                )
+            return per_file if by_file else [ids for f in per_file for ids in f]
+        by_files = [encode(words) for words, _ in self._word_columns()]
+        if by_file:
+            return by_files
+        result = array.array("i")
+        for ids in by_files:
+            result.extend(ids)
+        return result
+
+    def _word_columns(self) -> Iterator[tuple[list[str], list[int]]]:
+        """Yield the words of each file with the offsets of its utterances,
+        as in the columns of its token table."""
+        pending = self._pending
+        if pending is not None:
+            for table in pending.tables:
+                yield table.words, table.offsets
+            return
+        for utterances in self._file_words():
+            offsets = [0]
+            for words in utterances:
+                offsets.append(offsets[-1] + len(words))
+            yield [word for words in utterances for word in words], offsets
+
+    def _file_words(self) -> Iterator[list[list[str]]]:
+        """Yield the words of each file by utterance."""
+        pending = self._pending
+        if pending is not None:
+            for table in pending.tables:
+                yield table.utterance_words()
+            return
+        # Slicing out each file copies its data, which takes longer than this.
+        per_file: list = self._base.words(by_utterance=True, by_file=True)
+        per_file.reverse()
+        while per_file:
+            # Let go of each file's words as soon as they're used.
+            yield per_file.pop()
+
+    def tokens(
+        self,
+        *,
+        by_utterance: bool = False,
+        by_file: bool = False,
+        compact: bool = False,
+    ) -> list[Token] | list[list[Token]] | list[list[list[Token]]] | Columns:
+        """Return tokens.
+
+        Args:
+            by_utterance: If True, group tokens by utterance.
+            by_file: If True, group tokens by file.
+            compact: If True, return the tokens as :class:`~pylangacq.Columns`
+                (as :meth:`to_columns` does) instead of ``Token`` objects,
+                with all the strings (words, part-of-speech tags, etc.)
+                as integer IDs in :attr:`vocab`, comparable across readers.
+                The ``file`` and ``utterance`` columns take the place
+                of *by_file* and *by_utterance*.
+
+        Returns:
+            Tokens with optional grouping.
+
+        Raises:
+            ValueError: If compact is True with by_utterance or by_file.
+        """
+        if compact:
+            if by_utterance or by_file:
+                raise ValueError("compact=True is without by_utterance or by_file")
+            return build_columns(self._tables(), self._vocab)
+        pending = self._pending
+        if pending is not None:
+            per_file = [t.utterance_tokens() for t in pending.tables]
+            return group(per_file, by_utterance=by_utterance, by_file=by_file)
+        return self._chat.tokens(by_utterance=by_utterance, by_file=by_file)
+
+    def mlum(self, *, participant: str = "CHI", n: int | None = 100) -> list[float]:
+        """Mean length of utterance in morphemes.
+
+        Args:
+            participant: Target participant code.
+            n: Number of utterances to use per file. None for all.
+
+        Returns:
+            One value per file.
+        """
+        return self._compute_measure("mlum", participant, n)
+
+    def mlu(self, *, participant: str = "CHI", n: int | None = 100) -> list[float]:
+        """Mean length of utterance in morphemes.
+
+        Alias for :meth:`mlum`.
+
+        Args:
+            participant: Target participant code.
+            n: Number of utterances to use per file. None for all.
+
+        Returns:
+            One value per file.
+        """
+        return self._compute_measure("mlu", participant, n)
+
+    def mluw(self, *, participant: str = "CHI", n: int | None = 100) -> list[float]:
+        """Mean length of utterance in words.
+
+        Args:
+            participant: Target participant code.
+            n: Number of utterances to use per file. None for all.
+
+        Returns:
+            One value per file.
+        """
+        return self._compute_measure("mluw", participant, n)
+
+    def ttr(self, *, participant: str = "CHI", n: int | None = 350) -> list[float]:
+        """Type-token ratio for non-punctuation words.
+
+        Args:
+            participant: Target participant code.
+            n: Number of tokens to use per file. None for all.
+
+        Returns:
+            One value per file.
+        """
+        return self._compute_measure("ttr", participant, n)
+
+    def ipsyn(self, *, participant: str = "CHI", n: int | None = 100) -> list[int]:
+        """Index of Productive Syntax (IPSyn).
+
+        Args:
+            participant: Target participant code.
+            n: Number of utterances to use per file. None for all.
+
+        Returns:
+            One score (0-112) per file.
+        """
+        return self._compute_measure("ipsyn", participant, n)
+
+    def ages(self) -> list[Age | None]:
+        """Return the age of the target child (CHI) in each file.
+
+        Returns:
+            One Age per file, or None if the file has no CHI or the CHI
+            has no age.
+        """
+        return self._base.ages()
+
+    def slice_by_age(
+        self,
+        start: float | str | Age | None = None,
+        end: float | str | Age | None = None,
+        *,
+        participant: str = "CHI",
+    ) -> CHAT:
+        """Return a new CHAT of the files in an age range of a participant.
+
+        Files are looked up in an index sorted by the participant's age
+        (from the ``@ID`` headers), built at the first age query,
+        so that only the files in the age range are taken.
+        The files are kept in their order in this reader, and so are all
+        the utterances of each file; use :meth:`filter` for the utterances
+        of certain participants only.
+
+        Args:
+            start: Minimum age, inclusive. Either in months
+                (e.g., ``24``), as in ``Age.in_months()``,
+                a CHAT age string (e.g., ``"2;00"``), or an :class:`Age`.
+                None for no minimum.
+            end: Maximum age, exclusive, in the same forms as *start*.
+                None for no maximum.
+            participant: Participant code whose age is used.
+                Files where the participant has no age are left out,
+                as are all files if this reader has been filtered
+                to other participants.
+
+        Returns:
+            A new CHAT reader.
+
+        Raises:
+            ValueError: If an age string is not in the CHAT format.
+
+        Examples:
+            .. code-block:: python
+
+                # All child utterances from 2;0 up to 3;0
+                chat.slice_by_age("2;0", "3;0").filter(participants="CHI")
+        """
+        kept = self._age_index(participant).select(
+            as_months(start, "start"), as_months(end, "end")
+        )
+        if len(kept) == self.n_files:
+            return self[:]
+        return self._select(kept)
+
+    def measures_by_age(
+        self,
+        measures: Sequence[str] = ("mlum",),
+        *,
+        bin_months: float = 3,
+        start: float | str | Age | None = None,
+        end: float | str | Age | None = None,
+        participant: str = "CHI",
+    ) -> list[AgeBin]:
+        """Compute developmental measures of a participant by age bin.
+
+        Files are binned by the participant's age from the index
+        of :meth:`slice_by_age`, which also keeps the participant's
+        utterance and word counts of each file for the counts of the bins.
+        Each measure is computed per file as by its own method
+        (e.g., :meth:`mlum`, with its default ``n``), memoized as for it,
+        and averaged over the files of each bin
+        where the participant has any utterances.
+
+        Args:
+            measures: Measures to compute, from
+                ``"mlu"``, ``"mlum"``, ``"mluw"``, ``"ttr"``, and ``"ipsyn"``.
+            bin_months: Width of each bin in months.
+            start: Minimum age, in the same forms as for :meth:`slice_by_age`.
+                Bins start from here, or else from the multiple of
+                *bin_months* at or below the youngest age.
+            end: Maximum age, exclusive.
+            participant: Participant code whose age and utterances are used.
+
+        Returns:
+            A list of :class:`~pylangacq.AgeBin` objects for the bins with
+            any files, from the youngest to the oldest.
+
+        Raises:
+            ValueError: If a measure is not recognized,
+                or if *bin_months* is not positive.
+
+        Examples:
+            .. code-block:: python
+
+                # MLUm of the child per 3-month bin
+                for age_bin in chat.measures_by_age(["mlum"], bin_months=3):
+                    print(age_bin.start, age_bin.end, age_bin.measures["mlum"])
+        """
+        measures = _as_list(measures)
+        for name in measures:
+            if name not in MEASURE_NAMES:
+                raise ValueError(
+                    f"measure must be one of {sorted(MEASURE_NAMES)}: {name!r}"
+                )
+        if not bin_months > 0:
+            raise ValueError(f"bin_months must be positive: {bin_months!r}")
+        bins = self._age_index(participant).bins(
+            bin_months, as_months(start, "start"), as_months(end, "end")
+        )
+        summaries = self._file_summaries()
+        # Measures are computed by rustling in one pass over all the files,
+        # which takes much less time than taking out the files of the bins.
+        values: dict[str, list[Any]] = {}
+        if bins:
+            for name in measures:
+                n = DEFAULT_N[MEASURE_NAMES[name]]
+                values[name] = self._compute_measure(name, participant, n)
+
+        result = []
+        for bin_start, bin_end, kept in bins:
+            with_utterances = [
+                i for i in kept if summaries[i].n_utterances[participant]
+            ]
+            averages: dict[str, float | None] = {}
+            for name in measures:
+                file_values = [values[name][i] for i in with_utterances]
+                averages[name] = (
+                    sum(file_values) / len(file_values) if file_values else None
+                )
+            result.append(
+                AgeBin(
+                    bin_start,
+                    bin_end,
+                    tuple(kept),
+                    sum(summaries[i].n_utterances[participant] for i in kept),
+                    sum(summaries[i].n_words[participant] for i in kept),
+                    averages,
+                )
+            )
+        return result
+
+    def measures_table(
+        self,
+        measures: Sequence[str] = ("mlum", "mluw", "ttr", "ipsyn"),
+        *,
+        by: str | Sequence[str] = ("file", "participant"),
+        participant: str = "CHI",
+    ) -> MeasuresTable:
+        """Compute multiple developmental measures for all files and participants.
+
+        The participants of each file are collected in one pass over
+        the utterances, and the measures are computed for all of them
+        without filtering the reader per participant:
+        ``"mlum"``, ``"mluw"``, and ``"ttr"`` together in one more pass
+        over the tokens of each file, and ``"ipsyn"`` once per participant.
+        Each measure uses the default ``n`` of its method, e.g., :meth:`mlum`.
+        Results are memoized as for the individual measure methods.
+
+        Args:
+            measures: Measures to compute, from
+                ``"mlu"``, ``"mlum"``, ``"mluw"``, ``"ttr"``, and ``"ipsyn"``.
+            by: ``("file", "participant")`` for one row per participant
+                of each file, in order of appearance within the file,
+                or ``"file"`` for one row per file for *participant*.
+            participant: Target participant code, if *by* is ``"file"``.
+
+        Returns:
+            A :class:`~pylangacq.MeasuresTable` object.
+
+        Raises:
+            ValueError: If a measure or *by* is not recognized.
+        """
+        measures = _as_list(measures)
+        for name in measures:
+            if name not in MEASURE_NAMES:
+                raise ValueError(
+                    f"measure must be one of {sorted(MEASURE_NAMES)}: {name!r}"
+                )
+        by = tuple(_as_list(by))
+        tables = None
+        if by == ("file",):
+            speakers = [[participant] for _ in range(self.n_files)]
+        elif by == ("file", "participant"):
+            tables = self._tables()
+            speakers = [list(dict.fromkeys(table.participants)) for table in tables]
+        else:
+            raise ValueError(f"by must be 'file' or ('file', 'participant'): {by!r}")
+
+        ages = self.ages()
+        columns: dict[str, list[Any]] = {"file": []}
+        if len(by) == 2:
+            columns["participant"] = []
+        columns["age"] = []
+        for i, codes in enumerate(speakers):
+            columns["file"].extend([i] * len(codes))
+            if len(by) == 2:
+                columns["participant"].extend(codes)
+            columns["age"].extend([ages[i]] * len(codes))
+
+        all_codes = list(dict.fromkeys(c for codes in speakers for c in codes))
+        per_utterance = [
+            name
+            for name in dict.fromkeys(MEASURE_NAMES[name] for name in measures)
+            if name in UTTERANCE_MEASURES
+        ]
+        computed = self._compute_utterance_measures(per_utterance, all_codes, tables)
+        for name in measures:
+            canonical = MEASURE_NAMES[name]
+            if canonical in UTTERANCE_MEASURES:
+                results = {code: computed[canonical, code] for code in all_codes}
+            else:
+                results = {
+                    code: self._compute_measure(name, code, DEFAULT_N[canonical])
+                    for code in all_codes
+                }
+            columns[name] = [
+                results[code][i] for i, codes in enumerate(speakers) for code in codes
+            ]
+        return MeasuresTable(columns, self.file_paths)
+
+    def bootstrap(
+        self,
+        measure: str,
+        *,
+        n_resamples: int = 1000,
+        confidence: float = 0.95,
+        by: str = "file",
+        participant: str = "CHI",
+        seed: int | None = None,
+    ) -> list[ConfidenceInterval | None] | ConfidenceInterval | None:
+        """Compute bootstrap confidence intervals of a developmental measure.
+
+        With ``by="file"``, the participant's utterances in each file
+        are resampled with replacement. The per-utterance morpheme
+        and word counts, and the word types of the utterances for ``"ttr"``,
+        are extracted once, and each batch of resamples is then computed
+        with a few NumPy array operations instead of one reader per resample.
+        With ``by="corpus"``, the files where the participant has
+        any utterances are resampled, for an interval of the mean
+        of the measure over these files.
+
+        The measure uses the default ``n`` of its method, e.g., :meth:`mlum`,
+        and the estimate of each interval is as from that method.
+        Intervals are by the percentile method.
+        This method requires the ``numpy`` package.
+
+        Args:
+            measure: ``"mlu"``, ``"mlum"``, ``"mluw"``, ``"ttr"``,
+                or ``"ipsyn"``, which is only available with ``by="corpus"``
+                as it's not a sum over utterances.
+            n_resamples: Number of resamples.
+            confidence: Confidence level of the intervals.
+            by: ``"file"`` or ``"corpus"``.
+            participant: Target participant code.
+            seed: Seed of the random number generator, for reproducible results.
+
+        Returns:
+            With ``by="file"``, one :class:`~pylangacq.ConfidenceInterval`
+            per file, or None for a file without the participant's
+            utterances (or words, for ``"ttr"``).
+            With ``by="corpus"``, one interval, or None if no files have
+            the participant's utterances.
+
+        Raises:
+            ValueError: If the measure, *by*, *n_resamples*,
+                or *confidence* is not valid.
+
+        Examples:
+            .. code-block:: python
+
+                for path, ci in zip(chat.file_paths, chat.bootstrap("mluw", seed=0)):
+                    print(path, ci.estimate, ci.low, ci.high)
+        """
+        if measure not in MEASURE_NAMES:
+            raise ValueError(
+                f"measure must be one of {sorted(MEASURE_NAMES)}: {measure!r}"
+            )
+        if by not in ("file", "corpus"):
+            raise ValueError(f"by must be 'file' or 'corpus': {by!r}")
+        name = MEASURE_NAMES[measure]
+        if by == "file" and name not in UTTERANCE_MEASURES:
+            raise ValueError(f"{measure!r} can only be bootstrapped with by='corpus'")
+        check_resampling(n_resamples, confidence)
+        rng = random_generator(seed)
+        n = DEFAULT_N[name]
+        estimates = self._compute_measure(name, participant, n)
+
+        if by == "corpus":
+            summaries = self._file_summaries()
+            values = [
+                value
+                for value, summary in zip(estimates, summaries)
+                if summary.n_utterances[participant]
+            ]
+            if not values:
+                return None
+            estimate = sum(values) / len(values)
+            return bootstrap_interval(values, estimate, n_resamples, confidence, rng)
+
+        intervals: list[ConfidenceInterval | None] = []
+        for table, estimate in zip(self._tables(), estimates):
+            units = utterance_units(table, name, participant, n)
+            intervals.append(
+                bootstrap_interval(units, estimate, n_resamples, confidence, rng)
+                if units
+                else None
+            )
+        return intervals
+
+    def permutation_test(
+        self,
+        measure: str,
+        participants: tuple[str, str] = ("CHI", "MOT"),
+        *,
+        n_resamples: int = 1000,
+        seed: int | None = None,
+    ) -> list[PermutationTest | None]:
+        """Test the difference of a developmental measure between two participants.
+
+        In each file, the two participants' utterances are pooled and
+        randomly reassigned to them, as many to each participant as they have,
+        for the distribution of the difference if the measure didn't depend
+        on the participant. As for :meth:`bootstrap`, the units are extracted
+        once and the permutations are computed in batches of array operations.
+        The measure uses the default ``n`` of its method for each participant.
+        This method requires the ``numpy`` package.
+
+        Args:
+            measure: ``"mlu"``, ``"mlum"``, ``"mluw"``, or ``"ttr"``.
+            participants: The two participant codes to compare.
+            n_resamples: Number of permutations.
+            seed: Seed of the random number generator, for reproducible results.
+
+        Returns:
+            One :class:`~pylangacq.PermutationTest` per file, or None for
+            a file where either participant has no utterances
+            (or words, for ``"ttr"``).
+
+        Raises:
+            ValueError: If the measure or *n_resamples* is not valid.
+
+        Examples:
+            .. code-block:: python
+
+                for test in chat.permutation_test("mlum", ("CHI", "MOT"), seed=0):
+                    print(test.difference, test.p_value)
+        """
+        name = MEASURE_NAMES.get(measure)
+        if name not in UTTERANCE_MEASURES:
+            raise ValueError(
+                "measure must be one of ['mlu', 'mlum', 'mluw', 'ttr']: " f"{measure!r}"
+            )
+        check_resampling(n_resamples)
+        rng = random_generator(seed)
+        n = DEFAULT_N[name]
+        first, second = participants
+        estimates = zip(
+            self._compute_measure(name, first, n),
+            self._compute_measure(name, second, n),
+        )
+        tests: list[PermutationTest | None] = []
+        for table, pair in zip(self._tables(), estimates):
+            units = (
+                utterance_units(table, name, first, n),
+                utterance_units(table, name, second, n),
+            )
+            tests.append(
+                permute(*units, pair, n_resamples, rng) if all(units) else None
+            )
+        return tests
+
+    def measure_cache_info(self) -> MeasureCacheInfo:
+        """Return statistics of the memoized developmental measures.
+
+        The results of :meth:`mlu`, :meth:`mlum`, :meth:`mluw`, :meth:`ttr`,
+        and :meth:`ipsyn` are memoized per file, participant, and ``n``.
+        Files added to or removed from this reader have their results
+        added or dropped accordingly, without affecting the other files.
+        A reader derived with :meth:`filter` or indexing
+        reuses the per-file results of this reader.
+
+        Returns:
+            A :class:`~pylangacq.MeasureCacheInfo` object.
+        """
+        with self._lock:
+            file_measures = self._measures
+            n_entries = sum(len(m) for m in file_measures) if file_measures else 0
+            return MeasureCacheInfo(
+                hits=self._measure_hits,
+                misses=self._measure_misses,
+                n_entries=n_entries,
+            )
+
+    def clear_measure_cache(self) -> None:
+        """Clear the memoized developmental measures and their statistics."""
+        # Other readers may share the per-file results, so drop them here
+        # instead of emptying them.
+        with self._lock:
+            self._measures = None
+            self._measure_hits = 0
+            self._measure_misses = 0
+
+    def word_ngrams(
+        self,
+        n: int,
+        *,
+        top_k: int | None = None,
+        approximate: bool = False,
+        capacity: int | None = None,
+    ) -> Ngrams | TopNgrams:
+        """Return an Ngrams for word n-grams across all utterances.
+
+        N-grams do not cross utterance boundaries.
+
+        With ``approximate=True``, the n-grams are counted file by file
+        into a :class:`~pylangacq.TopNgrams` of bounded size,
+        for the ``top_k`` most common n-grams of a dataset too large
+        for the exact counts of all its n-grams to fit in memory.
+        See :class:`~pylangacq.TopNgrams` for the error bounds of the counts.
+
+        Args:
+            n: The n-gram order (1 for unigrams, 2 for bigrams, etc.).
+            top_k: Number of the most common n-grams to count approximately.
+                Required if, and only allowed if, *approximate* is True.
+            approximate: If True, count approximately in bounded memory.
+            capacity: Number of n-grams to keep track of when counting
+                approximately. Defaults to ``10 * top_k``.
+
+        Returns:
+            An Ngrams with the accumulated counts,
+            or a TopNgrams if *approximate* is True.
+
+        Raises:
+            ValueError: If n < 1, or if top_k or capacity
+                is given without *approximate* or is out of range.
+        """
+        if not approximate:
+            if top_k is not None or capacity is not None:
+                raise ValueError("top_k and capacity require approximate=True")
+            return self._chat.word_ngrams(n)
+        if top_k is None:
+            raise ValueError("approximate=True requires top_k")
+        ngrams = TopNgrams(n, top_k, capacity=capacity)
+        for utterances in self._file_words():
+            ngrams.count_seqs(utterances)
+        return ngrams
+
+    def collocations(
+        self,
+        measure: str = "pmi",
+        *,
+        min_count: int = 1,
+        top_k: int | None = None,
+    ) -> Collocations:
+        """Score word bigrams by an association measure.
+
+        Bigrams are counted as by ``word_ngrams(2)``, within utterances,
+        but with the words as integer IDs in NumPy arrays, together with
+        the counts of each word as the first or second word of a bigram.
+        The association measures are then computed for all bigrams at once.
+        This method requires the ``numpy`` package.
+
+        Args:
+            measure: ``"pmi"`` (pointwise mutual information),
+                ``"log_likelihood"``, ``"t_score"``, or ``"dice"``.
+                See :class:`~pylangacq.Collocations` for their definitions.
+            min_count: Minimum count of a bigram to be scored.
+            top_k: Number of the highest-scoring bigrams to keep.
+                None for all.
+
+        Returns:
+            A :class:`~pylangacq.Collocations` object,
+            with the bigrams from the highest score.
+
+        Raises:
+            ValueError: If the measure is not recognized,
+                or if *top_k* is not positive.
+
+        Examples:
+            .. code-block:: python
+
+                collocations = chat.collocations("log_likelihood", min_count=5)
+                collocations[0]
+                # (('more', 'cookie'), 93.2...)
+        """
+        check_arguments(measure, top_k)
+        vocab = self._vocab
+        ids = array.array("i")
+        lengths: list[int] = []
+        for words, offsets in self._word_columns():
+            ids.extend(vocab.encode(words))
+            lengths.extend(offsets[i + 1] - offsets[i] for i in range(len(offsets) - 1))
+        first, second, counts = count_bigrams(ids, lengths, vocab)
+        return score(measure, first, second, counts, min_count, top_k, vocab)
+
+    def freeze(self) -> CHAT:
+        """Make this reader read-only, for sharing across threads.
+
+        All the methods that query a reader without modifying it
+        are safe to call from multiple threads at once on the same reader.
+        The data parsed or derived on demand (e.g., the %mor and %gra tiers
+        with ``lazy_tiers=True``, the memoized measures, and the search index)
+        is put in place under a lock, so that the threads see it either
+        before or after, and never while it's being updated.
+        Only the methods that add or remove files
+        (:meth:`append`, :meth:`extend`, :meth:`pop`, :meth:`clear`,
+        :meth:`refresh`, etc.) may not run alongside other calls.
+        A frozen reader raises a ``ValueError`` for them instead,
+        so that the data never changes under a thread querying it:
+
+        .. code-block:: python
+
+            chat = pylangacq.read_chat("path/to/Brown.zip").freeze()
+
+        Freezing doesn't copy or parse anything.
+        A reader derived from a frozen one (e.g., with :meth:`filter`
+        or indexing) is not frozen.
+
+        Returns:
+            This reader, frozen.
+        """
+        with self._lock:
+            self._frozen = True
+        return self
+
+    def run_parallel(
+        self,
+        queries: Sequence[str | Callable[[CHAT], Any]],
+        *,
+        workers: int | None = None,
+    ) -> list[Any]:
+        """Run independent queries on this reader on a pool of threads.
+
+        .. code-block:: python
+
+            words, mlum, bigrams = chat.run_parallel(
+                ["words", "mlum", lambda chat: chat.word_ngrams(2)]
+            )
+
+        Unlike :meth:`map_reduce`, which sends shards of files to worker
+        processes, the queries share this reader in this process,
+        along with what it has parsed and memoized, with no data copied.
+        Queries run in parallel in the parsing and computation that
+        rustling does without the GIL, and throughout on a free-threaded
+        build of Python (e.g., ``python3.14t``).
+        While the queries run, this reader can't be modified,
+        as if it's frozen (see :meth:`freeze`).
+
+        Args:
+            queries: Each query is either the name of a method of this reader,
+                called with no arguments, or a function called with this reader.
+            workers: Number of threads.
+                If None, the number of CPUs is used.
+                If 1, the queries run one after another in this thread.
+
+        Returns:
+            The result of each query, in the order of *queries*.
+            If a query raises an exception, it's raised here
+            once all the queries have finished.
+
+        Raises:
+            ValueError: If a query is not the name of a method,
+                or if *workers* is less than 1.
+        """
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers < 1:
+            raise ValueError(f"workers must be at least 1: {workers}")
+        calls: list[Callable[[], Any]] = []
+        for query in queries:
+            if isinstance(query, str):
+                if query.startswith("_") or not callable(
+                    getattr(type(self), query, None)
+                ):
+                    raise ValueError(f"Not a method of CHAT: {query!r}")
+                calls.append(getattr(self, query))
+            else:
+                calls.append(functools.partial(query, self))
+
+        with self._lock:
+            self._n_running += 1
+        try:
+            if workers == 1 or len(calls) < 2:
+                return [call() for call in calls]
+            with ThreadPoolExecutor(min(workers, len(calls))) as executor:
+                futures = [executor.submit(call) for call in calls]
+            return [future.result() for future in futures]
+        finally:
+            with self._lock:
+                self._n_running -= 1
+
+    def map_reduce(
+        self,
+        fn: Callable[[CHAT], Any],
+        reducer: str | Reducer | Callable[[Any, Any], Any],
+        *,
+        workers: int | None = None,
+        chunk_files: int = 1,
+    ) -> Any:
+        """Apply a function to shards of files in parallel and merge the results.
+
+        The files of this reader are split into shards of ``chunk_files`` files,
+        which are sent (as CHAT data already in memory, without re-reading
+        the data source) to a pool of worker processes.
+        Each worker parses its shard into a ``CHAT`` reader of this class,
+        with the same participant filters as this reader,
+        and calls *fn* on it.
+        The results are then merged in the order of the files.
+
+        .. code-block:: python
+
+            def bigrams(chat):
+                return chat.word_ngrams(2)
+
+            counts = chat.map_reduce(bigrams, "ngrams", workers=8)
+
+        Args:
+            fn: Function to apply to each shard's ``CHAT`` reader.
+                To be sent to the worker processes, it must be picklable,
+                e.g., a function defined at the top level of a module
+                (not a lambda).
+            reducer: How to merge the results, as the name of a built-in
+                reducer (``"counter"``, ``"ngrams"``, ``"top_ngrams"``,
+                or ``"measures"``),
+                a :class:`~pylangacq.Reducer`,
+                or a function that merges two results into one.
+                See :class:`~pylangacq.Reducer` for the built-in reducers.
+            workers: Number of worker processes.
+                If None, the number of CPUs is used.
+                If 1, the shards are processed in this process instead.
+            chunk_files: Number of files per shard.
+
+        Returns:
+            The merged result.
+
+        Raises:
+            ValueError: If *reducer* is not recognized,
+                or if *workers* or *chunk_files* is out of range.
+        """
+        reducer = get_reducer(reducer)
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers < 1:
+            raise ValueError(f"workers must be at least 1: {workers}")
+        if chunk_files < 1:
+            raise ValueError(f"chunk_files must be at least 1: {chunk_files}")
+        starts = range(0, self.n_files, chunk_files)
+        if not starts:
+            return reducer.finish(reducer.initial())
+
+        if workers == 1:
+            results = (
+                reducer.prepare(fn(self[start : start + chunk_files]))
+                for start in starts
+            )
+            merged = next(results)
+            for result in results:
+                merged = reducer.merge(merged, result)
+            return reducer.finish(merged)
+
+        strs, file_paths, participants, options = self._shard_data()
+        # Only send what the workers need, as a reducer with a merge function
+        # (e.g., a lambda) may not be picklable.
+        prepare = None if type(reducer).prepare is Reducer.prepare else reducer.prepare
+        with process_pool(min(workers, len(starts))) as executor:
+            futures = [
+                executor.submit(
+                    run_shard,
+                    fn,
+                    prepare,
+                    type(self),
+                    strs[start : start + chunk_files],
+                    file_paths[start : start + chunk_files],
+                    participants[start : start + chunk_files],
+                    options,
+                )
+                for start in starts
+            ]
+            merged = futures[0].result()
+            for future in futures[1:]:
+                merged = reducer.merge(merged, future.result())
+        return reducer.finish(merged)
+
+    def _shard_data(
+        self,
+    ) -> tuple[Sequence[str], list[str], list[list[str]], dict[str, Any]]:
+        """Return what worker processes need to parse shards of this reader.
+
+        Returns:
+            The CHAT data strings, file paths,
+            the participants kept in each file (see :meth:`_participant_codes`),
+            and the parsing options.
+        """
+        pending, lazy = self._pending, self._lazy
+        if pending is not None:
+            strs = pending.strs
+        elif lazy is not None:
+            strs = self._base.to_strs()
+        else:
+            strs = self._chat.to_strs()
+        options = dict(self._options)
+        return strs, self.file_paths, self._participant_codes(), options
+
+    @classmethod
+    def _from_shard(
+        cls,
+        strs: Sequence[str],
+        file_paths: list[str],
+        participants: Sequence[Sequence[str]],
+        options: dict[str, Any],
+    ) -> CHAT:
+        """Parse a shard of files from :meth:`_shard_data` in a worker process."""
+        chat = cls.from_strs(strs, ids=file_paths, parallel=False, **options)
+        parsed = _refilter(chat._chat, participants)
+        if parsed is chat._chat:
+            return chat
+        return cls._wrap(parsed, options=chat._options)
+
+    def append(self, other: CHAT, /) -> None:
+        """Append data from another CHAT reader.
+
+        Args:
+            other: A CHAT reader whose data to append.
+
+        Raises:
+            ValueError: If this reader is frozen (see :meth:`freeze`),
+                or if the data was parsed with other ``mor_tier``
+                or ``gra_tier`` options than this reader's.
+        """
+        with self._mutating():
+            self._adopt_options([other])
+            n_new = other.n_files
+            self._chat.append(_unwrap(other))
+            self._splice(slice(self.n_files - n_new, None), n_new)
+
+    def append_left(self, other: CHAT, /) -> None:
+        """Left-append data from another CHAT reader.
+
+        Args:
+            other: A CHAT reader whose data to prepend.
+
+        Raises:
+            ValueError: If this reader is frozen (see :meth:`freeze`),
+                or if the data was parsed with other ``mor_tier``
+                or ``gra_tier`` options than this reader's.
+        """
+        with self._mutating():
+            self._adopt_options([other])
+            n_new = other.n_files
+            self._chat.append_left(_unwrap(other))
+            self._splice(slice(0, 0), n_new)
+
+    def extend(self, others: Sequence[CHAT], /) -> None:
+        """Extend data from multiple CHAT readers.
+
+        Args:
+            others: CHAT readers whose data to append.
+
+        Raises:
+            ValueError: If this reader is frozen (see :meth:`freeze`),
+                or if the data was parsed with other ``mor_tier``
+                or ``gra_tier`` options than this reader's.
+        """
+        with self._mutating():
+            self._adopt_options(others)
+            unwrapped = [_unwrap(other) for other in others]
+            n_new = sum(other.n_files for other in unwrapped)
+            self._chat.extend(unwrapped)
+            self._splice(slice(self.n_files - n_new, None), n_new)
+
+    def extend_left(self, others: Sequence[CHAT], /) -> None:
+        """Left-extend data from multiple CHAT readers.
+
+        Args:
+            others: CHAT readers whose data to prepend.
+
+        Raises:
+            ValueError: If this reader is frozen (see :meth:`freeze`),
+                or if the data was parsed with other ``mor_tier``
+                or ``gra_tier`` options than this reader's.
+        """
+        with self._mutating():
+            self._adopt_options(others)
+            unwrapped = [_unwrap(other) for other in others]
+            n_new = sum(other.n_files for other in unwrapped)
+            self._chat.extend_left(unwrapped)
+            self._splice(slice(0, 0), n_new)
+
+    def pop(self) -> CHAT:
+        """Remove and return the last file as a new CHAT reader.
+
+        Returns:
+            A new CHAT reader containing the removed file.
+
+        Raises:
+            IndexError: If the reader is empty.
+            ValueError: If this reader is frozen (see :meth:`freeze`).
+        """
+        with self._mutating():
+            popped = self._derive(self._chat.pop())
+            index, measures = self._splice(slice(self.n_files, None), 0)
+            popped._index = index or None
+            popped._measures = measures or None
+            return popped
+
+    def pop_left(self) -> CHAT:
+        """Remove and return the first file as a new CHAT reader.
+
+        Returns:
+            A new CHAT reader containing the removed file.
+
+        Raises:
+            IndexError: If the reader is empty.
+            ValueError: If this reader is frozen (see :meth:`freeze`).
+        """
+        with self._mutating():
+            popped = self._derive(self._chat.pop_left())
+            index, measures = self._splice(slice(0, 1), 0)
+            popped._index = index or None
+            popped._measures = measures or None
+            return popped
+
+    def clear(self) -> None:
+        """Remove all data from this reader.
+
+        Raises:
+            ValueError: If this reader is frozen (see :meth:`freeze`).
+        """
+        with self._mutating():
+            self._chat.clear()
+            self._splice(slice(None), 0)
+
+    def to_strs(self) -> list[str]:
+        """Return CHAT data strings, one per file.
+
+        Returns:
+            A list of CHAT-formatted strings.
+        """
+        return self._base.to_strs()
+
+    def to_files(
+        self,
+        dir_path: str | os.PathLike[str],
+        /,
+        *,
+        filenames: Sequence[str] | None = None,
+    ) -> None:
+        """Write CHAT (.cha) files to a directory.
+
+        Args:
+            dir_path: Directory path to write .cha files to.
+            filenames: Custom filenames for the output files.
+                If None, filenames are derived from the original source
+                file paths (e.g., ``foo.cha`` stays ``foo.cha``). Falls
+                back to ``0001.cha``, ``0002.cha``, etc. when the data
+                was parsed from in-memory strings.
+
+        Raises:
+            ValueError: If filenames count doesn't match file count.
+            IOError: If writing fails.
+        """
+        self._base.to_files(dir_path, filenames=filenames)
+
+    def to_elan_strs(self) -> list[str]:
+        """Return EAF XML strings, one per file.
+
+        Participants become alignable tiers, and dependent tiers
+        (e.g., %mor, %gra) become reference annotation tiers named
+        ``{tier}@{participant}`` (e.g., ``mor@CHI``).
+
+        Returns:
+            A list of EAF XML strings.
+        """
+        return self._chat.to_elan_strs()
+
+    def to_elan(self) -> ELAN:
+        """Convert to an ELAN object.
+
+        Returns:
+            An :class:`~rustling.elan.ELAN` object.
+        """
+        return self._chat.to_elan()
+
+    def to_elan_files(
+        self,
+        dir_path: str | os.PathLike[str],
+        /,
+        *,
+        filenames: Sequence[str] | None = None,
+    ) -> None:
+        """Write ELAN (.eaf) files to a directory.
+
+        Args:
+            dir_path: Directory path to write .eaf files to.
+            filenames: Custom filenames for the output files.
+                If None, filenames are derived from the original source
+                file paths with the extension changed to ``.eaf``.
+
+        Raises:
+            ValueError: If filenames count doesn't match file count.
+            IOError: If writing fails.
+        """
+        self._chat.to_elan_files(dir_path, filenames=filenames)
+
+    def to_srt_strs(self, *, participants: Sequence[str] | None = None) -> list[str]:
+        """Return SRT format strings, one per file.
+
+        Args:
+            participants: Participant codes to include.
+                If None, all participants are included.
+                Utterances without time marks are skipped.
+
+        Returns:
+            A list of SRT-formatted strings.
+        """
+        return self._chat.to_srt_strs(participants=participants)
+
+    def to_srt(self, *, participants: Sequence[str] | None = None) -> SRT:
+        """Convert to an SRT object.
+
+        Args:
+            participants: Participant codes to include.
+                If None, all participants are included.
+
+        Returns:
+            A :class:`~rustling.srt.SRT` object.
+        """
+        return self._chat.to_srt(participants=participants)
+
+    def to_srt_files(
+        self,
+        dir_path: str | os.PathLike[str],
+        /,
+        *,
+        participants: Sequence[str] | None = None,
+        filenames: Sequence[str] | None = None,
+    ) -> None:
+        """Write SRT (.srt) files to a directory.
+
+        Args:
+            dir_path: Directory path to write .srt files to.
+            participants: Participant codes to include.
+                If None, all participants are included.
+            filenames: Custom filenames for the output files.
+                If None, filenames are derived from the original source
+                file paths with the extension changed to ``.srt``.
+
+        Raises:
+            ValueError: If filenames count doesn't match file count.
+            IOError: If writing fails.
+        """
+        self._chat.to_srt_files(
+            dir_path, participants=participants, filenames=filenames
+        )
+
+    def to_textgrid_strs(
+        self, *, participants: Sequence[str] | None = None
+    ) -> list[str]:
+        """Return TextGrid format strings, one per file."""
+        return self._chat.to_textgrid_strs(participants=participants)
+
+    def to_textgrid(self, *, participants: Sequence[str] | None = None) -> TextGrid:
+        """Convert to a TextGrid object."""
+        return self._chat.to_textgrid(participants=participants)
+
+    def to_textgrid_files(
+        self,
+        dir_path: str | os.PathLike[str],
+        /,
+        *,
+        participants: Sequence[str] | None = None,
+        filenames: Sequence[str] | None = None,
+    ) -> None:
+        """Write TextGrid (.TextGrid) files to a directory."""
+        self._chat.to_textgrid_files(
+            dir_path, participants=participants, filenames=filenames
+        )
+
+    def to_conllu_strs(self) -> list[str]:
+        """Return CoNLL-U format strings, one per file."""
+        return self._chat.to_conllu_strs()
+
+    def to_conllu(self) -> CoNLLU:
+        """Convert to a CoNLL-U object.
+
+        Returns:
+            A :class:`~rustling.conllu.CoNLLU` object.
+        """
+        return self._chat.to_conllu()
+
+    def to_conllu_files(
+        self,
+        dir_path: str | os.PathLike[str],
+        /,
+        *,
+        filenames: Sequence[str] | None = None,
+    ) -> None:
+        """Write CoNLL-U (.conllu) files to a directory.
+
+        Args:
+            dir_path: Directory path to write .conllu files to.
+            filenames: Custom filenames for the output files.
+
+        Raises:
+            ValueError: If filenames count doesn't match file count.
+            IOError: If writing fails.
+        """
+        self._chat.to_conllu_files(dir_path, filenames=filenames)
+
+    def convert(
+        self,
+        formats: str | Sequence[str],
+        out_dir: str | os.PathLike[str],
+        *,
+        workers: int | None = None,
+        chunk_files: int = 1,
+        names: Sequence[str] | None = None,
+        participants: Sequence[str] | None = None,
+        progress: Callable[[int, int], None] | None = None,
+    ) -> list[Conversion]:
+        """Convert the files to one or more formats and write them to a directory.
+
+        The files are split into shards of ``chunk_files`` files,
+        which are converted on a pool of worker processes.
+        Each shard is parsed once and converted to all the formats,
+        and each output is written to disk as soon as it's converted,
+        so that memory use doesn't grow with the number of files.
+
+        .. code-block:: python
+
+            chat.convert(["conllu", "elan"], "output_dir", workers=8)
+
+        Args:
+            formats: Output formats, out of ``"chat"`` (.cha), ``"conllu"``,
+                ``"elan"`` (.eaf), ``"srt"``, and ``"textgrid"``.
+            out_dir: Directory to write the output files to.
+            workers: Number of worker processes.
+                If None, the number of CPUs is used.
+                If 1, the files are converted in this process instead.
+            chunk_files: Number of files per shard.
+            names: Output file paths relative to *out_dir*, one per file,
+                without the extension. If None, the file paths relative to
+                the deepest directory they all share are used,
+                e.g., ``Eve/010600.cha`` and ``Adam/020304.cha``
+                become ``Eve/010600.eaf`` and ``Adam/020304.eaf``.
+            participants: Participant codes to include in SRT and TextGrid output.
+                If None, all participants are included.
+            progress: If provided, a function called with the number of files
+                converted so far and the total number of files,
+                whenever a shard has been converted.
+
+        Returns:
+            A :class:`~pylangacq.Conversion` for each output file written,
+            by file and then by format.
+
+        Raises:
+            ValueError: If a format is not supported, if the output file names
+                are not unique, or if *workers* or *chunk_files* is out of range.
+        """
+        return list(
+            self.iter_convert(
+                formats,
+                out_dir=out_dir,
+                workers=workers,
+                chunk_files=chunk_files,
+                names=names,
+                participants=participants,
+                progress=progress,
+            )
+        )
+
+    def iter_convert(
+        self,
+        formats: str | Sequence[str],
+        *,
+        out_dir: str | os.PathLike[str] | None = None,
+        workers: int | None = None,
+        chunk_files: int = 1,
+        names: Sequence[str] | None = None,
+        participants: Sequence[str] | None = None,
+        progress: Callable[[int, int], None] | None = None,
+    ) -> Iterator[Conversion]:
+        """Yield the files converted to one or more formats, in file order.
+
+        This is :meth:`convert` as a generator,
+        with the converted data at :attr:`Conversion.text`
+        unless *out_dir* is given.
+        Only a few shards ahead of the one being yielded are converted
+        at any time, so that the outputs don't pile up in memory.
+
+        .. code-block:: python
+
+            for conversion in chat.iter_convert("conllu", workers=4):
+                upload(conversion.name, conversion.text)
+
+        Args:
+            formats: Output formats, as for :meth:`convert`.
+            out_dir: If given, write the output files to this directory.
+            workers: Number of worker processes, as for :meth:`convert`.
+            chunk_files: Number of files per shard.
+            names: Output file paths without the extension,
+                as for :meth:`convert`.
+            participants: Participant codes to include in SRT and TextGrid output.
+            progress: Progress callback, as for :meth:`convert`.
+
+        Yields:
+            A :class:`~pylangacq.Conversion` for each file and format.
+
+        Raises:
+            ValueError: As for :meth:`convert`.
+        """
+        formats = check_formats(formats)
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if workers < 1:
+            raise ValueError(f"workers must be at least 1: {workers}")
+        if chunk_files < 1:
+            raise ValueError(f"chunk_files must be at least 1: {chunk_files}")
+        all_names = output_names(self.file_paths, names)
+        dir_path = None if out_dir is None else os.fspath(out_dir)
+        return self._iter_convert(
+            formats, dir_path, workers, chunk_files, all_names, participants, progress
+        )
+
+    def _iter_convert(
+        self,
+        formats: list[str],
+        out_dir: str | None,
+        workers: int,
+        chunk_files: int,
+        names: list[str],
+        participants: Sequence[str] | None,
+        progress: Callable[[int, int], None] | None,
+    ) -> Iterator[Conversion]:
+        n_files = self.n_files
+        starts = range(0, n_files, chunk_files)
+        if workers == 1 or len(starts) < 2:
+            results: Iterator[list[Conversion]] = (
+                convert_chat(
+                    self[start : start + chunk_files],
+                    formats,
+                    names[start : start + chunk_files],
+                    out_dir,
+                    participants,
+                )
+                for start in starts
+            )
+            yield from with_progress(results, n_files, len(formats), progress)
+            return
+        strs, file_paths, file_participants, options = self._shard_data()
+        workers = min(workers, len(starts))
+        with process_pool(workers) as executor:
+            results = imap_ordered(
+                executor,
+                convert_shard,
+                (
+                    (
+                        type(self),
+                        strs[start : start + chunk_files],
+                        file_paths[start : start + chunk_files],
+                        file_participants[start : start + chunk_files],
+                        options,
+                        names[start : start + chunk_files],
+                        formats,
+                        out_dir,
+                        participants,
+                    )
+                    for start in starts
+                ),
+                window=2 * workers,
+            )
+            yield from with_progress(results, n_files, len(formats), progress)
+
+    def refresh(self) -> DirChanges:
+        """Reparse the files changed in the directory this reader was read from.
+
+        Only for a reader from ``CHAT.from_dir(..., incremental=True)``.
+        Files added to the directory are parsed, modified files are reparsed,
+        and deleted files are dropped, with the files kept in sorted order.
+        Files added to this reader from elsewhere (e.g., by :meth:`append`)
+        are kept, each after the file from the directory it followed.
+        A file with an unchanged modification time and size,
+        or else an unchanged hash, is not reparsed.
+        The memoized measures and the search index are only updated
+        for the changed files.
+
+        Returns:
+            A :class:`~pylangacq.DirChanges` object of the changed files,
+            which is false if nothing has changed.
+
+        Raises:
+            ValueError: If this reader isn't from
+                ``CHAT.from_dir(..., incremental=True)``,
+                or if it's frozen (see :meth:`freeze`).
+        """
+        if self._source is None:
+            raise ValueError(
+                "refresh() is only available for a CHAT reader from "
+                "CHAT.from_dir(..., incremental=True)"
+            )
+        with self._mutating():
+            file_paths, changes, states = self._source.scan()
+            known = set(self._source.states) | set(states)
+            self._source.states = states
+            # Files filtered out by the age range are left out until they change.
+            changed = set(changes.added) | set(changes.modified)
+            skipped = self._source.skipped
+            file_paths = [p for p in file_paths if p not in skipped or p in changed]
+            old_paths = self.file_paths
+            if not changes and file_paths == [p for p in old_paths if p in known]:
+                return changes
+
+            old_positions = {
+                path: i for i, path in enumerate(old_paths) if path in known
+            }
+            # Also reparse files no longer in this reader, e.g., after pop().
+            changed.update(path for path in file_paths if path not in old_positions)
+            to_parse = [path for path in file_paths if path in changed]
+            parsed = self._source.parse(to_parse)
+            prefilter = self._source.prefilter
+            parsed = _filter_headers(self._wrap(parsed), prefilter)._chat
+            if parsed.n_files < len(to_parse):
+                file_paths = [path for path in file_paths if path not in skipped]
+                changed -= skipped
+
+            # Files not from the directory stay after the last file
+            # from the directory that they followed and that is still there.
+            followers: dict[str | None, list[int]] = {}
+            remaining = set(file_paths)
+            previous = None
+            for position, path in enumerate(old_paths):
+                if path in remaining:
+                    previous = path
+                elif path not in known:
+                    followers.setdefault(previous, []).append(position)
+            kept: list[int | None] = list(followers.get(None, []))
+            for path in file_paths:
+                kept.append(None if path in changed else old_positions[path])
+                kept.extend(followers.get(path, []))
+
+            # Put the files together from runs of consecutive files
+            # of either this reader or the newly parsed ones.
+            sources: list[tuple[_CHAT, int]] = []
+            i_parsed = 0
+            for i in kept:
+                if i is None:
+                    sources.append((parsed, i_parsed))
+                    i_parsed += 1
+                else:
+                    sources.append((self._chat, i))
+            new = _assemble(sources)
+
+            if self._index is not None:
+                self._index = [None if i is None else self._index[i] for i in kept]
+            if self._measures is not None:
+                self._measures = [
+                    FileMeasures() if i is None else self._measures[i] for i in kept
+                ]
+            if self._summaries is not None:
+                self._summaries = [
+                    None if i is None else self._summaries[i] for i in kept
+                ]
+            self._age_indices = {}
+            self._parsed = new
+            self._pending = None
+            return changes
+
+    def watch(self, interval: float = 1.0) -> Iterator[CHAT]:
+        """Yield a copy of this reader whenever files in its directory have changed.
+
+        Only for a reader from ``CHAT.from_dir(..., incremental=True)``.
+        The directory is checked with :meth:`refresh` every *interval* seconds,
+        which updates this reader in place, and a copy of it is yielded
+        after each change. A yielded copy (along with its memoized measures
+        and search index) is left as it is by the later changes,
+        e.g., to compare the data before and after a change.
+        The generator never stops on its own, so break out of the loop
+        as needed:
+
+        .. code-block:: python
+
+            chat = pylangacq.CHAT.from_dir("transcripts", incremental=True)
+            for snapshot in chat.watch(interval=5):
+                print(snapshot.mlum())
+
+        Args:
+            interval: Number of seconds between checks.
+
+        Yields:
+            A copy of this reader, after each change.
+
+        Raises:
+            ValueError: If this reader isn't from
+                ``CHAT.from_dir(..., incremental=True)``,
+                or if it's frozen (see :meth:`freeze`).
+        """
+        while True:
+            if self.refresh():
+                yield self[:]
+            time.sleep(interval)
+
+    def save(self, path: str | os.PathLike[str]) -> None:
+        """Save the parsed data as a compact binary snapshot.
+
+        The snapshot stores the token-level data as integer columns,
+        with all the strings (words, part-of-speech tags, etc.) interned
+        in a single string table, together with the CHAT text of each file
+        for the headers and the other tiers.
+        Load it with :meth:`load`, which is much faster than parsing
+        the data again.
+
+        Args:
+            path: Path of the snapshot file to write.
+        """
+        pending = self._pending
+        strs = pending.strs if pending is not None else self._chat.to_strs()
+        # The stored text is parsed with the same options at loading,
+        # and filtered to the same participants.
+        save(
+            path,
+            self.file_paths,
+            strs,
+            self._tables(),
+            self._options,
+            self._participant_codes(),
+        )
+
+    @classmethod
+    def load(cls, path: str | os.PathLike[str], *, mmap: bool = True) -> CHAT:
+        """Load a snapshot written by :meth:`save`.
+
+        Loading takes time roughly independent of the size of the data:
+        the data of each file is materialized only when needed,
+        e.g., by :meth:`words` and :meth:`tokens`, directly from the snapshot.
+        Other methods (e.g., :meth:`utterances` and :meth:`headers`)
+        parse the CHAT text stored in the snapshot at their first call.
+
+        Args:
+            path: Path of the snapshot file.
+            mmap: If True, memory-map the snapshot instead of reading it,
+                so that processes loading the same snapshot
+                share the memory of its (read-only) data.
+
+        Returns:
+            A new CHAT reader.
+
+        Raises:
+            ValueError: If *path* is not a snapshot of a supported version.
+        """
+        snapshot = Snapshot(path, use_mmap=mmap)
+        return cls._from_pending(
+            _Pending(
+                snapshot.file_paths,
+                LazySequence(snapshot, "text"),
+                LazySequence(snapshot, "table"),
+                snapshot.options,
+                codes=snapshot.participants,
+            )
+        )
+
+    def to_columns(self) -> Columns:
+        """Return the token-level data as columns.
+
+        Each field (file index, utterance index, participant, word,
+        part-of-speech tag, morphology, %gra dependent/head/relation,
+        and time marks) is one contiguous integer array with one item per token,
+        with strings dictionary-encoded as integer codes.
+        This is a compact form for vectorized analysis with, e.g., NumPy or pandas,
+        without creating a Python object per token.
+
+        Returns:
+            A :class:`~pylangacq.Columns` object.
+        """
+        return build_columns(self._tables())
+
+    def to_arrow(self) -> pyarrow.Table:
+        """Return the token-level data as a pyarrow Table.
+
+        The columns are those of :meth:`to_columns`,
+        with strings (and file paths) as dictionary-encoded columns
+        and missing values as nulls.
+        This method requires the ``pyarrow`` package.
+
+        Returns:
+            A ``pyarrow.Table`` object.
+        """
+        return to_arrow(self.to_columns(), self.file_paths)
+
+    def build_index(self) -> None:
+        """Build an inverted index for :meth:`search` and :meth:`concordance`.
+
+        The index maps each word, lemma (the stem of the %mor morphology,
+        e.g., ``"cookie"`` for ``"cookie-PL"``), and part-of-speech tag
+        to the tokens where it occurs, so that queries take time
+        roughly proportional to the number of matches rather than
+        the size of the data.
+        The index is built automatically at the first query,
+        is shared by the readers derived from this one with :meth:`filter`
+        and indexing, and is kept up to date file by file
+        when files are added or removed.
+        """
+        with self._lock:
+            if self._index is None or all(view is None for view in self._index):
+                self._index = [IndexView(FileIndex(t)) for t in self._tables()]
+                return
+            for i, view in enumerate(self._index):
+                if view is None:
+                    table = self[i]._tables()[0]
+                    self._index[i] = IndexView(FileIndex(table))
+
+    def search(
+        self,
+        *,
+        word: str | Sequence[str] | None = None,
+        lemma: str | Sequence[str] | None = None,
+        pos: str | Sequence[str] | None = None,
+        phrase: Sequence[str] | None = None,
+        participant: str | Sequence[str] | None = None,
+    ) -> list[SearchHit]:
+        """Search for tokens or phrases.
+
+        Multiple values for the same criterion are OR'd,
+        and different criteria are AND'd for the same token.
+        For example, ``search(lemma=["cookie", "cracker"], pos="n")``
+        finds nouns whose lemma is either "cookie" or "cracker".
+
+        Args:
+            word: Word form(s) to match exactly.
+            lemma: Lemma(s) from the %mor tier to match exactly.
+            pos: Part-of-speech tag(s) from the %mor tier to match exactly.
+            phrase: A sequence of consecutive word forms to match
+                within an utterance. Cannot be combined with
+                ``word``, ``lemma``, or ``pos``.
+            participant: Regex pattern(s) of the participant codes to include.
+                Patterns are auto-anchored (full match).
+
+        Returns:
+            The matches in file and utterance order.
+
+        Raises:
+            ValueError: If neither a phrase nor any of word/lemma/pos is given,
+                or if a phrase is combined with them.
+        """
+        criteria = {
+            field: _as_list(values)
+            for field, values in (("word", word), ("lemma", lemma), ("pos", pos))
+            if values is not None
+        }
+        if phrase is not None and criteria:
+            raise ValueError("phrase cannot be combined with word, lemma, or pos")
+        if not phrase and not criteria:
+            raise ValueError("at least one of phrase, word, lemma, or pos is required")
+        speaker = None
+        if participant is not None:
+            speaker = re.compile("|".join(f"(?:{p})" for p in _as_list(participant)))
+        if self._index is None or None in self._index:
+            self.build_index()
+        assert self._index is not None
+        hits = []
+        for i_file, view in enumerate(self._index):
+            assert view is not None
+            hits.extend(
+                view.search(i_file, criteria, list(phrase) if phrase else None, speaker)
+            )
+        return hits
+
+    def concordance(
+        self,
+        word: str | Sequence[str] | None = None,
+        *,
+        window: int = 5,
+        lemma: str | Sequence[str] | None = None,
+        pos: str | Sequence[str] | None = None,
+        phrase: Sequence[str] | None = None,
+        participant: str | Sequence[str] | None = None,
+    ) -> list[ConcordanceLine]:
+        """Return keyword-in-context (KWIC) lines.
+
+        Args:
+            word: Word form(s) to match exactly.
+            window: Maximum number of words to show on either side
+                of the match. The context does not cross utterance boundaries.
+            lemma: Lemma(s) from the %mor tier to match exactly.
+            pos: Part-of-speech tag(s) from the %mor tier to match exactly.
+            phrase: A sequence of consecutive word forms to match.
+            participant: Regex pattern(s) of the participant codes to include.
+
+        Returns:
+            One line per match, in file and utterance order.
+
+        Raises:
+            ValueError: If window is negative, or if the query is invalid
+                as in :meth:`search`.
+        """
+        if window < 0:
+            raise ValueError(f"window must not be negative: {window}")
+        hits = self.search(
+            word=word, lemma=lemma, pos=pos, phrase=phrase, participant=participant
+        )
+        lines = []
+        for hit in hits:
+            end = hit.position + hit.length
+            lines.append(
+                ConcordanceLine(
+                    hit=hit,
+                    left=hit.words[max(0, hit.position - window) : hit.position],
+                    right=hit.words[end : end + window],
+                )
+            )
+        return lines
+
+    def find_dependencies(
+        self, pattern: str, *, participant: str | Sequence[str] | None = None
+    ) -> list[DependencyMatch]:
+        """Find constructions by their dependencies in the %gra tier.
+
+        A pattern is a path of tokens (nodes, in square brackets)
+        linked by dependencies (edges):
+
+        - A node has constraints ``field=value`` on the ``word``,
+          ``lemma``, and ``pos`` (part-of-speech tag) of a token,
+          separated by spaces or ``&``. Alternative values are separated
+          by ``|``, and values may have the wildcards ``*`` and ``?``
+          (e.g., ``pos=pro*`` for ``pro:sub``, ``pro:obj``, etc.).
+          ``[]`` matches any token.
+        - ``-REL->`` links a head on its left to a dependent on its right
+          by the relation ``REL``, and ``<-REL-`` links a dependent on its left
+          to a head on its right. As with node values, ``REL`` may have
+          alternatives and wildcards, and ``-->`` and ``<--`` allow any relation.
+
+        For example:
+
+        .. code-block:: python
+
+            # Verbs with a pronoun as the object
+            chat.find_dependencies("[pos=v] -OBJ-> [pos=pro*]")
+            # Determiners of the objects of "want"
+            chat.find_dependencies("[lemma=want] -OBJ-> [] -DET-> []")
+            # Subjects of verbs, with the subject first
+            chat.find_dependencies("[] <-SUBJ- [pos=v]")
+
+        The search uses the index of :meth:`build_index`, together with
+        postings of the dependents by relation and by the part-of-speech tag
+        of their heads, which are built at the first call.
+
+        Args:
+            pattern: The dependency pattern.
+            participant: Regex pattern(s) of the participant codes to include.
+                Patterns are auto-anchored (full match).
+
+        Returns:
+            The matches in file and utterance order.
+
+        Raises:
+            ValueError: If the pattern is invalid.
+        """
+        parsed = parse_pattern(pattern)
+        speaker = None
+        if participant is not None:
+            speaker = re.compile("|".join(f"(?:{p})" for p in _as_list(participant)))
+        if self._index is None or None in self._index:
+            self.build_index()
+        assert self._index is not None
+        matches = []
+        for i_file, view in enumerate(self._index):
+            assert view is not None
+            matches.extend(view.find_dependencies(i_file, parsed, speaker))
+        return matches
+
+    def info(self, *, verbose: bool = False) -> None:
+        """Print a summary of this reader's data.
+
+        Args:
+            verbose: If True, show the details of all files.
+                Defaults to False (shows first 5 files only).
+        """
+        self._chat.info(verbose=verbose)
+
+    def __add__(self, other: CHAT, /) -> CHAT:
+        options = self._merged_options([other])
+        new = self._derive(self._chat + _unwrap(other))
+        new._options = options
+        return new
+
+    def __iadd__(self, other: CHAT, /) -> CHAT:
+        self.append(other)
+        return self
+
+    def __getitem__(self, index: int | slice, /) -> CHAT:
+        indices = range(self.n_files)
+        kept = indices[index] if isinstance(index, slice) else [indices[index]]
+        parsed = None if self._pending is not None else self._base[index]
+        return self._select(kept, parsed)
+
+    def __iter__(self) -> Iterator[CHAT]:
+        for i in range(self.n_files):
+            yield self[i]
+
+    def __bool__(self) -> bool:
+        return self.n_files > 0
+
+    def __repr__(self) -> str:
+        return repr(self._chat)
+
+    def __eq__(self, other: object, /) -> bool:
+        if isinstance(other, (CHAT, _CHAT)):
+            return self._chat == _unwrap(other)
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(self._chat)
+
+
+def read_chat(
+    path: str | os.PathLike[str] | Sequence[str],
+    *,
+    filter_files: str | Sequence[str] | None = None,
+    filter_participants: str | Sequence[str] | None = None,
+    exclude_participants: str | Sequence[str] | None = None,
+    age_range: tuple[float | None, float | None] | None = None,
+    lazy_tiers: bool = False,
+    cls: type[CHAT] = CHAT,
+    strict: bool = True,
+    mor_tier: str | None = "%mor",
+    gra_tier: str | None = "%gra",
+    cache: ParseCache | None = None,
+    profile: bool = False,
+    profile_hook: Callable[[FileProfile], None] | None = None,
+) -> CHAT:
+    """Read CHAT data.
+
+    Args:
+        path: Path to a ``.zip`` file, a local directory containing ``.cha``
+            files, a single ``.cha`` file, a git repository URL
+            (ending in ``.git``), or an HTTP/HTTPS URL.
+            Or a list of these, to be fetched concurrently
+            and read into one reader with :meth:`CHAT.from_urls`,
+            in which case *cache*, *profile*, and *profile_hook*
+            are not supported.
+        filter_files: Filename(s) to keep.
+            Regular expression matching is supported.
+            If ``None``, all files are included.
+        filter_participants: Participant code(s) to keep.
+            Regular expression matching is supported.
+            If ``None``, all participants are included.
+            The utterances of the other participants are removed
+            before parsing, which saves the time and memory to parse them.
+            The result is as that of :meth:`CHAT.filter`, except that
+            :meth:`~pylangacq.CHAT.to_strs` doesn't return
+            the utterances removed.
+        exclude_participants: Participant code(s) whose utterances
+            are removed before parsing, and who are left out of
+            the headers as with *filter_participants*.
+            Regular expression matching is supported.
+        age_range: ``(start, end)`` in months, to keep only the files
+            where the target child (CHI) is at least *start* and
+            younger than *end* months old. Either can be None for
+            an open end. The other files are not parsed at all.
+        lazy_tiers: If ``True``, parse the %mor and %gra tiers of a file
+            only when they are first needed (e.g., by
+            :meth:`~pylangacq.CHAT.tokens` or :meth:`~pylangacq.CHAT.mlum`),
+            so that methods such as :meth:`~pylangacq.CHAT.words`
+            don't pay for them.
+            Only for a ``.zip`` file, a local directory, or a ``.cha`` file.
+        cls: The class used to create the reader. Must be ``CHAT`` or a
+            subclass of it.
+        strict: If ``True``, enforce strict parsing of the CHAT data.
+        mor_tier: Name of the dependent tier to treat as the
+            morphology tier, e.g. ``"%mor"`` or ``"%xmor"``.
+            Set to None to disable mor+gra handling.
+        gra_tier: Name of the dependent tier to treat as the
+            grammatical relation tier, e.g. ``"%gra"`` or ``"%xgra"``.
+            Set to None to disable mor+gra handling.
+        cache: If provided, a :class:`~pylangacq.ParseCache` for the
+            parsed data of a ``.zip`` file or a local directory.
+            Not used if *profile* or *lazy_tiers* is True.
+        profile: If True, record the time of each stage of loading
+            each file (reading, decoding, parsing the main tiers,
+            and parsing the %mor and %gra tiers), along with byte, utterance,
+            and token counts, available as a
+            :class:`~pylangacq.LoadProfile` at :attr:`CHAT.profile`.
+            Only for a ``.zip`` file, a local directory, or a ``.cha`` file.
+            Profiling makes loading slower, as each file is parsed twice
+            to time the %mor and %gra tiers apart from the rest.
+        profile_hook: If provided, a function called with the
+            :class:`~pylangacq.FileProfile` of each file
+            as soon as the file is loaded, e.g., to forward the data
+            to a metrics system. Implies *profile*.
+            Can't be combined with *lazy_tiers*, as profiling parses
+            the %mor and %gra tiers of every file to time them.
+
+    Returns:
+        A ``CHAT`` instance filtered by the specified files and participants.
+
+    Raises:
+        TypeError: If *cls* is not ``CHAT`` or a subclass of it.
+        ValueError: If *path* does not point to a recognized source,
+            if *cache*, *profile*, or *profile_hook* is set
+            for a list of sources, or if *profile* or *profile_hook*
+            is set together with *lazy_tiers*.
+    """
+    if not (isinstance(cls, type) and issubclass(cls, CHAT)):
+        raise TypeError(f"Only a CHAT class or its child class is allowed: {cls}")
+
+    match = None
+    if filter_files is not None:
+        match = "|".join(f"(?:{p})" for p in _as_list(filter_files))
+    options: dict[str, Any] = {
+        "strict": strict,
+        "mor_tier": mor_tier,
+        "gra_tier": gra_tier,
+    }
+    prefilter = Prefilter.create(filter_participants, exclude_participants, age_range)
+    if not isinstance(path, (str, os.PathLike)):
+        unsupported = [
+            name
+            for name, value in [
+                ("cache", cache is not None),
+                ("profile", profile),
+                ("profile_hook", profile_hook is not None),
+            ]
+            if value
+        ]
+        if unsupported:
+            raise ValueError(
+                f"Not supported for a list of sources: {', '.join(unsupported)}"
+            )
+        return cls.from_urls(
+            path,
+            match=match,
+            **options,
+            participants=filter_participants,
+            exclude_participants=exclude_participants,
+            age_range=age_range,
+            lazy_tiers=lazy_tiers,
+        )
+    path = os.fspath(path)
+    path_lower = path.lower()
+    filters: dict[str, Any] = {
+        "participants": filter_participants,
+        "exclude_participants": exclude_participants,
+        "age_range": age_range,
+        "lazy_tiers": lazy_tiers,
+    }
+    if (profile or profile_hook is not None) and lazy_tiers:
+        raise ValueError("lazy_tiers is not supported with profile or profile_hook")
+    if profile or profile_hook is not None:
+        parsed, load_profile = load_profiled(
+            path,
+            filter_files=filter_files,
+            hook=profile_hook,
+            prefilter=prefilter,
+            **options,
+        )
+        chat = _filter_headers(cls._wrap(parsed, options=options), prefilter)
+        chat._profile = load_profile
+        return chat
+    elif path_lower.startswith(("http://", "https://")):
+        # The data is downloaded before it's parsed by rustling,
+        # so the participant and age filters can only be applied afterwards.
+        if path_lower.endswith(".git"):
+            chat = cls.from_git(path, match=match, **options)
+        else:
+            chat = cls.from_url(path, match=match, **options)
+        if prefilter is None:
+            return chat
+        return cls._wrap(_filter_parsed(chat._chat, prefilter), options=chat._options)
+    elif path_lower.endswith(".zip"):
+        return cls.from_zip(path, match=match, cache=cache, **options, **filters)
+    elif os.path.isdir(path):
+        return cls.from_dir(path, match=match, cache=cache, **options, **filters)
+    elif path_lower.endswith(".cha"):
+        if match is not None and not re.search(match, path):
+            return cls()
+        return cls.from_files([path], **options, **filters)
+    else:
+        raise ValueError(
+            "path is not one of the accepted choices of "
+            f"{{.zip file, local directory, .cha file, git URL, HTTP URL}}: {path}"
+        )
@@ -0,0 +1,393 @@
+"""The ``pylangacq`` command-line interface."""
+
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import os
+import sys
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, TextIO
+
+from pylangacq._cache import ParseCache
+from pylangacq._chat import CHAT, read_chat
+from pylangacq._collection import CorpusCollection
+from pylangacq._convert import FORMATS
+from pylangacq._measures import MEASURE_NAMES
+from pylangacq._server import DEFAULT_SOCKET, make_server, send, server_address
+from pylangacq._sources import is_remote
+
+_SERVER_ENV = "PYLANGACQ_SERVER"
+
+# Number of filtered views of the corpora kept by a server.
+_MAX_VIEWS = 16
+
+
+def _stats(chat: CHAT, args: argparse.Namespace, out: TextIO) -> None:
+    table = chat.measures_table(args.measures, by="file", participant=args.participant)
+    if not args.json:
+        out.write("\t".join(table.columns) + "\n")
+    for row in table.rows():
+        row["file"] = table.file_paths[row["file"]]
+        if args.json:
+            row["age"] = None if row["age"] is None else row["age"].in_months()
+            out.write(json.dumps(row) + "\n")
+        else:
+            out.write("\t".join(_format(value) for value in row.values()) + "\n")
+
+
+def _format(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, float):
+        return f"{value:.3f}"
+    return str(value)
+
+
+def _ngrams(chat: CHAT, args: argparse.Namespace, out: TextIO) -> None:
+    for ngram, count in chat.word_ngrams(args.n).most_common(args.top):
+        if args.json:
+            out.write(json.dumps({"ngram": list(ngram), "count": count}) + "\n")
+        else:
+            out.write(f"{count}\t{' '.join(ngram)}\n")
+
+
+def _search(chat: CHAT, args: argparse.Namespace, out: TextIO) -> None:
+    hits = chat.search(
+        word=args.word,
+        lemma=args.lemma,
+        pos=args.pos,
+        phrase=args.phrase.split() if args.phrase else None,
+    )
+    file_paths = chat.file_paths
+    for hit in hits[: args.limit]:
+        if args.json:
+            record = {
+                "file": file_paths[hit.file],
+                "utterance": hit.utterance,
+                "position": hit.position,
+                "participant": hit.participant,
+                "match": list(hit.match),
+                "words": list(hit.words),
+            }
+            out.write(json.dumps(record) + "\n")
+        else:
+            out.write(
+                f"{file_paths[hit.file]}\t{hit.utterance}\t{hit.participant}\t"
+                f"{' '.join(hit.match)}\t{' '.join(hit.words)}\n"
+            )
+
+
+def _convert(chat: CHAT, args: argparse.Namespace, out: TextIO) -> None:
+    for conversion in chat.convert(args.to, args.out_dir, workers=args.workers):
+        out.write(f"{conversion.path}\n")
+
+
+# Each command takes the reader of the data source, filtered as requested.
+COMMANDS: dict[str, Callable[[CHAT, argparse.Namespace, TextIO], None]] = {
+    "stats": _stats,
+    "ngrams": _ngrams,
+    "search": _search,
+    "convert": _convert,
+}
+
+
+def _run(
+    args: argparse.Namespace, get_chat: Callable[[], CHAT], out: TextIO, err: TextIO
+) -> int:
+    """Run a command, with its errors reported as those of the command line."""
+    try:
+        COMMANDS[args.command](get_chat(), args, out)
+    except (OSError, ValueError) as e:
+        err.write(f"pylangacq: error: {e}\n")
+        return 1
+    return 0
+
+
+def _request_args(request: Any) -> argparse.Namespace:
+    """Return the arguments of a request to a server, as if from the command line.
+
+    The options left out of the request have their default values.
+
+    Raises:
+        ValueError: If the request isn't for a command on a data source,
+            or if it doesn't have the arguments that the command requires.
+    """
+    args = request.get("args") if isinstance(request, dict) else None
+    if not isinstance(args, dict) or args.get("command") not in COMMANDS:
+        raise ValueError("not a command on a data source")
+    command = args["command"]
+    required = ["source"]
+    # Placeholders of the required arguments, for the defaults of the others.
+    placeholders = ["-"]
+    if command == "convert":
+        required += ["out_dir", "to"]
+        placeholders += ["-", "--to", next(iter(FORMATS))]
+    namespace = vars(build_parser().parse_args([command, *placeholders]))
+    missing = [name for name in required if name not in args]
+    if missing:
+        raise ValueError(f"missing arguments: {', '.join(missing)}")
+    unknown = sorted(args.keys() - namespace.keys())
+    if unknown:
+        raise ValueError(f"unknown arguments: {', '.join(unknown)}")
+    if not isinstance(args["source"], str):
+        raise ValueError(f"source is not a string: {args['source']!r}")
+    namespace.update(args)
+    return argparse.Namespace(**namespace)
+
+
+def _read_local(args: argparse.Namespace) -> CHAT:
+    # The files and participants are filtered out before parsing.
+    return read_chat(
+        args.source,
+        filter_files=args.files,
+        filter_participants=args.participants,
+        cache=ParseCache() if args.cache else None,
+    )
+
+
+class _Corpora:
+    """The corpora of a server, kept warm across requests.
+
+    Each data source is read in full once, and requests for some files
+    or participants of it are answered from a filtered view,
+    without reading the data again.
+    """
+
+    def __init__(self, collection: CorpusCollection, cache: bool) -> None:
+        self.collection = collection
+        self.cache = cache
+        self._lock = threading.Lock()
+        # Filtered views by source, files, and participants, most recent last,
+        # each with the full reader it was filtered from.
+        self._views: OrderedDict[tuple, tuple[CHAT, CHAT]] = OrderedDict()
+
+    def handle(self, request: dict[str, Any]) -> dict[str, Any]:
+        try:
+            args = _request_args(request)
+        except ValueError as e:
+            return {"status": 2, "stdout": "", "stderr": f"Invalid request: {e}\n"}
+        with self._lock:
+            if args.source not in self.collection:
+                options = {"cache": ParseCache()} if self.cache else {}
+                self.collection.add(args.source, args.source, **options)
+
+        def get_chat() -> CHAT:
+            try:
+                chat = self.collection[args.source]
+            except Exception:
+                # Not to keep a source that can't be read, e.g., a mistyped path.
+                with self._lock:
+                    if args.source in self.collection:
+                        self.collection.remove(args.source)
+                raise
+            finally:
+                self._drop_evicted()
+            # Requests on the same corpus run at the same time.
+            chat.freeze()
+            if args.command == "search":
+                # Filtered views share the index of the full reader.
+                chat.build_index()
+            if args.files is None and args.participants is None:
+                return chat
+            return self._view(chat, args)
+
+        out, err = io.StringIO(), io.StringIO()
+        status = _run(args, get_chat, out, err)
+        return {"status": status, "stdout": out.getvalue(), "stderr": err.getvalue()}
+
+    def _view(self, chat: CHAT, args: argparse.Namespace) -> CHAT:
+        """Return a filtered view of a reader, reused across requests.
+
+        Filtering copies the data, and a new view would also have to
+        memoize its results again, so the most recent views are kept.
+        """
+        key = (
+            args.source,
+            tuple(args.files or ()),
+            tuple(args.participants or ()),
+        )
+        with self._lock:
+            base, view = self._views.pop(key, (None, None))
+        # A view of a corpus evicted and read again is out of date.
+        if view is None or base is not chat:
+            view = chat.filter(files=args.files, participants=args.participants)
+        with self._lock:
+            self._views[key] = (chat, view)
+            while len(self._views) > _MAX_VIEWS:
+                self._views.popitem(last=False)
+        return view
+
+    def _drop_evicted(self) -> None:
+        """Drop the views of the corpora no longer in memory.
+
+        Otherwise, the views and the full readers they were filtered from
+        would be kept in memory past the memory budget of the collection.
+        """
+        loaded = set(self.collection.loaded)
+        with self._lock:
+            for key in [key for key in self._views if key[0] not in loaded]:
+                del self._views[key]
+
+
+def _serve(args: argparse.Namespace) -> int:
+    corpora = _Corpora(
+        CorpusCollection(max_memory=args.max_memory, spill_dir=args.spill_dir),
+        args.cache,
+    )
+    try:
+        server = make_server(
+            corpora.handle,
+            socket_path=args.socket,
+            host=args.host,
+            port=args.port,
+            token=args.token,
+        )
+    except OSError as e:
+        print(f"pylangacq: error: {e}", file=sys.stderr)
+        return 1
+    address = server_address(server)
+    print(f"Serving on {address}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if args.port is None:
+            os.remove(address.removeprefix("unix:"))
+    return 0
+
+
+def _request(args: argparse.Namespace) -> int:
+    """Send a command to a server, for the server's warm corpora."""
+    request = dict(vars(args))
+    del request["server"]
+    # Local paths, as the server may run from another directory.
+    if not is_remote(args.source) and os.path.exists(args.source):
+        request["source"] = os.path.abspath(args.source)
+    if args.command == "convert":
+        request["out_dir"] = os.path.abspath(args.out_dir)
+    try:
+        response = send(args.server, {"args": request})
+    except OSError as e:
+        print(f"pylangacq: error: server at {args.server}: {e}", file=sys.stderr)
+        return 1
+    sys.stdout.write(response["stdout"])
+    sys.stderr.write(response["stderr"])
+    return response["status"]
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="pylangacq", description="Tools for language acquisition research."
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    # Options of all the commands on CHAT data.
+    data = argparse.ArgumentParser(add_help=False)
+    data.add_argument(
+        "source",
+        help="A .zip file, a directory, a .cha file, a git URL, or an HTTP URL.",
+    )
+    data.add_argument(
+        "--files", action="append", help="Regex of file paths to keep (repeatable)."
+    )
+    data.add_argument(
+        "--participants",
+        action="append",
+        help="Regex of participant codes to keep (repeatable).",
+    )
+    data.add_argument(
+        "--cache",
+        action="store_true",
+        help="Cache the parsed data in ~/.pylangacq/cache/parsed/.",
+    )
+    data.add_argument(
+        "--server",
+        default=os.environ.get(_SERVER_ENV),
+        help=(
+            "Address of a `pylangacq serve` server to send the command to: "
+            f"unix:PATH or http://HOST:PORT. Defaults to ${_SERVER_ENV}."
+        ),
+    )
+    data.add_argument("--json", action="store_true", help="Output JSON lines.")
+
+    stats = subparsers.add_parser(
+        "stats", parents=[data], help="Developmental measures per file."
+    )
+    stats.add_argument(
+        "--measures",
+        nargs="+",
+        choices=list(MEASURE_NAMES),
+        default=["mlum", "mluw", "ttr", "ipsyn"],
+    )
+    stats.add_argument("--participant", default="CHI")
+
+    ngrams = subparsers.add_parser(
+        "ngrams", parents=[data], help="The most common word n-grams."
+    )
+    ngrams.add_argument("-n", type=int, default=2, help="The n-gram order.")
+    ngrams.add_argument("--top", type=int, default=20)
+
+    search = subparsers.add_parser(
+        "search", parents=[data], help="Utterances with matching tokens or phrases."
+    )
+    search.add_argument("--word", action="append")
+    search.add_argument("--lemma", action="append")
+    search.add_argument("--pos", action="append")
+    search.add_argument("--phrase", help="Words separated by spaces.")
+    search.add_argument("--limit", type=int, help="Maximum number of matches.")
+
+    convert = subparsers.add_parser(
+        "convert", parents=[data], help="Convert to other formats."
+    )
+    convert.add_argument("out_dir", help="Directory for the converted files.")
+    convert.add_argument("--to", action="append", choices=list(FORMATS), required=True)
+    convert.add_argument("--workers", type=int)
+
+    serve = subparsers.add_parser(
+        "serve", help="Keep corpora in memory to answer the other commands."
+    )
+    serve.add_argument(
+        "--socket", help=f"Unix socket to listen on. Defaults to {DEFAULT_SOCKET}."
+    )
+    serve.add_argument("--port", type=int, help="Port to listen on for HTTP instead.")
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument(
+        "--token",
+        help=(
+            "Token that HTTP requests must have, "
+            "as in the server address printed on starting. Defaults to a random one."
+        ),
+    )
+    serve.add_argument(
+        "--max-memory",
+        type=int,
+        default=2**32,
+        help="Estimated memory budget for the corpora, in bytes.",
+    )
+    serve.add_argument(
+        "--spill-dir", help="Directory for snapshots of evicted corpora."
+    )
+    serve.add_argument("--cache", action="store_true")
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the ``pylangacq`` command line.
+
+    Args:
+        argv: The command-line arguments. Defaults to ``sys.argv[1:]``.
+
+    Returns:
+        The exit status.
+    """
+    args = build_parser().parse_args(argv)
+    if args.command == "serve":
+        return _serve(args)
+    if args.server:
+        return _request(args)
+    return _run(args, lambda: _read_local(args), sys.stdout, sys.stderr)
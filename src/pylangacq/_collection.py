@@ -0,0 +1,409 @@
+"""A registry of named CHAT corpora, loaded lazily under a memory budget."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Iterator, Mapping, Sequence
+
+from pylangacq._cache import CacheStats
+from pylangacq._chat import CHAT, _as_list, read_chat
+from pylangacq._measures import MeasuresTable
+
+if TYPE_CHECKING:
+    Source = str | os.PathLike[str] | Sequence[str]
+
+# Parsed CHAT data takes several times the size of its CHAT text in memory,
+# for the utterances, tokens, and headers of the rustling objects.
+_BYTES_PER_TEXT_BYTE = 8
+
+_SPILL_SUFFIX = ".bin"
+
+
+@dataclass(frozen=True)
+class CollectionStats(CacheStats):
+    """Usage statistics of a :class:`CorpusCollection`."""
+
+    vocab_size: int
+    """Number of strings in the vocabularies of the corpora in memory
+    (see :attr:`CHAT.vocab`)."""
+
+
+@dataclass
+class _Entry:
+    source: Source
+    options: dict[str, Any]
+    chat: CHAT | None = None
+    size: int = 0
+    spill_path: str | None = None
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+def estimate_size(chat: CHAT) -> int:
+    """Return an estimate of the memory of a parsed reader, in bytes."""
+    text_size = sum(len(text.encode("utf-8")) for text in chat.to_strs())
+    return text_size * _BYTES_PER_TEXT_BYTE
+
+
+class CorpusCollection:
+    """Named CHAT data sources, parsed on first access
+    and kept in memory under a budget.
+
+    Each corpus is registered with a name and a data source
+    (a ``.zip`` file, a local directory, a URL, a git repository, etc.)
+    as for :func:`~pylangacq.read_chat`. Nothing is read until the corpus
+    is first accessed, e.g., with ``collection["Brown"]``. Parsed corpora
+    are then kept in memory for later accesses, until their estimated
+    total size exceeds ``max_memory``, at which point the least recently
+    used corpora are evicted.
+
+    An evicted corpus is read again at its next access. With ``spill_dir``,
+    an evicted corpus is saved to a snapshot (see :meth:`CHAT.save`)
+    in this directory instead, and the next access loads the snapshot
+    without reading the data source. Word- and token-level queries
+    (e.g., :meth:`CHAT.words` and :meth:`CHAT.search`) of a loaded snapshot
+    need no parsing; the others parse the CHAT text stored in the snapshot.
+
+    The memory of a corpus is estimated from the size of its CHAT data,
+    as parsed data takes several times as much memory.
+    A corpus larger than ``max_memory`` by itself is still kept in memory
+    until another corpus is accessed.
+
+    The same :class:`~pylangacq.CHAT` object is returned for a corpus
+    for as long as it stays in memory, so it shouldn't be modified
+    (e.g., with :meth:`CHAT.append`) unless it's meant to be shared.
+    Accesses are thread-safe; a corpus is only read once if
+    multiple threads access it at the same time.
+
+    The vocabulary of each corpus (see :attr:`CHAT.vocab`) is released
+    along with the corpus when it's evicted.
+    The total size of the vocabularies in memory is in :meth:`stats`.
+    """
+
+    def __init__(
+        self,
+        sources: Mapping[str, Source] | None = None,
+        *,
+        max_memory: int | None = 2**30,
+        spill_dir: str | os.PathLike[str] | None = None,
+        **options: Any,
+    ) -> None:
+        """Initialize a collection.
+
+        Args:
+            sources: Data source of each corpus by name,
+                in any of the forms accepted by :func:`~pylangacq.read_chat`.
+            max_memory: Estimated memory budget in bytes for the corpora
+                kept in memory. If None, corpora are never evicted.
+            spill_dir: Directory for snapshots of evicted corpora.
+                If None, evicted corpora are read again from their sources.
+            **options: Keyword arguments of :func:`~pylangacq.read_chat`
+                for reading the corpora in *sources*,
+                e.g., ``filter_participants`` or ``cache``.
+
+        Raises:
+            ValueError: If max_memory is negative.
+        """
+        if max_memory is not None and max_memory < 0:
+            raise ValueError(f"max_memory must not be negative: {max_memory}")
+        self.max_memory = max_memory
+        self.spill_dir = None if spill_dir is None else os.fspath(spill_dir)
+        self._entries: dict[str, _Entry] = {}
+        # Names of the corpora in memory, least recently used first.
+        self._loaded: OrderedDict[str, None] = OrderedDict()
+        self._lock = threading.RLock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        for name, source in (sources or {}).items():
+            self.add(name, source, **options)
+
+    def __repr__(self) -> str:
+        return f"CorpusCollection(names={self.names}, max_memory={self.max_memory!r})"
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.names)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._entries
+
+    @property
+    def names(self) -> list[str]:
+        """Names of the corpora, in the order they were added."""
+        with self._lock:
+            return list(self._entries)
+
+    @property
+    def loaded(self) -> list[str]:
+        """Names of the corpora in memory, from the least recently used."""
+        with self._lock:
+            return list(self._loaded)
+
+    def add(self, name: str, source: Source, **options: Any) -> None:
+        """Register a corpus. The data isn't read until the corpus is accessed.
+
+        Args:
+            name: Name of the corpus.
+            source: Data source, in any of the forms accepted by
+                :func:`~pylangacq.read_chat`.
+            **options: Keyword arguments of :func:`~pylangacq.read_chat`.
+
+        Raises:
+            ValueError: If a corpus of the same name is already registered.
+        """
+        with self._lock:
+            if name in self._entries:
+                raise ValueError(f"Corpus already in the collection: {name!r}")
+            self._entries[name] = _Entry(source, options)
+
+    def remove(self, name: str) -> None:
+        """Remove a corpus from the collection, along with its snapshot if any.
+
+        Raises:
+            KeyError: If there's no corpus of this name.
+        """
+        with self._lock:
+            entry = self._entries.pop(name)
+            self._loaded.pop(name, None)
+        if entry.spill_path is not None:
+            try:
+                os.remove(entry.spill_path)
+            except FileNotFoundError:
+                pass
+
+    def __getitem__(self, name: str) -> CHAT:
+        """Return the reader of a corpus, reading the data if it's not in memory.
+
+        Raises:
+            KeyError: If there's no corpus of this name.
+        """
+        with self._lock:
+            entry = self._entries[name]
+        with entry.lock:
+            with self._lock:
+                if entry.chat is not None:
+                    self._loaded.move_to_end(name)
+                    self._hits += 1
+                    return entry.chat
+            chat = self._read(entry)
+            with self._lock:
+                if name not in self._entries:
+                    # Removed while being read.
+                    return chat
+                entry.chat = chat
+                self._loaded[name] = None
+                self._misses += 1
+                evicted = self._over_budget(keep=name)
+        for other in evicted:
+            self._evict(other)
+        return chat
+
+    def select(self, corpora: str | Sequence[str] | None = None) -> list[str]:
+        """Return the names of the corpora that match regex patterns.
+
+        Args:
+            corpora: Regex pattern(s) of corpus names, auto-anchored
+                (full match) and OR'd as for the participants
+                of :meth:`CHAT.filter`. If None, all corpora match.
+
+        Returns:
+            The matching names, in the order the corpora were added.
+        """
+        names = self.names
+        if corpora is None:
+            return names
+        regex = re.compile("|".join(f"(?:{p})" for p in _as_list(corpora)))
+        return [name for name in names if regex.fullmatch(name)]
+
+    def items(
+        self,
+        corpora: str | Sequence[str] | None = None,
+        *,
+        files: str | Sequence[str] | None = None,
+        participants: str | Sequence[str] | None = None,
+    ) -> Iterator[tuple[str, CHAT]]:
+        """Iterate over (name, reader) pairs of the selected corpora.
+
+        The corpora are accessed one at a time, so that a collection larger
+        than its memory budget can be processed from start to finish.
+
+        Args:
+            corpora: Regex pattern(s) of corpus names, as for :meth:`select`.
+            files: If given, filter each reader by file paths,
+                as for :meth:`CHAT.filter`.
+            participants: If given, filter each reader by participants,
+                as for :meth:`CHAT.filter`.
+
+        Yields:
+            The name and the (filtered) reader of each selected corpus.
+        """
+        for name in self.select(corpora):
+            chat = self[name]
+            if files is not None or participants is not None:
+                chat = chat.filter(files=files, participants=participants)
+            yield name, chat
+
+    def map(
+        self,
+        fn: Callable[[CHAT], Any],
+        corpora: str | Sequence[str] | None = None,
+        *,
+        files: str | Sequence[str] | None = None,
+        participants: str | Sequence[str] | None = None,
+    ) -> dict[str, Any]:
+        """Apply a function to the reader of each selected corpus.
+
+        Args:
+            fn: Function called with each (filtered) reader.
+            corpora: Regex pattern(s) of corpus names, as for :meth:`select`.
+            files: If given, filter each reader by file paths.
+            participants: If given, filter each reader by participants.
+
+        Returns:
+            The result of each corpus by name.
+
+        Examples:
+            .. code-block:: python
+
+                hits = collection.map(
+                    lambda chat: len(chat.search(word="cookie")), "Brown|MacWhinney"
+                )
+        """
+        return {
+            name: fn(chat)
+            for name, chat in self.items(
+                corpora, files=files, participants=participants
+            )
+        }
+
+    def measures_table(
+        self,
+        measures: Sequence[str] = ("mlum", "mluw", "ttr", "ipsyn"),
+        corpora: str | Sequence[str] | None = None,
+        *,
+        files: str | Sequence[str] | None = None,
+        by: str | Sequence[str] = ("file", "participant"),
+        participant: str = "CHI",
+    ) -> MeasuresTable:
+        """Compute developmental measures across corpora.
+
+        The table of each corpus is as from :meth:`CHAT.measures_table`,
+        with the rows of all the selected corpora in one table
+        and an extra ``corpus`` column of the corpus names.
+        The ``file`` column indexes into the file paths of all the corpora
+        in the table's :attr:`~pylangacq.MeasuresTable.file_paths`.
+
+        Args:
+            measures: Measures to compute, as for :meth:`CHAT.measures_table`.
+            corpora: Regex pattern(s) of corpus names, as for :meth:`select`.
+            files: If given, filter each reader by file paths.
+            by: ``("file", "participant")`` or ``"file"``,
+                as for :meth:`CHAT.measures_table`.
+            participant: Target participant code, if *by* is ``"file"``.
+
+        Returns:
+            A :class:`~pylangacq.MeasuresTable` object.
+        """
+        columns: dict[str, list[Any]] = {"corpus": []}
+        file_paths: list[str] = []
+        for name, chat in self.items(corpora, files=files):
+            table = chat.measures_table(measures, by=by, participant=participant)
+            columns["corpus"].extend([name] * len(table))
+            for column, values in table.columns.items():
+                if column == "file":
+                    values = [i + len(file_paths) for i in values]
+                columns.setdefault(column, []).extend(values)
+            file_paths.extend(table.file_paths)
+        if "file" not in columns:
+            # No corpora selected, for the columns of an empty table.
+            empty = CHAT().measures_table(measures, by=by, participant=participant)
+            columns.update(empty.columns)
+        return MeasuresTable(columns, file_paths)
+
+    def unload(self, name: str | None = None) -> None:
+        """Evict a corpus from memory, or all corpora if *name* is None.
+
+        With ``spill_dir``, the evicted corpora are saved to snapshots
+        as they would be when over the memory budget.
+
+        Raises:
+            KeyError: If there's no corpus of this name.
+        """
+        with self._lock:
+            if name is not None:
+                self._entries[name]
+            names = list(self._loaded) if name is None else [name]
+        for other in names:
+            self._evict(other)
+
+    def stats(self) -> CollectionStats:
+        """Return the usage statistics of the collection.
+
+        ``hits`` are accesses of corpora in memory, ``misses`` are accesses
+        that read a corpus, ``n_entries`` is the number of corpora in memory,
+        ``size`` is their estimated memory in bytes,
+        and ``vocab_size`` is the number of strings in their vocabularies.
+        """
+        with self._lock:
+            vocabs = {
+                id(chat.vocab): chat.vocab
+                for chat in (self._entries[name].chat for name in self._loaded)
+                if chat is not None
+            }
+            return CollectionStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                n_entries=len(self._loaded),
+                size=sum(self._entries[name].size for name in self._loaded),
+                vocab_size=sum(len(vocab) for vocab in vocabs.values()),
+            )
+
+    def _read(self, entry: _Entry) -> CHAT:
+        """Read a corpus from its snapshot if it has one, else from its source."""
+        if entry.spill_path is not None and os.path.exists(entry.spill_path):
+            return CHAT.load(entry.spill_path)
+        chat = read_chat(entry.source, **entry.options)
+        entry.size = estimate_size(chat)
+        return chat
+
+    def _over_budget(self, keep: str) -> list[str]:
+        """Return the least recently used corpora to evict to meet the budget."""
+        if self.max_memory is None:
+            return []
+        total = sum(self._entries[name].size for name in self._loaded)
+        evicted = []
+        for name in self._loaded:
+            if total <= self.max_memory:
+                break
+            if name == keep:
+                continue
+            evicted.append(name)
+            total -= self._entries[name].size
+        return evicted
+
+    def _evict(self, name: str) -> None:
+        with self._lock:
+            entry = self._entries.get(name)
+        if entry is None:
+            return
+        with entry.lock:
+            with self._lock:
+                if entry.chat is None:
+                    return
+                chat, entry.chat = entry.chat, None
+                self._loaded.pop(name, None)
+                self._evictions += 1
+            if self.spill_dir is not None and entry.spill_path is None:
+                os.makedirs(self.spill_dir, exist_ok=True)
+                digest = hashlib.sha256(name.encode("utf-8")).hexdigest()[:16]
+                path = os.path.join(self.spill_dir, digest + _SPILL_SUFFIX)
+                chat.save(path)
+                entry.spill_path = path
@@ -0,0 +1,276 @@
+"""Association measures of word bigrams, computed with NumPy."""
+
+from __future__ import annotations
+
+import array
+from typing import TYPE_CHECKING, Any, Iterator, Sequence
+
+from pylangacq._vocab import Vocabulary
+
+if TYPE_CHECKING:
+    import numpy as np
+    from rustling.ngram import Ngrams
+
+MEASURES = ("pmi", "log_likelihood", "t_score", "dice")
+
+
+def _numpy() -> Any:
+    try:
+        import numpy
+    except ImportError as e:  # pragma: no cover
+        raise ImportError(
+            "numpy is required for association measures. "
+            "Install it with `pip install pylangacq[numpy]`."
+        ) from e
+    return numpy
+
+
+def check_arguments(measure: str, top_k: int | None) -> None:
+    if measure not in MEASURES:
+        raise ValueError(f"measure must be one of {MEASURES}: {measure!r}")
+    if top_k is not None and top_k < 1:
+        raise ValueError(f"top_k must be positive: {top_k!r}")
+
+
+class Collocations:
+    """Word bigrams scored by an association measure, from the highest score.
+
+    The scores are computed from the 2x2 contingency table of each bigram
+    ``(w1, w2)``: its count, the counts of bigrams with ``w1`` first
+    and with ``w2`` second, and the total count of bigrams.
+    With *O* for the bigram count and *E* for its count expected
+    if ``w1`` and ``w2`` were independent:
+
+    - ``"pmi"``: Pointwise mutual information, ``log2(O / E)``.
+    - ``"log_likelihood"``: Log-likelihood ratio (G²) of the contingency table.
+    - ``"t_score"``: ``(O - E) / sqrt(O)``.
+    - ``"dice"``: Dice coefficient, ``2 * O / (count of w1 + count of w2)``.
+
+    Data is kept in NumPy arrays, one item per bigram,
+    with the words as IDs in :attr:`vocab`.
+    Words and scores are only turned into Python objects
+    by indexing, iterating, or :meth:`items`.
+    """
+
+    def __init__(
+        self,
+        measure: str,
+        first: np.ndarray,
+        second: np.ndarray,
+        counts: np.ndarray,
+        scores: np.ndarray,
+        vocab: Vocabulary,
+    ) -> None:
+        self.measure = measure
+        """The association measure."""
+        self.first = first
+        """IDs of the first words of the bigrams (32-bit integers)."""
+        self.second = second
+        """IDs of the second words of the bigrams (32-bit integers)."""
+        self.counts = counts
+        """Counts of the bigrams (64-bit integers)."""
+        self.scores = scores
+        """Scores of the bigrams (64-bit floats)."""
+        self.vocab = vocab
+        """The :class:`~pylangacq.Vocabulary` of the word IDs."""
+
+    @classmethod
+    def from_ngrams(
+        cls,
+        ngrams: Ngrams,
+        measure: str = "pmi",
+        *,
+        min_count: int = 1,
+        top_k: int | None = None,
+    ) -> Collocations:
+        """Score the bigrams of an :class:`~pylangacq.Ngrams` object.
+
+        The bigrams are taken from the order-2 n-grams, e.g.,
+        of ``chat.word_ngrams(2)``. :meth:`CHAT.collocations` is faster
+        for the bigrams of a CHAT reader, as it doesn't need
+        a Python tuple for each bigram.
+
+        Args:
+            ngrams: N-gram counts that include bigrams.
+            measure: ``"pmi"``, ``"log_likelihood"``, ``"t_score"``, or ``"dice"``.
+            min_count: Minimum count of a bigram to be scored.
+            top_k: Number of the highest-scoring bigrams to keep.
+                None for all.
+
+        Returns:
+            A Collocations object.
+
+        Raises:
+            ValueError: If the measure is not recognized, if *top_k* is not
+                positive, or if the n-grams have no order 2.
+        """
+        check_arguments(measure, top_k)
+        if not ngrams.min_n <= 2 <= ngrams.n:
+            raise ValueError(
+                f"ngrams must include bigrams: min_n={ngrams.min_n}, n={ngrams.n}"
+            )
+        np = _numpy()
+        items = ngrams.items(order=2)
+        vocab = Vocabulary()
+        first = np.frombuffer(vocab.encode([ngram[0] for ngram, _ in items]), np.int32)
+        second = np.frombuffer(vocab.encode([ngram[1] for ngram, _ in items]), np.int32)
+        counts = np.fromiter((count for _, count in items), np.int64, len(items))
+        return score(measure, first, second, counts, min_count, top_k, vocab)
+
+    def __len__(self) -> int:
+        return len(self.scores)
+
+    def __getitem__(self, i: int) -> tuple[tuple[str, str], float]:
+        strings = self.vocab.strings
+        ngram = (strings[self.first[i]], strings[self.second[i]])
+        return ngram, float(self.scores[i])
+
+    def __iter__(self) -> Iterator[tuple[tuple[str, str], float]]:
+        return iter(self.items())
+
+    def __repr__(self) -> str:
+        return f"Collocations(measure={self.measure!r}, n_bigrams={len(self)})"
+
+    def ngrams(self) -> list[tuple[str, str]]:
+        """Return the bigrams, from the highest score."""
+        strings = self.vocab.strings
+        return [
+            (strings[w1], strings[w2])
+            for w1, w2 in zip(self.first.tolist(), self.second.tolist())
+        ]
+
+    def items(self) -> list[tuple[tuple[str, str], float]]:
+        """Return the (bigram, score) pairs, from the highest score."""
+        return list(zip(self.ngrams(), self.scores.tolist()))
+
+
+def count_bigrams(
+    ids: array.array, lengths: Sequence[int], vocab: Vocabulary
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Count the bigrams of word IDs within utterances.
+
+    Args:
+        ids: Word IDs of all utterances, one after another.
+        lengths: Number of words of each utterance.
+        vocab: The vocabulary of the word IDs.
+
+    Returns:
+        The IDs of the first and second words of each distinct bigram,
+        and the counts.
+    """
+    np = _numpy()
+    flat = np.frombuffer(ids, np.int32) if len(ids) else np.zeros(0, np.int32)
+    # A bigram starts at each word but the last word of each utterance.
+    starts = np.ones(len(flat), bool)
+    ends = np.cumsum(np.asarray(lengths, np.int64))
+    starts[ends[ends > 0] - 1] = False
+    size = np.int64(max(len(vocab), 1))
+    keys = flat[:-1][starts[:-1]].astype(np.int64) * size + flat[1:][starts[:-1]]
+    keys, counts = np.unique(keys, return_counts=True)
+    return (
+        (keys // size).astype(np.int32),
+        (keys % size).astype(np.int32),
+        counts.astype(np.int64),
+    )
+
+
+def score(
+    measure: str,
+    first: np.ndarray,
+    second: np.ndarray,
+    counts: np.ndarray,
+    min_count: int,
+    top_k: int | None,
+    vocab: Vocabulary,
+) -> Collocations:
+    """Score distinct bigrams, and keep the highest scores.
+
+    The marginal counts of the words are taken from the bigram counts,
+    before the bigrams under *min_count* are dropped.
+    """
+    np = _numpy()
+    size = int(max(first.max(initial=-1), second.max(initial=-1))) + 1
+    row = np.bincount(first, weights=counts, minlength=size)
+    column = np.bincount(second, weights=counts, minlength=size)
+    total = float(counts.sum())
+
+    keep = counts >= min_count
+    first, second, counts = first[keep], second[keep], counts[keep]
+    o11 = counts.astype(np.float64)
+    r1, c1 = row[first], column[second]
+    expected = r1 * c1 / total
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if measure == "pmi":
+            scores = np.log2(o11 / expected)
+        elif measure == "t_score":
+            scores = (o11 - expected) / np.sqrt(o11)
+        elif measure == "dice":
+            scores = 2 * o11 / (r1 + c1)
+        else:
+            r2, c2 = total - r1, total - c1
+            observed = (o11, r1 - o11, c1 - o11, total - r1 - c1 + o11)
+            margins = ((r1, c1), (r1, c2), (r2, c1), (r2, c2))
+            scores = np.zeros(len(o11))
+            for o, (r, c) in zip(observed, margins):
+                # 0 * log(0) is taken as 0.
+                term = o * np.log(o * total / (r * c))
+                scores += np.where(o > 0, term, 0.0)
+            scores *= 2
+
+    # Highest score first, with ties by count and then by the words.
+    if top_k is not None and top_k < len(scores):
+        threshold = np.partition(scores, len(scores) - top_k)[len(scores) - top_k]
+        # All the ties at the threshold, to be broken as in the full order.
+        top = np.flatnonzero(scores >= threshold)
+        first, second, counts, scores = (
+            values[top] for values in (first, second, counts, scores)
+        )
+    ranks = _string_ranks(np, vocab.strings, size)
+    order = _order(np, scores, counts, ranks[first], ranks[second])[:top_k]
+    return Collocations(
+        measure,
+        first[order],
+        second[order],
+        counts[order],
+        scores[order],
+        vocab,
+    )
+
+
+def _string_ranks(np: Any, strings: Sequence[str], size: int) -> np.ndarray:
+    """Return the rank of each of the first *size* strings in sorted order."""
+    ranks = np.empty(size, np.int64)
+    order = np.argsort(np.array(strings[:size], dtype=str), kind="stable")
+    ranks[order] = np.arange(size)
+    return ranks
+
+
+def _order(
+    np: Any,
+    scores: np.ndarray,
+    counts: np.ndarray,
+    first_ranks: np.ndarray,
+    second_ranks: np.ndarray,
+) -> np.ndarray:
+    """Return the order of bigrams by descending score, count, and then words.
+
+    Sorting by all four keys at once takes several times longer than
+    sorting by the scores, which are mostly distinct, and then sorting
+    only the tied bigrams by the other keys.
+    """
+    order = np.argsort(-scores)
+    sorted_scores = scores[order]
+    same = sorted_scores[1:] == sorted_scores[:-1]
+    tied = np.zeros(len(order), bool)
+    tied[1:] |= same
+    tied[:-1] |= same
+    if tied.any():
+        positions = np.flatnonzero(tied)
+        groups = np.cumsum(np.concatenate(([True], ~same)))[positions]
+        sub = order[positions]
+        sub_order = np.lexsort(
+            (second_ranks[sub], first_ranks[sub], -counts[sub], groups)
+        )
+        order[positions] = sub[sub_order]
+    return order
@@ -0,0 +1,146 @@
+"""Columnar, dictionary-encoded token data."""
+
+from __future__ import annotations
+
+import array
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Sequence
+
+from pylangacq._table import FileTable
+from pylangacq._vocab import MISSING, Vocabulary
+
+if TYPE_CHECKING:
+    import pyarrow
+
+# Integer columns use MISSING (-1) for missing values
+# (e.g., no %gra tier, no time marks, no %mor part-of-speech tag).
+
+STRING_COLUMNS = ("participant", "word", "pos", "mor", "gra_rel")
+
+# Column names and their array.array type codes, in the column order.
+TYPECODES = {
+    "file": "i",
+    "utterance": "i",
+    "participant": "i",
+    "word": "i",
+    "pos": "i",
+    "mor": "i",
+    "gra_dep": "i",
+    "gra_head": "i",
+    "gra_rel": "i",
+    "time_start": "q",
+    "time_end": "q",
+}
+
+
+@dataclass
+class Columns:
+    """Token-level CHAT data, one contiguous column per field.
+
+    Each column is an :class:`array.array` with one item per token,
+    so that it can be passed to NumPy (``numpy.asarray(columns["word"])``)
+    and similar libraries without copying.
+
+    - ``file``: Index of the file in :attr:`CHAT.file_paths`.
+    - ``utterance``: Index of the utterance, counting across all files
+      as in ``CHAT.words(by_utterance=True)``.
+    - ``participant``, ``word``, ``pos``, ``mor``, ``gra_rel``:
+      Integer codes into :attr:`vocabularies`.
+    - ``gra_dep``, ``gra_head``: Positions from the %gra tier.
+    - ``time_start``, ``time_end``: Time marks of the utterance in milliseconds.
+
+    Missing values are ``-1``.
+    """
+
+    columns: dict[str, array.array]
+    """Columns by field name."""
+    vocabularies: dict[str, list[str]]
+    """For each string field, the string of each integer code."""
+
+    def __len__(self) -> int:
+        return len(self.columns["word"])
+
+    def __getitem__(self, name: str) -> array.array:
+        return self.columns[name]
+
+    def decode(self, name: str) -> list[str | None]:
+        """Return the strings of a dictionary-encoded column.
+
+        Args:
+            name: One of the string fields, e.g., ``"word"``.
+
+        Returns:
+            One string per token, or None for a missing value.
+        """
+        vocabulary = self.vocabularies[name]
+        return [vocabulary[c] if c != MISSING else None for c in self.columns[name]]
+
+
+def build_columns(
+    tables: Sequence[FileTable], vocab: Vocabulary | None = None
+) -> Columns:
+    """Build columns from the token tables of all files.
+
+    Args:
+        tables: Token tables of the files.
+        vocab: If given, encode all the string columns with this vocabulary.
+            Otherwise, each string column has its own vocabulary of codes.
+    """
+    encoders = {
+        name: vocab if vocab is not None else Vocabulary() for name in STRING_COLUMNS
+    }
+    columns = {name: array.array(code) for name, code in TYPECODES.items()}
+    n_utterances = 0
+    for i_file, table in enumerate(tables):
+        n_tokens = len(table.words)
+        columns["file"].extend([i_file] * n_tokens)
+        # Participants are encoded once per utterance, not per token.
+        participant_ids = encoders["participant"].encode(table.participants)
+        for i in range(table.n_utterances):
+            width = table.offsets[i + 1] - table.offsets[i]
+            columns["utterance"].extend([n_utterances + i] * width)
+            columns["participant"].extend([participant_ids[i]] * width)
+            time_marks = table.time_marks[i] or (MISSING, MISSING)
+            columns["time_start"].extend([time_marks[0]] * width)
+            columns["time_end"].extend([time_marks[1]] * width)
+        n_utterances += table.n_utterances
+        columns["word"].extend(encoders["word"].encode(table.words))
+        columns["pos"].extend(encoders["pos"].encode(table.pos))
+        columns["mor"].extend(encoders["mor"].encode(table.mor))
+        gra = table.gra
+        columns["gra_dep"].extend([MISSING if g is None else g[0] for g in gra])
+        columns["gra_head"].extend([MISSING if g is None else g[1] for g in gra])
+        columns["gra_rel"].extend(
+            encoders["gra_rel"].encode([None if g is None else g[2] for g in gra])
+        )
+    vocabularies = {name: encoder.strings for name, encoder in encoders.items()}
+    return Columns(columns, vocabularies)
+
+
+def to_arrow(columns: Columns, file_paths: list[str]) -> pyarrow.Table:
+    """Convert columns to a pyarrow Table with dictionary-encoded strings."""
+    try:
+        import pyarrow as pa
+        import pyarrow.compute as pc
+    except ImportError as e:  # pragma: no cover
+        raise ImportError(
+            "pyarrow is required for converting CHAT data to Arrow. "
+            "Install it with `pip install pylangacq[arrow]`."
+        ) from e
+    arrays: dict[str, Any] = {}
+    for name, column in columns.columns.items():
+        # Zero-copy view of the array.array buffer.
+        type_ = pa.int32() if column.itemsize == 4 else pa.int64()
+        values = pa.Array.from_buffers(type_, len(column), [None, pa.py_buffer(column)])
+        if name not in ("file", "utterance"):
+            values = pc.if_else(
+                pc.equal(values, MISSING), pa.scalar(None, type_), values
+            )
+        if name in STRING_COLUMNS:
+            dictionary = pa.array(columns.vocabularies[name], type=pa.string())
+            values = pa.DictionaryArray.from_arrays(values, dictionary)
+        elif name == "file":
+            dictionary = pa.array(file_paths, type=pa.string())
+            values = pa.DictionaryArray.from_arrays(values, dictionary)
+        arrays[name] = values
+    return pa.table(arrays)
@@ -0,0 +1,190 @@
+"""Batch conversion of CHAT data to other formats."""
+
+from __future__ import annotations
+
+import collections
+import functools
+import os
+import re
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, Sequence
+
+from pylangacq._mapreduce import run_shard
+
+if TYPE_CHECKING:
+    from pylangacq._chat import CHAT
+
+# Output formats and their file extensions.
+FORMATS = {
+    "chat": ".cha",
+    "conllu": ".conllu",
+    "elan": ".eaf",
+    "srt": ".srt",
+    "textgrid": ".TextGrid",
+}
+
+# File paths of CHAT data from in-memory strings without IDs.
+_UUID = re.compile(r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}")
+
+
+@dataclass(frozen=True)
+class Conversion:
+    """One file of CHAT data converted to one format."""
+
+    file_path: str
+    """Path of the CHAT file, as in :attr:`CHAT.file_paths`."""
+    format: str
+    """The output format, e.g., ``"conllu"``."""
+    name: str
+    """Output file path relative to the output directory, e.g., ``"Eve/010600.eaf"``."""
+    path: str | None
+    """Path of the output file written, or None if not written to disk."""
+    text: str | None
+    """The converted data, or None if written to disk."""
+
+
+def check_formats(formats: str | Sequence[str]) -> list[str]:
+    """Return the output formats as a list, checking that they're supported."""
+    formats = [formats] if isinstance(formats, str) else list(formats)
+    if not formats:
+        raise ValueError("formats must not be empty")
+    for format_ in formats:
+        if format_ not in FORMATS:
+            raise ValueError(
+                f"Unsupported format {format_!r}; must be one of {sorted(FORMATS)}"
+            )
+    return list(dict.fromkeys(formats))
+
+
+def output_names(
+    file_paths: Sequence[str], names: Sequence[str] | None = None
+) -> list[str]:
+    """Return the output file path of each file, without the extension.
+
+    Unless given, the names are the file paths relative to the deepest directory
+    they all share, so that files with the same name in different directories
+    (e.g., ``Adam/020304.cha`` and ``Eve/020304.cha``) don't overwrite each other.
+    Data from in-memory strings without IDs is numbered ``0001``, ``0002``, etc.
+
+    Raises:
+        ValueError: If names don't match the files, or if any two are the same.
+    """
+    if names is not None:
+        if len(names) != len(file_paths):
+            raise ValueError(
+                "names and files must have the same length: "
+                f"{len(names)} vs {len(file_paths)}"
+            )
+        result = [os.path.splitext(os.fspath(name))[0] for name in names]
+    else:
+        real = [path for path in file_paths if not _UUID.fullmatch(path)]
+        try:
+            root: str | None = os.path.commonpath(
+                [os.path.dirname(path) for path in real]
+            )
+        except ValueError:
+            # Absolute and relative paths mixed, or no paths at all.
+            root = None
+        result = []
+        for i, path in enumerate(file_paths):
+            if _UUID.fullmatch(path):
+                result.append(f"{i + 1:04d}")
+                continue
+            if root is None:
+                name = os.path.basename(path)
+            else:
+                name = os.path.relpath(path, root or os.curdir)
+            result.append(os.path.splitext(name)[0])
+    duplicates = sorted(
+        name for name, count in collections.Counter(result).items() if count > 1
+    )
+    if duplicates:
+        raise ValueError(f"Output file names must be unique: {duplicates}")
+    return result
+
+
+def _to_strs(chat: CHAT, format_: str, participants: Any) -> list[str]:
+    if format_ == "chat":
+        return chat.to_strs()
+    elif format_ == "conllu":
+        return chat.to_conllu_strs()
+    elif format_ == "elan":
+        return chat.to_elan_strs()
+    elif format_ == "srt":
+        return chat.to_srt_strs(participants=participants)
+    else:
+        return chat.to_textgrid_strs(participants=participants)
+
+
+def convert_chat(
+    chat: CHAT,
+    formats: Sequence[str],
+    names: Sequence[str],
+    out_dir: str | None,
+    participants: Sequence[str] | None,
+) -> list[Conversion]:
+    """Convert the files of a reader to each of the formats.
+
+    If *out_dir* is given, each output is written there as soon as
+    the files are converted to its format, and isn't kept in memory.
+    """
+    file_paths = chat.file_paths
+    by_file: list[list[Conversion]] = [[] for _ in file_paths]
+    for format_ in formats:
+        texts = _to_strs(chat, format_, participants)
+        for i, (file_path, name, text) in enumerate(zip(file_paths, names, texts)):
+            output_name = name + FORMATS[format_]
+            path = None
+            if out_dir is not None:
+                path = os.path.join(out_dir, output_name)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write(text)
+            by_file[i].append(
+                Conversion(
+                    file_path,
+                    format_,
+                    output_name,
+                    path,
+                    text if out_dir is None else None,
+                )
+            )
+        del texts
+    return [conversion for conversions in by_file for conversion in conversions]
+
+
+def convert_shard(
+    cls: type[CHAT],
+    strs: Sequence[str],
+    file_paths: list[str],
+    file_participants: list[list[str]],
+    options: dict[str, Any],
+    names: Sequence[str],
+    formats: Sequence[str],
+    out_dir: str | None,
+    participants: Sequence[str] | None,
+) -> list[Conversion]:
+    """Parse a shard of files in a worker process and convert them."""
+    convert = functools.partial(
+        convert_chat,
+        formats=formats,
+        names=names,
+        out_dir=out_dir,
+        participants=participants,
+    )
+    return run_shard(convert, None, cls, strs, file_paths, file_participants, options)
+
+
+def with_progress(
+    results: Iterable[list[Conversion]],
+    n_files: int,
+    n_formats: int,
+    progress: Callable[[int, int], None] | None,
+) -> Iterator[Conversion]:
+    """Yield the conversions of each shard, reporting progress shard by shard."""
+    done = 0
+    for conversions in results:
+        done += len(conversions) // n_formats
+        if progress is not None:
+            progress(done, n_files)
+        yield from conversions
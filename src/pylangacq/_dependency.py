@@ -0,0 +1,266 @@
+"""Dependency queries over the %gra tier."""
+
+from __future__ import annotations
+
+import array
+import fnmatch
+import re
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Iterable
+
+from pylangacq._table import FileTable
+
+if TYPE_CHECKING:
+    from pylangacq._index import FileIndex
+
+NODE_FIELDS = ("word", "lemma", "pos")
+
+# A node in square brackets, or an edge: "-REL->", "<-REL-", "-->", or "<--".
+_PATTERN_TOKEN = re.compile(
+    r"\s*(?:(?P<node>\[[^\]]*\])|-(?P<down>[^\s<>\[\]-]*)->|<-(?P<up>[^\s<>\[\]-]*)-)"
+)
+_CONSTRAINT = re.compile(r"\s*(\w+)\s*=\s*(\"[^\"]*\"|'[^']*'|[^\s&]+)\s*")
+
+
+@dataclass(frozen=True)
+class DependencyMatch:
+    """Tokens matched by :meth:`CHAT.find_dependencies`."""
+
+    file: int
+    """Index of the file in :attr:`CHAT.file_paths`."""
+    utterance: int
+    """Index of the utterance within the file,
+    as in ``CHAT.words(by_utterance=True, by_file=True)[file]``."""
+    positions: tuple[int, ...]
+    """Index within the utterance of the token matched by each node
+    of the pattern, in the order of the nodes."""
+    participant: str
+    """Participant code of the utterance."""
+    words: tuple[str, ...]
+    """All the words of the utterance."""
+
+    @property
+    def match(self) -> tuple[str, ...]:
+        """The matched words, in the order of the nodes of the pattern."""
+        return tuple(self.words[i] for i in self.positions)
+
+    @property
+    def span(self) -> tuple[int, int]:
+        """Start and end (exclusive) of the tokens of the match in the utterance."""
+        return min(self.positions), max(self.positions) + 1
+
+
+@dataclass(frozen=True)
+class Node:
+    """Constraints on a token, as values (or glob patterns) for each field."""
+
+    constraints: tuple[tuple[str, tuple[str, ...]], ...] = ()
+
+
+@dataclass(frozen=True)
+class Edge:
+    """A dependency between two consecutive nodes of a pattern."""
+
+    relations: tuple[str, ...] | None
+    """Relations (or glob patterns) allowed, or None for any relation."""
+    head_first: bool
+    """Whether the node before the edge is the head (``->``),
+    or else the dependent (``<-``)."""
+
+
+@dataclass(frozen=True)
+class Pattern:
+    """A parsed dependency pattern: nodes linked by edges, as a path."""
+
+    nodes: tuple[Node, ...]
+    edges: tuple[Edge, ...]
+
+
+def _split_values(value: str) -> tuple[str, ...]:
+    if value[:1] in ("'", '"'):
+        value = value[1:-1]
+    return tuple(value.split("|"))
+
+
+def _parse_node(text: str) -> Node:
+    body = text[1:-1].strip()
+    constraints = []
+    for part in filter(None, (p.strip() for p in re.split(r"&|\s+(?=\w+\s*=)", body))):
+        m = _CONSTRAINT.fullmatch(part)
+        if m is None or m.group(1) not in NODE_FIELDS:
+            raise ValueError(
+                f"Invalid node constraint {part!r} in {text!r}; "
+                f"expected field=value, with the field one of {NODE_FIELDS}"
+            )
+        constraints.append((m.group(1), _split_values(m.group(2))))
+    return Node(tuple(constraints))
+
+
+def parse_pattern(pattern: str) -> Pattern:
+    """Parse a dependency pattern such as ``"[pos=v] -OBJ-> [pos=pro*]"``.
+
+    Raises:
+        ValueError: If the pattern is invalid.
+    """
+    nodes: list[Node] = []
+    edges: list[Edge] = []
+    position = 0
+    expect_node = True
+    pattern = pattern.strip()
+    while position < len(pattern):
+        m = _PATTERN_TOKEN.match(pattern, position)
+        if m is None or (m.group("node") is not None) != expect_node:
+            raise ValueError(
+                f"Invalid dependency pattern at position {position}: {pattern!r}"
+            )
+        if m.group("node") is not None:
+            nodes.append(_parse_node(m.group("node")))
+        else:
+            head_first = m.group("down") is not None
+            relation = m.group("down") if head_first else m.group("up")
+            relations = _split_values(relation) if relation else None
+            edges.append(Edge(relations, head_first))
+        expect_node = not expect_node
+        position = m.end()
+    if expect_node or not edges:
+        raise ValueError(
+            "A dependency pattern must be nodes linked by edges, "
+            f"e.g., '[pos=v] -OBJ-> [pos=n]': {pattern!r}"
+        )
+    return Pattern(tuple(nodes), tuple(edges))
+
+
+def _is_glob(value: str) -> bool:
+    return any(c in value for c in "*?[")
+
+
+def _expand(values: Iterable[str], keys: Iterable[str]) -> list[str]:
+    """Return the keys that are values or match values with glob wildcards."""
+    exact = [value for value in values if not _is_glob(value)]
+    globs = [value for value in values if _is_glob(value)]
+    if not globs:
+        return exact
+    regex = re.compile("|".join(fnmatch.translate(value) for value in globs))
+    return exact + [key for key in keys if regex.match(key)]
+
+
+class DependencyIndex:
+    """Dependency postings of one file.
+
+    - ``heads``: For each token, the offset of its head token in the file,
+      or -1 for the root or a token without %gra.
+    - ``relations``: For each relation, the offsets of the dependents.
+    - ``head_pos``: For each part-of-speech tag,
+      the offsets of the dependents whose head has the tag.
+    """
+
+    def __init__(self, table: FileTable) -> None:
+        self.heads = array.array("i", [-1] * len(table.words))
+        relations: defaultdict[str, array.array] = defaultdict(lambda: array.array("i"))
+        head_pos: defaultdict[str, array.array] = defaultdict(lambda: array.array("i"))
+        offsets, gras, pos = table.offsets, table.gra, table.pos
+        for i in range(table.n_utterances):
+            start, end = offsets[i], offsets[i + 1]
+            by_dep = {
+                gras[offset][0]: offset  # type: ignore[index]
+                for offset in range(start, end)
+                if gras[offset] is not None
+            }
+            for offset in range(start, end):
+                gra = gras[offset]
+                if gra is None:
+                    continue
+                relations[gra[2]].append(offset)
+                head = by_dep.get(gra[1], -1) if gra[1] else -1
+                self.heads[offset] = head
+                if head >= 0 and pos[head]:
+                    head_pos[pos[head]].append(offset)  # type: ignore[index]
+        self.relations = dict(relations)
+        self.head_pos = dict(head_pos)
+
+
+def _node_offsets(index: FileIndex, node: Node) -> set[int] | None:
+    """Return the offsets of the tokens matching a node, or None for any token."""
+    result: set[int] | None = None
+    for field, values in node.constraints:
+        postings = index.postings[field]
+        offsets = index.lookup(field, _expand(values, postings))
+        result = offsets if result is None else result & offsets
+    return result
+
+
+def _node_pos(node: Node) -> tuple[str, ...] | None:
+    for field, values in node.constraints:
+        if field == "pos":
+            return values
+    return None
+
+
+def match_pattern(index: FileIndex, pattern: Pattern) -> list[tuple[int, ...]]:
+    """Return the offsets of the tokens of each match of a pattern in a file."""
+    deps = index.dependencies
+    node_offsets = [_node_offsets(index, node) for node in pattern.nodes]
+    matches: list[tuple[int, ...]] | None = None
+    for i, edge in enumerate(pattern.edges):
+        head_node = pattern.nodes[i] if edge.head_first else pattern.nodes[i + 1]
+        head_tags = _node_pos(head_node)
+        by_head_pos = None
+        if head_tags is not None:
+            tags = _expand(head_tags, deps.head_pos)
+            by_head_pos = {o for tag in tags for o in deps.head_pos.get(tag, ())}
+        pairs = _pairs(index, edge, node_offsets[i], node_offsets[i + 1], by_head_pos)
+        if matches is None:
+            matches = list(pairs)
+            continue
+        by_left: defaultdict[int, list[int]] = defaultdict(list)
+        for left, right in pairs:
+            by_left[left].append(right)
+        matches = [
+            match + (right,)
+            for match in matches
+            for right in by_left.get(match[-1], ())
+        ]
+        if not matches:
+            break
+    return sorted(matches or [])
+
+
+def _pairs(
+    index: FileIndex,
+    edge: Edge,
+    left: set[int] | None,
+    right: set[int] | None,
+    by_head_pos: set[int] | None,
+) -> list[tuple[int, int]]:
+    """Return the (left, right) offsets of the token pairs matching an edge.
+
+    Args:
+        left, right: Offsets of the tokens matching the nodes
+            on either side of the edge, or None for any token.
+        by_head_pos: Offsets of the dependents whose heads have
+            the part-of-speech tags of the head node, or None if unconstrained.
+    """
+    deps = index.dependencies
+    dependents, heads = (right, left) if edge.head_first else (left, right)
+    # Intersect the dependents starting from the smallest postings.
+    candidates: list[set[int]] = [
+        offsets for offsets in (dependents, by_head_pos) if offsets is not None
+    ]
+    if edge.relations is not None:
+        relations = _expand(edge.relations, deps.relations)
+        candidates.append(
+            {o for relation in relations for o in deps.relations.get(relation, ())}
+        )
+    if candidates:
+        candidates.sort(key=len)
+        offsets: Iterable[int] = sorted(candidates[0].intersection(*candidates[1:]))
+    else:
+        offsets = range(len(deps.heads))
+    pairs = []
+    for dependent in offsets:
+        head = deps.heads[dependent]
+        if head < 0 or (heads is not None and head not in heads):
+            continue
+        pairs.append((head, dependent) if edge.head_first else (dependent, head))
+    return pairs
@@ -0,0 +1,40 @@
+"""Listing CHAT files in a data source."""
+
+from __future__ import annotations
+
+import os
+import re
+import zipfile
+
+
+def _match(names: list[str], match: str | None) -> list[str]:
+    if match is None:
+        return names
+    regex = re.compile(match)
+    return [name for name in names if regex.search(name)]
+
+
+def list_zip(
+    path: str | os.PathLike[str], extension: str, match: str | None = None
+) -> list[str]:
+    """Return the sorted member names of a zip file with the extension.
+
+    If *match* is given, only the names matching this regex are returned.
+    """
+    with zipfile.ZipFile(path) as f:
+        names = sorted(name for name in f.namelist() if name.endswith(extension))
+    return _match(names, match)
+
+
+def list_dir(path: str, extension: str, match: str | None = None) -> list[str]:
+    """Return the sorted paths of the files under a directory with the extension.
+
+    If *match* is given, only the paths matching this regex are returned.
+    """
+    paths = sorted(
+        os.path.join(root, name)
+        for root, _, names in os.walk(path)
+        for name in names
+        if name.endswith(extension)
+    )
+    return _match(paths, match)
@@ -0,0 +1,223 @@
+"""Inverted index over words, lemmas, part-of-speech tags, and participants."""
+
+from __future__ import annotations
+
+import array
+import bisect
+import functools
+import re
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Sequence
+
+from pylangacq._dependency import (
+    DependencyIndex,
+    DependencyMatch,
+    Pattern,
+    match_pattern,
+)
+from pylangacq._table import FileTable
+
+FIELDS = ("word", "lemma", "pos")
+
+_MOR_AFFIX_DELIMITERS = re.compile(r"[-&]")
+
+
+def lemma_of(mor: str | None) -> str | None:
+    """Return the lemma of a %mor morphology string.
+
+    For example, the lemma of ``"cookie-PL"`` is ``"cookie"``,
+    and the lemma of ``"be&3S"`` is ``"be"``.
+    """
+    if not mor:
+        return None
+    return _MOR_AFFIX_DELIMITERS.split(mor, maxsplit=1)[0]
+
+
+@dataclass(frozen=True)
+class SearchHit:
+    """A token matched by :meth:`CHAT.search`."""
+
+    file: int
+    """Index of the file in :attr:`CHAT.file_paths`."""
+    utterance: int
+    """Index of the utterance within the file,
+    as in ``CHAT.words(by_utterance=True, by_file=True)[file]``."""
+    position: int
+    """Index of the (first) matched token within the utterance."""
+    participant: str
+    """Participant code of the utterance."""
+    words: tuple[str, ...]
+    """All the words of the utterance."""
+    length: int = 1
+    """Number of matched tokens, which is greater than 1 for phrase queries."""
+
+    @property
+    def match(self) -> tuple[str, ...]:
+        """The matched words."""
+        return self.words[self.position : self.position + self.length]
+
+
+@dataclass(frozen=True)
+class ConcordanceLine:
+    """A keyword-in-context line from :meth:`CHAT.concordance`."""
+
+    hit: SearchHit
+    """The matched tokens."""
+    left: tuple[str, ...]
+    """Words before the match, within the same utterance."""
+    right: tuple[str, ...]
+    """Words after the match, within the same utterance."""
+
+    def __str__(self) -> str:
+        return "  ".join(
+            [" ".join(self.left), " ".join(self.hit.match), " ".join(self.right)]
+        )
+
+
+class FileIndex:
+    """Postings of one file, mapping each value to its token offsets."""
+
+    def __init__(self, table: FileTable) -> None:
+        self.table = table
+        postings: dict[str, defaultdict[str, array.array]] = {
+            field: defaultdict(lambda: array.array("i")) for field in FIELDS
+        }
+        words, pos, lemma = postings["word"], postings["pos"], postings["lemma"]
+        for offset, (word, tag, mor) in enumerate(
+            zip(table.words, table.pos, table.mor)
+        ):
+            words[word].append(offset)
+            if tag:
+                pos[tag].append(offset)
+            if (value := lemma_of(mor)) is not None:
+                lemma[value].append(offset)
+        self.postings = {field: dict(values) for field, values in postings.items()}
+
+    @functools.cached_property
+    def dependencies(self) -> DependencyIndex:
+        """Dependency postings from the %gra tier, built on first use."""
+        return DependencyIndex(self.table)
+
+    def lookup(self, field: str, values: Sequence[str]) -> set[int]:
+        postings = self.postings[field]
+        result: set[int] = set()
+        for value in values:
+            result.update(postings.get(value, ()))
+        return result
+
+
+class IndexView:
+    """A file index, as seen through the participant filters of a reader.
+
+    Filtering a reader by participants shares the underlying
+    :class:`FileIndex` and only adds to the filters here.
+    """
+
+    def __init__(
+        self, index: FileIndex, participants: tuple[re.Pattern, ...] = ()
+    ) -> None:
+        self.index = index
+        self.participants = participants
+        self._utterance_map: dict[int, int] | None = None
+
+    def with_participants(self, patterns: Sequence[str]) -> IndexView:
+        regex = re.compile("|".join(f"(?:{p})" for p in patterns))
+        return IndexView(self.index, self.participants + (regex,))
+
+    def utterance_map(self) -> dict[int, int]:
+        """Map utterance indices of the file to those of the filtered view."""
+        if self._utterance_map is None:
+            kept = [
+                i
+                for i, participant in enumerate(self.index.table.participants)
+                if all(regex.fullmatch(participant) for regex in self.participants)
+            ]
+            self._utterance_map = {old: new for new, old in enumerate(kept)}
+        return self._utterance_map
+
+    def search(
+        self,
+        i_file: int,
+        criteria: dict[str, list[str]],
+        phrase: list[str] | None,
+        participant: re.Pattern | None,
+    ) -> list[SearchHit]:
+        table = self.index.table
+        offsets = table.offsets
+        if phrase:
+            candidates = self.index.lookup("word", phrase[:1])
+        else:
+            # Intersect starting from the smallest postings.
+            matches = sorted(
+                (
+                    self.index.lookup(field, values)
+                    for field, values in criteria.items()
+                ),
+                key=len,
+            )
+            candidates = matches[0].intersection(*matches[1:])
+        utterance_map = self.utterance_map() if self.participants else None
+        length = len(phrase) if phrase else 1
+        hits = []
+        for offset in sorted(candidates):
+            i_utterance = bisect.bisect_right(offsets, offset) - 1
+            start, end = offsets[i_utterance], offsets[i_utterance + 1]
+            if offset + length > end:
+                continue
+            if phrase and table.words[offset : offset + length] != phrase:
+                continue
+            speaker = table.participants[i_utterance]
+            if participant is not None and not participant.fullmatch(speaker):
+                continue
+            if utterance_map is not None:
+                if i_utterance not in utterance_map:
+                    continue
+                i_utterance = utterance_map[i_utterance]
+            hits.append(
+                SearchHit(
+                    file=i_file,
+                    utterance=i_utterance,
+                    position=offset - start,
+                    participant=speaker,
+                    words=tuple(table.words[start:end]),
+                    length=length,
+                )
+            )
+        return hits
+
+    def find_dependencies(
+        self, i_file: int, pattern: Pattern, participant: re.Pattern | None
+    ) -> list[DependencyMatch]:
+        table = self.index.table
+        offsets = table.offsets
+        utterance_map = self.utterance_map() if self.participants else None
+        matches = []
+        # Matches often share utterances, e.g., a verb with both SUBJ and OBJ.
+        utterance_words: dict[int, tuple[str, ...]] = {}
+        for match in match_pattern(self.index, pattern):
+            i_utterance = bisect.bisect_right(offsets, match[0]) - 1
+            speaker = table.participants[i_utterance]
+            if participant is not None and not participant.fullmatch(speaker):
+                continue
+            i_kept = i_utterance
+            if utterance_map is not None:
+                if i_utterance not in utterance_map:
+                    continue
+                i_kept = utterance_map[i_utterance]
+            start = offsets[i_utterance]
+            words = utterance_words.get(i_utterance)
+            if words is None:
+                words = utterance_words[i_utterance] = tuple(
+                    table.words[start : offsets[i_utterance + 1]]
+                )
+            matches.append(
+                DependencyMatch(
+                    file=i_file,
+                    utterance=i_kept,
+                    positions=tuple(offset - start for offset in match),
+                    participant=speaker,
+                    words=words,
+                )
+            )
+        return matches
@@ -0,0 +1,176 @@
+"""Map-reduce over the files of a CHAT reader on a process pool."""
+
+from __future__ import annotations
+
+import abc
+import collections
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, Sequence
+
+if TYPE_CHECKING:
+    from pylangacq._chat import CHAT
+    from pylangacq._sketch import TopNgrams
+
+
+class Reducer(abc.ABC):
+    """How to merge the per-shard results of :meth:`CHAT.map_reduce`.
+
+    Results of the mapped function are first converted by :meth:`prepare`
+    in the worker process, so that they can be sent back to the main process
+    (e.g., an ``Ngrams`` object can't be pickled, but a ``Counter`` can).
+    The prepared results are then merged pairwise with :meth:`merge`
+    in the order of the files, and the final result is :meth:`finish`-ed.
+
+    Subclass this class for a custom mergeable result,
+    with at least :meth:`merge` implemented.
+    The built-in reducers are available by name:
+
+    - ``"counter"``: :class:`collections.Counter` results, added up.
+    - ``"ngrams"``: :class:`~pylangacq.Ngrams` results, added up into a
+      ``Counter`` mapping each n-gram tuple (of any order
+      from ``min_n`` to ``n``) to its count.
+    - ``"top_ngrams"``: :class:`~pylangacq.TopNgrams` results, merged
+      with the same error bounds as if counted in a single process.
+    - ``"measures"``: Lists of one value per file, such as the results of
+      :meth:`CHAT.mlum` and the other developmental measures,
+      concatenated to be aligned with :attr:`CHAT.file_paths`.
+    """
+
+    def initial(self) -> Any:
+        """Return the result for a reader without files."""
+        return None
+
+    def prepare(self, result: Any) -> Any:
+        """Convert a result of the mapped function in the worker process."""
+        return result
+
+    @abc.abstractmethod
+    def merge(self, left: Any, right: Any) -> Any:
+        """Merge two prepared results, where *left* covers the earlier files."""
+
+    def finish(self, merged: Any) -> Any:
+        """Convert the merged result into the final result."""
+        return merged
+
+
+class _FunctionReducer(Reducer):
+    def __init__(self, merge: Callable[[Any, Any], Any]) -> None:
+        self._merge = merge
+
+    def merge(self, left: Any, right: Any) -> Any:
+        return self._merge(left, right)
+
+
+class _CounterReducer(Reducer):
+    def initial(self) -> collections.Counter:
+        return collections.Counter()
+
+    def merge(
+        self, left: collections.Counter, right: collections.Counter
+    ) -> collections.Counter:
+        # Unlike `left + right`, this keeps zero and negative counts.
+        left.update(right)
+        return left
+
+
+class _NgramsReducer(_CounterReducer):
+    def prepare(self, result: Any) -> collections.Counter:
+        counter: collections.Counter = collections.Counter()
+        for order in range(result.min_n, result.n + 1):
+            counter.update(result.to_counter(order=order))
+        return counter
+
+
+class _TopNgramsReducer(Reducer):
+    def merge(self, left: TopNgrams, right: TopNgrams) -> TopNgrams:
+        return left + right
+
+
+class _MeasuresReducer(Reducer):
+    def initial(self) -> list:
+        return []
+
+    def prepare(self, result: Sequence[Any]) -> list:
+        return list(result)
+
+    def merge(self, left: list, right: list) -> list:
+        left.extend(right)
+        return left
+
+
+REDUCERS: dict[str, Reducer] = {
+    "counter": _CounterReducer(),
+    "ngrams": _NgramsReducer(),
+    "top_ngrams": _TopNgramsReducer(),
+    "measures": _MeasuresReducer(),
+}
+
+
+def get_reducer(reducer: str | Reducer | Callable[[Any, Any], Any]) -> Reducer:
+    if isinstance(reducer, Reducer):
+        return reducer
+    if isinstance(reducer, str):
+        try:
+            return REDUCERS[reducer]
+        except KeyError:
+            raise ValueError(
+                f"reducer must be one of {sorted(REDUCERS)}, "
+                f"a Reducer, or a callable: {reducer!r}"
+            ) from None
+    if callable(reducer):
+        return _FunctionReducer(reducer)
+    raise TypeError(f"reducer must be a str, a Reducer, or a callable: {reducer!r}")
+
+
+def run_shard(
+    fn: Callable[[CHAT], Any],
+    prepare: Callable[[Any], Any] | None,
+    cls: type[CHAT],
+    strs: Sequence[str],
+    file_paths: list[str],
+    participants: list[list[str]],
+    options: dict[str, Any],
+) -> Any:
+    """Parse a shard of files in a worker process and apply *fn* to it.
+
+    Args:
+        participants: For each file, the participants kept
+            in the reader that the shard came from, so that
+            a participant filter on that reader is applied here, too.
+    """
+    chat = cls._from_shard(strs, file_paths, participants, options)
+    result = fn(chat)
+    return result if prepare is None else prepare(result)
+
+
+def process_pool(workers: int) -> ProcessPoolExecutor:
+    """Return a pool of worker processes for shards of CHAT data."""
+    methods = multiprocessing.get_all_start_methods()
+    # Not "fork", so that workers don't inherit the state of the threads
+    # (e.g., those for parsing in parallel) of this process.
+    context = multiprocessing.get_context(
+        "forkserver" if "forkserver" in methods else "spawn"
+    )
+    return ProcessPoolExecutor(max_workers=workers, mp_context=context)
+
+
+def imap_ordered(
+    executor: ProcessPoolExecutor,
+    fn: Callable[..., Any],
+    args: Iterable[tuple],
+    *,
+    window: int,
+) -> Iterator[Any]:
+    """Yield ``fn(*a)`` for each *a* in *args* in order, computed by *executor*.
+
+    At most *window* calls are submitted ahead of the results yielded,
+    so that the results waiting to be consumed don't pile up in memory.
+    """
+    pending: collections.deque[Future] = collections.deque()
+    for call_args in args:
+        pending.append(executor.submit(fn, *call_args))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
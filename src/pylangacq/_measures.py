@@ -0,0 +1,142 @@
+"""Memoization of developmental measures."""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Hashable, Sequence
+
+if TYPE_CHECKING:
+    import pyarrow
+
+# "mlu" is an alias of "mlum", so they share their cached results.
+MEASURE_NAMES = {
+    "mlu": "mlum",
+    "mlum": "mlum",
+    "mluw": "mluw",
+    "ttr": "ttr",
+    "ipsyn": "ipsyn",
+}
+
+# Default number of utterances (or tokens, for ttr) per file.
+DEFAULT_N = {"mlum": 100, "mluw": 100, "ttr": 350, "ipsyn": 100}
+
+MISSING = object()
+
+
+@dataclass(frozen=True)
+class MeasureCacheInfo:
+    """Statistics of the memoized measures of a :class:`~pylangacq.CHAT` object."""
+
+    hits: int
+    """Number of per-file results served from the cache."""
+    misses: int
+    """Number of per-file results that had to be computed."""
+    n_entries: int
+    """Number of per-file results currently cached."""
+
+
+class FileMeasures:
+    """Memoized measures of one file.
+
+    A reader filtered by participants shares the results of its parent
+    for the participants that the filter keeps, since measures for
+    a participant only depend on the participant's own utterances.
+    Results for any other participant are private to the filtered reader.
+    """
+
+    def __init__(
+        self,
+        shared: dict[Hashable, float] | None = None,
+        participants: tuple[re.Pattern, ...] = (),
+    ) -> None:
+        self.shared: dict[Hashable, float] = {} if shared is None else shared
+        self.private: dict[Hashable, float] = {}
+        self.participants = participants
+
+    def __len__(self) -> int:
+        if not self.participants:
+            return len(self.shared)
+        return sum(self._is_shared(key) for key in self.shared) + len(self.private)
+
+    def _is_shared(self, key: Hashable) -> bool:
+        participant = key[1]  # type: ignore[index]
+        return all(regex.fullmatch(participant) for regex in self.participants)
+
+    def get(self, key: Hashable) -> object:
+        if self._is_shared(key):
+            return self.shared.get(key, MISSING)
+        return self.private.get(key, MISSING)
+
+    def set(self, key: Hashable, value: float) -> None:
+        if self._is_shared(key):
+            self.shared[key] = value
+        else:
+            self.private[key] = value
+
+    def with_participants(self, patterns: Sequence[str]) -> FileMeasures:
+        regex = re.compile("|".join(f"(?:{p})" for p in patterns))
+        return FileMeasures(self.shared, self.participants + (regex,))
+
+
+@dataclass
+class MeasuresTable:
+    """Developmental measures as columns, one row per file or file-participant pair.
+
+    - ``file``: Index of the file in :attr:`file_paths`
+      (and in :attr:`CHAT.file_paths`).
+    - ``participant``: Participant code, if the table is by participant.
+    - ``age``: Age of the target child (CHI) in the file,
+      as in :meth:`CHAT.ages`.
+    - One column per requested measure, e.g., ``mlum``.
+    """
+
+    columns: dict[str, list[Any]]
+    """Columns by name."""
+    file_paths: list[str]
+    """File paths of the reader the table was computed from."""
+
+    def __len__(self) -> int:
+        return len(self.columns["file"])
+
+    def __getitem__(self, name: str) -> list[Any]:
+        return self.columns[name]
+
+    def rows(self) -> list[dict[str, Any]]:
+        """Return the table as one dict per row."""
+        names = list(self.columns)
+        return [dict(zip(names, row)) for row in zip(*self.columns.values())]
+
+    def to_arrow(self) -> pyarrow.Table:
+        """Return the table as a pyarrow Table.
+
+        File paths are a dictionary-encoded ``file`` column,
+        and ages are in months as floats.
+        A pandas DataFrame is then available with ``.to_pandas()``.
+        This method requires the ``pyarrow`` package.
+
+        Returns:
+            A ``pyarrow.Table`` object.
+        """
+        try:
+            import pyarrow as pa
+        except ImportError as e:  # pragma: no cover
+            raise ImportError(
+                "pyarrow is required for converting CHAT data to Arrow. "
+                "Install it with `pip install pylangacq[arrow]`."
+            ) from e
+        arrays: dict[str, Any] = {}
+        for name, column in self.columns.items():
+            if name == "file":
+                arrays[name] = pa.DictionaryArray.from_arrays(
+                    pa.array(column, type=pa.int32()),
+                    pa.array(self.file_paths, type=pa.string()),
+                )
+            elif name == "age":
+                arrays[name] = pa.array(
+                    [age.in_months() if age else None for age in column],
+                    type=pa.float64(),
+                )
+            else:
+                arrays[name] = pa.array(column)
+        return pa.table(arrays)
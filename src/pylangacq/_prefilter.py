@@ -0,0 +1,213 @@
+"""Filtering CHAT data by participant and age before it is parsed."""
+
+from __future__ import annotations
+
+import functools
+import re
+from dataclasses import dataclass
+from typing import Any, Callable, Sequence
+
+from rustling.chat import CHAT as _CHAT
+
+# Age in the CHAT format: years;months.days, with the months and days optional.
+_AGE = re.compile(r"(\d+);(\d*)(?:\.(\d*))?")
+
+
+def age_in_months(age: str) -> float | None:
+    """Return an age such as ``"2;06.15"`` in months, as ``Age.in_months()``."""
+    m = _AGE.fullmatch(age.strip())
+    if m is None:
+        return None
+    years, months, days = (int(group) if group else 0 for group in m.groups())
+    return years * 12 + months + days / 30
+
+
+def participant_ages(text: str) -> dict[str, float | None]:
+    """Return the age in months of each participant in the ``@ID`` headers."""
+    ages: dict[str, float | None] = {}
+    for line in text.splitlines():
+        if line[:1] == "*":
+            break
+        if not line.startswith("@ID:"):
+            continue
+        fields = line[4:].split("|")
+        if len(fields) > 3:
+            ages.setdefault(fields[2].strip(), age_in_months(fields[3]))
+    return ages
+
+
+def declared_participants(text: str) -> list[str]:
+    """Return the participant codes in the ``@Participants`` header."""
+    lines = text.splitlines()
+    for i, line in enumerate(lines):
+        if line[:1] == "*":
+            break
+        if not line.startswith("@Participants:"):
+            continue
+        value = line[len("@Participants:") :]
+        # Continuation lines of a long header start with a tab.
+        for next_line in lines[i + 1 :]:
+            if next_line[:1] != "\t":
+                break
+            value += " " + next_line
+        return [entry.split()[0] for entry in value.split(",") if entry.strip()]
+    return []
+
+
+def target_child_age(text: str) -> float | None:
+    """Return the age in months of CHI in the ``@ID`` headers of CHAT data."""
+    return participant_ages(text).get("CHI")
+
+
+def filter_utterances(text: str, keep: Callable[[str], bool]) -> str:
+    """Keep only the utterances (with their dependent tiers) of some participants.
+
+    As with :meth:`CHAT.filter`, changeable headers between utterances
+    (e.g., ``@Comment``) are dropped too, unless no utterance is dropped.
+
+    Args:
+        text: CHAT data.
+        keep: Whether to keep the utterances of a participant code.
+    """
+    lines = text.splitlines(keepends=True)
+    speakers = {line[1:].split(":", 1)[0] for line in lines if line[:1] == "*"}
+    kept_speakers = {speaker for speaker in speakers if keep(speaker)}
+    if kept_speakers == speakers:
+        return text
+    kept = []
+    keep_line = True
+    in_body = False
+    for line in lines:
+        if line[:1] == "*":
+            in_body = True
+            keep_line = line[1:].split(":", 1)[0] in kept_speakers
+        elif line[:1] == "@":
+            keep_line = not in_body or line.startswith("@End")
+        if keep_line:
+            kept.append(line)
+    return "".join(kept)
+
+
+def _compile(patterns: str | Sequence[str]) -> re.Pattern[str]:
+    patterns = [patterns] if isinstance(patterns, str) else patterns
+    return re.compile("|".join(f"(?:{p})" for p in patterns))
+
+
+@dataclass(frozen=True)
+class Prefilter:
+    """Participant and age filters applied to CHAT data before parsing.
+
+    Utterances of the participants filtered out are removed from the CHAT data,
+    and so are never parsed into utterances and tokens.
+    Files filtered out by the age of the target child are not parsed at all.
+    """
+
+    participants: tuple[str, ...] | None = None
+    exclude_participants: tuple[str, ...] | None = None
+    age_range: tuple[float | None, float | None] | None = None
+
+    @classmethod
+    def create(
+        cls,
+        participants: str | Sequence[str] | None,
+        exclude_participants: str | Sequence[str] | None,
+        age_range: tuple[float | None, float | None] | None,
+    ) -> Prefilter | None:
+        """Return a prefilter, or None if there's nothing to filter."""
+        if participants is None and exclude_participants is None and age_range is None:
+            return None
+        if age_range is not None and len(age_range) != 2:
+            raise ValueError(f"age_range must be (start, end): {age_range!r}")
+
+        def as_tuple(patterns: str | Sequence[str] | None) -> tuple[str, ...] | None:
+            if patterns is None:
+                return None
+            return (patterns,) if isinstance(patterns, str) else tuple(patterns)
+
+        return cls(
+            as_tuple(participants),
+            as_tuple(exclude_participants),
+            None if age_range is None else (age_range[0], age_range[1]),
+        )
+
+    def key(self) -> dict[str, Any]:
+        """Return the filters as JSON-serializable data, e.g., for a cache key."""
+        return {
+            "participants": self.participants,
+            "exclude_participants": self.exclude_participants,
+            "age_range": self.age_range,
+        }
+
+    @functools.cached_property
+    def _include(self) -> re.Pattern[str] | None:
+        return None if self.participants is None else _compile(self.participants)
+
+    @functools.cached_property
+    def _exclude(self) -> re.Pattern[str] | None:
+        if self.exclude_participants is None:
+            return None
+        return _compile(self.exclude_participants)
+
+    def keeps_participant(self, code: str) -> bool:
+        """Return whether to keep the utterances of a participant."""
+        if self._include is not None and not self._include.fullmatch(code):
+            return False
+        return self._exclude is None or not self._exclude.fullmatch(code)
+
+    def keeps_age(self, age: float | None) -> bool:
+        """Return whether to keep a file by its target child's age in months."""
+        if self.age_range is None:
+            return True
+        if age is None:
+            return False
+        start, end = self.age_range
+        return (start is None or start <= age) and (end is None or age < end)
+
+    def apply(
+        self, strs: Sequence[str], ids: Sequence[str] | None = None
+    ) -> tuple[list[str], list[str] | None]:
+        """Filter CHAT data strings.
+
+        Returns:
+            The filtered strings, with those of the files out of
+            the age range dropped, and their IDs (None if *ids* is None).
+        """
+        if ids is not None and len(ids) != len(strs):
+            raise ValueError(
+                f"strs and ids must have the same length: {len(strs)} vs {len(ids)}"
+            )
+        by_participant = self.participants is not None or (
+            self.exclude_participants is not None
+        )
+        new_strs = []
+        new_ids: list[str] | None = None if ids is None else []
+        for i, text in enumerate(strs):
+            if self.age_range is not None and not self.keeps_age(
+                target_child_age(text)
+            ):
+                continue
+            if by_participant:
+                text = filter_utterances(text, self.keeps_participant)
+            new_strs.append(text)
+            if new_ids is not None:
+                assert ids is not None
+                new_ids.append(ids[i])
+        return new_strs, new_ids
+
+
+def _read_files(paths: Sequence[str]) -> list[str]:
+    strs = []
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            strs.append(f.read())
+    return strs
+
+
+def parse_files(
+    paths: Sequence[str], prefilter: Prefilter | None, options: dict[str, Any]
+) -> _CHAT:
+    """Parse CHAT files, with the prefilter (if any) applied before parsing."""
+    if prefilter is None:
+        return _CHAT.from_files(paths, **options)
+    strs, ids = prefilter.apply(_read_files(paths), paths)
+    return _CHAT.from_strs(strs, ids=ids, **options)
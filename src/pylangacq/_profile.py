@@ -0,0 +1,234 @@
+"""Profiling the loading of CHAT data, stage by stage and file by file."""
+
+from __future__ import annotations
+
+import os
+import re
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Sequence
+
+from rustling.chat import CHAT as _CHAT
+
+from pylangacq._files import list_dir, list_zip
+from pylangacq._prefilter import Prefilter
+
+# Stages of loading each file, in order.
+#   - read: Reading the bytes from the zip file or the disk.
+#   - decode: Decoding the bytes as UTF-8.
+#   - parse: Parsing the headers and the main tiers.
+#   - mor_gra: Parsing the %mor and %gra tiers.
+FILE_STAGES = ("read", "decode", "parse", "mor_gra")
+
+
+@dataclass(frozen=True)
+class FileProfile:
+    """Profile of loading one CHAT file."""
+
+    path: str
+    """File path, as in :attr:`CHAT.file_paths`."""
+    n_bytes: int
+    """Size of the file's data in bytes (uncompressed)."""
+    n_utterances: int
+    """Number of utterances."""
+    n_tokens: int
+    """Number of tokens (including punctuation)."""
+    times: dict[str, float]
+    """Time in seconds for each stage: ``"read"``, ``"decode"``,
+    ``"parse"`` (headers and main tiers), and ``"mor_gra"``
+    (%mor and %gra tiers)."""
+
+    @property
+    def total_time(self) -> float:
+        """Total time in seconds across the stages."""
+        return sum(self.times.values())
+
+
+@dataclass(frozen=True)
+class LoadProfile:
+    """Profile of loading CHAT data with ``read_chat(..., profile=True)``."""
+
+    files: list[FileProfile]
+    """Profile of each file, in the order of :attr:`CHAT.file_paths`."""
+    times: dict[str, float]
+    """Total time in seconds for each stage across all files,
+    plus ``"combine"`` for putting the files together into one reader."""
+    wall_time: float
+    """Elapsed time in seconds of the whole loading."""
+    workers: int
+    """Number of threads that loaded the files."""
+    utilization: float
+    """Proportion of the available worker time spent loading files,
+    between 0 and 1."""
+
+    def slowest(self, n: int = 5, *, stage: str | None = None) -> list[FileProfile]:
+        """Return the files that took the longest to load.
+
+        Args:
+            n: Number of files to return.
+            stage: If given, rank the files by the time of this stage only.
+        """
+        if stage is None:
+            return sorted(self.files, key=lambda f: f.total_time, reverse=True)[:n]
+        return sorted(self.files, key=lambda f: f.times[stage], reverse=True)[:n]
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the profile as plain Python objects, e.g., for JSON."""
+        return asdict(self)
+
+    def __str__(self) -> str:
+        n_bytes = sum(f.n_bytes for f in self.files)
+        n_utterances = sum(f.n_utterances for f in self.files)
+        n_tokens = sum(f.n_tokens for f in self.files)
+        total = sum(self.times.values()) or 1.0
+        lines = [
+            f"{len(self.files)} files, {n_bytes} bytes, "
+            f"{n_utterances} utterances, {n_tokens} tokens",
+            f"wall time {self.wall_time:.3f}s with {self.workers} worker(s), "
+            f"utilization {self.utilization:.0%}",
+        ]
+        for stage, seconds in self.times.items():
+            lines.append(f"  {stage:<8} {seconds:>9.3f}s {seconds / total:>6.1%}")
+        lines.append("slowest files:")
+        for f in self.slowest(3):
+            lines.append(f"  {f.path} {f.total_time:.3f}s")
+        return "\n".join(lines)
+
+
+def _count_utterances(text: str) -> int:
+    return sum(1 for line in text.splitlines() if line.startswith("*"))
+
+
+def load_profiled(
+    path: str,
+    *,
+    filter_files: str | Sequence[str] | None,
+    strict: bool,
+    mor_tier: str | None = "%mor",
+    gra_tier: str | None = "%gra",
+    hook: Callable[[FileProfile], None] | None,
+    prefilter: Prefilter | None = None,
+    workers: int | None = None,
+) -> tuple[_CHAT, LoadProfile]:
+    """Load CHAT data one file at a time, timing each stage of each file.
+
+    Each file is parsed twice, once without and once with the %mor and %gra
+    tiers, in order to time them apart from the rest.
+    Profiling therefore makes loading slower than usual.
+    The prefilter, if any, is timed as part of the "decode" stage.
+    Files filtered out by its age range are left out of the profile.
+    """
+    start = time.perf_counter()
+    read: Callable[[str], bytes]
+    archive: zipfile.ZipFile | None = None
+    if path.lower().endswith(".zip"):
+        file_paths = list_zip(path, ".cha")
+        archive = zipfile.ZipFile(path)
+
+        def read(name: str) -> bytes:
+            assert archive is not None
+            with archive.open(name) as f:
+                return f.read()
+
+    elif os.path.isdir(path):
+        file_paths = list_dir(path, ".cha")
+
+        def read(name: str) -> bytes:
+            with open(name, "rb") as f:
+                return f.read()
+
+    elif path.lower().endswith(".cha"):
+        file_paths = [path]
+
+        def read(name: str) -> bytes:
+            with open(name, "rb") as f:
+                return f.read()
+
+    else:
+        raise ValueError(
+            "profiling is only available for a .zip file, a local directory, "
+            f"or a .cha file: {path}"
+        )
+    if filter_files is not None:
+        patterns = [filter_files] if isinstance(filter_files, str) else filter_files
+        regex = re.compile("|".join(f"(?:{p})" for p in patterns))
+        file_paths = [p for p in file_paths if regex.search(p)]
+
+    def load(name: str) -> tuple[_CHAT, FileProfile] | None:
+        times = {}
+        t0 = time.perf_counter()
+        data = read(name)
+        t1 = time.perf_counter()
+        text = data.decode("utf-8")
+        if prefilter is not None:
+            texts, _ = prefilter.apply([text])
+            if not texts:
+                return None
+            text = texts[0]
+        t2 = time.perf_counter()
+        _CHAT.from_strs(
+            [text],
+            ids=[name],
+            parallel=False,
+            strict=strict,
+            mor_tier=None,
+            gra_tier=None,
+        )
+        t3 = time.perf_counter()
+        chat = _CHAT.from_strs(
+            [text],
+            ids=[name],
+            parallel=False,
+            strict=strict,
+            mor_tier=mor_tier,
+            gra_tier=gra_tier,
+        )
+        t4 = time.perf_counter()
+        times["read"] = t1 - t0
+        times["decode"] = t2 - t1
+        times["parse"] = t3 - t2
+        times["mor_gra"] = max(0.0, (t4 - t3) - (t3 - t2))
+        profile = FileProfile(
+            path=name,
+            n_bytes=len(data),
+            n_utterances=_count_utterances(text),
+            n_tokens=len(chat.words()),
+            times=times,
+        )
+        return chat, profile
+
+    workers = workers or os.cpu_count() or 1
+    chats = []
+    profiles = []
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for loaded in executor.map(load, file_paths):
+                if loaded is None:
+                    continue
+                chat, profile = loaded
+                chats.append(chat)
+                profiles.append(profile)
+                if hook is not None:
+                    hook(profile)
+    finally:
+        if archive is not None:
+            archive.close()
+    combine = time.perf_counter()
+
+    chat = _CHAT()
+    chat.extend(chats)
+    end = time.perf_counter()
+
+    times = {stage: sum(p.times[stage] for p in profiles) for stage in FILE_STAGES}
+    times["combine"] = end - combine
+    busy = sum(p.total_time for p in profiles)
+    available = (combine - start) * min(workers, max(len(file_paths), 1))
+    return chat, LoadProfile(
+        files=profiles,
+        times=times,
+        wall_time=end - start,
+        workers=workers,
+        utilization=min(1.0, busy / available) if available else 0.0,
+    )
@@ -0,0 +1,103 @@
+"""Tracking changes to the files of a directory for incremental reloading."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+from dataclasses import dataclass, field
+from typing import Any
+
+from rustling.chat import CHAT as _CHAT
+
+from pylangacq._cache import hash_file
+from pylangacq._files import list_dir
+from pylangacq._prefilter import Prefilter, parse_files
+
+
+@dataclass(frozen=True)
+class FileState:
+    """What is known about a file when it was last parsed."""
+
+    mtime_ns: int
+    size: int
+    digest: str
+
+    @classmethod
+    def of(cls, path: str) -> FileState:
+        stat = os.stat(path)
+        digest = hashlib.sha256()
+        for block in hash_file(path):
+            digest.update(block)
+        return cls(stat.st_mtime_ns, stat.st_size, digest.hexdigest())
+
+
+@dataclass(frozen=True)
+class DirChanges:
+    """Files changed in a directory since a :class:`~pylangacq.CHAT` read it."""
+
+    added: list[str] = field(default_factory=list)
+    """Paths of the new files."""
+    modified: list[str] = field(default_factory=list)
+    """Paths of the files whose contents have changed."""
+    removed: list[str] = field(default_factory=list)
+    """Paths of the files no longer there."""
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.modified or self.removed)
+
+
+@dataclass
+class DirSource:
+    """A directory read by ``CHAT.from_dir(..., incremental=True)``."""
+
+    path: str
+    match: str | None
+    extension: str
+    options: dict[str, Any]
+    states: dict[str, FileState] = field(default_factory=dict)
+    prefilter: Prefilter | None = None
+    skipped: set[str] = field(default_factory=set)
+    """Paths of the files filtered out by the age range of the prefilter."""
+
+    def list_files(self) -> list[str]:
+        return list_dir(self.path, self.extension, self.match)
+
+    def parse(self, file_paths: list[str]) -> _CHAT:
+        """Parse files, skipping those filtered out by the age range."""
+        chat = parse_files(file_paths, self.prefilter, self.options)
+        parsed = set(chat.file_paths)
+        self.skipped.difference_update(parsed)
+        self.skipped.update(p for p in file_paths if p not in parsed)
+        return chat
+
+    def scan(self) -> tuple[list[str], DirChanges, dict[str, FileState]]:
+        """Compare the files in the directory with the known file states.
+
+        A file whose modification time and size are unchanged is assumed
+        to be unchanged. Otherwise, its contents are hashed, so that a file
+        that is only touched or saved again without edits is not reparsed.
+
+        Returns:
+            The sorted file paths, the changes, and the new file states.
+        """
+        file_paths = self.list_files()
+        changes = DirChanges()
+        states = {}
+        for file_path in file_paths:
+            old = self.states.get(file_path)
+            stat = os.stat(file_path)
+            if (
+                old is not None
+                and old.mtime_ns == stat.st_mtime_ns
+                and old.size == stat.st_size
+            ):
+                states[file_path] = old
+                continue
+            new = FileState.of(file_path)
+            states[file_path] = new
+            if old is None:
+                changes.added.append(file_path)
+            elif old.digest != new.digest:
+                changes.modified.append(file_path)
+        changes.removed.extend(p for p in self.states if p not in states)
+        return file_paths, changes, states
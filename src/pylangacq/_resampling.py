@@ -0,0 +1,272 @@
+"""Bootstrap intervals and permutation tests of developmental measures,
+computed with NumPy."""
+
+from __future__ import annotations
+
+import sys
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, Mapping, Sequence
+
+from pylangacq._table import FileTable
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Measures with per-utterance units, which can be resampled within a file.
+UTTERANCE_MEASURES = ("mlum", "mluw", "ttr")
+
+# Upper bound of the number of array items per batch of resamples.
+_BATCH_ITEMS = 1 << 22
+
+
+@dataclass(frozen=True)
+class ConfidenceInterval:
+    """A bootstrap confidence interval of a measure, from :meth:`CHAT.bootstrap`."""
+
+    estimate: float
+    """The measure itself, as from its own method (e.g., :meth:`CHAT.mlum`)."""
+    low: float
+    """Lower bound of the interval."""
+    high: float
+    """Upper bound of the interval."""
+    standard_error: float
+    """Standard deviation of the measure over the resamples."""
+
+
+@dataclass(frozen=True)
+class PermutationTest:
+    """A permutation test of a measure between two participants,
+    from :meth:`CHAT.permutation_test`."""
+
+    estimates: tuple[float, float]
+    """The measure of each participant, as from its own method."""
+    difference: float
+    """The measure of the first participant minus that of the second."""
+    p_value: float
+    """Two-sided p-value of the difference."""
+
+
+def _numpy() -> Any:
+    try:
+        import numpy
+    except ImportError as e:  # pragma: no cover
+        raise ImportError(
+            "numpy is required for bootstrapping and permutation tests. "
+            "Install it with `pip install pylangacq[numpy]`."
+        ) from e
+    return numpy
+
+
+def random_generator(seed: int | None) -> np.random.Generator:
+    return _numpy().random.default_rng(seed)
+
+
+def check_resampling(n_resamples: int, confidence: float = 0.95) -> None:
+    if n_resamples < 1:
+        raise ValueError(f"n_resamples must be positive: {n_resamples!r}")
+    if not 0 < confidence < 1:
+        raise ValueError(f"confidence must be between 0 and 1: {confidence!r}")
+
+
+def utterance_units(
+    table: FileTable, measure: str, participant: str, n: int | None
+) -> list[int] | list[list[str]]:
+    """Return the resampling units of a participant in one file.
+
+    The units follow the measures as computed by rustling:
+
+    - ``"mlum"``: The number of morphemes (tokens with a part-of-speech tag)
+      of each of the first *n* utterances.
+    - ``"mluw"``: The number of words (tokens with a word form, other than
+      punctuation, which has an empty part-of-speech tag) of each of
+      the first *n* utterances.
+    - ``"ttr"``: The words, as counted for ``"mluw"``, of each utterance
+      with any of the first *n* words.
+    """
+    offsets, words, pos = table.offsets, table.words, table.pos
+    spans = [
+        (offsets[i], offsets[i + 1])
+        for i, code in enumerate(table.participants)
+        if code == participant
+    ]
+    if measure == "mlum":
+        return [sum(1 for j in range(*span) if pos[j]) for span in spans[:n]]
+    by_utterance = [
+        [words[j] for j in range(*span) if words[j] and pos[j] != ""] for span in spans
+    ]
+    if measure == "mluw":
+        return [len(utterance) for utterance in by_utterance[:n]]
+    segments = []
+    remaining = n
+    for utterance in by_utterance:
+        if remaining is not None:
+            if remaining <= 0:
+                break
+            utterance = utterance[:remaining]
+            remaining -= len(utterance)
+        if utterance:
+            segments.append(utterance)
+    return segments
+
+
+def utterance_measures(
+    table: FileTable, measures: Mapping[str, int | None]
+) -> dict[str, dict[str, float]]:
+    """Return measures of each participant in one file, in one pass over it.
+
+    The measures are as computed by rustling, from the units of
+    :func:`utterance_units`, and 0.0 for a participant without any units.
+
+    Args:
+        measures: The *n* of each measure to compute,
+            from ``"mlum"``, ``"mluw"``, and ``"ttr"``.
+
+    Returns:
+        The measures by participant, for the participants
+        with utterances in the file.
+    """
+    offsets, words, pos = table.offsets, table.words, table.pos
+    limits = {name: sys.maxsize if n is None else n for name, n in measures.items()}
+    # The sum of the units and the number of utterances (or words, for ttr)
+    # of each measure by participant, and the word types for ttr.
+    sums: dict[str, dict[str, list[int]]] = {}
+    types: dict[str, set[str]] = {}
+    for i, code in enumerate(table.participants):
+        counts = sums.setdefault(code, {name: [0, 0] for name in limits})
+        start, end = offsets[i], offsets[i + 1]
+        if "mlum" in counts and counts["mlum"][1] < limits["mlum"]:
+            counts["mlum"][0] += sum(1 for j in range(start, end) if pos[j])
+            counts["mlum"][1] += 1
+        wanted = [
+            name
+            for name in ("mluw", "ttr")
+            if name in counts and counts[name][1] < limits[name]
+        ]
+        if not wanted:
+            continue
+        utterance = [words[j] for j in range(start, end) if words[j] and pos[j] != ""]
+        if "mluw" in wanted:
+            counts["mluw"][0] += len(utterance)
+            counts["mluw"][1] += 1
+        if "ttr" in wanted:
+            utterance = utterance[: limits["ttr"] - counts["ttr"][1]]
+            types.setdefault(code, set()).update(utterance)
+            counts["ttr"][1] += len(utterance)
+    for code, word_types in types.items():
+        sums[code]["ttr"][0] = len(word_types)
+    return {
+        code: {name: total / n if n else 0.0 for name, (total, n) in counts.items()}
+        for code, counts in sums.items()
+    }
+
+
+class _Statistic:
+    """A measure as a function of how many times each unit is drawn.
+
+    Resamples are rows of a matrix of counts, one column per unit,
+    so that a whole batch of resamples takes a few array operations:
+    a mean is a matrix-vector product, and a type-token ratio
+    counts the nonzero columns of the product with the incidence matrix
+    of the units (rows) and their word types (columns).
+    """
+
+    def __init__(self, np: Any, units: Sequence[Any]) -> None:
+        self.np = np
+        self.n_units = len(units)
+        if units and isinstance(units[0], list):
+            type_ids: dict[str, int] = {}
+            rows, columns = [], []
+            for i, words in enumerate(units):
+                for word in words:
+                    rows.append(i)
+                    columns.append(type_ids.setdefault(word, len(type_ids)))
+            self.types = np.zeros((len(units), len(type_ids)))
+            self.types[rows, columns] = 1
+            self.values = np.array([len(words) for words in units], np.float64)
+        else:
+            self.types = None
+            self.values = np.array(units, np.float64)
+
+    @property
+    def width(self) -> int:
+        if self.types is None:
+            return self.n_units
+        return self.n_units + self.types.shape[1]
+
+    def batches(self, n_resamples: int) -> list[int]:
+        """Split resamples into batches of bounded array sizes."""
+        size = max(1, _BATCH_ITEMS // max(self.width, 1))
+        return [min(size, n_resamples - i) for i in range(0, n_resamples, size)]
+
+    def __call__(self, weights: np.ndarray) -> np.ndarray:
+        if self.types is None:
+            return weights @ self.values / weights.sum(axis=1)
+        n_types = self.np.count_nonzero(weights @ self.types, axis=1)
+        return n_types / (weights @ self.values)
+
+
+def bootstrap_interval(
+    units: Sequence[Any],
+    estimate: float,
+    n_resamples: int,
+    confidence: float,
+    rng: np.random.Generator,
+) -> ConfidenceInterval:
+    """Return a percentile bootstrap interval by resampling the units.
+
+    Args:
+        units: Numbers to average, or the words of utterances
+            for a type-token ratio.
+        estimate: The measure of all the units.
+    """
+    np = _numpy()
+    statistic = _Statistic(np, units)
+    m = statistic.n_units
+    uniform = np.full(m, 1 / m)
+    stats = np.concatenate(
+        [
+            statistic(rng.multinomial(m, uniform, size=size))
+            for size in statistic.batches(n_resamples)
+        ]
+    )
+    alpha = 1 - confidence
+    low, high = np.quantile(stats, [alpha / 2, 1 - alpha / 2])
+    return ConfidenceInterval(estimate, float(low), float(high), float(stats.std()))
+
+
+def permute(
+    first: Sequence[Any],
+    second: Sequence[Any],
+    estimates: tuple[float, float],
+    n_resamples: int,
+    rng: np.random.Generator,
+) -> PermutationTest:
+    """Return a permutation test of the difference between two sets of units.
+
+    The units of both sets are pooled, and each permutation assigns
+    as many of them to the first set as it has.
+    """
+    np = _numpy()
+    statistic = _Statistic(np, [*first, *second])
+    m1, m = len(first), statistic.n_units
+    labels = np.zeros((1, m))
+    labels[0, :m1] = 1
+    observed = abs(_difference(statistic, labels)[0])
+    n_extreme = 0
+    for size in statistic.batches(n_resamples):
+        chosen = np.argsort(rng.random((size, m)), axis=1)[:, :m1]
+        labels = np.zeros((size, m))
+        np.put_along_axis(labels, chosen, 1, axis=1)
+        # With a tolerance for the rounding errors of ties with the observed.
+        extreme = np.abs(_difference(statistic, labels)) >= observed - 1e-12
+        n_extreme += int(np.count_nonzero(extreme))
+    return PermutationTest(
+        estimates,
+        estimates[0] - estimates[1],
+        (n_extreme + 1) / (n_resamples + 1),
+    )
+
+
+def _difference(statistic: _Statistic, labels: np.ndarray) -> np.ndarray:
+    """Return the measure of the units labeled 1 minus that of the others."""
+    return statistic(labels) - statistic(1 - labels)
@@ -0,0 +1,244 @@
+"""A local server for the command-line interface, over a Unix socket or HTTP."""
+
+from __future__ import annotations
+
+import hmac
+import http.client
+import http.server
+import json
+import os
+import secrets
+import socket
+import socketserver
+import stat
+import urllib.parse
+from typing import Any, Callable
+
+DEFAULT_SOCKET = os.path.join("~", ".pylangacq", "server.sock")
+
+# Host header values for a server on a loopback address, with the port appended.
+_LOOPBACK_HOSTS = ("127.0.0.1", "localhost", "[::1]")
+# Addresses to listen on all interfaces, reached under any host name.
+_WILDCARD_HOSTS = ("", "0.0.0.0", "::")
+
+# A request is a JSON object, and so is the response.
+Handler = Callable[[dict[str, Any]], dict[str, Any]]
+
+
+class _UnixRequestHandler(socketserver.StreamRequestHandler):
+    """One JSON request per line, answered by one JSON response per line."""
+
+    server: _UnixServer
+
+    def handle(self) -> None:
+        for line in self.rfile:
+            response = self.server.respond(line)
+            self.wfile.write(json.dumps(response).encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+
+class _HTTPRequestHandler(http.server.BaseHTTPRequestHandler):
+    """A JSON request as the body of a POST request.
+
+    Web pages in a browser on the same machine can send requests
+    to a local server too, so a request is only answered if it has
+    the server's token, a JSON content type (which a page can't send
+    to another site without the server's consent), and a host name
+    of the server (against DNS rebinding).
+    """
+
+    server: _HTTPServer
+
+    def do_POST(self) -> None:
+        if not self.server.allows_host(self.headers.get("Host", "")):
+            self.send_error(403, "Host not allowed")
+            return
+        authorization = self.headers.get("Authorization", "")
+        if not hmac.compare_digest(
+            authorization.encode("utf-8"), f"Bearer {self.server.token}".encode()
+        ):
+            self.send_error(401, "Missing or invalid token")
+            return
+        content_type = self.headers.get("Content-Type", "")
+        if content_type.split(";")[0].strip().lower() != "application/json":
+            self.send_error(415, "Content-Type must be application/json")
+            return
+        length = int(self.headers.get("Content-Length", 0))
+        response = self.server.respond(self.rfile.read(length))
+        body = json.dumps(response).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+class _Responder:
+    handler: Handler
+
+    def respond(self, data: bytes) -> dict[str, Any]:
+        try:
+            request = json.loads(data)
+        except ValueError as e:
+            return {"status": 2, "stdout": "", "stderr": f"Invalid request: {e}\n"}
+        try:
+            return self.handler(request)
+        except Exception as e:
+            # An error of the handler is the client's to report, not the server's.
+            error = f"{type(e).__name__}: {e}"
+            return {"status": 1, "stdout": "", "stderr": f"Server error: {error}\n"}
+
+
+class _UnixServer(_Responder, socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+
+class _HTTPServer(_Responder, http.server.ThreadingHTTPServer):
+    daemon_threads = True
+    token: str
+
+    def allows_host(self, host: str) -> bool:
+        """Return whether to answer a request with this Host header."""
+        address, port = self.socket.getsockname()[:2]
+        if address in _WILDCARD_HOSTS:
+            return True
+        names = {*_LOOPBACK_HOSTS, address, f"[{address}]"}
+        return host.lower() in {f"{name}:{port}" for name in names}
+
+
+def _remove_stale_socket(path: str) -> None:
+    """Remove a socket left behind by a server that didn't shut down cleanly.
+
+    Raises:
+        OSError: If a server is listening on the socket.
+    """
+    try:
+        if not stat.S_ISSOCK(os.stat(path).st_mode):
+            # Not a socket, for binding to fail rather than removing it.
+            return
+    except FileNotFoundError:
+        return
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        try:
+            sock.connect(path)
+        except ConnectionRefusedError:
+            os.remove(path)
+            return
+    raise OSError(f"A server is already listening on {path}")
+
+
+def make_server(
+    handler: Handler,
+    *,
+    socket_path: str | os.PathLike[str] | None = None,
+    host: str = "127.0.0.1",
+    port: int | None = None,
+    token: str | None = None,
+) -> socketserver.BaseServer:
+    """Return a server of requests on a thread each, not yet serving.
+
+    Args:
+        handler: Function from a request to its response.
+        socket_path: Path of the Unix socket to listen on, if *port* is None.
+            Defaults to ``~/.pylangacq/server.sock``.
+            Only the current user can connect to the socket.
+        host: Host to listen on for HTTP.
+        port: Port to listen on for HTTP (0 for any free port).
+            If None, listen on a Unix socket instead.
+        token: Token that HTTP requests must have,
+            as in the address from :func:`server_address`.
+            If None, a random one is generated.
+
+    Raises:
+        OSError: If another server is listening on the Unix socket.
+    """
+    server: _UnixServer | _HTTPServer
+    if port is not None:
+        server = _HTTPServer((host, port), _HTTPRequestHandler)
+        server.token = token if token is not None else secrets.token_urlsafe(32)
+    else:
+        path = os.path.expanduser(
+            os.fspath(socket_path) if socket_path is not None else DEFAULT_SOCKET
+        )
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        _remove_stale_socket(path)
+        # The socket is created by bind() with these permissions,
+        # with no time in between for other users to connect to it.
+        umask = os.umask(0o177)
+        try:
+            server = _UnixServer(path, _UnixRequestHandler)
+        finally:
+            os.umask(umask)
+    server.handler = handler
+    return server
+
+
+def server_address(server: socketserver.BaseServer) -> str:
+    """Return the address of a server, as taken by :func:`send`."""
+    address = server.socket.getsockname()  # type: ignore[attr-defined]
+    if isinstance(server, _HTTPServer):
+        query = urllib.parse.urlencode({"token": server.token})
+        return f"http://{address[0]}:{address[1]}/?{query}"
+    return f"unix:{address}"
+
+
+def send(address: str, request: dict[str, Any]) -> dict[str, Any]:
+    """Send a request to a server and return its response.
+
+    Args:
+        address: ``http://HOST:PORT/?token=TOKEN`` for HTTP, or ``unix:PATH``
+            (or just the path) for a Unix socket.
+
+    Raises:
+        OSError: If the server can't be reached, refuses the request,
+            or doesn't send a valid response.
+    """
+    data = json.dumps(request).encode("utf-8")
+    if address.startswith("http://"):
+        url = urllib.parse.urlsplit(address)
+        token = urllib.parse.parse_qs(url.query).get("token", [""])[0]
+        connection = http.client.HTTPConnection(url.hostname or "", url.port)
+        try:
+            connection.request(
+                "POST",
+                url.path or "/",
+                body=data,
+                headers={
+                    "Content-Type": "application/json",
+                    "Authorization": f"Bearer {token}",
+                },
+            )
+            response = connection.getresponse()
+            body = response.read()
+            if response.status != 200:
+                raise OSError(f"HTTP {response.status} {response.reason}")
+            return _decode_response(body)
+        finally:
+            connection.close()
+    path = os.path.expanduser(address.removeprefix("unix:"))
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(path)
+        sock.sendall(data + b"\n")
+        with sock.makefile("rb") as f:
+            return _decode_response(f.readline())
+
+
+def _decode_response(body: bytes) -> dict[str, Any]:
+    """Return the response of a server from its JSON data.
+
+    Raises:
+        OSError: If the server closed the connection without a response,
+            or if the response isn't a JSON object.
+    """
+    if not body.strip():
+        raise OSError("Connection closed without a response")
+    try:
+        response = json.loads(body)
+    except ValueError as e:
+        raise OSError(f"Invalid response: {e}") from e
+    if not isinstance(response, dict):
+        raise OSError(f"Invalid response: {response!r}")
+    return response
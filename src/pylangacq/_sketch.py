@@ -0,0 +1,228 @@
+"""Approximate counting of the most common n-grams in bounded memory."""
+
+from __future__ import annotations
+
+import collections
+from typing import Iterable, Iterator, Sequence
+
+# Multiple of top_k for the default number of n-grams kept track of.
+_CAPACITY_FACTOR = 10
+
+
+class TopNgrams:
+    """Approximate counts of the most common n-grams, in bounded memory.
+
+    Unlike :class:`~pylangacq.Ngrams`, which keeps the exact count of every
+    n-gram seen, this summary keeps track of at most ``capacity``
+    n-grams (``10 * top_k`` by default) with the Misra-Gries algorithm,
+    the mergeable counterpart of the Space-Saving algorithm:
+    whenever too many distinct n-grams are tracked, the same amount is taken off
+    every count, and the n-grams whose counts drop to zero are forgotten.
+
+    Error bounds: if ``total()`` n-grams have been counted,
+    the count :meth:`get` returns for an n-gram is never more than its true count,
+    and is less than its true count by at most :attr:`error`,
+    which is no more than ``total() / (capacity + 1)``.
+    In particular, every n-gram whose true count is more than :attr:`error`
+    is tracked, and so none of the truly most common n-grams is missed
+    as long as their counts are above :attr:`error`.
+
+    Summaries of different files or worker processes are merged with ``+``,
+    with the same error bounds as if all their n-grams were counted together.
+    Unlike :class:`~pylangacq.Ngrams`, a summary can be pickled,
+    e.g., to be returned from a worker process of :meth:`CHAT.map_reduce`.
+    """
+
+    def __init__(self, n: int = 2, top_k: int = 10, *, capacity: int | None = None):
+        """Initialize an empty summary.
+
+        Args:
+            n: The n-gram order (1 for unigrams, 2 for bigrams, etc.).
+            top_k: Number of the most common n-grams to report.
+            capacity: Number of n-grams to keep track of,
+                at least ``top_k``. Defaults to ``10 * top_k``.
+                A larger capacity uses more memory for smaller errors.
+
+        Raises:
+            ValueError: If n or top_k is less than 1,
+                or if capacity is less than top_k.
+        """
+        if n < 1:
+            raise ValueError(f"n must be at least 1: {n}")
+        if top_k < 1:
+            raise ValueError(f"top_k must be at least 1: {top_k}")
+        if capacity is None:
+            capacity = _CAPACITY_FACTOR * top_k
+        if capacity < top_k:
+            raise ValueError(f"capacity must be at least top_k ({top_k}): {capacity}")
+        self._n = n
+        self._top_k = top_k
+        self._capacity = capacity
+        self._counts: collections.Counter[tuple[str, ...]] = collections.Counter()
+        self._total = 0
+        self._error = 0
+
+    @property
+    def n(self) -> int:
+        """The n-gram order."""
+        return self._n
+
+    @property
+    def min_n(self) -> int:
+        """The lowest n-gram order counted, the same as :attr:`n`."""
+        return self._n
+
+    @property
+    def top_k(self) -> int:
+        """Number of the most common n-grams to report."""
+        return self._top_k
+
+    @property
+    def capacity(self) -> int:
+        """Number of n-grams to keep track of."""
+        return self._capacity
+
+    @property
+    def error(self) -> int:
+        """The most by which any count from :meth:`get` is below the true count."""
+        return self._error
+
+    def __repr__(self) -> str:
+        return (
+            f"TopNgrams(n={self._n}, top_k={self._top_k}, "
+            f"capacity={self._capacity}, total={self._total}, error={self._error})"
+        )
+
+    def __len__(self) -> int:
+        return len(self._counts)
+
+    def __contains__(self, ngram: object) -> bool:
+        return ngram in self._counts
+
+    def __iter__(self) -> Iterator[tuple[str, ...]]:
+        return iter(self._counts)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, TopNgrams):
+            return NotImplemented
+        return (
+            self._n == other._n
+            and self._top_k == other._top_k
+            and self._capacity == other._capacity
+            and self._total == other._total
+            and self._error == other._error
+            and self._counts == other._counts
+        )
+
+    def __add__(self, other: TopNgrams) -> TopNgrams:
+        """Merge two summaries into a new one.
+
+        The new summary has the smaller ``capacity`` of the two,
+        and its :attr:`error` is within the bound for all the n-grams counted.
+
+        Raises:
+            ValueError: If the two summaries are of different n-gram orders.
+        """
+        if not isinstance(other, TopNgrams):
+            return NotImplemented
+        if other._n != self._n:
+            raise ValueError(
+                f"Cannot merge summaries of different orders: {self._n} vs {other._n}"
+            )
+        new = TopNgrams(
+            self._n,
+            min(self._top_k, other._top_k),
+            capacity=min(self._capacity, other._capacity),
+        )
+        new._counts = self._counts.copy()
+        new._counts.update(other._counts)
+        new._total = self._total + other._total
+        new._error = self._error + other._error
+        new._reduce(new._capacity)
+        return new
+
+    def count(self, seq: Sequence[str]) -> None:
+        """Count n-grams from a single sequence.
+
+        N-grams do not cross sequence boundaries.
+        """
+        n = self._n
+        self._counts.update(zip(*(seq[i:] for i in range(n))))
+        self._total += max(len(seq) - n + 1, 0)
+        # Let the summary grow to twice its capacity before reducing it,
+        # so that the cost of reducing is spread over many n-grams.
+        if len(self._counts) > 2 * self._capacity:
+            self._reduce(self._capacity)
+
+    def count_seqs(self, seqs: Iterable[Sequence[str]]) -> None:
+        """Count n-grams from multiple sequences, e.g., utterances."""
+        for seq in seqs:
+            self.count(seq)
+
+    def get(self, ngram: Sequence[str]) -> int:
+        """Return the count of an n-gram, 0 if it isn't tracked.
+
+        The count is at most the true count, and at least
+        the true count minus :attr:`error`.
+        """
+        return self._counts.get(tuple(ngram), 0)
+
+    def bounds(self, ngram: Sequence[str]) -> tuple[int, int]:
+        """Return the lower and upper bounds of the true count of an n-gram."""
+        count = self.get(ngram)
+        return count, count + self._error
+
+    def most_common(
+        self, n: int | None = None, *, order: int | None = None
+    ) -> list[tuple[tuple[str, ...], int]]:
+        """Return the n most common n-grams with their counts.
+
+        If n is None, returns the ``top_k`` most common n-grams.
+        Ties are broken by the n-grams themselves.
+        """
+        self._check_order(order)
+        k = self._top_k if n is None else n
+        return sorted(self._counts.items(), key=lambda item: (-item[1], item[0]))[:k]
+
+    def items(self, *, order: int | None = None) -> list[tuple[tuple[str, ...], int]]:
+        """Return all the n-grams tracked with their counts."""
+        self._check_order(order)
+        return list(self._counts.items())
+
+    def to_counter(
+        self, *, order: int | None = None
+    ) -> collections.Counter[tuple[str, ...]]:
+        """Return the n-grams tracked with their counts as a Counter."""
+        self._check_order(order)
+        return self._counts.copy()
+
+    def total(self, *, order: int | None = None) -> int:
+        """Return the total number of n-grams counted, tracked or not."""
+        self._check_order(order)
+        return self._total
+
+    def clear(self) -> None:
+        """Remove all counts."""
+        self._counts.clear()
+        self._total = 0
+        self._error = 0
+
+    def _check_order(self, order: int | None) -> None:
+        if order is not None and order != self._n:
+            raise ValueError(f"order must be {self._n}: {order}")
+
+    def _reduce(self, capacity: int) -> None:
+        """Take off the same amount from every count, to keep at most *capacity*.
+
+        Each reduction takes at least ``(capacity + 1) * amount`` off the counts
+        in total, which is why the errors add up to at most
+        ``total / (capacity + 1)``.
+        """
+        if len(self._counts) <= capacity:
+            return
+        counts = sorted(self._counts.values(), reverse=True)
+        amount = counts[capacity]
+        self._counts = collections.Counter(
+            {ngram: c - amount for ngram, c in self._counts.items() if c > amount}
+        )
+        self._error += amount
@@ -0,0 +1,270 @@
+"""Compact binary snapshots of parsed CHAT data."""
+
+from __future__ import annotations
+
+import array
+import json
+import mmap
+import os
+import struct
+import sys
+from typing import Any, Iterator, Sequence, overload
+
+from pylangacq._prefilter import filter_utterances
+from pylangacq._table import FileTable
+
+MAGIC = b"PYLACQS\x00"
+VERSION = 1
+
+_MISSING = -1
+_ALIGNMENT = 8
+
+# Sections of the snapshot and their array.array type codes.
+#
+# - Per file: "file_utterances" (utterance offsets, n_files + 1 items)
+#   and "text_offsets" (byte offsets into "text", n_files + 1 items).
+# - Per utterance: "utterance_tokens" (token offsets, n_utterances + 1 items),
+#   "participant" (string code), and "time_start" / "time_end".
+# - Per token: "word", "pos", "mor", "gra_rel" (string codes),
+#   and "gra_dep" / "gra_head".
+# - Strings: "string_offsets" (byte offsets into "strings") for the interned
+#   strings shared by all the string codes above.
+SECTIONS = {
+    "file_utterances": "q",
+    "text_offsets": "q",
+    "utterance_tokens": "q",
+    "participant": "i",
+    "time_start": "q",
+    "time_end": "q",
+    "word": "i",
+    "pos": "i",
+    "mor": "i",
+    "gra_dep": "i",
+    "gra_head": "i",
+    "gra_rel": "i",
+    "string_offsets": "q",
+    "strings": "B",
+    "text": "B",
+}
+
+
+class _Interner:
+    def __init__(self) -> None:
+        self.codes: dict[str, int] = {}
+
+    def __call__(self, value: str | None) -> int:
+        if value is None:
+            return _MISSING
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.codes)
+        return code
+
+
+def save(
+    path: str | os.PathLike[str],
+    file_paths: Sequence[str],
+    strs: Sequence[str],
+    tables: Sequence[FileTable],
+    options: dict[str, Any],
+    participants: Sequence[Sequence[str]] | None = None,
+) -> None:
+    """Write a snapshot of parsed CHAT data.
+
+    The CHAT text of each file only keeps the utterances in its table,
+    and *participants* (the participants kept in each file) are stored
+    for the headers, so that the snapshot of a reader filtered
+    by participants is parsed into the same filtered data.
+    """
+    intern = _Interner()
+    arrays = {name: array.array(code) for name, code in SECTIONS.items()}
+    arrays["file_utterances"].append(0)
+    arrays["utterance_tokens"].append(0)
+    texts = []
+    n_utterances = n_tokens = 0
+    for text, table in zip(strs, tables):
+        speakers = set(table.participants)
+        texts.append(filter_utterances(text, speakers.__contains__).encode("utf-8"))
+        for i, participant in enumerate(table.participants):
+            time_marks = table.time_marks[i] or (_MISSING, _MISSING)
+            arrays["participant"].append(intern(participant))
+            arrays["time_start"].append(time_marks[0])
+            arrays["time_end"].append(time_marks[1])
+            arrays["utterance_tokens"].append(n_tokens + table.offsets[i + 1])
+        n_utterances += table.n_utterances
+        n_tokens += len(table.words)
+        arrays["file_utterances"].append(n_utterances)
+        arrays["word"].extend(map(intern, table.words))
+        arrays["pos"].extend(map(intern, table.pos))
+        arrays["mor"].extend(map(intern, table.mor))
+        for gra in table.gra:
+            dep, head, rel = gra or (_MISSING, _MISSING, None)
+            arrays["gra_dep"].append(dep)
+            arrays["gra_head"].append(head)
+            arrays["gra_rel"].append(intern(rel))
+
+    strings = [value.encode("utf-8") for value in intern.codes]
+    for name, blobs in (("string_offsets", strings), ("text_offsets", texts)):
+        offset = 0
+        arrays[name].append(0)
+        for blob in blobs:
+            offset += len(blob)
+            arrays[name].append(offset)
+    arrays["strings"] = array.array("B", b"".join(strings))
+    arrays["text"] = array.array("B", b"".join(texts))
+
+    sections = {}
+    offset = 0
+    for name, values in arrays.items():
+        sections[name] = [offset, len(values)]
+        offset += -(-len(values) * values.itemsize // _ALIGNMENT) * _ALIGNMENT
+    header = json.dumps(
+        {
+            "version": VERSION,
+            "byteorder": sys.byteorder,
+            "file_paths": list(file_paths),
+            "options": options,
+            "participants": (
+                None if participants is None else [list(p) for p in participants]
+            ),
+            "sections": sections,
+        }
+    ).encode("utf-8")
+    header += b" " * (-len(header) % _ALIGNMENT)
+
+    tmp_path = f"{os.fspath(path)}.tmp{os.getpid()}"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<Q", len(header)))
+        f.write(header)
+        for values in arrays.values():
+            data = values.tobytes()
+            f.write(data)
+            f.write(b"\x00" * (-len(data) % _ALIGNMENT))
+    os.replace(tmp_path, path)
+
+
+class Snapshot:
+    """A snapshot file, with its sections as views of the (mapped) buffer."""
+
+    def __init__(self, path: str | os.PathLike[str], *, use_mmap: bool = True):
+        with open(path, "rb") as f:
+            if use_mmap:
+                buffer: Any = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                buffer = f.read()
+        view = memoryview(buffer)
+        if bytes(view[: len(MAGIC)]) != MAGIC:
+            raise ValueError(f"Not a pylangacq snapshot: {path}")
+        (header_size,) = struct.unpack("<Q", view[len(MAGIC) : len(MAGIC) + 8])
+        start = len(MAGIC) + 8
+        header = json.loads(bytes(view[start : start + header_size]))
+        if header["version"] != VERSION:
+            raise ValueError(
+                f"Unsupported snapshot version {header['version']}: {path}"
+            )
+        start += header_size
+        self.file_paths: list[str] = header["file_paths"]
+        self.options: dict[str, Any] = header["options"]
+        self.participants: list[list[str]] | None = header.get("participants")
+        self.sections: dict[str, Any] = {}
+        for name, (offset, length) in header["sections"].items():
+            code: Any = SECTIONS[name]
+            size = array.array(code).itemsize
+            data = view[start + offset : start + offset + length * size]
+            if header["byteorder"] != sys.byteorder and size > 1:
+                swapped = array.array(code, data.tobytes())
+                swapped.byteswap()
+                self.sections[name] = memoryview(swapped)
+            else:
+                self.sections[name] = data.cast(code)
+        self._strings: list[str | None] | None = None
+
+    @property
+    def n_files(self) -> int:
+        return len(self.file_paths)
+
+    def strings(self) -> list[str | None]:
+        """Return the interned strings, decoded on first access.
+
+        The last item is None, so that the code -1 for a missing value
+        can be decoded by indexing like any other code.
+        """
+        if self._strings is None:
+            offsets, blob = self.sections["string_offsets"], self.sections["strings"]
+            strings: list[str | None] = [
+                str(blob[offsets[i] : offsets[i + 1]], "utf-8")
+                for i in range(len(offsets) - 1)
+            ]
+            strings.append(None)
+            self._strings = strings
+        return self._strings
+
+    def text(self, i: int) -> str:
+        offsets = self.sections["text_offsets"]
+        return str(self.sections["text"][offsets[i] : offsets[i + 1]], "utf-8")
+
+    def table(self, i: int) -> FileTable:
+        s = self.sections
+        decode: Any = self.strings().__getitem__
+        u_start, u_end = s["file_utterances"][i], s["file_utterances"][i + 1]
+        t_start = s["utterance_tokens"][u_start]
+        t_end = s["utterance_tokens"][u_end]
+
+        def per_utterance(name: str) -> list[int]:
+            return s[name][u_start:u_end].tolist()
+
+        def per_token(name: str) -> list[int]:
+            return s[name][t_start:t_end].tolist()
+
+        # Build the tuples in bulk, and then replace those of missing values.
+        time_starts = per_utterance("time_start")
+        time_marks: list[Any] = list(zip(time_starts, per_utterance("time_end")))
+        if _MISSING in time_starts:
+            time_marks = [None if t[0] == _MISSING else t for t in time_marks]
+        deps = per_token("gra_dep")
+        gra: list[Any] = list(
+            zip(deps, per_token("gra_head"), map(decode, per_token("gra_rel")))
+        )
+        if _MISSING in deps:
+            gra = [None if g[0] == _MISSING else g for g in gra]
+        offsets = s["utterance_tokens"][u_start : u_end + 1].tolist()
+        return FileTable(
+            participants=list(map(decode, per_utterance("participant"))),
+            time_marks=time_marks,
+            offsets=[offset - t_start for offset in offsets],
+            words=list(map(decode, per_token("word"))),
+            pos=list(map(decode, per_token("pos"))),
+            mor=list(map(decode, per_token("mor"))),
+            gra=gra,
+        )
+
+
+class LazySequence(Sequence):
+    """Items of a snapshot, one per file, each materialized on first access."""
+
+    def __init__(self, snapshot: Snapshot, kind: str) -> None:
+        self._snapshot = snapshot
+        self._get = snapshot.table if kind == "table" else snapshot.text
+        self._items: list[Any] = [None] * snapshot.n_files
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    @overload
+    def __getitem__(self, index: int) -> Any: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[Any]: ...
+
+    def __getitem__(self, index: int | slice) -> Any:
+        if isinstance(index, slice):
+            return [self[i] for i in range(len(self))[index]]
+        index = range(len(self))[index]
+        item = self._items[index]
+        if item is None:
+            item = self._items[index] = self._get(index)
+        return item
+
+    def __iter__(self) -> Iterator[Any]:
+        return (self[i] for i in range(len(self)))
@@ -0,0 +1,381 @@
+"""On-disk cache of downloaded and cloned CHAT data sources."""
+
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from typing import Any, Iterator
+
+from pylangacq._cache import CacheStats, hash_file
+
+_DEFAULT_CACHE_DIR = os.path.join("~", ".pylangacq", "cache", "sources")
+_META = "meta.json"
+_PART_SUFFIX = ".part"
+_CHUNK_SIZE = 1 << 16
+
+
+def is_git_url(url: str) -> bool:
+    """Return whether a URL is that of a git repository."""
+    return url.lower().rstrip("/").endswith(".git")
+
+
+def is_remote(source: str) -> bool:
+    """Return whether a data source is fetched rather than read locally."""
+    scheme = urllib.parse.urlsplit(source).scheme.lower()
+    return scheme in ("http", "https") or (scheme == "file" and is_git_url(source))
+
+
+def _checksum_matches(path: str, checksum: str) -> bool:
+    """Check a file against a checksum, ``"<algorithm>:<hex>"`` or sha256 hex."""
+    algorithm, _, expected = checksum.rpartition(":")
+    digest = hashlib.new(algorithm or "sha256")
+    for block in hash_file(path):
+        digest.update(block)
+    return digest.hexdigest() == expected.lower()
+
+
+def _range_total(content_range: str | None) -> int | None:
+    """Return the full size from a ``Content-Range: bytes */<size>`` header."""
+    if not content_range or not content_range.startswith("bytes */"):
+        return None
+    try:
+        return int(content_range[len("bytes */") :])
+    except ValueError:
+        return None
+
+
+def _dir_size(path: str) -> int:
+    size = 0
+    for root, _, names in os.walk(path):
+        for name in names:
+            try:
+                size += os.lstat(os.path.join(root, name)).st_size
+            except FileNotFoundError:
+                pass
+    return size
+
+
+def _git(*args: str) -> str:
+    return subprocess.run(
+        ["git", *args], check=True, capture_output=True, text=True
+    ).stdout
+
+
+class SourceCache:
+    """On-disk cache of CHAT data sources fetched from URLs and git repositories.
+
+    Each source (a downloaded file, or a clone of a git repository)
+    has its own entry in the cache directory:
+
+    - Downloads that are interrupted are resumed from where they stopped,
+      if the server supports range requests.
+    - A cached download is revalidated with the server by its ``ETag``
+      or ``Last-Modified`` header, and is only downloaded again if it has changed.
+      A cached clone is only fetched again if the remote ``HEAD``
+      has moved.
+    - If a checksum is given for a download, the data is verified against it.
+
+    Entries are evicted in least-recently-used order
+    whenever the total size of the cache exceeds ``max_size``.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str | os.PathLike[str] | None = None,
+        *,
+        max_size: int | None = 2**32,
+    ) -> None:
+        """Initialize a cache.
+
+        Args:
+            cache_dir: Directory for the cache entries.
+                Defaults to ``~/.pylangacq/cache/sources/``.
+            max_size: Maximum total size of the cache in bytes.
+                If None, the cache grows without bound.
+
+        Raises:
+            ValueError: If max_size is negative.
+        """
+        if max_size is not None and max_size < 0:
+            raise ValueError(f"max_size must not be negative: {max_size}")
+        self.cache_dir = os.path.expanduser(
+            os.fspath(cache_dir) if cache_dir is not None else _DEFAULT_CACHE_DIR
+        )
+        self.max_size = max_size
+        self._lock = threading.Lock()
+        self._in_use: dict[str, int] = {}
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def __repr__(self) -> str:
+        return f"SourceCache({self.cache_dir!r}, max_size={self.max_size!r})"
+
+    def fetch(
+        self, url: str, *, checksum: str | None = None, revalidate: bool = True
+    ) -> str:
+        """Fetch a data source into the cache, unless it's already there.
+
+        The fetched entry itself is never evicted to keep the cache
+        under its maximum size, but a later fetch may evict it.
+        Use :meth:`pinned` to read the entry before that can happen.
+
+        Args:
+            url: URL of a file (e.g., a ZIP archive) over HTTP or HTTPS,
+                or of a git repository (ending in ``.git``).
+            checksum: Expected checksum of a downloaded file,
+                as ``"<algorithm>:<hex digest>"`` (e.g., ``"sha256:9f86..."``)
+                or a SHA-256 hex digest.
+            revalidate: If False, use a cached copy without checking
+                with the server whether it has changed.
+
+        Returns:
+            The local path of the downloaded file or of the cloned repository.
+
+        Raises:
+            ValueError: If the downloaded data doesn't match the checksum.
+            OSError: If the download fails.
+            subprocess.CalledProcessError: If cloning or fetching fails.
+        """
+        with self.pinned(url, checksum=checksum, revalidate=revalidate) as path:
+            return path
+
+    @contextlib.contextmanager
+    def pinned(
+        self, url: str, *, checksum: str | None = None, revalidate: bool = True
+    ) -> Iterator[str]:
+        """Fetch a data source, and keep it from being evicted in the block.
+
+        Other fetches, from this thread or others, don't evict the entry
+        until the ``with`` block exits.
+
+        Args:
+            url: URL of a file or of a git repository, as in :meth:`fetch`.
+            checksum: Expected checksum of a downloaded file, as in :meth:`fetch`.
+            revalidate: If False, use a cached copy without checking
+                with the server whether it has changed.
+
+        Yields:
+            The local path of the downloaded file or of the cloned repository.
+
+        Raises:
+            ValueError: If the downloaded data doesn't match the checksum.
+            OSError: If the download fails.
+            subprocess.CalledProcessError: If cloning or fetching fails.
+        """
+        entry = self._entry_dir(url)
+        with self._lock:
+            self._in_use[entry] = self._in_use.get(entry, 0) + 1
+        try:
+            os.makedirs(entry, exist_ok=True)
+            if is_git_url(url):
+                path = self._fetch_git(url, entry, revalidate)
+            else:
+                path = self._fetch_file(url, entry, checksum, revalidate)
+            # Refresh the mtime for least-recently-used eviction.
+            os.utime(os.path.join(entry, _META))
+            # Evict while the entry is still pinned, so that it's kept.
+            self._evict()
+            yield path
+        finally:
+            with self._lock:
+                self._in_use[entry] -= 1
+                if not self._in_use[entry]:
+                    del self._in_use[entry]
+
+    def stats(self) -> CacheStats:
+        """Return the usage statistics of this cache.
+
+        Hits are fetches answered by a cached copy,
+        including those revalidated as unchanged with the server.
+        """
+        entries = self._entries()
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                n_entries=len(entries),
+                size=sum(size for _, size, _ in entries),
+            )
+
+    def clear(self) -> None:
+        """Remove all entries and reset the statistics."""
+        for path, _, _ in self._entries():
+            shutil.rmtree(path, ignore_errors=True)
+        with self._lock:
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+
+    def _entry_dir(self, url: str) -> str:
+        key = hashlib.sha256(url.encode("utf-8")).hexdigest()[:32]
+        return os.path.join(self.cache_dir, key)
+
+    def _count(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self._hits += 1
+            else:
+                self._misses += 1
+
+    @staticmethod
+    def _read_meta(entry: str) -> dict[str, Any]:
+        try:
+            with open(os.path.join(entry, _META), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    @staticmethod
+    def _write_meta(entry: str, meta: dict[str, Any]) -> None:
+        tmp_path = os.path.join(entry, _META + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        os.replace(tmp_path, os.path.join(entry, _META))
+
+    def _fetch_file(
+        self, url: str, entry: str, checksum: str | None, revalidate: bool
+    ) -> str:
+        name = os.path.basename(urllib.parse.urlsplit(url).path) or "data"
+        path = os.path.join(entry, name)
+        part_path = path + _PART_SUFFIX
+        meta = self._read_meta(entry)
+        cached = os.path.exists(path) and meta.get("url") == url
+        if cached and checksum is not None and not _checksum_matches(path, checksum):
+            cached = False
+        if cached and not revalidate:
+            self._count(hit=True)
+            return path
+
+        request = urllib.request.Request(url)
+        part = meta.get("part") or {}
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        validator = part.get("etag") or part.get("last_modified")
+        if offset and validator:
+            # Resume the interrupted download, if the data hasn't changed since.
+            request.add_header("Range", f"bytes={offset}-")
+            request.add_header("If-Range", validator)
+        elif cached:
+            if meta.get("etag"):
+                request.add_header("If-None-Match", meta["etag"])
+            if meta.get("last_modified"):
+                request.add_header("If-Modified-Since", meta["last_modified"])
+
+        try:
+            response = urllib.request.urlopen(request)
+        except urllib.error.HTTPError as error:
+            if error.code == 304 and cached:
+                self._count(hit=True)
+                return path
+            if error.code == 416 and offset:
+                # The partial file is as large as the data or larger:
+                # keep it if it is complete, or else start over.
+                total = _range_total(error.headers.get("Content-Range"))
+                if total == offset and (
+                    checksum is None or _checksum_matches(part_path, checksum)
+                ):
+                    os.replace(part_path, path)
+                    headers = {
+                        "etag": part.get("etag"),
+                        "last_modified": part.get("last_modified"),
+                    }
+                    self._write_meta(
+                        entry, dict(url=url, fetched=time.time(), **headers)
+                    )
+                    self._count(hit=False)
+                    return path
+                os.remove(part_path)
+                return self._fetch_file(url, entry, checksum, revalidate)
+            raise
+        with response:
+            headers = {
+                "etag": response.headers.get("ETag"),
+                "last_modified": response.headers.get("Last-Modified"),
+            }
+            if response.status == 206:
+                mode = "ab"
+            else:
+                mode, offset = "wb", 0
+            self._write_meta(entry, dict(meta, url=url, part=headers))
+            length = response.headers.get("Content-Length")
+            with open(part_path, mode) as f:
+                while chunk := response.read(_CHUNK_SIZE):
+                    f.write(chunk)
+        if length is not None and os.path.getsize(part_path) != offset + int(length):
+            raise OSError(f"Incomplete download of {url}; it resumes on a retry")
+        if checksum is not None and not _checksum_matches(part_path, checksum):
+            os.remove(part_path)
+            raise ValueError(f"Checksum mismatch for {url}: expected {checksum}")
+        os.replace(part_path, path)
+        self._write_meta(entry, dict(url=url, fetched=time.time(), **headers))
+        self._count(hit=False)
+        return path
+
+    def _fetch_git(self, url: str, entry: str, revalidate: bool) -> str:
+        path = os.path.join(entry, "repo")
+        meta = self._read_meta(entry)
+        if os.path.isdir(path) and meta.get("url") == url:
+            if not revalidate:
+                self._count(hit=True)
+                return path
+            remote = _git("ls-remote", url, "HEAD").split()
+            if remote and remote[0] == meta.get("head"):
+                self._count(hit=True)
+                return path
+        # Clone into a temporary directory first, so that an interrupted clone
+        # never leaves a broken repository behind.
+        tmp_dir = tempfile.mkdtemp(dir=entry, prefix="clone-")
+        try:
+            _git("clone", "--quiet", "--depth", "1", url, tmp_dir)
+            head = _git("-C", tmp_dir, "rev-parse", "HEAD").strip()
+            shutil.rmtree(path, ignore_errors=True)
+            os.replace(tmp_dir, path)
+        except BaseException:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+        self._write_meta(entry, {"url": url, "head": head, "fetched": time.time()})
+        self._count(hit=False)
+        return path
+
+    def _entries(self) -> list[tuple[str, int, float]]:
+        """Return (path, size, mtime) of all entries, least recently used first."""
+        try:
+            names = os.listdir(self.cache_dir)
+        except FileNotFoundError:
+            return []
+        entries = []
+        for name in names:
+            path = os.path.join(self.cache_dir, name)
+            try:
+                mtime = os.stat(os.path.join(path, _META)).st_mtime
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+            entries.append((path, _dir_size(path), mtime))
+        entries.sort(key=lambda entry: entry[2])
+        return entries
+
+    def _evict(self) -> None:
+        if self.max_size is None:
+            return
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        for path, size, _ in entries:
+            if total <= self.max_size:
+                break
+            with self._lock:
+                if path in self._in_use:
+                    continue
+                self._evictions += 1
+            shutil.rmtree(path, ignore_errors=True)
+            total -= size
@@ -0,0 +1,161 @@
+"""Streaming CHAT data in chunks of files."""
+
+from __future__ import annotations
+
+import collections
+import os
+import re
+import zipfile
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Iterator, Sequence
+
+from pylangacq._chat import CHAT, _as_list
+from pylangacq._files import list_dir, list_zip
+
+
+def iter_chat(
+    path: str | os.PathLike[str],
+    *,
+    filter_files: str | Sequence[str] | None = None,
+    filter_participants: str | Sequence[str] | None = None,
+    exclude_participants: str | Sequence[str] | None = None,
+    age_range: tuple[float | None, float | None] | None = None,
+    chunk_files: int = 1,
+    prefetch: int = 1,
+    extension: str = ".cha",
+    cls: type[CHAT] = CHAT,
+    parallel: bool = True,
+    strict: bool = True,
+    mor_tier: str | None = "%mor",
+    gra_tier: str | None = "%gra",
+    lazy_tiers: bool = False,
+) -> Iterator[CHAT]:
+    """Read CHAT data lazily, a chunk of files at a time.
+
+    Unlike :func:`~pylangacq.read_chat`, which holds all the parsed data
+    in memory at once, this generator yields small ``CHAT`` objects
+    of ``chunk_files`` files each, in the same file order as ``read_chat``.
+    While a chunk is being consumed, the next ``prefetch`` chunks are
+    read and parsed in the background.
+    Peak memory is therefore bounded by ``chunk_files * (prefetch + 1)`` files,
+    regardless of the size of the data source.
+
+    Args:
+        path: Path to a ``.zip`` file, a local directory containing ``.cha``
+            files, or a single ``.cha`` file.
+        filter_files: Filename(s) to keep.
+            Regular expression matching is supported.
+            Files that don't match are never read.
+            If ``None``, all files are included.
+        filter_participants: Participant code(s) to keep.
+            Regular expression matching is supported.
+            The utterances of the other participants are never parsed.
+            If ``None``, all participants are included.
+        exclude_participants: Participant code(s) whose utterances
+            are never parsed.
+            Regular expression matching is supported.
+        age_range: ``(start, end)`` in months, to keep only the files
+            where the target child (CHI) is at least *start* and
+            younger than *end* months old. Either can be None for
+            an open end. The other files are read but not parsed.
+        chunk_files: Number of files per yielded ``CHAT`` object.
+        prefetch: Number of chunks to parse ahead of the one being consumed.
+            Set to 0 to parse each chunk only when it is requested.
+        extension: File extension to filter by (default: ".cha").
+        cls: The class used to create the readers. Must be ``CHAT`` or a
+            subclass of it.
+        parallel: If True, parse the files within a chunk in parallel.
+        strict: If ``True``, enforce strict parsing of the CHAT data.
+        mor_tier: Name of the dependent tier to treat as the
+            morphology tier. Set to None to disable mor+gra handling.
+        gra_tier: Name of the dependent tier to treat as the
+            grammatical relation tier. Set to None to disable
+            mor+gra handling.
+        lazy_tiers: If ``True``, parse the %mor and %gra tiers of a file
+            only when they are first needed, as in :func:`~pylangacq.read_chat`.
+
+    Yields:
+        ``CHAT`` objects, each with up to ``chunk_files`` files.
+
+    Raises:
+        TypeError: If *cls* is not ``CHAT`` or a subclass of it.
+        ValueError: If *path* does not point to a recognized source,
+            or if *chunk_files* or *prefetch* is out of range.
+    """
+    if not (isinstance(cls, type) and issubclass(cls, CHAT)):
+        raise TypeError(f"Only a CHAT class or its child class is allowed: {cls}")
+    if chunk_files < 1:
+        raise ValueError(f"chunk_files must be at least 1: {chunk_files}")
+    if prefetch < 0:
+        raise ValueError(f"prefetch must not be negative: {prefetch}")
+
+    path = os.fspath(path)
+    options: dict[str, Any] = {
+        "parallel": parallel,
+        "strict": strict,
+        "mor_tier": mor_tier,
+        "gra_tier": gra_tier,
+        "participants": filter_participants,
+        "exclude_participants": exclude_participants,
+        "age_range": age_range,
+        "lazy_tiers": lazy_tiers,
+    }
+    file_paths: list[str]
+    parse: Callable[[list[str]], CHAT]
+    if path.lower().endswith(".zip"):
+        file_paths = list_zip(path, extension)
+
+        def parse(names: list[str]) -> CHAT:
+            with zipfile.ZipFile(path) as f:
+                strs = [f.read(name).decode("utf-8") for name in names]
+            return cls.from_strs(strs, ids=names, **options)
+
+    elif os.path.isdir(path):
+        file_paths = list_dir(path, extension)
+
+        def parse(names: list[str]) -> CHAT:
+            return cls.from_files(names, **options)
+
+    elif path.lower().endswith(".cha"):
+        file_paths = [path]
+
+        def parse(names: list[str]) -> CHAT:
+            return cls.from_files(names, **options)
+
+    else:
+        raise ValueError(
+            "path is not one of the accepted choices of "
+            f"{{.zip file, local directory, .cha file}}: {path}"
+        )
+
+    if filter_files is not None:
+        regex = re.compile("|".join(f"(?:{p})" for p in _as_list(filter_files)))
+        file_paths = [p for p in file_paths if regex.search(p)]
+
+    chunks = (
+        file_paths[i : i + chunk_files] for i in range(0, len(file_paths), chunk_files)
+    )
+    # A chunk with all its files out of the age range is skipped.
+    if not prefetch:
+        for chunk in chunks:
+            chat = parse(chunk)
+            if chat.n_files:
+                yield chat
+        return
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        pending: collections.deque[Future[CHAT]] = collections.deque()
+        try:
+            for chunk in chunks:
+                pending.append(executor.submit(parse, chunk))
+                if len(pending) > prefetch:
+                    chat = pending.popleft().result()
+                    if chat.n_files:
+                        yield chat
+            while pending:
+                chat = pending.popleft().result()
+                if chat.n_files:
+                    yield chat
+        finally:
+            for future in pending:
+                future.cancel()
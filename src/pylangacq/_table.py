@@ -0,0 +1,100 @@
+"""Plain-Python token tables for parsed CHAT files."""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass, field
+from typing import Sequence
+
+from rustling.chat import CHAT as _CHAT, Gra, Token
+
+
+@dataclass
+class FileTable:
+    """Tokens of one parsed CHAT file, stored column by column.
+
+    Utterance ``i`` owns the tokens at positions
+    ``offsets[i]`` to ``offsets[i + 1]`` of the token columns.
+    Changeable headers such as ``@Comment`` are not part of the table.
+    """
+
+    participants: list[str] = field(default_factory=list)
+    time_marks: list[tuple[int, int] | None] = field(default_factory=list)
+    offsets: list[int] = field(default_factory=lambda: [0])
+    words: list[str] = field(default_factory=list)
+    pos: list[str | None] = field(default_factory=list)
+    mor: list[str | None] = field(default_factory=list)
+    gra: list[tuple[int, int, str] | None] = field(default_factory=list)
+
+    @property
+    def n_utterances(self) -> int:
+        return len(self.participants)
+
+    def utterance_words(self) -> list[list[str]]:
+        words, offsets = self.words, self.offsets
+        return [words[offsets[i] : offsets[i + 1]] for i in range(len(offsets) - 1)]
+
+    def utterance_tokens(self) -> list[list[Token]]:
+        tokens = [
+            Token(word, pos, mor, None if gra is None else Gra(*gra))
+            for word, pos, mor, gra in zip(self.words, self.pos, self.mor, self.gra)
+        ]
+        offsets = self.offsets
+        return [tokens[offsets[i] : offsets[i + 1]] for i in range(len(offsets) - 1)]
+
+    def filter_participants(self, patterns: Sequence[str]) -> FileTable:
+        """Return a new table with only the matching participants.
+
+        Args:
+            patterns: Regex patterns, auto-anchored and OR'd
+                as in :meth:`CHAT.filter`.
+        """
+        regex = re.compile("|".join(f"(?:{p})" for p in patterns))
+        new = FileTable()
+        for i, participant in enumerate(self.participants):
+            if not regex.fullmatch(participant):
+                continue
+            start, end = self.offsets[i], self.offsets[i + 1]
+            new.participants.append(participant)
+            new.time_marks.append(self.time_marks[i])
+            new.words.extend(self.words[start:end])
+            new.pos.extend(self.pos[start:end])
+            new.mor.extend(self.mor[start:end])
+            new.gra.extend(self.gra[start:end])
+            new.offsets.append(len(new.words))
+        return new
+
+
+def build_tables(chat: _CHAT) -> list[FileTable]:
+    """Extract one :class:`FileTable` per file from parsed CHAT data."""
+    tables = []
+    for utterances in chat.utterances(by_file=True):
+        table = FileTable()
+        for utterance in utterances:
+            if utterance.participant is None or utterance.tokens is None:
+                continue
+            table.participants.append(utterance.participant)
+            table.time_marks.append(utterance.time_marks)
+            for token in utterance.tokens:
+                gra = token.gra
+                table.words.append(token.word)
+                table.pos.append(token.pos)
+                table.mor.append(token.mor)
+                table.gra.append(None if gra is None else (gra.dep, gra.head, gra.rel))
+            table.offsets.append(len(table.words))
+        tables.append(table)
+    return tables
+
+
+def group(
+    per_file: list[list[list]], *, by_utterance: bool, by_file: bool
+) -> list | list[list] | list[list[list]]:
+    """Flatten per-file, per-utterance items to the requested grouping."""
+    if by_file and by_utterance:
+        return per_file
+    elif by_file:
+        return [[item for utt in utts for item in utt] for utts in per_file]
+    elif by_utterance:
+        return [utt for utts in per_file for utt in utts]
+    else:
+        return [item for utts in per_file for utt in utts for item in utt]
@@ -0,0 +1,118 @@
+"""Interned vocabulary of strings with integer IDs."""
+
+from __future__ import annotations
+
+import array
+import sys
+import threading
+from typing import Iterable, Iterator
+
+# Integer ID for a missing string, as in the columns of `CHAT.to_columns`.
+MISSING = -1
+
+
+class Vocabulary:
+    """Interned strings, each with an integer ID.
+
+    IDs are assigned in order of first appearance, starting from 0,
+    and never change, so that IDs from different readers can be compared
+    as long as they come from the same vocabulary.
+    Each string is stored once (and interned with :func:`sys.intern`),
+    however many times it occurs in the data.
+
+    Each ``CHAT`` reader has a vocabulary at :attr:`CHAT.vocab`,
+    which the readers derived from it share.
+    A vocabulary only grows, and is safe to use from multiple threads.
+    Its memory is released along with the last reader
+    (or :class:`~pylangacq.Collocations` object) that uses it.
+    IDs are not comparable across processes.
+    """
+
+    def __init__(self, strings: Iterable[str] = ()) -> None:
+        """Initialize a vocabulary.
+
+        Args:
+            strings: Strings to add first, with IDs in this order.
+        """
+        self._ids: dict[str, int] = {}
+        self._strings: list[str] = []
+        self._lock = threading.Lock()
+        for string in strings:
+            self.add(string)
+
+    def __repr__(self) -> str:
+        return f"Vocabulary(size={len(self._strings)})"
+
+    def __len__(self) -> int:
+        return len(self._strings)
+
+    def __contains__(self, string: object) -> bool:
+        return string in self._ids
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._strings)
+
+    def __getitem__(self, id_: int) -> str:
+        """Return the string of an ID."""
+        if id_ < 0:
+            raise IndexError(f"ID out of range: {id_}")
+        return self._strings[id_]
+
+    @property
+    def strings(self) -> list[str]:
+        """The strings, such that ``vocab.strings[i]`` has ID ``i``.
+
+        This is the vocabulary's own list, kept up to date as strings are added,
+        and must not be modified.
+        """
+        return self._strings
+
+    def get(self, string: str) -> int | None:
+        """Return the ID of a string, or None if it isn't in the vocabulary."""
+        return self._ids.get(string)
+
+    def add(self, string: str) -> int:
+        """Return the ID of a string, adding the string if it's new."""
+        id_ = self._ids.get(string)
+        if id_ is not None:
+            return id_
+        with self._lock:
+            # Check again, in case another thread has just added the string.
+            id_ = self._ids.get(string)
+            if id_ is None:
+                id_ = len(self._strings)
+                string = sys.intern(string)
+                self._strings.append(string)
+                self._ids[string] = id_
+            return id_
+
+    def encode(self, strings: Iterable[str | None]) -> array.array:
+        """Return the IDs of strings, adding the new ones.
+
+        Args:
+            strings: Strings, with None for a missing string.
+
+        Returns:
+            An ``array.array`` of 32-bit integer IDs, with ``-1`` for None.
+        """
+        strings = strings if isinstance(strings, list) else list(strings)
+        ids = self._ids
+        try:
+            # Fast path, for strings all already in the vocabulary.
+            return array.array("i", map(ids.__getitem__, strings))
+        except KeyError:
+            pass
+        result = array.array("i")
+        append = result.append
+        for string in strings:
+            if string is None:
+                append(MISSING)
+                continue
+            id_ = ids.get(string)
+            append(id_ if id_ is not None else self.add(string))
+        return result
+
+    def decode(self, ids: Iterable[int]) -> list[str | None]:
+        """Return the strings of IDs, with None for ``-1``."""
+        strings = self._strings
+        return [strings[id_] if id_ != MISSING else None for id_ in ids]
@@ -0,0 +1,80 @@
+import zipfile
+
+import pytest
+
+import pylangacq
+
+# Two small transcripts of the same child at different ages.
+_EVE_1 = """@UTF8
+@Begin
+@Languages:\teng
+@Participants:\tCHI Eve Target_Child, MOT Mother
+@ID:\teng|test|CHI|1;06.00|female|||Target_Child|||
+@ID:\teng|test|MOT|||||Mother|||
+*CHI:\tmore cookie .
+%mor:\tqn|more n|cookie .
+%gra:\t1|2|QUANT 2|0|ROOT 3|2|PUNCT
+*MOT:\tyou want more cookies ? \x150_1500\x15
+%mor:\tpro:per|you v|want qn|more n|cookie-PL ?
+%gra:\t1|2|SUBJ 2|0|ROOT 3|4|QUANT 4|2|OBJ 5|2|PUNCT
+@Comment:\tEve reaches for the jar
+*CHI:\tI want cookies .
+%mor:\tpro:sub|I v|want n|cookie-PL .
+%gra:\t1|2|SUBJ 2|0|ROOT 3|2|OBJ 4|2|PUNCT
+*MOT:\there you go .
+%mor:\tadv|here pro:per|you v|go .
+%gra:\t1|3|JCT 2|3|SUBJ 3|0|ROOT 4|3|PUNCT
+@End
+"""
+
+_EVE_2 = """@UTF8
+@Begin
+@Languages:\teng
+@Participants:\tCHI Eve Target_Child, MOT Mother
+@ID:\teng|test|CHI|2;00.00|female|||Target_Child|||
+@ID:\teng|test|MOT|||||Mother|||
+*CHI:\tthe dog is running .
+%mor:\tdet:art|the n|dog aux|be&3S part|run-PRESP .
+%gra:\t1|2|DET 2|4|SUBJ 3|4|AUX 4|0|ROOT 5|4|PUNCT
+*MOT:\tthe dog likes you .
+%mor:\tdet:art|the n|dog v|like-3S pro:obj|you .
+%gra:\t1|2|DET 2|3|SUBJ 3|0|ROOT 4|3|OBJ 5|3|PUNCT
+*CHI:\tI see him .
+%mor:\tpro:sub|I v|see pro:obj|him .
+%gra:\t1|2|SUBJ 2|0|ROOT 3|2|OBJ 4|2|PUNCT
+@End
+"""
+
+SAMPLE_STRS = [_EVE_1, _EVE_2]
+SAMPLE_IDS = ["Eve/010600.cha", "Eve/020000.cha"]
+
+
+@pytest.fixture
+def sample_chat():
+    return pylangacq.CHAT.from_strs(SAMPLE_STRS, ids=SAMPLE_IDS)
+
+
+@pytest.fixture
+def sample_xmor_strs():
+    """The sample data with the %mor and %gra tiers named %xmor and %xgra."""
+    return [
+        s.replace("%mor:", "%xmor:").replace("%gra:", "%xgra:") for s in SAMPLE_STRS
+    ]
+
+
+@pytest.fixture
+def sample_zip(tmp_path):
+    path = tmp_path / "Eve.zip"
+    with zipfile.ZipFile(path, "w") as f:
+        for file_path, data in zip(SAMPLE_IDS, SAMPLE_STRS):
+            f.writestr(file_path, data)
+    return path
+
+
+@pytest.fixture
+def sample_dir(tmp_path):
+    path = tmp_path / "corpus"
+    for file_path, data in zip(SAMPLE_IDS, SAMPLE_STRS):
+        (path / file_path).parent.mkdir(parents=True, exist_ok=True)
+        (path / file_path).write_text(data, encoding="utf-8")
+    return path
@@ -0,0 +1,88 @@
+import pytest
+
+import pylangacq
+from pylangacq._prefilter import filter_utterances
+
+
+def test_slice_by_age(sample_chat):
+    def files(*args, **kwargs):
+        return sample_chat.slice_by_age(*args, **kwargs).file_paths
+
+    assert files() == sample_chat.file_paths
+    assert files("2;0") == ["Eve/020000.cha"]
+    assert files(None, 24) == ["Eve/010600.cha"]
+    assert files(18.0, "2;00.00") == ["Eve/010600.cha"]
+    assert files(sample_chat.ages()[1]) == ["Eve/020000.cha"]
+    assert files(12, 18) == []
+    assert files(participant="MOT") == []
+
+    chi = sample_chat.slice_by_age("2;0").filter(participants="CHI")
+    assert chi.words(by_utterance=True) == [
+        ["the", "dog", "is", "running", "."],
+        ["I", "see", "him", "."],
+    ]
+
+    with pytest.raises(ValueError):
+        sample_chat.slice_by_age("two years")
+
+
+def test_age_index_follows_changes(sample_chat):
+    assert sample_chat.slice_by_age(24).n_files == 1
+    sample_chat.append(sample_chat[1])
+    assert sample_chat.slice_by_age(24).n_files == 2
+    sample_chat.pop_left()
+    assert sample_chat.slice_by_age(None, 24).n_files == 0
+
+
+def test_slice_by_age_of_loaded_snapshot(sample_chat, tmp_path):
+    sample_chat.save(tmp_path / "eve.bin")
+    loaded = pylangacq.CHAT.load(tmp_path / "eve.bin")
+    older = loaded.slice_by_age("2;0")
+    assert loaded._pending is not None
+    assert older.words() == sample_chat[1].words()
+
+
+def test_measures_by_age(sample_chat):
+    bins = sample_chat.measures_by_age(["mlum", "mluw"])
+    assert [(b.start, b.end, b.files) for b in bins] == [
+        (18.0, 21.0, (0,)),
+        (24.0, 27.0, (1,)),
+    ]
+    assert [b.measures["mlum"] for b in bins] == sample_chat.mlum()
+    assert [b.measures["mluw"] for b in bins] == sample_chat.mluw()
+    assert [(b.n_utterances, b.n_words) for b in bins] == [(2, 7), (2, 9)]
+    # The measures are memoized with the per-file results of mlum() and mluw().
+    assert sample_chat.measure_cache_info().hits == 4
+
+    (only,) = sample_chat.measures_by_age(bin_months=12, start=0, end="2;0")
+    assert (only.start, only.end, only.files) == (12.0, 24.0, (0,))
+
+    (both,) = sample_chat.measures_by_age(bin_months=12, start=18)
+    assert both.files == (0, 1)
+    assert both.measures["mlum"] == pytest.approx(sum(sample_chat.mlum()) / 2)
+
+
+def test_measures_by_age_without_utterances(sample_chat):
+    # CHI is still in the headers, with an age.
+    strs = [
+        filter_utterances(text, lambda code: code != "CHI")
+        for text in sample_chat.to_strs()
+    ]
+    mot = pylangacq.CHAT.from_strs(strs)
+    bins = mot.measures_by_age()
+    assert [b.files for b in bins] == [(0,), (1,)]
+    assert [b.measures for b in bins] == [{"mlum": None}, {"mlum": None}]
+    assert [b.n_utterances for b in bins] == [0, 0]
+
+    # As with ages(), a reader filtered by participants has only their ages,
+    # whether or not the age index of the unfiltered reader has been built.
+    assert sample_chat.filter(participants="MOT").measures_by_age() == []
+    assert len(sample_chat.measures_by_age()) == 2
+    assert sample_chat.filter(participants="MOT").measures_by_age() == []
+
+
+def test_measures_by_age_invalid_arguments(sample_chat):
+    with pytest.raises(ValueError):
+        sample_chat.measures_by_age(["foo"])
+    with pytest.raises(ValueError):
+        sample_chat.measures_by_age(bin_months=0)
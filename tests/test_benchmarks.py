@@ -0,0 +1,30 @@
+import json
+import os
+import subprocess
+import sys
+
+RUN = os.path.join(os.path.dirname(__file__), os.pardir, "benchmarks", "run.py")
+
+
+def test_benchmarks_run_and_compare(tmp_path):
+    output = str(tmp_path / "results.json")
+    command = [sys.executable, RUN, "--files", "2", "--utterances", "5"]
+    command += ["--repeat", "1", "--output", output]
+    command += ["--benchmark", "CHAT.from_zip", "--benchmark", "CHAT.ipsyn"]
+    subprocess.run(command, check=True, capture_output=True)
+    with open(output) as f:
+        results = json.load(f)
+    assert set(results["results"]) == {
+        "CHAT.from_zip[parallel=True]",
+        "CHAT.from_zip[parallel=False]",
+        "CHAT.ipsyn",
+    }
+    assert results["corpus"]["n_files"] == 2
+    assert results["results"]["CHAT.ipsyn"]["import_time"] > 0
+    compared = subprocess.run(
+        [sys.executable, RUN, "--compare", output, output],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    assert "CHAT.ipsyn" in compared
@@ -0,0 +1,61 @@
+import pylangacq
+
+
+def test_cache_miss_then_hit_from_zip(sample_zip, tmp_path):
+    cache = pylangacq.ParseCache(tmp_path / "cache")
+    cold = pylangacq.CHAT.from_zip(sample_zip, cache=cache)
+    warm = pylangacq.CHAT.from_zip(sample_zip, cache=cache)
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.n_entries) == (1, 1, 1)
+    assert warm.file_paths == cold.file_paths
+    assert warm.words(by_utterance=True) == cold.words(by_utterance=True)
+    assert warm.tokens(by_file=True) == cold.tokens(by_file=True)
+    assert warm.mlum() == cold.mlum()
+    assert warm == cold
+
+
+def test_cache_from_dir_detects_changes(sample_dir, tmp_path):
+    cache = pylangacq.ParseCache(tmp_path / "cache")
+    pylangacq.CHAT.from_dir(sample_dir, cache=cache)
+    pylangacq.CHAT.from_dir(sample_dir, cache=cache)
+    path = sample_dir / "Eve" / "020000.cha"
+    path.write_text(path.read_text().replace("him", "her"))
+    chat = pylangacq.CHAT.from_dir(sample_dir, cache=cache)
+    assert "her" in chat.words()
+    assert cache.stats().misses == 2
+
+
+def test_cache_key_depends_on_options(sample_zip, tmp_path):
+    cache = pylangacq.ParseCache(tmp_path / "cache")
+    pylangacq.CHAT.from_zip(sample_zip, cache=cache)
+    chat = pylangacq.CHAT.from_zip(sample_zip, cache=cache, mor_tier=None)
+    assert cache.stats().misses == 2
+    assert chat.tokens()[0].pos is None
+
+
+def test_warm_reader_filters_without_parsing(sample_zip, tmp_path):
+    cache = pylangacq.ParseCache(tmp_path / "cache")
+    cold = pylangacq.read_chat(sample_zip, cache=cache)
+    warm = pylangacq.read_chat(sample_zip, cache=cache)
+    for kwargs in [{"files": "0106"}, {"participants": "CHI"}, {"participants": "M.*"}]:
+        expected = cold.filter(**kwargs)
+        actual = warm.filter(**kwargs)
+        assert actual.file_paths == expected.file_paths
+        assert actual.words(by_utterance=True) == expected.words(by_utterance=True)
+        assert actual.mlum() == expected.mlum()
+    assert warm._pending is not None
+    assert warm[1].words() == cold[1].words()
+
+
+def test_cache_eviction_and_clear(sample_zip, sample_dir, tmp_path):
+    cache = pylangacq.ParseCache(tmp_path / "cache", max_size=0)
+    pylangacq.CHAT.from_zip(sample_zip, cache=cache)
+    stats = cache.stats()
+    assert (stats.n_entries, stats.evictions) == (0, 1)
+
+    cache = pylangacq.ParseCache(tmp_path / "cache")
+    pylangacq.CHAT.from_zip(sample_zip, cache=cache)
+    pylangacq.CHAT.from_dir(sample_dir, cache=cache)
+    assert cache.stats().n_entries == 2
+    cache.clear()
+    assert cache.stats() == pylangacq.CacheStats(0, 0, 0, 0, 0)
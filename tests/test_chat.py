@@ -0,0 +1,52 @@
+import pytest
+import rustling
+
+import pylangacq
+
+
+def test_wraps_rustling_reader(sample_chat):
+    assert sample_chat.n_files == 2
+    assert sample_chat.file_paths == ["Eve/010600.cha", "Eve/020000.cha"]
+    assert sample_chat.mlum() == [2.5, 3.5]
+    assert [str(age) for age in sample_chat.ages()] == ["1;06.00", "2;00.00"]
+
+
+def test_methods_return_pylangacq_chat(sample_chat):
+    assert isinstance(sample_chat.filter(participants="CHI"), pylangacq.CHAT)
+    assert isinstance(sample_chat[0], pylangacq.CHAT)
+    assert isinstance(sample_chat[:1], pylangacq.CHAT)
+    assert isinstance(sample_chat + sample_chat, pylangacq.CHAT)
+    assert all(isinstance(chat, pylangacq.CHAT) for chat in sample_chat)
+
+
+def test_equality_with_rustling_reader(sample_chat):
+    other = rustling.chat.CHAT.from_strs(
+        sample_chat.to_strs(), ids=sample_chat.file_paths
+    )
+    assert sample_chat == other
+    assert sample_chat == pylangacq.CHAT.from_strs(
+        sample_chat.to_strs(), ids=sample_chat.file_paths
+    )
+
+
+def test_append_and_pop(sample_chat):
+    chat = pylangacq.CHAT()
+    assert not chat
+    chat.append(sample_chat[1])
+    chat.append_left(sample_chat[0])
+    assert chat == sample_chat
+    assert chat.pop().file_paths == ["Eve/020000.cha"]
+    assert chat.n_files == 1
+
+
+def test_read_chat_rejects_other_classes(sample_zip):
+    with pytest.raises(TypeError):
+        pylangacq.read_chat(sample_zip, cls=rustling.chat.CHAT)
+
+
+def test_read_chat_with_filters(sample_zip):
+    chat = pylangacq.read_chat(
+        sample_zip, filter_files="0200", filter_participants="CHI"
+    )
+    assert chat.file_paths == ["Eve/020000.cha"]
+    assert chat.words() == ["the", "dog", "is", "running", ".", "I", "see", "him", "."]
@@ -0,0 +1,271 @@
+import http.client
+import json
+import socket
+import sys
+import threading
+
+import pytest
+
+import pylangacq
+from pylangacq._cli import _Corpora, main
+from pylangacq._server import make_server, send, server_address
+
+
+def test_stats(sample_zip, capsys):
+    assert main(["stats", str(sample_zip), "--measures", "mlum", "ttr"]) == 0
+    assert capsys.readouterr().out.splitlines() == [
+        "file\tage\tmlum\tttr",
+        "Eve/010600.cha\t1;06.00\t2.500\t1.000",
+        "Eve/020000.cha\t2;00.00\t3.500\t1.000",
+    ]
+
+    assert main(["stats", str(sample_zip), "--files", "0200", "--json"]) == 0
+    (line,) = capsys.readouterr().out.splitlines()
+    chat = pylangacq.read_chat(sample_zip)
+    assert json.loads(line) == {
+        "file": "Eve/020000.cha",
+        "age": 24.0,
+        "mlum": chat.mlum()[1],
+        "mluw": chat.mluw()[1],
+        "ttr": chat.ttr()[1],
+        "ipsyn": chat.ipsyn()[1],
+    }
+
+
+def test_ngrams_and_search(sample_zip, capsys):
+    assert main(["ngrams", str(sample_zip), "--top", "1"]) == 0
+    assert capsys.readouterr().out == "2\tthe dog\n"
+
+    argv = ["search", str(sample_zip), "--word", "dog", "--participants", "CHI"]
+    assert main(argv) == 0
+    assert capsys.readouterr().out == (
+        "Eve/020000.cha\t0\tCHI\tdog\tthe dog is running .\n"
+    )
+    assert main(["search", str(sample_zip), "--phrase", "the dog", "--json"]) == 0
+    hits = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [hit["participant"] for hit in hits] == ["CHI", "MOT"]
+    assert hits[0]["match"] == ["the", "dog"]
+
+
+def test_convert(sample_zip, tmp_path, capsys):
+    out_dir = tmp_path / "out"
+    argv = ["convert", str(sample_zip), str(out_dir), "--to", "srt", "--workers", "1"]
+    assert main(argv) == 0
+    assert capsys.readouterr().out.split() == [
+        str(out_dir / "010600.srt"),
+        str(out_dir / "020000.srt"),
+    ]
+    assert (out_dir / "020000.srt").exists()
+
+
+def test_errors(sample_zip, tmp_path, capsys):
+    assert main(["search", str(sample_zip)]) == 1
+    assert "pylangacq: error:" in capsys.readouterr().err
+    assert main(["stats", str(tmp_path / "missing.zip")]) == 1
+    with pytest.raises(SystemExit):
+        main(["stats", str(sample_zip), "--measures", "foo"])
+    assert main(["stats", str(sample_zip), "--server", "http://127.0.0.1:1"]) == 1
+    assert "server at http://127.0.0.1:1" in capsys.readouterr().err
+
+
+@pytest.fixture(params=["unix", "http"])
+def server(request, tmp_path):
+    if request.param == "unix" and sys.platform == "win32":
+        pytest.skip("Unix sockets only")
+    corpora = _Corpora(pylangacq.CorpusCollection(), cache=False)
+    if request.param == "unix":
+        server = make_server(corpora.handle, socket_path=tmp_path / "server.sock")
+    else:
+        server = make_server(corpora.handle, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server_address(server), corpora
+    server.shutdown()
+    server.server_close()
+
+
+def test_server(server, sample_zip, sample_dir, tmp_path, monkeypatch, capsys):
+    address, corpora = server
+    for argv in [
+        ["stats", str(sample_zip)],
+        ["stats", str(sample_zip), "--participants", "MOT", "--participant", "MOT"],
+        ["ngrams", str(sample_dir), "-n", "3", "--json"],
+        ["search", str(sample_zip), "--lemma", "cookie", "--files", "0106"],
+        ["search", str(sample_zip), "--word", "dog", "--participants", "CHI"],
+    ]:
+        assert main(argv) == 0
+        expected = capsys.readouterr()
+        assert main([*argv, "--server", address]) == 0
+        assert capsys.readouterr() == expected
+
+    # Each data source is read once, for all the files and participants.
+    stats = corpora.collection.stats()
+    assert (stats.misses, stats.hits) == (2, 3)
+
+    # Relative paths are from the directory of the client.
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("PYLANGACQ_SERVER", address)
+    argv = ["convert", sample_zip.name, "out", "--to", "conllu", "--workers", "1"]
+    assert main(argv) == 0
+    assert (tmp_path / "out" / "010600.conllu").exists()
+
+    assert main(["search", sample_zip.name]) == 1
+    assert "pylangacq: error:" in capsys.readouterr().err
+
+
+def test_concurrent_requests(server, sample_zip):
+    address, corpora = server
+    request = {
+        "args": {
+            "command": "stats",
+            "source": str(sample_zip),
+            "files": None,
+            "participants": None,
+            "cache": False,
+            "json": True,
+            "measures": ["mlum"],
+            "participant": "CHI",
+        }
+    }
+    results = []
+
+    def query():
+        results.append(send(address, request))
+
+    threads = [threading.Thread(target=query) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len({json.dumps(r) for r in results}) == 1
+    assert results[0]["status"] == 0
+    assert corpora.collection.stats().misses == 1
+
+    assert send(address, {"args": {"command": "rm"}})["status"] == 2
+
+
+def test_invalid_requests(server, sample_zip, tmp_path):
+    address, corpora = server
+    source = str(sample_zip)
+    for request in [
+        [],
+        {"args": None},
+        {"args": {"command": "stats"}},
+        {"args": {"command": "stats", "source": [source]}},
+        {"args": {"command": "stats", "source": source, "foo": 1}},
+        {"args": {"command": "convert", "source": source}},
+    ]:
+        response = send(address, request)
+        assert response["status"] == 2
+        assert response["stderr"].startswith("Invalid request")
+
+    # The options left out have their default values.
+    ok = send(address, {"args": {"command": "ngrams", "source": source}})
+    assert ok["status"] == 0
+    assert ok["stdout"].startswith("2\tthe dog\n")
+
+    # Any other error is an error response, and the server keeps serving.
+    response = send(address, {"args": {"command": "ngrams", "source": source, "n": []}})
+    assert response["status"] == 1
+    assert response["stderr"].startswith("Server error: TypeError")
+    assert send(address, {"args": {"command": "ngrams", "source": source}}) == ok
+
+    # A source that can't be read isn't kept.
+    missing = str(tmp_path / "missing.zip")
+    response = send(address, {"args": {"command": "stats", "source": missing}})
+    assert response["status"] == 1
+    assert missing not in corpora.collection
+
+
+def test_views_of_evicted_corpora(sample_zip, sample_dir):
+    # Each corpus evicts the other.
+    corpora = _Corpora(pylangacq.CorpusCollection(max_memory=0), cache=False)
+    for source in [sample_zip, sample_dir]:
+        request = {
+            "args": {
+                "command": "ngrams",
+                "source": str(source),
+                "participants": ["CHI"],
+            }
+        }
+        assert corpora.handle(request)["status"] == 0
+        assert corpora.collection.loaded == [str(source)]
+        assert [key[0] for key in corpora._views] == [str(source)]
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Unix sockets only")
+def test_send_without_response(tmp_path):
+    path = tmp_path / "server.sock"
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.bind(str(path))
+        sock.listen()
+
+        def close():
+            connection, _ = sock.accept()
+            with connection, connection.makefile("rb") as f:
+                f.readline()
+
+        thread = threading.Thread(target=close, daemon=True)
+        thread.start()
+        with pytest.raises(OSError, match="without a response"):
+            send(f"unix:{path}", {"args": {"command": "rm"}})
+        thread.join()
+
+
+def test_http_server_refuses_requests():
+    corpora = _Corpora(pylangacq.CorpusCollection(), cache=False)
+    server = make_server(corpora.handle, port=0, token="secret")
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    address = server_address(server)
+    assert address.endswith("/?token=secret")
+    port = server.socket.getsockname()[1]
+    request = json.dumps({"args": {"command": "rm"}})
+
+    def post(headers):
+        connection = http.client.HTTPConnection("127.0.0.1", port)
+        try:
+            connection.request("POST", "/", body=request, headers=headers)
+            return connection.getresponse().status
+        finally:
+            connection.close()
+
+    json_type = {"Content-Type": "application/json"}
+    auth = {"Authorization": "Bearer secret"}
+    try:
+        assert post({**json_type, **auth}) == 200
+        assert post({"Content-Type": "text/plain", **auth}) == 415
+        assert post(json_type) == 401
+        assert post({**json_type, "Authorization": "Bearer wrong"}) == 401
+        assert post({**json_type, **auth, "Host": f"evil.example:{port}"}) == 403
+        assert post({**json_type, **auth, "Host": f"localhost:{port}"}) == 200
+
+        assert send(address, {"args": {"command": "rm"}})["status"] == 2
+        with pytest.raises(OSError, match="401"):
+            send(address.split("?")[0], {"args": {"command": "rm"}})
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Unix sockets only")
+def test_stale_socket(tmp_path):
+    corpora = _Corpora(pylangacq.CorpusCollection(), cache=False)
+    path = tmp_path / "server.sock"
+    # A socket file without a server listening on it.
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.bind(str(path))
+    server = make_server(corpora.handle, socket_path=path)
+    assert oct(path.stat().st_mode & 0o777) == oct(0o600)
+    try:
+        with pytest.raises(OSError, match="already listening"):
+            make_server(corpora.handle, socket_path=path)
+        assert path.exists()
+    finally:
+        server.server_close()
+
+    other = tmp_path / "other"
+    other.write_text("not a socket")
+    with pytest.raises(OSError):
+        make_server(corpora.handle, socket_path=other)
+    assert other.read_text() == "not a socket"
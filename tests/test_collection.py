@@ -0,0 +1,188 @@
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import pylangacq
+from pylangacq._collection import estimate_size
+
+
+def test_lazy_loading(sample_zip, sample_dir, tmp_path):
+    collection = pylangacq.CorpusCollection(
+        {"zip": sample_zip, "dir": sample_dir}, max_memory=None
+    )
+    collection.add("missing", str(tmp_path / "missing.zip"))
+    assert collection.names == ["zip", "dir", "missing"]
+    assert len(collection) == 3 and "dir" in collection
+    assert collection.loaded == []
+
+    chat = collection["zip"]
+    assert chat.words() == pylangacq.read_chat(sample_zip).words()
+    assert collection["zip"] is chat
+    assert collection.loaded == ["zip"]
+    stats = collection.stats()
+    assert (stats.hits, stats.misses, stats.n_entries) == (1, 1, 1)
+    assert stats.size == estimate_size(chat) > 0
+    chat.word_ids()
+    assert collection.stats().vocab_size == len(chat.vocab) > 0
+
+    with pytest.raises(OSError):
+        collection["missing"]
+    with pytest.raises(KeyError):
+        collection["foo"]
+
+
+def test_options(sample_zip):
+    collection = pylangacq.CorpusCollection(
+        {"chi": sample_zip}, filter_participants="CHI"
+    )
+    collection.add("all", sample_zip)
+    chi = pylangacq.read_chat(sample_zip, filter_participants="CHI")
+    assert collection["chi"].words() == chi.words()
+    assert collection["all"].words() == pylangacq.read_chat(sample_zip).words()
+
+
+def test_lru_eviction(sample_zip, sample_dir):
+    size = estimate_size(pylangacq.read_chat(sample_zip))
+    collection = pylangacq.CorpusCollection(
+        {"a": sample_zip, "b": sample_dir, "c": sample_zip}, max_memory=2 * size
+    )
+    collection["a"]
+    collection["b"]
+    collection["a"]
+    assert collection.loaded == ["b", "a"]
+    collection["c"]
+    assert collection.loaded == ["a", "c"]
+    assert collection.stats().evictions == 1
+
+    # A corpus over the budget by itself is still kept until the next one.
+    collection.max_memory = 0
+    collection["b"]
+    assert collection.loaded == ["b"]
+    collection.unload()
+    assert collection.loaded == []
+    assert collection.stats().evictions == 4
+
+
+def _data(chat):
+    return (
+        chat.file_paths,
+        chat.headers(),
+        chat.ages(),
+        chat.participants(),
+        chat.utterances(),
+        chat.words(),
+    )
+
+
+@pytest.mark.parametrize("participants", ["CHI", "MOT"])
+def test_evicted_corpus_read_again(sample_zip, participants):
+    collection = pylangacq.CorpusCollection(
+        {"eve": sample_zip}, filter_participants=participants
+    )
+    expected = _data(collection["eve"])
+    collection.unload("eve")
+    chat = collection["eve"]
+    assert collection.stats().misses == 2
+    assert _data(chat) == expected
+
+
+def test_spill_to_snapshots(sample_zip, tmp_path):
+    spill_dir = tmp_path / "spill"
+    collection = pylangacq.CorpusCollection(
+        {"eve": sample_zip}, spill_dir=spill_dir, filter_participants="CHI"
+    )
+    expected = _data(collection["eve"])
+    collection.unload("eve")
+    (snapshot,) = spill_dir.iterdir()
+
+    chat = collection["eve"]
+    assert chat._pending is not None
+    assert _data(chat) == expected
+    assert chat.mlum() == pylangacq.read_chat(sample_zip).mlum()
+
+    collection.remove("eve")
+    assert not snapshot.exists()
+    assert collection.names == []
+
+
+@pytest.mark.parametrize("lazy_tiers", [False, True])
+def test_spill_keeps_parse_options(sample_xmor_strs, tmp_path, lazy_tiers):
+    path = tmp_path / "xmor.zip"
+    with zipfile.ZipFile(path, "w") as f:
+        for i, data in enumerate(sample_xmor_strs):
+            f.writestr(f"{i}.cha", data)
+    collection = pylangacq.CorpusCollection(
+        spill_dir=tmp_path / "spill", lazy_tiers=lazy_tiers
+    )
+    for name, options in [
+        ("xmor", {"mor_tier": "%xmor", "gra_tier": "%xgra"}),
+        ("none", {"mor_tier": None, "gra_tier": None}),
+    ]:
+        collection.add(name, path, **options)
+        expected = pylangacq.read_chat(path, **options)
+        assert collection[name].mlum() == expected.mlum()
+        collection.unload(name)
+        reloaded = collection[name]
+        assert reloaded._pending is not None
+        assert reloaded.mlum() == expected.mlum()
+        assert reloaded.to_conllu_strs() == expected.to_conllu_strs()
+    assert collection["xmor"].mlum() != collection["none"].mlum()
+
+
+def test_spill_keeps_participant_filter(sample_zip, tmp_path):
+    collection = pylangacq.CorpusCollection(
+        {"eve": sample_zip}, spill_dir=tmp_path / "spill", filter_participants="MOT"
+    )
+    chat = collection["eve"]
+    before = chat.headers(), chat.ages(), chat.participants(), chat.utterances()
+    assert before[1] == [None, None]
+    collection.unload("eve")
+    chat = collection["eve"]
+    assert chat._pending is not None
+    assert (chat.headers(), chat.ages(), chat.participants(), chat.utterances()) == (
+        before
+    )
+
+
+def test_queries_across_corpora(sample_zip, sample_dir):
+    collection = pylangacq.CorpusCollection(
+        {"Eve-zip": sample_zip, "Eve-dir": sample_dir, "Other": sample_zip}
+    )
+    assert collection.select("Eve.*") == ["Eve-zip", "Eve-dir"]
+    assert collection.select(["Other", "Eve-dir"]) == ["Eve-dir", "Other"]
+
+    counts = collection.map(
+        lambda chat: len(chat.words()), "Eve.*", files="020000", participants="CHI"
+    )
+    assert counts == {"Eve-zip": 9, "Eve-dir": 9}
+    assert [name for name, _ in collection.items("Other")] == ["Other"]
+
+    table = collection.measures_table(["mlum"], "Eve.*", by="file")
+    assert table["corpus"] == ["Eve-zip", "Eve-zip", "Eve-dir", "Eve-dir"]
+    assert table["file"] == [0, 1, 2, 3]
+    assert table["mlum"] == collection["Eve-zip"].mlum() * 2
+    assert len(table.file_paths) == 4
+
+    empty = collection.measures_table(["mlum"], "nothing")
+    assert len(empty) == 0 and "mlum" in empty.columns
+
+
+def test_concurrent_access_reads_once(sample_zip):
+    collection = pylangacq.CorpusCollection({"eve": sample_zip})
+    with ThreadPoolExecutor(8) as executor:
+        chats = list(executor.map(lambda _: collection["eve"], range(16)))
+    assert all(chat is chats[0] for chat in chats)
+    assert collection.stats().misses == 1
+
+
+def test_invalid_arguments(sample_zip):
+    with pytest.raises(ValueError):
+        pylangacq.CorpusCollection(max_memory=-1)
+    collection = pylangacq.CorpusCollection({"eve": sample_zip})
+    with pytest.raises(ValueError):
+        collection.add("eve", sample_zip)
+    with pytest.raises(KeyError):
+        collection.remove("foo")
+    with pytest.raises(KeyError):
+        collection.unload("foo")
@@ -0,0 +1,85 @@
+import math
+
+import pytest
+
+import pylangacq
+
+np = pytest.importorskip("numpy")
+
+
+def _contingency(chat):
+    bigrams = dict(chat.word_ngrams(2).items(order=2))
+    first, second = {}, {}
+    for (w1, w2), count in bigrams.items():
+        first[w1] = first.get(w1, 0) + count
+        second[w2] = second.get(w2, 0) + count
+    return bigrams, first, second, sum(bigrams.values())
+
+
+@pytest.mark.parametrize("measure", ["pmi", "log_likelihood", "t_score", "dice"])
+def test_collocations(sample_chat, measure):
+    bigrams, first, second, total = _contingency(sample_chat)
+    collocations = sample_chat.collocations(measure)
+    assert len(collocations) == len(bigrams)
+    for (w1, w2), score in collocations.items():
+        o = bigrams[w1, w2]
+        r, c = first[w1], second[w2]
+        e = r * c / total
+        if measure == "pmi":
+            expected = math.log2(o / e)
+        elif measure == "t_score":
+            expected = (o - e) / math.sqrt(o)
+        elif measure == "dice":
+            expected = 2 * o / (r + c)
+        else:
+            cells = [
+                (o, r, c),
+                (r - o, r, total - c),
+                (c - o, total - r, c),
+                (total - r - c + o, total - r, total - c),
+            ]
+            expected = 2 * sum(
+                o_ij * math.log(o_ij * total / (r_i * c_j))
+                for o_ij, r_i, c_j in cells
+                if o_ij
+            )
+        assert score == pytest.approx(expected)
+
+    items = list(zip(collocations.ngrams(), collocations.scores.tolist()))
+    counts = collocations.counts.tolist()
+    assert items == collocations.items() == list(collocations)
+    assert [(-s, -n, ngram) for (ngram, s), n in zip(items, counts)] == sorted(
+        (-s, -n, ngram) for (ngram, s), n in zip(items, counts)
+    )
+    assert collocations[0] == items[0]
+
+
+def test_min_count_and_top_k(sample_chat):
+    everything = sample_chat.collocations("t_score")
+    frequent = sample_chat.collocations("t_score", min_count=2)
+    assert set(frequent.ngrams()) == {
+        ngram for ngram, count in sample_chat.word_ngrams(2).items(order=2) if count > 1
+    }
+    # The word counts are from all bigrams, not only the frequent ones.
+    assert dict(frequent.items()).items() <= dict(everything.items()).items()
+
+    top = sample_chat.collocations("pmi", top_k=3)
+    assert top.items() == sample_chat.collocations("pmi").items()[:3]
+    assert top.vocab.decode(top.first) == [w1 for w1, _ in top.ngrams()]
+    assert top.counts.dtype == np.int64
+
+
+def test_from_ngrams(sample_chat):
+    ngrams = sample_chat.word_ngrams(2)
+    collocations = pylangacq.Collocations.from_ngrams(ngrams, "dice", top_k=5)
+    assert collocations.items() == sample_chat.collocations("dice", top_k=5).items()
+
+    with pytest.raises(ValueError):
+        pylangacq.Collocations.from_ngrams(sample_chat.word_ngrams(3))
+
+
+def test_invalid_arguments(sample_chat):
+    with pytest.raises(ValueError):
+        sample_chat.collocations("chi_square")
+    with pytest.raises(ValueError):
+        sample_chat.collocations(top_k=0)
@@ -0,0 +1,43 @@
+import pytest
+
+import pylangacq
+
+
+def test_to_columns(sample_chat):
+    columns = sample_chat.to_columns()
+    tokens = sample_chat.tokens()
+    assert len(columns) == len(tokens)
+    assert columns.decode("word") == [token.word for token in tokens]
+    assert columns.decode("pos") == [token.pos for token in tokens]
+    assert columns.decode("mor") == [token.mor for token in tokens]
+    assert columns.decode("gra_rel") == [token.gra.rel for token in tokens]
+    assert list(columns["gra_head"]) == [token.gra.head for token in tokens]
+    assert columns.vocabularies["participant"] == ["CHI", "MOT"]
+    assert list(columns["file"]) == [0] * 16 + [1] * 14
+    assert list(columns["utterance"][:4]) == [0, 0, 0, 1]
+    assert list(columns["time_start"][:4]) == [-1, -1, -1, 0]
+    assert list(columns["time_end"][:4]) == [-1, -1, -1, 1500]
+
+
+def test_to_columns_shares_codes_for_repeated_strings(sample_chat):
+    columns = sample_chat.to_columns()
+    words = columns.vocabularies["word"]
+    assert len(words) == len(set(words))
+    assert columns["word"].count(words.index("the")) == 2
+
+
+def test_to_columns_without_mor(sample_dir):
+    chat = pylangacq.CHAT.from_dir(sample_dir, mor_tier=None, gra_tier=None)
+    columns = chat.to_columns()
+    assert set(columns["pos"]) == {-1}
+    assert set(columns["gra_dep"]) == {-1}
+    assert columns.vocabularies["pos"] == []
+
+
+def test_to_arrow(sample_chat):
+    pytest.importorskip("pyarrow")
+    table = sample_chat.to_arrow()
+    assert table.num_rows == len(sample_chat.words())
+    assert table.column("word").to_pylist() == sample_chat.words()
+    assert table.column("file").to_pylist()[-1] == "Eve/020000.cha"
+    assert table.column("time_start").to_pylist()[:4] == [None, None, None, 0]
@@ -0,0 +1,100 @@
+import re
+
+import pytest
+
+import pylangacq
+
+_FORMATS = {
+    "chat": "to_strs",
+    "conllu": "to_conllu_strs",
+    "elan": "to_elan_strs",
+    "srt": "to_srt_strs",
+    "textgrid": "to_textgrid_strs",
+}
+
+
+def _tier_ids(eaf):
+    return sorted(re.findall(r'TIER_ID="([^"]+)"', eaf))
+
+
+@pytest.mark.parametrize("xmor", [False, True])
+@pytest.mark.parametrize("workers", [1, 2])
+def test_convert(sample_chat, sample_xmor_strs, tmp_path, workers, xmor):
+    if xmor:
+        # Worker processes must parse the tiers under these names, too.
+        sample_chat = pylangacq.CHAT.from_strs(
+            sample_xmor_strs,
+            ids=sample_chat.file_paths,
+            mor_tier="%xmor",
+            gra_tier="%xgra",
+        )
+    progress = []
+    conversions = sample_chat.convert(
+        list(_FORMATS),
+        tmp_path,
+        workers=workers,
+        progress=lambda done, total: progress.append((done, total)),
+    )
+    assert progress == [(1, 2), (2, 2)]
+    assert [(c.file_path, c.format) for c in conversions] == [
+        (file_path, format_)
+        for file_path in sample_chat.file_paths
+        for format_ in _FORMATS
+    ]
+    for conversion in conversions:
+        assert conversion.text is None
+        i = sample_chat.file_paths.index(conversion.file_path)
+        expected = getattr(sample_chat, _FORMATS[conversion.format])()[i]
+        with open(conversion.path, encoding="utf-8") as f:
+            text = f.read()
+        if conversion.format == "elan":
+            # rustling doesn't keep the order of the dependent tiers
+            # across parses.
+            assert _tier_ids(text) == _tier_ids(expected)
+        else:
+            assert text == expected
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted(
+        f"{name}.{ext}"
+        for name in ("010600", "020000")
+        for ext in ("cha", "conllu", "eaf", "srt", "TextGrid")
+    )
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_iter_convert(sample_chat, workers):
+    chi = sample_chat.filter(participants="CHI")
+    conversions = list(chi.iter_convert("conllu", workers=workers))
+    assert [c.text for c in conversions] == chi.to_conllu_strs()
+    assert [c.name for c in conversions] == ["010600.conllu", "020000.conllu"]
+    assert all(c.path is None for c in conversions)
+
+
+def test_output_names(sample_chat, sample_dir, tmp_path):
+    chat = pylangacq.CHAT.from_strs(
+        sample_chat.to_strs(), ids=["Adam/010600.cha", "Eve/010600.cha"]
+    )
+    chat.convert("srt", tmp_path, workers=1)
+    assert (tmp_path / "Adam" / "010600.srt").exists()
+    assert (tmp_path / "Eve" / "010600.srt").exists()
+
+    chat = pylangacq.CHAT.from_strs(sample_chat.to_strs())
+    conversions = chat.convert("elan", tmp_path, workers=1, names=["a", "b/c"])
+    assert [c.name for c in conversions] == ["a.eaf", "b/c.eaf"]
+    conversions = list(chat.iter_convert("elan", workers=1))
+    assert [c.name for c in conversions] == ["0001.eaf", "0002.eaf"]
+
+    conversions = list(pylangacq.read_chat(sample_dir).iter_convert("chat", workers=1))
+    assert [c.name for c in conversions] == ["010600.cha", "020000.cha"]
+
+
+def test_invalid_arguments(sample_chat, tmp_path):
+    with pytest.raises(ValueError):
+        sample_chat.convert("docx", tmp_path)
+    with pytest.raises(ValueError):
+        sample_chat.convert([], tmp_path)
+    with pytest.raises(ValueError):
+        sample_chat.convert("srt", tmp_path, workers=0)
+    with pytest.raises(ValueError):
+        sample_chat.convert("srt", tmp_path, names=["a", "a"])
+    with pytest.raises(ValueError):
+        sample_chat.iter_convert("srt", names=["a"])
@@ -0,0 +1,72 @@
+import pytest
+
+
+def _naive(chat, relation, head_pos, dependent_pos):
+    matches = []
+    for i_file, utterances in enumerate(chat.tokens(by_utterance=True, by_file=True)):
+        for i_utterance, tokens in enumerate(utterances):
+            by_dep = {token.gra.dep: i for i, token in enumerate(tokens) if token.gra}
+            for i, token in enumerate(tokens):
+                if not token.gra or token.gra.rel != relation:
+                    continue
+                head = by_dep.get(token.gra.head)
+                if head is None or tokens[head].pos != head_pos:
+                    continue
+                if token.pos == dependent_pos:
+                    matches.append((i_file, i_utterance, (head, i)))
+    return matches
+
+
+def test_find_dependencies(sample_chat):
+    matches = sample_chat.find_dependencies("[pos=v] -OBJ-> [pos=pro*]")
+    assert [m.match for m in matches] == [("likes", "you"), ("see", "him")]
+    first = matches[0]
+    assert (first.file, first.utterance, first.participant) == (1, 1, "MOT")
+    assert first.positions == (2, 3)
+    assert first.span == (2, 4)
+    assert first.words == ("the", "dog", "likes", "you", ".")
+
+
+@pytest.mark.parametrize(
+    "relation, head_pos, dependent_pos",
+    [("OBJ", "v", "n"), ("SUBJ", "v", "pro:sub"), ("DET", "n", "det:art")],
+)
+def test_same_as_walking_the_tree(sample_chat, relation, head_pos, dependent_pos):
+    matches = sample_chat.find_dependencies(
+        f"[pos={head_pos}] -{relation}-> [pos={dependent_pos}]"
+    )
+    assert [(m.file, m.utterance, m.positions) for m in matches] == _naive(
+        sample_chat, relation, head_pos, dependent_pos
+    )
+
+
+def test_pattern_language(sample_chat):
+    def find(pattern):
+        return [m.match for m in sample_chat.find_dependencies(pattern)]
+
+    assert find("[lemma=want] -OBJ-> [] -QUANT-> []") == [("want", "cookies", "more")]
+    assert find("[] <-SUBJ- [pos=v lemma=see]") == [("I", "see")]
+    assert find("[word=dog] <-- []") == [("dog", "running"), ("dog", "likes")]
+    assert find("[pos=v & lemma=want] -SUBJ|OBJ-> [word='you']") == [("want", "you")]
+    assert find('[pos="aux"] <-AU*- []') == [("is", "running")]
+    assert find("[pos=v] -OBJ-> [pos=adj]") == []
+
+
+def test_participants(sample_chat):
+    pattern = "[] -SUBJ-> [pos=pro*]"
+    mot = sample_chat.filter(participants="MOT").find_dependencies(pattern)
+    assert [(m.file, m.utterance, m.match) for m in mot] == [
+        (0, 0, ("want", "you")),
+        (0, 1, ("go", "you")),
+    ]
+    chi = sample_chat.find_dependencies(pattern, participant="CHI")
+    assert [m.match for m in chi] == [("want", "I"), ("see", "I")]
+
+
+@pytest.mark.parametrize(
+    "pattern",
+    ["[pos=v]", "[pos=v] -OBJ->", "-OBJ-> [pos=n]", "[tag=v] --> []", "[pos=v] [n]"],
+)
+def test_invalid_patterns(sample_chat, pattern):
+    with pytest.raises(ValueError):
+        sample_chat.find_dependencies(pattern)
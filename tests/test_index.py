@@ -0,0 +1,79 @@
+import pytest
+
+import pylangacq
+
+
+def test_search_word(sample_chat):
+    hits = sample_chat.search(word="want")
+    assert [(h.file, h.utterance, h.position, h.participant) for h in hits] == [
+        (0, 1, 1, "MOT"),
+        (0, 2, 1, "CHI"),
+    ]
+    assert hits[0].words == ("you", "want", "more", "cookies", "?")
+    assert hits[0].match == ("want",)
+
+
+def test_search_boolean_queries(sample_chat):
+    hits = sample_chat.search(lemma="cookie", participant="CHI")
+    assert [h.words[h.position] for h in hits] == ["cookie", "cookies"]
+    hits = sample_chat.search(lemma=["dog", "cookie"], pos="n", participant="MOT")
+    assert [h.match for h in hits] == [("cookies",), ("dog",)]
+    assert sample_chat.search(word="dog", pos="v") == []
+
+
+def test_search_phrase(sample_chat):
+    hits = sample_chat.search(phrase=["the", "dog"])
+    assert [(h.file, h.utterance, h.participant) for h in hits] == [
+        (1, 0, "CHI"),
+        (1, 1, "MOT"),
+    ]
+    assert hits[0].match == ("the", "dog")
+    assert sample_chat.search(phrase=["dog", "the"]) == []
+
+
+def test_search_invalid_queries(sample_chat):
+    with pytest.raises(ValueError):
+        sample_chat.search()
+    with pytest.raises(ValueError):
+        sample_chat.search(word="dog", phrase=["the", "dog"])
+
+
+def test_concordance(sample_chat):
+    lines = sample_chat.concordance("want", window=1)
+    assert [str(line) for line in lines] == ["you  want  more", "I  want  cookies"]
+
+
+def test_index_is_shared_by_filtered_readers(sample_chat):
+    sample_chat.build_index()
+    chi = sample_chat.filter(participants="CHI")
+    assert chi._index[0].index is sample_chat._index[0].index
+    hits = chi.search(word="want")
+    assert [(h.file, h.utterance) for h in hits] == [(0, 1)]
+    assert chi.words(by_utterance=True, by_file=True)[0][1][1] == "want"
+
+    second = sample_chat.filter(files="0200")
+    assert second._index[0] is sample_chat._index[1]
+    assert [(h.file, h.utterance) for h in second.search(word="dog")] == [
+        (0, 0),
+        (0, 1),
+    ]
+    assert sample_chat[1]._index[0] is sample_chat._index[1]
+
+
+def test_index_is_updated_when_files_change(sample_chat):
+    sample_chat.build_index()
+    popped = sample_chat.pop()
+    assert len(sample_chat._index) == 1
+    assert sample_chat.search(word="dog") == []
+    assert len(popped.search(word="dog")) == 2
+    sample_chat.append(popped)
+    assert sample_chat._index[1] is None
+    assert sample_chat.search(word="dog")[0].file == 1
+
+
+def test_search_on_cached_reader(sample_zip, tmp_path):
+    cache = pylangacq.ParseCache(tmp_path)
+    cold = pylangacq.read_chat(sample_zip, cache=cache)
+    warm = pylangacq.read_chat(sample_zip, cache=cache).filter(participants="CHI")
+    assert warm.search(word="dog") == cold.filter(participants="CHI").search(word="dog")
+    assert warm._pending is not None
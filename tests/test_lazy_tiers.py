@@ -0,0 +1,67 @@
+import pytest
+
+import pylangacq
+from pylangacq._measures import FileMeasures
+
+
+@pytest.fixture
+def lazy_chat(sample_zip):
+    return pylangacq.read_chat(sample_zip, lazy_tiers=True)
+
+
+def test_words_without_tiers(lazy_chat, sample_zip):
+    chat = pylangacq.read_chat(sample_zip)
+    assert lazy_chat.words() == chat.words()
+    assert lazy_chat.headers() == chat.headers()
+    assert lazy_chat.to_strs() == chat.to_strs()
+    assert lazy_chat._lazy.unparsed == [True, True]
+
+
+@pytest.mark.parametrize(
+    "method",
+    ["tokens", "utterances", "mlum", "ipsyn", "to_conllu_strs", "to_columns"],
+)
+def test_tiers_parsed_on_demand(lazy_chat, sample_zip, method):
+    chat = pylangacq.read_chat(sample_zip)
+    assert getattr(lazy_chat, method)() == getattr(chat, method)()
+    assert lazy_chat._lazy is None
+
+
+def test_tiers_parsed_per_file(lazy_chat, sample_zip):
+    chat = pylangacq.read_chat(sample_zip)
+    second = lazy_chat[1]
+    assert second.tokens() == chat[1].tokens()
+    assert lazy_chat._lazy.unparsed == [True, True]
+
+    # With the measure memoized for the first file,
+    # only the second file's tiers are parsed.
+    lazy_chat._measures = [FileMeasures(), FileMeasures()]
+    lazy_chat[0].mlum()
+    assert lazy_chat.mlum() == chat.mlum()
+    assert lazy_chat._lazy.unparsed == [True, False]
+    assert lazy_chat.tokens() == chat.tokens()
+    assert lazy_chat._lazy is None
+
+
+def test_filter(sample_zip):
+    lazy_chat = pylangacq.read_chat(
+        sample_zip, filter_files="0200", lazy_tiers=True
+    ).filter(participants="CHI")
+    chat = pylangacq.read_chat(sample_zip, filter_files="0200").filter(
+        participants="CHI"
+    )
+    assert lazy_chat._lazy is not None
+    assert lazy_chat.tokens() == chat.tokens()
+    assert lazy_chat.mlum() == chat.mlum()
+
+
+def test_from_strs_without_tiers(sample_chat):
+    chat = pylangacq.CHAT.from_strs(
+        sample_chat.to_strs(), mor_tier=None, gra_tier=None, lazy_tiers=True
+    )
+    assert chat._lazy is None
+
+
+def test_incremental_from_dir(sample_dir):
+    with pytest.raises(ValueError):
+        pylangacq.CHAT.from_dir(sample_dir, incremental=True, lazy_tiers=True)
@@ -0,0 +1,133 @@
+import collections
+
+import pytest
+
+import pylangacq
+
+
+def _bigrams(chat):
+    return chat.word_ngrams(2)
+
+
+def _word_counts(chat):
+    return collections.Counter(chat.words())
+
+
+def _mlum(chat):
+    return chat.mlum()
+
+
+def _n_files(chat):
+    return chat.n_files
+
+
+def _header_codes(chat):
+    return [[p.code for p in ps] for ps in chat.participants(by_file=True)]
+
+
+class _SumReducer(pylangacq.Reducer):
+    def initial(self):
+        return 0
+
+    def merge(self, left, right):
+        return left + right
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_map_reduce_builtin_reducers(sample_chat, workers):
+    bigrams = sample_chat.map_reduce(_bigrams, "ngrams", workers=workers)
+    assert bigrams == sample_chat.word_ngrams(2).to_counter()
+    counts = sample_chat.map_reduce(_word_counts, "counter", workers=workers)
+    assert counts == collections.Counter(sample_chat.words())
+    mlum = sample_chat.map_reduce(_mlum, "measures", workers=workers)
+    assert mlum == sample_chat.mlum()
+
+
+def test_map_reduce_keeps_participant_filters(sample_chat):
+    chi = sample_chat.filter(participants="CHI")
+    counts = chi.map_reduce(_word_counts, "counter", workers=2)
+    assert counts == collections.Counter(chi.words())
+    assert "you" not in counts
+
+
+def test_map_reduce_keeps_silent_participants(sample_chat):
+    # FAT is in the headers of the first file, without any utterances.
+    first, second = sample_chat.to_strs()
+    first = first.replace("MOT Mother", "MOT Mother, FAT Father").replace(
+        "@ID:\teng|test|MOT|||||Mother|||\n",
+        "@ID:\teng|test|MOT|||||Mother|||\n@ID:\teng|test|FAT|||||Father|||\n",
+    )
+    chat = pylangacq.CHAT.from_strs([first, second], ids=sample_chat.file_paths)
+    for reader in [
+        chat,
+        chat.filter(participants="CHI|FAT"),
+        chat.filter(files="0200"),
+    ]:
+        codes = reader.map_reduce(_header_codes, lambda a, b: a + b, workers=2)
+        assert codes == _header_codes(reader)
+    assert _header_codes(chat)[0] == ["CHI", "MOT", "FAT"]
+
+
+def test_combine_different_tiers(sample_chat, sample_xmor_strs):
+    xmor = pylangacq.CHAT.from_strs(
+        sample_xmor_strs, ids=["a", "b"], mor_tier="%xmor", gra_tier="%xgra"
+    )
+    for combine in [
+        lambda: sample_chat.append(xmor),
+        lambda: sample_chat.append_left(xmor),
+        lambda: sample_chat.extend([xmor]),
+        lambda: sample_chat.extend_left([xmor]),
+        lambda: sample_chat + xmor,
+        lambda: pylangacq.CHAT().extend([sample_chat, xmor]),
+    ]:
+        with pytest.raises(ValueError, match="mor_tier"):
+            combine()
+    assert sample_chat.n_files == 2
+
+    # Empty readers take the options of the data added.
+    combined = pylangacq.CHAT()
+    combined.extend([pylangacq.CHAT(), xmor])
+    combined.append(xmor[:1])
+    assert combined.map_reduce(_mlum, "measures", workers=2) == (
+        xmor.mlum() + xmor[:1].mlum()
+    )
+
+
+@pytest.mark.parametrize("mor_tier", ["%xmor", None])
+def test_map_reduce_keeps_parse_options(sample_chat, sample_xmor_strs, mor_tier):
+    if mor_tier is None:
+        strs = sample_chat.to_strs()
+        options = {"mor_tier": None, "gra_tier": None}
+    else:
+        strs = sample_xmor_strs
+        options = {"mor_tier": "%xmor", "gra_tier": "%xgra"}
+    chat = pylangacq.CHAT.from_strs(strs, ids=["a", "b"], **options)
+    assert chat.map_reduce(_mlum, "measures", workers=1) == chat.mlum()
+    assert chat.map_reduce(_mlum, "measures", workers=2) == chat.mlum()
+    # The same after filtering, or from a reader put together from others.
+    assert chat[1:].map_reduce(_mlum, "measures", workers=2) == chat[1:].mlum()
+    combined = pylangacq.CHAT()
+    combined.extend([chat[0], chat[1]])
+    assert combined.map_reduce(_mlum, "measures", workers=2) == chat.mlum()
+
+
+def test_map_reduce_custom_reducers(sample_chat):
+    assert sample_chat.map_reduce(_n_files, _SumReducer(), workers=2) == 2
+    assert sample_chat.map_reduce(_n_files, lambda a, b: a + b, workers=2) == 2
+    assert sample_chat.map_reduce(_n_files, max, workers=1, chunk_files=2) == 2
+
+    class NoMerge(pylangacq.Reducer):
+        def initial(self):
+            return 0
+
+    with pytest.raises(TypeError):
+        NoMerge()
+
+
+def test_map_reduce_edge_cases(sample_chat):
+    assert pylangacq.CHAT().map_reduce(_word_counts, "counter") == {}
+    assert pylangacq.CHAT().map_reduce(_n_files, _SumReducer()) == 0
+    with pytest.raises(ValueError):
+        sample_chat.map_reduce(_n_files, "median")
+    with pytest.raises(ValueError):
+        sample_chat.map_reduce(_n_files, "counter", workers=0)
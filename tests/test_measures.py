@@ -0,0 +1,117 @@
+import pytest
+
+import pylangacq
+
+
+def test_measures_are_memoized(sample_chat):
+    assert sample_chat.mlum() == [2.5, 3.5]
+    assert sample_chat.measure_cache_info() == pylangacq.MeasureCacheInfo(
+        hits=0, misses=2, n_entries=2
+    )
+    assert sample_chat.mlu() == [2.5, 3.5]
+    assert sample_chat.measure_cache_info().hits == 2
+    sample_chat.mlum(n=None)
+    assert sample_chat.measure_cache_info().n_entries == 4
+
+
+def test_measure_cache_follows_file_changes(sample_chat):
+    expected = sample_chat.ipsyn()
+    popped = sample_chat.pop_left()
+    assert popped.measure_cache_info().n_entries == 1
+    assert popped.ipsyn() == expected[:1]
+    assert popped.measure_cache_info().hits == 1
+    sample_chat.append_left(popped)
+    assert sample_chat.measure_cache_info().n_entries == 1
+    assert sample_chat.ipsyn() == expected
+    assert sample_chat.measure_cache_info().misses == 3
+    sample_chat.clear()
+    assert sample_chat.measure_cache_info().n_entries == 0
+    assert sample_chat.ipsyn() == []
+
+
+def test_filter_reuses_measures(sample_chat):
+    sample_chat.mluw()
+    by_file = sample_chat.filter(files="020000")
+    assert by_file.mluw() == sample_chat.mluw()[1:]
+    assert by_file.measure_cache_info().misses == 0
+    by_participant = sample_chat.filter(participants="CHI")
+    assert by_participant.mluw() == sample_chat.mluw()
+    assert by_participant.measure_cache_info().misses == 0
+    # MOT is filtered out, so its results must not come from the parent.
+    assert by_participant.mluw(participant="MOT") == [0.0, 0.0]
+    assert sample_chat.mluw(participant="MOT") != [0.0, 0.0]
+
+
+def test_clear_measure_cache(sample_chat):
+    sample_chat.ttr()
+    view = sample_chat[:1]
+    view.clear_measure_cache()
+    assert view.measure_cache_info() == pylangacq.MeasureCacheInfo(0, 0, 0)
+    assert sample_chat.measure_cache_info().n_entries == 2
+    sample_chat.clear_measure_cache()
+    assert sample_chat.measure_cache_info().n_entries == 0
+
+
+def test_measures_table_by_file_and_participant(sample_chat):
+    table = sample_chat.measures_table(["mlum", "ipsyn"])
+    assert table["file"] == [0, 0, 1, 1]
+    assert table["participant"] == ["CHI", "MOT", "CHI", "MOT"]
+    ages = sample_chat.ages()
+    assert table["age"] == [ages[0], ages[0], ages[1], ages[1]]
+    assert table["mlum"][::2] == sample_chat.mlum()
+    assert table["mlum"][1::2] == sample_chat.mlum(participant="MOT")
+    assert table["ipsyn"][::2] == sample_chat.ipsyn()
+    assert table.rows()[1]["participant"] == "MOT"
+    assert table.file_paths == sample_chat.file_paths
+
+
+def test_measures_table_by_file(sample_chat):
+    table = sample_chat.measures_table("ttr", by="file")
+    assert list(table.columns) == ["file", "age", "ttr"]
+    assert table["ttr"] == sample_chat.ttr()
+    assert len(table) == 2
+
+
+@pytest.mark.parametrize(
+    "options",
+    [{}, {"lazy_tiers": True}, {"mor_tier": None, "gra_tier": None}, {"n": 1}],
+)
+def test_measures_table_in_one_pass(sample_chat, options):
+    text = sample_chat.to_strs()[0]
+    # A participant with utterances but no words, and another one without %mor.
+    extra = "*FAT:\txxx .\n*MOT:\tmore cookies please .\n@End\n"
+    strs = [text.replace("@End\n", extra), *sample_chat.to_strs()[1:]]
+    n = options.pop("n", None)
+    chat = pylangacq.CHAT.from_strs(strs, ids=sample_chat.file_paths, **options)
+    if n is not None:
+        chat = chat[:n]
+    measures = ["mlu", "mlum", "mluw", "ttr"]
+    table = chat.measures_table(measures)
+    for i, (file_index, code) in enumerate(zip(table["file"], table["participant"])):
+        for name in measures:
+            expected = getattr(chat._base, name)(participant=code)[file_index]
+            assert table[name][i] == expected
+    # Each measure of each participant and file is computed once.
+    n_codes = len(set(table["participant"]))
+    assert chat.measure_cache_info().misses == n_codes * chat.n_files * 3
+    assert chat.measures_table(measures)["ttr"] == table["ttr"]
+    assert chat.measure_cache_info().misses == n_codes * chat.n_files * 3
+
+
+def test_measures_table_invalid_arguments(sample_chat):
+    with pytest.raises(ValueError):
+        sample_chat.measures_table(["mlx"])
+    with pytest.raises(ValueError):
+        sample_chat.measures_table(by="participant")
+
+
+def test_measures_table_to_arrow(sample_chat):
+    pytest.importorskip("pyarrow")
+    table = sample_chat.measures_table(["mlum"]).to_arrow()
+    assert table.column("file").to_pylist() == [
+        "Eve/010600.cha",
+        "Eve/010600.cha",
+        "Eve/020000.cha",
+        "Eve/020000.cha",
+    ]
+    assert table.column("age").to_pylist() == [18.0, 18.0, 24.0, 24.0]
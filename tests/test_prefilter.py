@@ -0,0 +1,191 @@
+import os
+
+import pytest
+
+import pylangacq
+
+
+@pytest.fixture
+def sample_strs(sample_chat):
+    return sample_chat.to_strs()
+
+
+@pytest.mark.parametrize("age", ["1;06.00", "2;", "2;06", "2;06.", "2;06.15"])
+def test_age_range_matches_ages(sample_strs, age):
+    strs = [sample_strs[0].replace("1;06.00", age)]
+    in_months = pylangacq.CHAT.from_strs(strs).ages()[0].in_months()
+    assert pylangacq.CHAT.from_strs(strs, age_range=(in_months, in_months + 0.01))
+    assert not pylangacq.CHAT.from_strs(strs, age_range=(None, in_months))
+
+
+def test_participants(sample_zip):
+    chat = pylangacq.CHAT.from_zip(sample_zip, participants="CHI")
+    expected = pylangacq.CHAT.from_zip(sample_zip).filter(participants="CHI")
+    assert chat.utterances() == expected.utterances()
+    assert chat.mlum() == expected.mlum()
+    # The utterances filtered out were never parsed.
+    assert not any("*MOT:" in text for text in chat.to_strs())
+    assert all("@Comment" not in text for text in chat.to_strs())
+
+
+def test_exclude_participants(sample_chat, sample_strs):
+    chat = pylangacq.CHAT.from_strs(
+        sample_strs, ids=sample_chat.file_paths, exclude_participants=["CHI", "FAT"]
+    )
+    assert chat.utterances() == sample_chat.filter(participants="MOT").utterances()
+
+
+def test_participants_with_exclude_participants(sample_dir):
+    chat = pylangacq.CHAT.from_dir(
+        sample_dir, participants=".*", exclude_participants="M.*"
+    )
+    assert {u.participant for u in chat.utterances()} == {"CHI"}
+
+
+@pytest.mark.parametrize(
+    "age_range, expected",
+    [
+        ((None, None), [0, 1]),
+        ((18, None), [0, 1]),
+        ((18.5, None), [1]),
+        ((None, 24), [0]),
+        ((12, 18), []),
+    ],
+)
+def test_age_range(sample_chat, sample_strs, age_range, expected):
+    ids = sample_chat.file_paths
+    chat = pylangacq.CHAT.from_strs(sample_strs, ids=ids, age_range=age_range)
+    assert chat.file_paths == [ids[i] for i in expected]
+
+
+def test_age_range_without_age(sample_strs):
+    strs = [sample_strs[0].replace("1;06.00", "")]
+    assert not pylangacq.CHAT.from_strs(strs, age_range=(None, None))
+
+
+def test_from_files(sample_dir):
+    paths = pylangacq.CHAT.from_dir(sample_dir).file_paths
+    chat = pylangacq.CHAT.from_files(paths, participants="CHI", age_range=(20, 30))
+    assert chat.file_paths == paths[1:]
+    expected = pylangacq.CHAT.from_files(paths[1:]).filter(participants="CHI")
+    assert chat.words() == expected.words()
+
+
+def test_read_chat(sample_zip, sample_dir):
+    for path in (sample_zip, sample_dir):
+        chat = pylangacq.read_chat(path, filter_files="0200", filter_participants="CHI")
+        expected = pylangacq.read_chat(path).filter(files="0200", participants="CHI")
+        assert chat.utterances() == expected.utterances()
+
+        chat = pylangacq.read_chat(path, exclude_participants="CHI", age_range=(0, 24))
+        assert len(chat.file_paths) == 1
+        assert {u.participant for u in chat.utterances()} == {"MOT"}
+
+
+@pytest.mark.parametrize("lazy_tiers", [False, True])
+def test_read_chat_as_filter(sample_zip, sample_dir, lazy_tiers):
+    for path in (sample_zip, sample_dir):
+        expected = pylangacq.read_chat(path).filter(participants="MOT")
+        for kwargs in [
+            {"filter_participants": "MOT"},
+            {"exclude_participants": "CHI"},
+            {"filter_participants": "M.*|CHI", "exclude_participants": "CHI"},
+        ]:
+            chat = pylangacq.read_chat(path, lazy_tiers=lazy_tiers, **kwargs)
+            assert chat.ages() == expected.ages() == [None, None]
+            assert chat.participants() == expected.participants()
+            assert chat.headers() == expected.headers()
+            assert chat.utterances() == expected.utterances()
+            assert chat.mlum() == expected.mlum()
+            # The utterances filtered out are never parsed, nor kept as text.
+            assert all("*CHI:" not in text for text in chat.to_strs())
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"participants": "MOT"},
+        {"exclude_participants": "CHI"},
+        {"participants": "M.*|CHI", "exclude_participants": "CHI"},
+    ],
+)
+@pytest.mark.parametrize(
+    "constructor",
+    ["strs", "files", "dir", "incremental", "dir_cache", "zip", "zip_cache"],
+)
+def test_constructors_filter_headers(
+    sample_zip, sample_dir, sample_chat, sample_strs, tmp_path, constructor, kwargs
+):
+    expected = pylangacq.read_chat(
+        sample_zip,
+        filter_participants=kwargs.get("participants"),
+        exclude_participants=kwargs.get("exclude_participants"),
+    )
+    paths = pylangacq.CHAT.from_dir(sample_dir).file_paths
+    cache = pylangacq.ParseCache(tmp_path / "cache")
+    read = {
+        "strs": lambda: pylangacq.CHAT.from_strs(
+            sample_strs, ids=sample_chat.file_paths, **kwargs
+        ),
+        "files": lambda: pylangacq.CHAT.from_files(paths, **kwargs),
+        "dir": lambda: pylangacq.CHAT.from_dir(sample_dir, **kwargs),
+        "incremental": lambda: pylangacq.CHAT.from_dir(
+            sample_dir, incremental=True, **kwargs
+        ),
+        "dir_cache": lambda: pylangacq.CHAT.from_dir(sample_dir, cache=cache, **kwargs),
+        "zip": lambda: pylangacq.CHAT.from_zip(sample_zip, **kwargs),
+        "zip_cache": lambda: pylangacq.CHAT.from_zip(sample_zip, cache=cache, **kwargs),
+    }[constructor]
+    # Read twice, for the cached data to be read from the cache the second time.
+    for chat in [read(), read()]:
+        assert chat.headers() == expected.headers()
+        assert chat.participants() == expected.participants()
+        assert chat.ages() == expected.ages() == [None, None]
+        assert chat.utterances() == expected.utterances()
+
+
+def test_refresh_filters_headers(sample_dir):
+    first, _ = pylangacq.CHAT.from_dir(sample_dir).file_paths
+    chat = pylangacq.CHAT.from_dir(sample_dir, incremental=True, participants="MOT")
+    text = open(first, encoding="utf-8").read()
+    with open(first, "w", encoding="utf-8") as f:
+        f.write(text.replace("1;06.00", "1;09.00"))
+    stat = os.stat(first)
+    os.utime(first, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert chat.refresh().modified == [first]
+    expected = pylangacq.read_chat(sample_dir).filter(participants="MOT")
+    assert chat.headers() == expected.headers()
+    assert chat.ages() == [None, None]
+
+
+def test_cache_key(sample_zip, tmp_path):
+    cache = pylangacq.ParseCache(tmp_path / "cache")
+    filtered = pylangacq.read_chat(sample_zip, cache=cache, filter_participants="CHI")
+    unfiltered = pylangacq.read_chat(sample_zip, cache=cache)
+    assert len(filtered.utterances()) < len(unfiltered.utterances())
+    warm = pylangacq.read_chat(sample_zip, cache=cache, filter_participants="CHI")
+    assert warm.utterances() == filtered.utterances()
+
+
+def test_iter_chat(sample_zip):
+    chats = list(pylangacq.iter_chat(sample_zip, filter_participants="CHI"))
+    assert [u for c in chats for u in c.utterances()] == (
+        pylangacq.read_chat(sample_zip, filter_participants="CHI").utterances()
+    )
+
+
+def test_incremental_from_dir(sample_dir):
+    first, second = pylangacq.CHAT.from_dir(sample_dir).file_paths
+    chat = pylangacq.CHAT.from_dir(sample_dir, incremental=True, age_range=(20, None))
+    assert chat.file_paths == [second]
+    assert not chat.refresh()
+
+    # The first file is now within the age range.
+    text = open(first, encoding="utf-8").read()
+    with open(first, "w", encoding="utf-8") as f:
+        f.write(text.replace("1;06.00", "1;09.00"))
+    stat = os.stat(first)
+    os.utime(first, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    assert chat.refresh().modified == [first]
+    assert chat.file_paths == [first, second]
+    assert not chat.refresh()
@@ -0,0 +1,50 @@
+import json
+
+import pytest
+
+import pylangacq
+
+
+@pytest.mark.parametrize("source", ["sample_zip", "sample_dir"])
+def test_read_chat_with_profile(source, request):
+    path = request.getfixturevalue(source)
+    chat = pylangacq.read_chat(path, profile=True)
+    assert chat == pylangacq.read_chat(path)
+    profile = chat.profile
+    assert [f.path for f in profile.files] == chat.file_paths
+    assert [f.n_utterances for f in profile.files] == [4, 3]
+    assert [f.n_tokens for f in profile.files] == [16, 14]
+    assert all(f.n_bytes > 0 for f in profile.files)
+    assert set(profile.times) == {"read", "decode", "parse", "mor_gra", "combine"}
+    assert 0 <= profile.utilization <= 1
+    assert profile.slowest(1, stage="parse")[0] in profile.files
+    assert "2 files" in str(profile)
+    json.dumps(profile.to_dict())
+
+
+def test_read_chat_with_profile_hook(sample_zip):
+    seen = []
+    chat = pylangacq.read_chat(
+        sample_zip,
+        filter_files="020000",
+        filter_participants="CHI",
+        profile_hook=seen.append,
+    )
+    assert [f.path for f in seen] == ["Eve/020000.cha"]
+    assert chat.profile.files == seen
+    assert chat == pylangacq.read_chat(
+        sample_zip, filter_files="020000", filter_participants="CHI"
+    )
+
+
+def test_read_chat_without_profile(sample_chat):
+    assert sample_chat.profile is None
+    with pytest.raises(ValueError):
+        pylangacq.read_chat("https://example.com/data.zip.git", profile=True)
+
+
+def test_read_chat_profile_with_lazy_tiers(sample_zip):
+    with pytest.raises(ValueError, match="lazy_tiers"):
+        pylangacq.read_chat(sample_zip, profile=True, lazy_tiers=True)
+    with pytest.raises(ValueError, match="lazy_tiers"):
+        pylangacq.read_chat(sample_zip, profile_hook=print, lazy_tiers=True)
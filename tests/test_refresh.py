@@ -0,0 +1,99 @@
+import os
+
+import pytest
+
+import pylangacq
+
+
+def _touch(path):
+    """Make sure that a file's modification time changes."""
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_incremental_from_dir(sample_dir):
+    chat = pylangacq.CHAT.from_dir(sample_dir, incremental=True)
+    assert chat == pylangacq.CHAT.from_dir(sample_dir)
+    assert not chat.refresh()
+
+
+def test_refresh_added_modified_removed(sample_dir):
+    chat = pylangacq.CHAT.from_dir(sample_dir, incremental=True)
+    chat.build_index()
+    mlum = chat.mlum()
+    first, second = chat.file_paths
+
+    # Saved again without edits: not reparsed.
+    _touch(first)
+    assert not chat.refresh()
+
+    text = open(second, encoding="utf-8").read()
+    with open(second, "w", encoding="utf-8") as f:
+        f.write(text.replace("I see him", "I see them").replace("|him", "|them"))
+    _touch(second)
+    new = os.path.join(os.path.dirname(first), "015000.cha")
+    with open(new, "w", encoding="utf-8") as f:
+        f.write(open(first, encoding="utf-8").read())
+
+    changes = chat.refresh()
+    assert changes == pylangacq.DirChanges(added=[new], modified=[second])
+    assert chat == pylangacq.CHAT.from_dir(sample_dir)
+    assert chat.file_paths == [first, new, second]
+    assert chat._index[0] is not None and chat._index[1:] == [None, None]
+    assert chat.measure_cache_info().n_entries == 1
+    assert chat.mlum() == [mlum[0], mlum[0], mlum[1]]
+    assert chat.search(word="them")[0].file == 2
+
+    os.remove(first)
+    assert chat.refresh() == pylangacq.DirChanges(removed=[first])
+    assert chat.file_paths == [new, second]
+    assert chat == pylangacq.CHAT.from_dir(sample_dir)
+
+
+def test_refresh_keeps_files_from_elsewhere(sample_dir, sample_chat):
+    chat = pylangacq.CHAT.from_dir(sample_dir, incremental=True)
+    first, second = chat.file_paths
+    chat.append_left(sample_chat[1])
+    chat.append(sample_chat[0])
+    chat.mlum()
+    os.remove(first)
+    new = os.path.join(os.path.dirname(first), "030000.cha")
+    with open(new, "w", encoding="utf-8") as f:
+        f.write(open(second, encoding="utf-8").read())
+
+    assert chat.refresh() == pylangacq.DirChanges(added=[new], removed=[first])
+    assert chat.file_paths == [
+        sample_chat.file_paths[1],
+        second,
+        sample_chat.file_paths[0],
+        new,
+    ]
+    assert chat.utterances(by_file=True) == [
+        sample_chat[1].utterances(),
+        sample_chat[1].utterances(),
+        sample_chat[0].utterances(),
+        sample_chat[1].utterances(),
+    ]
+    assert chat.measure_cache_info().n_entries == 3
+    assert not chat.refresh()
+
+
+def test_watch(sample_dir):
+    chat = pylangacq.CHAT.from_dir(sample_dir, incremental=True)
+    first, second = chat.file_paths
+    os.remove(first)
+    watch = chat.watch(interval=0)
+    updated = next(watch)
+    assert updated is not chat
+    assert updated == chat
+    assert updated.file_paths == [second]
+
+    # A copy yielded earlier is left as it is by later changes.
+    os.remove(second)
+    assert next(watch).n_files == chat.n_files == 0
+    assert updated.file_paths == [second]
+
+
+def test_refresh_requires_incremental(sample_chat):
+    with pytest.raises(ValueError):
+        sample_chat.refresh()
@@ -0,0 +1,83 @@
+import random
+
+import pytest
+
+import pylangacq
+
+np = pytest.importorskip("numpy")
+
+
+@pytest.mark.parametrize("measure", ["mlu", "mlum", "mluw", "ttr"])
+def test_bootstrap_by_file(sample_chat, measure):
+    intervals = sample_chat.bootstrap(measure, n_resamples=200, seed=0)
+    assert len(intervals) == sample_chat.n_files
+    estimates = getattr(sample_chat, measure)()
+    for ci, estimate in zip(intervals, estimates):
+        assert ci.estimate == estimate
+        assert ci.low <= ci.estimate <= ci.high
+        assert ci.standard_error >= 0
+    assert intervals == sample_chat.bootstrap(measure, n_resamples=200, seed=0)
+
+
+def test_bootstrap_matches_resampled_readers(sample_chat):
+    # The child's utterances at 2;00 have 4 and 3 morphemes,
+    # so the MLUm of a resample of them is 3, 3.5, or 4,
+    # each as for a reader built from the resampled utterances.
+    utterances = [u for u in sample_chat[1].utterances() if u.participant == "CHI"]
+    rng = random.Random(0)
+    resampled = {
+        pylangacq.CHAT.from_utterances(rng.choices(utterances, k=2)).mlum()[0]
+        for _ in range(20)
+    }
+    assert resampled == {3.0, 3.5, 4.0}
+
+    ci = sample_chat.bootstrap("mlum", n_resamples=2000, seed=0)[1]
+    assert (ci.low, ci.estimate, ci.high) == (3.0, 3.5, 4.0)
+    # The standard error of the mean of two draws of 3 or 4.
+    assert ci.standard_error == pytest.approx(0.5 / 2**0.5, rel=0.1)
+
+
+def test_bootstrap_without_utterances(sample_chat):
+    assert sample_chat.bootstrap("mlum", participant="FAT") == [None, None]
+    assert sample_chat.bootstrap("mlum", by="corpus", participant="FAT") is None
+
+
+def test_bootstrap_by_corpus(sample_chat):
+    ci = sample_chat.bootstrap("ipsyn", by="corpus", n_resamples=500, seed=1)
+    ipsyn = sample_chat.ipsyn()
+    assert ci.estimate == sum(ipsyn) / 2
+    assert min(ipsyn) <= ci.low <= ci.high <= max(ipsyn)
+
+    ci = sample_chat.bootstrap("mluw", by="corpus", n_resamples=500, confidence=0.5)
+    assert ci.estimate == pytest.approx(sum(sample_chat.mluw()) / 2)
+
+
+def test_permutation_test(sample_chat):
+    tests = sample_chat.permutation_test("mluw", n_resamples=500, seed=0)
+    assert len(tests) == sample_chat.n_files
+    for test, chi, mot in zip(
+        tests, sample_chat.mluw(), sample_chat.mluw(participant="MOT")
+    ):
+        assert test.estimates == (chi, mot)
+        assert test.difference == pytest.approx(chi - mot)
+        assert 1 / 501 <= test.p_value <= 1
+
+    # With two utterances each, a difference as large as the observed one
+    # turns up in at least 2 of the 6 possible assignments of the labels.
+    assert all(test.p_value > 0.2 for test in tests)
+    assert sample_chat.permutation_test("ttr", ("CHI", "FAT")) == [None, None]
+
+
+def test_invalid_arguments(sample_chat):
+    with pytest.raises(ValueError):
+        sample_chat.bootstrap("foo")
+    with pytest.raises(ValueError):
+        sample_chat.bootstrap("ipsyn")
+    with pytest.raises(ValueError):
+        sample_chat.bootstrap("mlum", by="utterance")
+    with pytest.raises(ValueError):
+        sample_chat.bootstrap("mlum", n_resamples=0)
+    with pytest.raises(ValueError):
+        sample_chat.bootstrap("mlum", confidence=1)
+    with pytest.raises(ValueError):
+        sample_chat.permutation_test("ipsyn")
@@ -0,0 +1,105 @@
+import collections
+import pickle
+import random
+
+import pytest
+
+import pylangacq
+
+
+def _top_bigrams(chat):
+    return chat.word_ngrams(2, top_k=5, approximate=True)
+
+
+@pytest.fixture
+def zipfian_seqs():
+    rng = random.Random(0)
+    vocab = [f"w{i}" for i in range(200)]
+    weights = [1 / (i + 1) for i in range(len(vocab))]
+    return [rng.choices(vocab, weights, k=rng.randint(1, 12)) for _ in range(3000)]
+
+
+def _exact(seqs, n):
+    counter = collections.Counter()
+    for seq in seqs:
+        counter.update(zip(*(seq[i:] for i in range(n))))
+    return counter
+
+
+def _check_bounds(ngrams, exact):
+    assert ngrams.total() == sum(exact.values())
+    assert 0 < ngrams.error <= ngrams.total() / (ngrams.capacity + 1)
+    assert len(ngrams) <= 2 * ngrams.capacity
+    for ngram, count in exact.items():
+        lower, upper = ngrams.bounds(ngram)
+        assert lower <= count <= upper
+        if count > ngrams.error:
+            assert ngram in ngrams
+
+
+def test_exact_under_capacity(sample_chat):
+    ngrams = sample_chat.word_ngrams(2, top_k=5, approximate=True)
+    exact = sample_chat.word_ngrams(2)
+    assert isinstance(ngrams, pylangacq.TopNgrams)
+    assert ngrams.error == 0
+    assert ngrams.to_counter() == exact.to_counter()
+    assert ngrams.total() == exact.total()
+    assert ngrams.most_common() == exact.most_common(5)
+    assert ngrams.most_common(2) == exact.most_common(2)
+
+
+def test_filtered(sample_chat):
+    chi = sample_chat.filter(participants="CHI")
+    ngrams = chi.word_ngrams(1, top_k=3, approximate=True)
+    assert ngrams.to_counter() == chi.word_ngrams(1).to_counter()
+
+
+@pytest.mark.parametrize("n", [1, 2, 3])
+def test_error_bounds(zipfian_seqs, n):
+    ngrams = pylangacq.TopNgrams(n, top_k=10, capacity=50)
+    ngrams.count_seqs(zipfian_seqs)
+    exact = _exact(zipfian_seqs, n)
+    _check_bounds(ngrams, exact)
+    if n == 1:
+        # The most common words of a Zipfian distribution stand out.
+        assert ngrams.most_common(3) == [
+            (ngram, ngrams.get(ngram)) for ngram, _ in exact.most_common(3)
+        ]
+
+
+def test_merge(zipfian_seqs):
+    left = pylangacq.TopNgrams(2, top_k=10, capacity=50)
+    right = pylangacq.TopNgrams(2, top_k=10, capacity=50)
+    left.count_seqs(zipfian_seqs[:1000])
+    right.count_seqs(zipfian_seqs[1000:])
+    merged = left + right
+    assert len(merged) <= merged.capacity
+    _check_bounds(merged, _exact(zipfian_seqs, 2))
+
+    with pytest.raises(ValueError):
+        left + pylangacq.TopNgrams(3)
+
+
+@pytest.mark.parametrize("workers", [1, 2])
+def test_map_reduce(sample_chat, workers):
+    ngrams = sample_chat.map_reduce(_top_bigrams, "top_ngrams", workers=workers)
+    assert ngrams == _top_bigrams(sample_chat)
+
+
+def test_pickle(zipfian_seqs):
+    ngrams = pylangacq.TopNgrams(2, top_k=10)
+    ngrams.count_seqs(zipfian_seqs)
+    assert pickle.loads(pickle.dumps(ngrams)) == ngrams
+
+
+def test_invalid_arguments(sample_chat):
+    with pytest.raises(ValueError):
+        sample_chat.word_ngrams(2, approximate=True)
+    with pytest.raises(ValueError):
+        sample_chat.word_ngrams(2, top_k=5)
+    with pytest.raises(ValueError):
+        sample_chat.word_ngrams(0, top_k=5, approximate=True)
+    with pytest.raises(ValueError):
+        pylangacq.TopNgrams(2, top_k=10, capacity=5)
+    with pytest.raises(ValueError):
+        pylangacq.TopNgrams(2).most_common(order=1)
@@ -0,0 +1,98 @@
+import pytest
+
+import pylangacq
+
+
+@pytest.mark.parametrize("mmap", [True, False])
+def test_save_and_load(sample_chat, tmp_path, mmap):
+    path = tmp_path / "eve.snapshot"
+    sample_chat.save(path)
+    loaded = pylangacq.CHAT.load(path, mmap=mmap)
+    assert loaded._pending is not None
+    assert loaded.file_paths == sample_chat.file_paths
+    assert loaded.words(by_utterance=True) == sample_chat.words(by_utterance=True)
+    assert loaded.tokens(by_file=True) == sample_chat.tokens(by_file=True)
+    assert loaded.to_columns() == sample_chat.to_columns()
+    assert loaded._pending is not None
+    assert loaded.utterances() == sample_chat.utterances()
+    assert loaded.headers() == sample_chat.headers()
+    assert loaded.mlum() == sample_chat.mlum()
+
+
+@pytest.mark.parametrize("lazy_tiers", [False, True])
+def test_snapshot_keeps_parse_options(sample_chat, tmp_path, lazy_tiers):
+    chat = pylangacq.CHAT.from_strs(
+        sample_chat.to_strs(), mor_tier=None, gra_tier=None, lazy_tiers=lazy_tiers
+    )
+    path = tmp_path / "eve.snapshot"
+    chat.save(path)
+    loaded = pylangacq.CHAT.load(path)
+    assert loaded.mlum() == chat.mlum() == [0.0, 0.0]
+    assert loaded.utterances() == chat.utterances()
+    tokens = [u.tokens for u in loaded.utterances() if u.tokens is not None]
+    assert tokens == loaded.tokens(by_utterance=True)
+
+    # And a snapshot of the loaded reader, before it's parsed.
+    pylangacq.CHAT.load(path).save(tmp_path / "again.snapshot")
+    assert pylangacq.CHAT.load(tmp_path / "again.snapshot").mlum() == [0.0, 0.0]
+
+
+def test_load_materializes_files_lazily(sample_chat, tmp_path):
+    path = tmp_path / "eve.snapshot"
+    sample_chat.save(path)
+    loaded = pylangacq.CHAT.load(path)
+    assert loaded[1].words() == sample_chat[1].words()
+    assert loaded._pending.tables._items[0] is None
+
+
+def test_snapshot_of_filtered_reader(sample_chat, tmp_path):
+    path = tmp_path / "chi.snapshot"
+    chi = sample_chat.filter(participants="CHI")
+    chi.save(path)
+    loaded = pylangacq.CHAT.load(path)
+    assert loaded.words() == chi.words()
+    assert loaded.utterances() == chi.utterances()
+    assert loaded.mlum(participant="MOT") == chi.mlum(participant="MOT")
+
+
+def _headers(chat):
+    return chat.headers(), chat.ages(), chat.participants()
+
+
+@pytest.mark.parametrize("filtered", ["filter", "read_chat", "cache"])
+def test_snapshot_keeps_participant_headers(sample_zip, tmp_path, filtered):
+    if filtered == "filter":
+        mot = pylangacq.read_chat(sample_zip).filter(participants="MOT")
+    elif filtered == "read_chat":
+        mot = pylangacq.read_chat(sample_zip, filter_participants="MOT")
+    else:
+        cache = pylangacq.ParseCache(tmp_path / "cache")
+        pylangacq.read_chat(sample_zip, cache=cache)
+        mot = pylangacq.read_chat(sample_zip, cache=cache, filter_participants="MOT")
+    path = tmp_path / "mot.snapshot"
+    mot.save(path)
+    loaded = pylangacq.CHAT.load(path)
+    assert _headers(loaded) == _headers(mot)
+    assert mot.ages() == [None, None]
+    assert loaded.utterances() == mot.utterances()
+
+    # A loaded snapshot, filtered and saved again.
+    loaded = pylangacq.CHAT.load(path).filter(participants="(?!)")
+    loaded.save(path)
+    assert _headers(pylangacq.CHAT.load(path)) == _headers(loaded)
+
+
+def test_snapshot_of_cached_reader(sample_zip, tmp_path):
+    cache = pylangacq.ParseCache(tmp_path / "cache")
+    pylangacq.read_chat(sample_zip, cache=cache)
+    warm = pylangacq.read_chat(sample_zip, cache=cache)
+    path = tmp_path / "eve.snapshot"
+    warm.save(path)
+    assert pylangacq.CHAT.load(path) == pylangacq.read_chat(sample_zip)
+
+
+def test_load_invalid_file(tmp_path):
+    path = tmp_path / "not_a_snapshot"
+    path.write_bytes(b"@UTF8\n@Begin\n@End\n")
+    with pytest.raises(ValueError):
+        pylangacq.CHAT.load(path)
@@ -0,0 +1,245 @@
+import hashlib
+import http.server
+import io
+import os
+import subprocess
+import threading
+import zipfile
+
+import pytest
+
+import pylangacq
+
+
+class _Server(http.server.ThreadingHTTPServer):
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _Handler)
+        self.files = {}
+        self.requests = []
+        # If set, send only this many bytes of the next response body.
+        self.truncate_at = None
+
+    def url(self, name):
+        return f"http://127.0.0.1:{self.server_port}/{name}"
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        name = self.path.lstrip("/")
+        server.requests.append((name, dict(self.headers)))
+        if name not in server.files:
+            self.send_error(404)
+            return
+        data = server.files[name]
+        etag = '"' + hashlib.sha256(data).hexdigest()[:16] + '"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        start = 0
+        if self.headers.get("Range") and self.headers.get("If-Range") == etag:
+            start = int(self.headers["Range"].split("=")[1].rstrip("-"))
+            if start >= len(data):
+                self.send_response(416)
+                self.send_header("Content-Range", f"bytes */{len(data)}")
+                self.end_headers()
+                return
+            self.send_response(206)
+            self.send_header("Content-Range", f"bytes {start}-{len(data) - 1}/*")
+        else:
+            self.send_response(200)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(data) - start))
+        self.end_headers()
+        body = data[start:]
+        if server.truncate_at is not None:
+            body, server.truncate_at = body[: server.truncate_at], None
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def server(sample_chat):
+    server = _Server()
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as f:
+        for file_path, data in zip(sample_chat.file_paths, sample_chat.to_strs()):
+            f.writestr(file_path, data)
+    server.files["Eve.zip"] = buffer.getvalue()
+    server.files["010600.cha"] = sample_chat.to_strs()[0].encode("utf-8")
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def git_repo(sample_dir, tmp_path):
+    def git(*args, cwd=sample_dir):
+        subprocess.run(
+            ["git", "-c", "user.name=test", "-c", "user.email=test@example.com"]
+            + list(args),
+            cwd=cwd,
+            check=True,
+            capture_output=True,
+        )
+
+    git("init", "--quiet")
+    git("add", ".")
+    git("commit", "--quiet", "-m", "Add transcripts")
+    bare = tmp_path / "corpus.git"
+    git("clone", "--quiet", "--bare", str(sample_dir), str(bare), cwd=tmp_path)
+    return bare, git
+
+
+def test_download(server, tmp_path, sample_chat):
+    cache = pylangacq.SourceCache(tmp_path / "cache")
+    url = server.url("Eve.zip")
+    chat = pylangacq.CHAT.from_urls([url], cache=cache)
+    assert chat.utterances() == sample_chat.utterances()
+
+    # Revalidated with the ETag, and not downloaded again.
+    assert pylangacq.CHAT.from_urls([url], cache=cache) == chat
+    assert server.requests[-1][1]["If-None-Match"]
+    assert cache.stats().hits == 1
+    assert cache.stats().misses == 1
+
+    pylangacq.CHAT.from_urls([url], cache=cache, revalidate=False)
+    assert len(server.requests) == 2
+
+
+def test_download_changed(server, tmp_path, sample_chat):
+    cache = pylangacq.SourceCache(tmp_path / "cache")
+    url = server.url("010600.cha")
+    assert pylangacq.CHAT.from_urls([url], cache=cache).n_files == 1
+    server.files["010600.cha"] = sample_chat.to_strs()[1].encode("utf-8")
+    chat = pylangacq.CHAT.from_urls([url], cache=cache)
+    assert chat.utterances() == sample_chat[1].utterances()
+    assert cache.stats().misses == 2
+
+
+def test_resume_download(server, tmp_path, sample_chat):
+    cache = pylangacq.SourceCache(tmp_path / "cache")
+    url = server.url("Eve.zip")
+    server.truncate_at = 100
+    with pytest.raises(OSError):
+        cache.fetch(url)
+    chat = pylangacq.CHAT.from_urls([url], cache=cache)
+    assert chat.utterances() == sample_chat.utterances()
+    assert server.requests[-1][1]["Range"] == "bytes=100-"
+
+
+@pytest.mark.parametrize("extra", [b"", b"trailing bytes"])
+def test_resume_complete_download(server, tmp_path, sample_chat, extra):
+    cache = pylangacq.SourceCache(tmp_path / "cache")
+    url = server.url("Eve.zip")
+    server.truncate_at = 100
+    with pytest.raises(OSError):
+        cache.fetch(url)
+    # The partial file already has all the data (or more), so nothing is left
+    # to fetch and the server answers the range request with a 416.
+    part_path = os.path.join(cache._entry_dir(url), "Eve.zip.part")
+    with open(part_path, "wb") as f:
+        f.write(server.files["Eve.zip"] + extra)
+    digest = hashlib.sha256(server.files["Eve.zip"]).hexdigest()
+    path = cache.fetch(url, checksum=f"sha256:{digest}")
+    with open(path, "rb") as f:
+        assert f.read() == server.files["Eve.zip"]
+    assert not os.path.exists(part_path)
+    assert (
+        server.requests[1][1]["Range"]
+        == f"bytes={len(server.files['Eve.zip']) + len(extra)}-"
+    )
+    assert len(server.requests) == (2 if not extra else 3)
+
+
+def test_checksum(server, tmp_path):
+    cache = pylangacq.SourceCache(tmp_path / "cache")
+    url = server.url("Eve.zip")
+    digest = hashlib.sha256(server.files["Eve.zip"]).hexdigest()
+    assert os.path.exists(cache.fetch(url, checksum=f"sha256:{digest}"))
+    with pytest.raises(ValueError):
+        cache.fetch(server.url("010600.cha"), checksum=digest)
+
+
+def test_git(git_repo, tmp_path, sample_dir):
+    bare, git = git_repo
+    cache = pylangacq.SourceCache(tmp_path / "cache")
+    url = bare.as_uri()
+    chat = pylangacq.CHAT.from_urls([url], cache=cache)
+    assert chat.words() == pylangacq.CHAT.from_dir(sample_dir).words()
+
+    # Not cloned again unless the remote HEAD has moved.
+    pylangacq.CHAT.from_urls([url], cache=cache)
+    assert cache.stats().hits == 1
+    first = next(p for p in sorted(sample_dir.rglob("*.cha")))
+    first.unlink()
+    git("commit", "--quiet", "-am", "Remove a transcript")
+    git("push", "--quiet", str(bare), "HEAD")
+    assert pylangacq.CHAT.from_urls([url], cache=cache).n_files == 1
+
+
+def test_concurrent_sources_in_order(server, git_repo, tmp_path, sample_zip):
+    cache = pylangacq.SourceCache(tmp_path / "cache")
+    urls = [server.url("010600.cha"), git_repo[0].as_uri(), str(sample_zip)]
+    chat = pylangacq.CHAT.from_urls(
+        urls, cache=cache, max_concurrency=2, participants="CHI"
+    )
+    assert chat.n_files == 5
+    assert chat.file_paths[0].endswith("010600.cha")
+    assert chat.file_paths[-2:] == pylangacq.read_chat(sample_zip).file_paths
+    assert {u.participant for u in chat.utterances()} == {"CHI"}
+
+
+def test_read_chat(server, sample_zip, tmp_path, monkeypatch):
+    # For the default cache directory under the home directory.
+    monkeypatch.setenv("HOME", str(tmp_path))
+    chat = pylangacq.read_chat(
+        [server.url("Eve.zip"), str(sample_zip)], filter_participants="CHI"
+    )
+    expected = pylangacq.read_chat(sample_zip, filter_participants="CHI")
+    assert chat.utterances() == expected.utterances() * 2
+
+    chat = pylangacq.read_chat([server.url("Eve.zip")], lazy_tiers=True)
+    assert chat._lazy is not None
+    assert chat.tokens() == pylangacq.read_chat(sample_zip).tokens()
+
+    for kwargs in [
+        {"cache": pylangacq.ParseCache(tmp_path / "parse")},
+        {"profile": True},
+        {"profile_hook": print},
+    ]:
+        with pytest.raises(ValueError, match="list of sources"):
+            pylangacq.read_chat([str(sample_zip)], **kwargs)
+
+
+def test_lru_size_cap(server, tmp_path):
+    size = len(server.files["Eve.zip"])
+    cache = pylangacq.SourceCache(tmp_path / "cache", max_size=size + 300)
+    cache.fetch(server.url("Eve.zip"))
+    cache.fetch(server.url("010600.cha"))
+    assert cache.stats().evictions == 1
+    assert cache.stats().n_entries == 1
+
+    with pytest.raises(ValueError):
+        pylangacq.SourceCache(max_size=-1)
+
+
+@pytest.mark.parametrize("max_concurrency", [1, 2])
+def test_small_cache_keeps_sources_until_parsed(server, tmp_path, max_concurrency):
+    # Each source alone is larger than the cache.
+    cache = pylangacq.SourceCache(tmp_path / "cache", max_size=100)
+    urls = [server.url("Eve.zip"), server.url("010600.cha")]
+    chat = pylangacq.CHAT.from_urls(urls, cache=cache, max_concurrency=max_concurrency)
+    assert chat.n_files == 3
+
+    path = cache.fetch(server.url("Eve.zip"))
+    assert os.path.exists(path)
+    with cache.pinned(server.url("010600.cha")) as pinned:
+        cache.fetch(server.url("Eve.zip"))
+        assert os.path.exists(pinned)
+    assert cache.stats().n_entries == 2
@@ -0,0 +1,74 @@
+import pytest
+
+import pylangacq
+
+
+@pytest.mark.parametrize("source", ["sample_zip", "sample_dir"])
+@pytest.mark.parametrize("prefetch", [0, 1, 3])
+def test_iter_chat_matches_read_chat(source, prefetch, request):
+    path = request.getfixturevalue(source)
+    expected = pylangacq.read_chat(path)
+    chunks = list(pylangacq.iter_chat(path, prefetch=prefetch))
+    assert [chunk.n_files for chunk in chunks] == [1, 1]
+    assert [p for chunk in chunks for p in chunk.file_paths] == expected.file_paths
+    assert [v for chunk in chunks for v in chunk.mlum()] == expected.mlum()
+
+
+def test_iter_chat_chunks_and_filters(sample_zip):
+    chunks = list(pylangacq.iter_chat(sample_zip, chunk_files=5))
+    assert len(chunks) == 1
+    assert chunks[0] == pylangacq.read_chat(sample_zip)
+
+    chunks = list(
+        pylangacq.iter_chat(sample_zip, filter_files="0200", filter_participants="CHI")
+    )
+    assert len(chunks) == 1
+    assert chunks[0].words() == [
+        "the",
+        "dog",
+        "is",
+        "running",
+        ".",
+        "I",
+        "see",
+        "him",
+        ".",
+    ]
+
+
+@pytest.mark.parametrize("prefetch", [0, 1])
+def test_iter_chat_prefilter(sample_zip, prefetch):
+    kwargs = {"exclude_participants": "CHI", "age_range": (20, None)}
+    chunks = list(pylangacq.iter_chat(sample_zip, prefetch=prefetch, **kwargs))
+    expected = pylangacq.read_chat(sample_zip, **kwargs)
+    assert [chunk.file_paths for chunk in chunks] == [expected.file_paths]
+    assert chunks[0].utterances() == expected.utterances()
+    assert chunks[0].participants() == expected.participants()
+
+    chunks = list(pylangacq.iter_chat(sample_zip, filter_participants="MOT"))
+    expected = pylangacq.read_chat(sample_zip).filter(participants="MOT")
+    assert [age for chunk in chunks for age in chunk.ages()] == expected.ages()
+    assert [h for chunk in chunks for h in chunk.headers()] == expected.headers()
+
+
+@pytest.mark.parametrize("source", ["sample_zip", "sample_dir"])
+def test_iter_chat_lazy_tiers(source, request):
+    path = request.getfixturevalue(source)
+    chunks = list(pylangacq.iter_chat(path, lazy_tiers=True, filter_participants="CHI"))
+    assert all(chunk._lazy is not None for chunk in chunks)
+    expected = pylangacq.read_chat(path, filter_participants="CHI")
+    assert [w for chunk in chunks for w in chunk.words()] == expected.words()
+    assert [t for chunk in chunks for t in chunk.tokens()] == expected.tokens()
+
+
+def test_iter_chat_single_file(sample_dir):
+    path = sample_dir / "Eve" / "010600.cha"
+    (chat,) = pylangacq.iter_chat(path)
+    assert chat.n_files == 1
+
+
+def test_iter_chat_invalid_arguments(sample_zip):
+    with pytest.raises(ValueError):
+        next(pylangacq.iter_chat(sample_zip, chunk_files=0))
+    with pytest.raises(ValueError):
+        next(pylangacq.iter_chat("data.txt"))
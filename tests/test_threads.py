@@ -0,0 +1,154 @@
+import sys
+import threading
+
+import pytest
+
+import pylangacq
+
+
+def _queries():
+    return [
+        lambda chat: chat.words(),
+        lambda chat: chat.utterances(by_file=True),
+        lambda chat: chat.mlum(),
+        lambda chat: chat.ttr(participant="MOT"),
+        lambda chat: chat.word_ngrams(2).most_common(),
+        lambda chat: chat.search(lemma="cookie"),
+        lambda chat: chat.measures_by_age(["mluw"], bin_months=6),
+    ]
+
+
+def _run_threads(chat, queries, n_threads=8):
+    """Run each query on many threads at once, and return the results."""
+    barrier = threading.Barrier(n_threads)
+    results = [[] for _ in queries]
+
+    def run():
+        barrier.wait()
+        for query, query_results in zip(queries, results):
+            query_results.append(query(chat))
+
+    threads = [threading.Thread(target=run) for _ in range(n_threads)]
+    # Switch threads as often as possible, for the threads to interleave.
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(interval)
+    return results
+
+
+@pytest.mark.parametrize("how", ["parsed", "lazy_tiers", "snapshot"])
+def test_concurrent_queries(sample_zip, tmp_path, how):
+    expected = [query(pylangacq.read_chat(sample_zip)) for query in _queries()]
+    if how == "snapshot":
+        path = tmp_path / "eve.bin"
+        pylangacq.read_chat(sample_zip).save(path)
+        chat = pylangacq.CHAT.load(path)
+    else:
+        chat = pylangacq.read_chat(sample_zip, lazy_tiers=how == "lazy_tiers")
+    results = _run_threads(chat, _queries())
+    for query_results, result in zip(results, expected):
+        assert all(r == result for r in query_results)
+    assert chat._pending is None and chat._lazy is None
+    # Three measures, each computed for each file by each thread.
+    info = chat.measure_cache_info()
+    assert info.hits + info.misses == 8 * 3 * chat.n_files
+    assert info.n_entries == 3 * chat.n_files
+
+
+def test_run_parallel(sample_zip):
+    chat = pylangacq.read_chat(sample_zip, lazy_tiers=True)
+    queries = ["words", "mlum", *_queries()]
+    expected = [getattr(chat, q)() if isinstance(q, str) else q(chat) for q in queries]
+    assert chat.run_parallel(queries, workers=4) == expected
+    assert chat.run_parallel(queries, workers=1) == expected
+    assert chat.run_parallel([]) == []
+
+    def pop(chat):
+        return chat.pop()
+
+    with pytest.raises(ValueError, match="run_parallel"):
+        chat.run_parallel(["words", pop], workers=2)
+    # The reader can be modified again once the queries are done.
+    chat.pop()
+    assert chat.n_files == 1
+
+
+def test_run_parallel_errors(sample_zip):
+    chat = pylangacq.read_chat(sample_zip)
+    for query in ["foo", "_tables", "file_paths"]:
+        with pytest.raises(ValueError, match="Not a method"):
+            chat.run_parallel(["words", query])
+    with pytest.raises(ValueError):
+        chat.run_parallel(["words"], workers=0)
+    with pytest.raises(ZeroDivisionError):
+        chat.run_parallel(["words", lambda chat: 1 / 0])
+
+
+def test_freeze(sample_zip, sample_dir):
+    chat = pylangacq.read_chat(sample_zip)
+    assert not chat.frozen
+    assert chat.freeze() is chat
+    assert chat.frozen
+    for modify in [
+        lambda: chat.append(chat[0]),
+        lambda: chat.append_left(chat[0]),
+        lambda: chat.extend([chat[0]]),
+        lambda: chat.extend_left([chat[0]]),
+        lambda: chat.pop(),
+        lambda: chat.pop_left(),
+        lambda: chat.clear(),
+    ]:
+        with pytest.raises(ValueError, match="frozen"):
+            modify()
+    with pytest.raises(ValueError, match="frozen"):
+        chat += chat[0]
+    assert chat.n_files == 2
+
+    # Queries and the readers derived from a frozen one are as usual.
+    assert chat.words() == pylangacq.read_chat(sample_zip).words()
+    derived = chat.filter(participants="CHI")
+    assert not derived.frozen
+    derived.pop()
+    assert chat.n_files == 2
+
+    incremental = pylangacq.CHAT.from_dir(sample_dir, incremental=True).freeze()
+    with pytest.raises(ValueError, match="frozen"):
+        incremental.refresh()
+
+
+def test_modification_holds_lock(sample_zip):
+    chat = pylangacq.read_chat(sample_zip)
+    expected = chat[0].words()
+    started, release = threading.Event(), threading.Event()
+    splice = chat._splice
+
+    def slow_splice(*args):
+        started.set()
+        release.wait(5)
+        return splice(*args)
+
+    chat._splice = slow_splice
+    popping = threading.Thread(target=chat.pop)
+    popping.start()
+    assert started.wait(5)
+    # Neither run_parallel nor freeze can start while a file is being popped.
+    results = []
+    querying = threading.Thread(
+        target=lambda: results.append(chat.run_parallel(["words"]))
+    )
+    freezing = threading.Thread(target=chat.freeze)
+    querying.start()
+    freezing.start()
+    querying.join(0.2)
+    assert querying.is_alive() and not chat.frozen
+    release.set()
+    for thread in (popping, querying, freezing):
+        thread.join()
+    assert results == [[expected]]
+    assert chat.frozen
@@ -0,0 +1,104 @@
+import array
+import gc
+import threading
+import weakref
+
+import pytest
+
+import pylangacq
+
+
+def test_word_ids(sample_chat):
+    vocab = sample_chat.vocab
+    ids = sample_chat.word_ids()
+    assert isinstance(ids, array.array)
+    assert vocab.decode(ids) == sample_chat.words()
+    for by_utterance in (False, True):
+        for by_file in (False, True):
+            grouped = sample_chat.word_ids(by_utterance=by_utterance, by_file=by_file)
+            words = sample_chat.words(by_utterance=by_utterance, by_file=by_file)
+            if by_utterance and by_file:
+                assert [[vocab.decode(u) for u in f] for f in grouped] == words
+            elif by_utterance or by_file:
+                assert [vocab.decode(ids) for ids in grouped] == words
+
+
+def test_shared_vocabulary(sample_chat, sample_zip):
+    derived = [sample_chat.filter(participants="MOT"), sample_chat[1:]]
+    assert all(chat.vocab is sample_chat.vocab for chat in derived)
+    other = pylangacq.read_chat(sample_zip).filter(participants="MOT")
+    assert other.vocab is not sample_chat.vocab
+    other.vocab = sample_chat.vocab
+    ids = sample_chat.word_ids()
+    cookie = sample_chat.vocab.get("cookies")
+    assert cookie in ids
+    assert cookie in other.word_ids()
+    # Each word is stored once, however many times it occurs.
+    words = sample_chat.vocab.decode(sample_chat.word_ids())
+    assert len({id(word) for word in words}) == len(set(words))
+
+
+def test_vocabulary_released(sample_chat):
+    pytest.importorskip("numpy")
+    sample_strs = sample_chat.to_strs()
+    refs = []
+    for i in range(3):
+        # New words each time, for a vocabulary that would keep growing.
+        strs = [text.replace("cookie", f"cookie{i}") for text in sample_strs]
+        chat = pylangacq.CHAT.from_strs(strs)
+        chat.word_ids()
+        collocations = chat.collocations()
+        assert collocations.vocab is chat.vocab
+        assert f"cookie{i}" in chat.vocab
+        refs.append(weakref.ref(chat.vocab))
+        del chat, collocations
+        gc.collect()
+    assert all(ref() is None for ref in refs)
+
+    # Collocations from n-grams have their own vocabulary.
+    collocations = pylangacq.Collocations.from_ngrams(sample_chat.word_ngrams(2))
+    assert collocations.vocab is not sample_chat.vocab
+    assert len(sample_chat.vocab) == 0
+
+
+def test_compact_tokens(sample_chat):
+    columns = sample_chat.tokens(compact=True)
+    tokens = sample_chat.tokens()
+    assert columns.decode("word") == [t.word for t in tokens]
+    assert columns.decode("pos") == [t.pos for t in tokens]
+    assert list(columns["word"]) == list(sample_chat.word_ids())
+    assert columns.vocabularies["pos"] is sample_chat.vocab.strings
+    assert columns["file"] == sample_chat.to_columns()["file"]
+
+    with pytest.raises(ValueError):
+        sample_chat.tokens(compact=True, by_utterance=True)
+
+
+def test_vocabulary():
+    vocab = pylangacq.Vocabulary(["a", "b"])
+    assert vocab.add("b") == 1
+    assert vocab.add("c") == 2
+    assert vocab.get("d") is None
+    assert list(vocab) == ["a", "b", "c"]
+    assert list(vocab.encode(["c", None, "a"])) == [2, -1, 0]
+    assert vocab.decode([2, -1]) == ["c", None]
+    with pytest.raises(IndexError):
+        vocab[-1]
+
+
+def test_vocabulary_threads():
+    vocab = pylangacq.Vocabulary()
+    words = [f"w{i % 500}" for i in range(5000)]
+    results = []
+
+    def encode():
+        results.append(vocab.encode(words))
+
+    threads = [threading.Thread(target=encode) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(vocab) == 500
+    assert all(ids == results[0] for ids in results)
+    assert vocab.decode(results[0]) == words